@@ -2,8 +2,15 @@ import dash
 from dash import html, dash_table, dcc, Input, Output, State
 import pandas as pd
 import csv
+import os
+import sys
 from typing import List, Dict, Any
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fixlib.rule_cache import rule_cache
+
+ROUTING_COLUMNS = ('SENDERCOMPID', 'CURRENCY', 'TARGETSUBID', 'ETF', 'COUNTRYCODE', 'DESTINATION')
+
 # Sample customer data - replace with your actual data
 customer_data = [
     {'id': 1, 'name': 'Customer A', 'sendercompid': 'BPGICRD', 'region': 'North America'},
@@ -97,42 +104,69 @@ app.index_string = '''
 '''
 
 # Routing rules functions
+def read_routing_file(csv_file_path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """SENDERCOMPID -> its rule rows, in file (priority) order"""
+    rules_by_sender = {}
+    with open(csv_file_path, 'r', newline='', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile, delimiter=';')
+        for row in reader:
+            rules_by_sender.setdefault(row['SENDERCOMPID'], []).append(
+                {column: row[column] for column in ROUTING_COLUMNS})
+    return rules_by_sender
+
+class RoutingIndex:
+    """
+    Rules of one routing file keyed by SENDERCOMPID, plus the smart display per
+    sender, built on first request. A new index is compiled whenever the file
+    changes, so the memoized displays never outlive the rules they came from.
+    """
+
+    def __init__(self, files: Dict[str, Dict[str, List[Dict[str, Any]]]]):
+        self.rules_by_sender = next(iter(files.values()), {})
+        self.displays: Dict[str, List[Dict[str, Any]]] = {}
+
+    def display(self, sendercompid: str) -> List[Dict[str, Any]]:
+        display_rules = self.displays.get(sendercompid)
+        if display_rules is None:
+            display_rules = build_smart_routing_display(self.rules_by_sender.get(sendercompid, []))
+            self.displays[sendercompid] = display_rules
+        return display_rules
+
+def load_routing_index(csv_file_path: str = 'routing.csv') -> RoutingIndex:
+    """Routing index for the file, re-read only when its mtime/size changes"""
+    return rule_cache('dash_routing').load([csv_file_path], read_routing_file, RoutingIndex).compiled
+
 def get_routing_rules(sendercompid: str, csv_file_path: str = 'routing.csv') -> List[Dict[str, Any]]:
     """
     Get routing rules for a given sendercompid from the routing CSV file.
     """
-    routing_rules = []
-    
+    if not os.path.exists(csv_file_path):
+        print(f"Error: Routing file '{csv_file_path}' not found.")
+        return []
     try:
-        with open(csv_file_path, 'r', newline='', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile, delimiter=';')
-            
-            for row in reader:
-                if row['SENDERCOMPID'] == sendercompid:
-                    routing_rules.append({
-                        'SENDERCOMPID': row['SENDERCOMPID'],
-                        'CURRENCY': row['CURRENCY'],
-                        'TARGETSUBID': row['TARGETSUBID'],
-                        'ETF': row['ETF'],
-                        'COUNTRYCODE': row['COUNTRYCODE'],
-                        'DESTINATION': row['DESTINATION']
-                    })
-    
-    except FileNotFoundError:
+        return list(load_routing_index(csv_file_path).rules_by_sender.get(sendercompid, []))
+    except Exception as e:
+        print(f"Error reading routing file: {e}")
+        return []
+
+def get_smart_routing_display(sendercompid: str, csv_file_path: str = 'routing.csv') -> List[Dict[str, Any]]:
+    """
+    Smart routing display for a sender, memoized per sender until the routing file changes.
+    The returned list is shared between calls; do not modify it.
+    """
+    if not os.path.exists(csv_file_path):
         print(f"Error: Routing file '{csv_file_path}' not found.")
         return []
+    try:
+        return load_routing_index(csv_file_path).display(sendercompid)
     except Exception as e:
         print(f"Error reading routing file: {e}")
         return []
-    
-    return routing_rules
 
-def get_smart_routing_display(sendercompid: str) -> List[Dict[str, Any]]:
+def build_smart_routing_display(all_rules: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Smart routing display that handles single-rule and multi-rule scenarios with currency grouping.
     """
-    all_rules = get_routing_rules(sendercompid)
-    
     if not all_rules:
         return []
     
@@ -1,18 +1,35 @@
 import dash
 from dash import dcc, html, dash_table, Input, Output, State
+from dash.exceptions import PreventUpdate
 import pandas as pd
 import plotly.graph_objects as go
 from datetime import datetime
 import base64
+import hashlib
 import io
-import re
 import os
+import sys
 from urllib.parse import quote
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fixlib.columnar import INT, FixColumnBuilder, append_frame
+from fixlib.frame_store import FrameStore, frame_store
+from fixlib.paged_table import page_count, page_records, page_tooltips, register_paged_table, register_table_export
+from fixlib.tail import close_session, get_session, log_root, open_session, resolve_log_path
+from fixlib.text_index import TextIndex, get_index, register_index, search_positions
+
 # Initialize the Dash app with callback exception suppression
 app = dash.Dash(__name__, suppress_callback_exceptions=True)
 app.title = "Ullink FIX Log & Account Viewer"
 
+# Refresh period of the live tail (ms)
+LIVE_REFRESH_MS = 2000
+# Rows per page of the FIX message and account tables (pages are served from the frame store)
+PAGE_SIZE = 20
+ACCOUNT_PAGE_SIZE = 15
+# parsed-data-store value when nothing is loaded; loaded data is {'key', 'columns', 'rows'}
+EMPTY_PARSED = {'key': None, 'columns': [], 'rows': 0}
+
 # Define FIX tag mappings for common fields
 FIX_TAG_MAP = {
     "8": "BeginString",
@@ -57,6 +74,49 @@ MSG_TYPE_MAP = {
     "A": "Logon"
 }
 
+SIDE_MAP = {"1": "Buy", "2": "Sell"}
+
+ORD_STATUS_MAP = {
+    "0": "New",
+    "1": "Partially Filled",
+    "2": "Filled",
+    "4": "Canceled",
+    "5": "Replaced",
+    "6": "Pending Cancel",
+    "8": "Rejected",
+    "9": "Suspended"
+}
+
+EXEC_TYPE_MAP = {
+    "0": "New",
+    "1": "Partial Fill",
+    "2": "Fill",
+    "3": "Done for Day",
+    "4": "Canceled",
+    "5": "Replace",
+    "6": "Pending Cancel",
+    "7": "Stopped",
+    "8": "Rejected",
+    "9": "Suspended",
+    "A": "Pending New",
+    "B": "Calculated",
+    "C": "Expired",
+    "D": "Restated",
+    "E": "Pending Replace",
+    "F": "Trade",
+    "G": "Trade Correct",
+    "H": "Trade Cancel",
+    "I": "Order Status"
+}
+
+# Enum decoders applied by the shared tokenizer (tag -> code map)
+FIX_DECODERS = {
+    "35": MSG_TYPE_MAP,
+    "54": SIDE_MAP,
+    "39": ORD_STATUS_MAP,
+    "150": EXEC_TYPE_MAP
+}
+
 # List of networks for Account Mapping
 NETWORKS = {
     'total': 'Total',
@@ -174,84 +234,45 @@ def load_all_network_files_1():
 # Load account data at startup
 print(f"Loading account data at {datetime.now()}")
 network_data = load_all_network_files()
+# Columns searched by the account search box
+ACCOUNT_SEARCH_COLUMNS = ['ACCOUNT_NUMBER', 'ACRONAME']
+# Account frames stay server-side; the browser only gets the row counts
+network_frames = {key: pd.DataFrame(records) for key, records in network_data.items()}
+network_indexes = {key: TextIndex.build(df, ACCOUNT_SEARCH_COLUMNS) for key, df in network_frames.items()}
 
-def parse_fix_message(fix_string):
-    """Parse a single FIX message string into a dictionary"""
-    if not fix_string:
-        return {}
-    
-    fields = {}
-    # Split by SOH character (ASCII 1)
-    parts = re.split(r'[\x01|;]', fix_string)
-    
-    for part in parts:
-        if '=' in part:
-            tag, value = part.split('=', 1)
-            if tag in FIX_TAG_MAP:
-                field_name = FIX_TAG_MAP[tag]
-                
-                # Special handling for certain fields
-                if tag == "35":  # MsgType
-                    value = MSG_TYPE_MAP.get(value, value)
-                elif tag == "52":  # SendingTime
-                    # Try to parse timestamp
-                    try:
-                        dt = datetime.strptime(value, "%Y%m%d-%H:%M:%S.%f")
-                        value = dt.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-                    except:
-                        pass
-                elif tag == "54":  # Side
-                    side_map = {"1": "Buy", "2": "Sell"}
-                    value = side_map.get(value, value)
-                elif tag == "39":  # OrdStatus
-                    status_map = {
-                        "0": "New",
-                        "1": "Partially Filled",
-                        "2": "Filled",
-                        "4": "Canceled",
-                        "5": "Replaced",
-                        "6": "Pending Cancel",
-                        "8": "Rejected",
-                        "9": "Suspended"
-                    }
-                    value = status_map.get(value, value)
-                elif tag == "150":  # ExecType
-                    exec_map = {
-                        "0": "New",
-                        "1": "Partial Fill",
-                        "2": "Fill",
-                        "3": "Done for Day",
-                        "4": "Canceled",
-                        "5": "Replace",
-                        "6": "Pending Cancel",
-                        "7": "Stopped",
-                        "8": "Rejected",
-                        "9": "Suspended",
-                        "A": "Pending New",
-                        "B": "Calculated",
-                        "C": "Expired",
-                        "D": "Restated",
-                        "E": "Pending Replace",
-                        "F": "Trade",
-                        "G": "Trade Correct",
-                        "H": "Trade Cancel",
-                        "I": "Order Status"
-                    }
-                    value = exec_map.get(value, value)
-                
-                fields[field_name] = value
-            else:
-                fields[f"Tag_{tag}"] = value
-    
-    return fields
+# Columns shown first in the message table, in this order
+COMMON_FIELDS = ['_LineNumber', 'MsgType', 'MsgSeqNum', 'SendingTime', 
+                 'SenderCompID', 'TargetCompID', 'ClOrdID', 'Symbol',
+                 'Side', 'OrdStatus', 'ExecType', 'LastPx', 'LastQty',
+                 'OrderQty', 'CumQty', 'LeavesQty', 'Price']
 
-def parse_fix_text(text_content):
-    """Parse FIX log text content directly"""
-    try:
-        messages = []
-        lines = text_content.split('\n')
-        
-        for i, line in enumerate(lines):
+def order_columns(columns):
+    """Put common fields first and the raw message last"""
+    existing_common = [f for f in COMMON_FIELDS if f in columns and f != '_LineNumber']
+    other_cols = [col for col in columns if col not in existing_common + ['_LineNumber', '_RawMessage']]
+    final_order = ['_LineNumber'] + existing_common + other_cols + ['_RawMessage']
+    # Only include columns that exist
+    return [col for col in final_order if col in columns]
+
+class FixTextState:
+    """Parsed messages of a log that is read in pieces (pasted text or a live tail)"""
+
+    def __init__(self):
+        # Fields go straight into typed columns (categorical MsgType/Side/..., float prices
+        # and quantities, datetime SendingTime) instead of one dict per message
+        self.builder = FixColumnBuilder(names=FIX_TAG_MAP, decoders=FIX_DECODERS, unknown="Tag_{}",
+                                        extra_kinds={'_LineNumber': INT})
+        self.line_count = 0
+
+    @property
+    def rows(self):
+        return self.builder.rows
+
+    def feed(self, lines):
+        """Parse more lines, continuing the line numbering; returns the number of new messages"""
+        rows = self.builder.rows
+        for line in lines:
+            self.line_count += 1
             line = line.strip()
             if line and not line.startswith('#'):  # Skip empty lines and comments
                 # Try to find FIX messages in the line
@@ -260,33 +281,25 @@ def parse_fix_text(text_content):
                     # Clean up the line
                     line = line.replace('', '\x01')  # Replace SOH representation
                     
-                    # Parse the FIX message
-                    parsed_msg = parse_fix_message(line)
-                    if parsed_msg:
-                        parsed_msg['_LineNumber'] = i + 1
-                        parsed_msg['_RawMessage'] = line[:200] + "..." if len(line) > 200 else line
-                        messages.append(parsed_msg)
-        
-        if messages:
-            df = pd.DataFrame(messages)
-            # Reorder columns to put common fields first
-            common_fields = ['_LineNumber', 'MsgType', 'MsgSeqNum', 'SendingTime', 
-                           'SenderCompID', 'TargetCompID', 'ClOrdID', 'Symbol',
-                           'Side', 'OrdStatus', 'ExecType', 'LastPx', 'LastQty',
-                           'OrderQty', 'CumQty', 'LeavesQty', 'Price']
-            
-            # Get actual columns that exist in dataframe
-            existing_common = [f for f in common_fields if f in df.columns]
-            other_cols = [col for col in df.columns if col not in existing_common + ['_LineNumber', '_RawMessage']]
-            
-            final_order = ['_LineNumber'] + existing_common + other_cols + ['_RawMessage']
-            # Only include columns that exist
-            final_order = [col for col in final_order if col in df.columns]
-            
-            df = df[final_order]
-            return df
-        else:
-            return pd.DataFrame()
+                    # Parse the FIX message into the column buffers
+                    self.builder.append_fix(line, _LineNumber=self.line_count,
+                                            _RawMessage=line[:200] + "..." if len(line) > 200 else line)
+        return self.builder.rows - rows
+
+    def frame(self, start=0):
+        """Messages from row `start` on as a typed DataFrame, columns in display order"""
+        df = self.builder.to_frame(start)
+        return df[self.ordered_columns()]
+
+    def ordered_columns(self):
+        return order_columns(self.builder.column_names())
+
+def parse_fix_text(text_content):
+    """Parse FIX log text content directly"""
+    try:
+        state = FixTextState()
+        state.feed(text_content.split('\n'))
+        return state.frame() if state.rows else pd.DataFrame()
             
     except Exception as e:
         print(f"Error parsing text: {e}")
@@ -311,91 +324,35 @@ def parse_fix_log_file(contents):
         print(f"Error parsing file: {e}")
         return pd.DataFrame()
 
+def store_fix_frame(df, dataset_id, version=None, index=None):
+    """Put a parsed frame in the frame store with its search index; returns the key"""
+    key = frame_store().put(df, dataset_id, version)
+    register_index(key, index if index is not None else TextIndex.build(df))
+    return key
+
 # New function for multi-term search
-def search_dataframe(df, search_text):
+def search_dataframe(df, search_text, index=None):
     """
     Search DataFrame for multiple terms separated by spaces.
-    Returns rows where any column contains ALL search terms (in any order).
+    Returns rows where any text column contains ALL search terms (in any order).
+    With the frame's TextIndex the terms are looked up instead of scanned.
     """
-    if not search_text or not search_text.strip():
-        return df
-    
-    # Split search text into individual terms
-    search_terms = [term.strip().lower() for term in search_text.split() if term.strip()]
-    if not search_terms:
+    positions = search_positions(df, search_text, index)
+    if positions is None:
         return df
-    
-    # Initialize mask - start with all True
-    mask = pd.Series([True] * len(df))
-    
-    # For each search term, find rows that contain it
-    for term in search_terms:
-        term_mask = pd.Series([False] * len(df))
-        
-        # Search in all string columns
-        for col in df.columns:
-            try:
-                # Skip non-string columns or columns with no data
-                if df[col].dtype == 'object' and len(df[col]) > 0:
-                    # Check if the term exists in this column
-                    col_mask = df[col].astype(str).str.lower().str.contains(term, na=False)
-                    term_mask = term_mask | col_mask
-            except Exception as e:
-                # Skip columns that can't be converted to string
-                continue
-        
-        # Combine with AND logic - row must contain ALL terms
-        mask = mask & term_mask
-    
-    return df[mask] if mask.any() else pd.DataFrame()
+    return df.iloc[positions]
 
 # Function for filtering account data
-def filter_account_dataframe(df, search_term=None):
+def filter_account_dataframe(df, search_term=None, index=None):
     """Filter dataframe by multiple search terms separated by spaces"""
     if df is None or df.empty:
         return pd.DataFrame()
     
+    positions = search_positions(df, str(search_term or ''), index, ACCOUNT_SEARCH_COLUMNS)
     # If no search term, return original dataframe
-    if not search_term or not str(search_term).strip():
+    if positions is None:
         return df.copy()
-    
-    # Clean and split search terms
-    search_terms = str(search_term).strip().lower()
-    if not search_terms:
-        return df.copy()
-    
-    # Split by spaces and filter out empty strings
-    search_list = [term.strip() for term in search_terms.split() if term.strip()]
-    
-    if not search_list:
-        return df.copy()
-    
-    # Create a copy of the dataframe
-    df_copy = df.copy()
-    
-    # Ensure columns are strings for comparison
-    if 'ACCOUNT_NUMBER' in df_copy.columns:
-        df_copy['ACCOUNT_NUMBER'] = df_copy['ACCOUNT_NUMBER'].astype(str).str.lower()
-    if 'ACRONAME' in df_copy.columns:
-        df_copy['ACRONAME'] = df_copy['ACRONAME'].astype(str).str.lower()
-    
-    # Initialize mask to True for all rows
-    mask = pd.Series([True] * len(df_copy), index=df_copy.index)
-    
-    # Apply each search term with AND logic
-    for term in search_list:
-        # Check if term exists in either column
-        term_mask = pd.Series([False] * len(df_copy), index=df_copy.index)
-        
-        if 'ACCOUNT_NUMBER' in df_copy.columns:
-            term_mask = term_mask | (df_copy['ACCOUNT_NUMBER'].str.contains(term, na=False, regex=False))
-        if 'ACRONAME' in df_copy.columns:
-            term_mask = term_mask | (df_copy['ACRONAME'].str.contains(term, na=False, regex=False))
-        
-        mask = mask & term_mask
-    
-    # Apply the combined mask
-    return df[mask].copy()
+    return df.iloc[positions]
 
 # Main layout with sidebar navigation
 app.layout = html.Div([
@@ -469,13 +426,18 @@ app.layout = html.Div([
     
     # Hidden storage for data
     dcc.Store(id='parsed-data-store'),
+    dcc.Store(id='fix-table-key-store'),
     dcc.Store(id='data-source-store', data={'source': 'none', 'filename': ''}),
     dcc.Store(id='current-page', data='fix-log'),
-    dcc.Store(id='account-network-data', data=network_data),
+    dcc.Store(id='account-network-data', data={key: len(df) for key, df in network_frames.items()}),
+    dcc.Store(id='account-table-key-store'),
     dcc.Store(id='account-last-updated', data=datetime.now().isoformat()),
+    dcc.Store(id='live-session-store'),
+    dcc.Interval(id='live-interval', interval=LIVE_REFRESH_MS, n_intervals=0, disabled=True),
     
     # Download components
     dcc.Download(id="download-dataframe-csv"),
+    dcc.Download(id="download-table-csv"),
     dcc.Download(id="download-account-csv"),
 ], className="min-h-screen bg-gray-50")
 
@@ -605,6 +567,30 @@ def get_fix_log_layout():
                     ], id='paste-section', className="mb-6", style={'display': 'none'}),
                 ], id='input-method-container'),
                 
+                # Live Tail Card
+                html.Div([
+                    html.H3("Live Tail", className="text-lg font-semibold text-gray-800 mb-4"),
+                    dcc.Input(
+                        id='live-log-paths',
+                        type='text',
+                        placeholder='Log file path(s) under the log root, comma separated',
+                        className="w-full px-3 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500 focus:border-blue-500"
+                    ),
+                    html.Div([
+                        html.Button([
+                            html.I(className="fas fa-satellite-dish mr-2"),
+                            "Follow"
+                        ], id='live-start-btn', n_clicks=0,
+                           className="px-4 py-2 bg-green-600 text-white rounded-lg hover:bg-green-700 transition-colors mt-3"),
+                        html.Button([
+                            html.I(className="fas fa-stop mr-2"),
+                            "Stop"
+                        ], id='live-stop-btn', n_clicks=0,
+                           className="px-4 py-2 bg-gray-200 text-gray-800 rounded-lg hover:bg-gray-300 transition-colors mt-3 ml-2"),
+                    ], className="flex"),
+                    html.Div(id='live-info', className="mt-3 text-sm text-gray-600")
+                ], className="bg-white rounded-xl shadow-sm p-6 mb-6"),
+                
                 # Filters Card
                 html.Div([
                     html.H3("Filters", className="text-lg font-semibold text-gray-800 mb-4 flex items-center"),
@@ -931,6 +917,82 @@ def switch_input_method(upload_clicks, paste_clicks):
                 "tab-button px-4 py-2 rounded-t-lg bg-gray-100 text-gray-700 hover:bg-gray-200",
                 "tab-button px-4 py-2 rounded-t-lg bg-blue-600 text-white")
 
+# Callback to start/stop following log files on disk (FIX Log)
+@app.callback(
+    [Output('live-session-store', 'data'),
+     Output('live-interval', 'disabled'),
+     Output('live-info', 'children')],
+    [Input('live-start-btn', 'n_clicks'),
+     Input('live-stop-btn', 'n_clicks')],
+    [State('live-log-paths', 'value'),
+     State('live-session-store', 'data')],
+    prevent_initial_call=True
+)
+def toggle_live_tail(start_clicks, stop_clicks, paths_value, session_id):
+    ctx = dash.callback_context
+    if not ctx.triggered:
+        raise PreventUpdate
+    
+    close_session(session_id)
+    
+    if ctx.triggered[0]['prop_id'].split('.')[0] == 'live-stop-btn':
+        return None, True, "Stopped"
+    
+    typed = [p.strip() for p in (paths_value or '').split(',') if p.strip()]
+    if not typed:
+        return None, True, "Enter at least one log file path"
+    # Only files under the configured log root may be followed
+    paths = [resolve_log_path(p) for p in typed]
+    outside = [p for p, resolved in zip(typed, paths) if resolved is None]
+    if outside:
+        return None, True, f"Not under the log root {log_root()}: {', '.join(outside)}"
+    missing = [p for p, resolved in zip(typed, paths) if not os.path.isfile(resolved)]
+    if missing:
+        return None, True, f"File not found: {', '.join(missing)}"
+    
+    return open_session(paths, FixTextState), False, f"Following {len(paths)} file(s)"
+
+def live_tail_update(session_id, current_source):
+    """
+    Store update for one live-interval tick. The session's frame is kept server-side,
+    versioned by message count; each tick builds only the rows parsed since the
+    previous one and appends them to the previous tick's frame. The browser gets
+    the new key.
+    """
+    session = get_session(session_id)
+    if session is None:
+        raise PreventUpdate
+    new_count = session.poll()
+    
+    source = {'source': 'live', 'filename': ', '.join(os.path.basename(p) for p in session.paths),
+              'session': session_id}
+    first_tick = (current_source or {}).get('session') != session_id
+    if not new_count and not first_tick:
+        raise PreventUpdate
+    
+    with session.lock:
+        columns = session.state.ordered_columns()
+        count = session.state.rows
+        previous_rows = count - new_count
+        previous_key = FrameStore.make_key(session_id, previous_rows)
+        previous = frame_store().get(previous_key) if previous_rows else None
+        index = None
+        if previous is not None and len(previous) == previous_rows:
+            # Only the rows parsed since the previous tick are built from the column buffers
+            added = session.state.frame(previous_rows)
+            df = append_frame(previous, added, columns)
+            index = get_index(previous_key)
+            if index is not None and index.rows == previous_rows:
+                # Extend the previous tick's search index with the new rows only
+                index.add(added)
+            else:
+                index = None
+        else:
+            # First tick, or the previous frame was evicted: build it whole
+            df = session.state.frame()
+    key = store_fix_frame(df, session_id, count, index)
+    return {'key': key, 'columns': columns, 'rows': len(df)}, source if first_tick else dash.no_update
+
 # Callback to handle data parsing from both sources (FIX Log)
 @app.callback(
     [Output('parsed-data-store', 'data'),
@@ -939,12 +1001,15 @@ def switch_input_method(upload_clicks, paste_clicks):
      Output('paste-info', 'children')],
     [Input('upload-data', 'contents'),
      Input('parse-btn', 'n_clicks'),
-     Input('clear-paste-btn', 'n_clicks')],
+     Input('clear-paste-btn', 'n_clicks'),
+     Input('live-interval', 'n_intervals')],
     [State('upload-data', 'filename'),
      State('paste-text', 'value'),
-     State('data-source-store', 'data')]
+     State('data-source-store', 'data'),
+     State('live-session-store', 'data')]
 )
-def parse_data(upload_contents, parse_clicks, clear_paste_clicks, filename, paste_text, current_source):
+def parse_data(upload_contents, parse_clicks, clear_paste_clicks, n_intervals, filename, paste_text,
+               current_source, live_session):
     ctx = dash.callback_context
     
     # Initialize outputs
@@ -956,18 +1021,22 @@ def parse_data(upload_contents, parse_clicks, clear_paste_clicks, filename, past
     
     trigger_id = ctx.triggered[0]['prop_id'].split('.')[0]
     
+    # Live tail tick: push only the newly parsed rows
+    if trigger_id == 'live-interval':
+        data, source = live_tail_update(live_session, current_source)
+        return data, source, dash.no_update, dash.no_update
+    
     # Handle clear paste button
     if trigger_id == 'clear-paste-btn':
         # Return empty data and clear info displays
-        return {'data': [], 'columns': []}, {'source': 'none', 'filename': ''}, "", ""
+        return EMPTY_PARSED, {'source': 'none', 'filename': ''}, "", ""
     
     if trigger_id == 'upload-data' and upload_contents:
         # Parse from uploaded file
         df = parse_fix_log_file(upload_contents)
         if not df.empty:
-            # Convert DataFrame to JSON for storage
-            data = df.to_dict('records')
-            columns = list(df.columns)
+            # Keep the DataFrame server-side; the browser only holds its key
+            parsed = {'key': store_fix_frame(df, 'fix-log'), 'columns': list(df.columns), 'rows': len(df)}
             
             # Create file info
             file_info = html.Div([
@@ -986,15 +1055,14 @@ def parse_data(upload_contents, parse_clicks, clear_paste_clicks, filename, past
                 ], className="flex items-center")
             ])
             
-            return {'data': data, 'columns': columns}, {'source': 'file', 'filename': filename}, file_info, paste_info
+            return parsed, {'source': 'file', 'filename': filename}, file_info, paste_info
     
     elif trigger_id == 'parse-btn' and paste_text:
         # Parse from pasted text
         df = parse_fix_text(paste_text)
         if not df.empty:
-            # Convert DataFrame to JSON for storage
-            data = df.to_dict('records')
-            columns = list(df.columns)
+            # Keep the DataFrame server-side; the browser only holds its key
+            parsed = {'key': store_fix_frame(df, 'fix-log'), 'columns': list(df.columns), 'rows': len(df)}
             
             # Create paste info
             paste_info = html.Div([
@@ -1013,10 +1081,10 @@ def parse_data(upload_contents, parse_clicks, clear_paste_clicks, filename, past
                 ], className="flex items-center")
             ])
             
-            return {'data': data, 'columns': columns}, {'source': 'paste', 'filename': 'Pasted Content'}, file_info, paste_info
+            return parsed, {'source': 'paste', 'filename': 'Pasted Content'}, file_info, paste_info
     
     # Return empty data if parsing failed
-    return {'data': [], 'columns': []}, {'source': 'none', 'filename': ''}, file_info, paste_info
+    return EMPTY_PARSED, {'source': 'none', 'filename': ''}, file_info, paste_info
 
 # Callback to clear the paste text area (FIX Log)
 @app.callback(
@@ -1033,6 +1101,7 @@ def clear_paste_text(n_clicks):
 # Main callback to update the display (FIX Log)
 @app.callback(
     [Output('data-table-container', 'children'),
+     Output('fix-table-key-store', 'data'),
      Output('msgtype-filter', 'options'),
      Output('summary-stats', 'children'),
      Output('msgtype-chart', 'figure')],
@@ -1048,38 +1117,49 @@ def clear_paste_text(n_clicks):
 def update_display(parsed_data, msgtype_filter, sender_filter, target_filter, 
                    symbol_filter, global_search, clear_clicks, source_data):
     
-    # Check if we have data
-    if not parsed_data or not parsed_data['data']:
-        # Return empty state
+    # Fetch the parsed frame from the server-side store (filters below never modify it)
+    original_df = frame_store().get((parsed_data or {}).get('key'))
+    if original_df is None or original_df.empty:
+        # Return empty state (nothing loaded, or the frame was evicted)
+        expired = bool((parsed_data or {}).get('key'))
         empty_state = html.Div([
             html.Div([
                 html.I(className="fas fa-chart-bar text-5xl text-gray-300 mb-4"),
-                html.H3("No Data Loaded", className="text-xl font-semibold text-gray-700 mb-2"),
+                html.H3("Data Expired" if expired else "No Data Loaded",
+                        className="text-xl font-semibold text-gray-700 mb-2"),
                 html.P("Upload a file or paste FIX log content to start analyzing", className="text-gray-500"),
             ], className="text-center py-12")
         ], className="bg-white rounded-xl shadow-sm")
-        return empty_state, [], None, go.Figure()
-    
-    # Convert stored data back to DataFrame
-    df = pd.DataFrame(parsed_data['data'])
-    
-    # Store original unfiltered dataframe
-    original_df = df.copy()
-    
-    # Apply filters
-    if msgtype_filter:
-        df = df[df['MsgType'].isin(msgtype_filter)]
-    if sender_filter:
-        df = df[df['SenderCompID'].astype(str).str.contains(sender_filter, case=False, na=False)]
-    if target_filter:
-        df = df[df['TargetCompID'].astype(str).str.contains(target_filter, case=False, na=False)]
+        return empty_state, None, [], None, go.Figure()
+    df = original_df
+    dataset_key = parsed_data['key']
     
-    if symbol_filter:
-        df = df[df['Symbol'].isin(symbol_filter)]
-
-    # Apply multi-term global search using the new function
-    if global_search and global_search.strip():
-        df = search_dataframe(df, global_search)
+    # Filtered views are kept in the frame store per (dataset, filter values)
+    filters = (global_search.strip() if global_search else '', sorted(msgtype_filter or []),
+               sender_filter or '', target_filter or '', sorted(symbol_filter or []))
+    view_key = dataset_key
+    if any(filters):
+        filter_hash = hashlib.sha1(repr(filters).encode()).hexdigest()[:12]
+        view_key = FrameStore.make_key(dataset_key, filter_hash)
+        df = frame_store().get(view_key)
+    if df is None:
+        df = original_df
+        
+        # Apply multi-term global search first: the frame's index holds positions in the full frame
+        if global_search and global_search.strip():
+            df = search_dataframe(df, global_search, get_index(dataset_key))
+        
+        # Apply filters
+        if msgtype_filter:
+            df = df[df['MsgType'].isin(msgtype_filter)]
+        if sender_filter:
+            df = df[df['SenderCompID'].astype(str).str.contains(sender_filter, case=False, na=False)]
+        if target_filter:
+            df = df[df['TargetCompID'].astype(str).str.contains(target_filter, case=False, na=False)]
+        
+        if symbol_filter:
+            df = df[df['Symbol'].isin(symbol_filter)]
+        frame_store().put(df, dataset_key, filter_hash)
     
     # Create message type options for dropdown
     msgtype_options = []
@@ -1088,8 +1168,12 @@ def update_display(parsed_data, msgtype_filter, sender_filter, target_filter,
         msgtype_options = [{'label': f"{msg} ({count})", 'value': msg} 
                           for msg, count in msgtype_counts.items()]
     
-    # Create data table if we have data
+    # Create data table if we have data; the table only gets the current page
+    table_key = None
     if not df.empty:
+        table_key = view_key
+        page_data = page_records(df.iloc[:PAGE_SIZE])
+
         # Determine status-based styling
         status_conditions = []
         if 'OrdStatus' in df.columns:
@@ -1117,13 +1201,16 @@ def update_display(parsed_data, msgtype_filter, sender_filter, target_filter,
                  "type": "text"}
                 for col in df.columns
             ],
-            data=df.to_dict('records'),
-            page_size=20,
+            data=page_data,
+            page_size=PAGE_SIZE,
             page_current=0,
-            page_action='native',
-            filter_action='native',
-            sort_action='native',
+            page_count=page_count(len(df), PAGE_SIZE),
+            page_action='custom',
+            filter_action='custom',
+            filter_query='',
+            sort_action='custom',
             sort_mode='multi',
+            sort_by=[],
             column_selectable='single',
             row_selectable='multi',
             selected_columns=[],
@@ -1182,16 +1269,21 @@ def update_display(parsed_data, msgtype_filter, sender_filter, target_filter,
                 'border': '1px solid #e5e7eb',
                 'padding': '8px'
             },
-            tooltip_data=[
-                {
-                    column: {'value': str(value), 'type': 'markdown'}
-                    for column, value in row.items()
-                } for row in df.to_dict('records')
-            ],
-            tooltip_duration=None,
-            export_format='csv',
-            export_headers='display'
+            filter_options={'case': 'insensitive'},
+            tooltip_data=page_tooltips(page_data),
+            tooltip_duration=None
         )
+        # The table only holds one page: export the filtered, sorted rows from the store
+        table = html.Div([
+            html.Div([
+                html.Button([
+                    html.I(className="fas fa-file-export mr-2"),
+                    "Export Table"
+                ], id='export-table-btn', n_clicks=0,
+                   className="px-3 py-1 bg-blue-600 text-white rounded-lg hover:bg-blue-700 transition-colors text-sm")
+            ], className="flex justify-end mb-2"),
+            table
+        ])
     else:
         table = html.Div([
             html.Div([
@@ -1311,7 +1403,13 @@ def update_display(parsed_data, msgtype_filter, sender_filter, target_filter,
             )
         )
     
-    return table, msgtype_options, summary_stats, fig
+    return table, table_key, msgtype_options, summary_stats, fig
+
+
+# Serve table pages, sorting and column filters from the filtered frame in the store
+register_paged_table(app, 'fix-data-table', 'fix-table-key-store', PAGE_SIZE, tooltips=True)
+register_table_export(app, 'export-table-btn', 'download-table-csv', 'fix-data-table', 'fix-table-key-store',
+                      'fix_log_table.csv')
 
 # Callback to clear all filter inputs when the clear button is clicked (FIX Log)
 @app.callback(
@@ -1338,10 +1436,8 @@ def clear_filter_inputs(n_clicks):
     prevent_initial_call=True
 )
 def export_fix_data(n_clicks, parsed_data):
-    if n_clicks and parsed_data and parsed_data['data']:
-        # Convert stored data back to DataFrame
-        df = pd.DataFrame(parsed_data['data'])
-        
+    df = frame_store().get((parsed_data or {}).get('key')) if n_clicks else None
+    if df is not None and not df.empty:
         # Create CSV string
         csv_string = df.to_csv(index=False, encoding='utf-8')
         
@@ -1358,25 +1454,16 @@ def export_fix_data(n_clicks, parsed_data):
 )
 def update_symbol_options(parsed_data):
     """Dynamically populate symbol dropdown from parsed data"""
-    if not parsed_data or not parsed_data['data']:
+    df = frame_store().get((parsed_data or {}).get('key'))
+    if df is None:
         return []
     
-    df = pd.DataFrame(parsed_data['data'])
-    
     # Check if Symbol column exists
     if 'Symbol' in df.columns and not df['Symbol'].empty:
-        # Get unique symbols, sorted alphabetically
-        symbols = sorted(df['Symbol'].dropna().astype(str).unique())
-        
-        # Create options with counts
-        options = []
-        for symbol in symbols:
-            count = len(df[df['Symbol'] == symbol])
-            options.append({
-                'label': f"{symbol} ({count})",
-                'value': symbol
-            })
-        return options
+        # Unique symbols with counts, sorted alphabetically
+        counts = df['Symbol'].dropna().astype(str).value_counts().sort_index()
+        return [{'label': f"{symbol} ({count})", 'value': symbol}
+                for symbol, count in counts.items()]
     
     return []
 
@@ -1389,7 +1476,8 @@ def update_symbol_options(parsed_data):
      Output('account-stats-summary', 'children'),
      Output('account-tabs', 'children'),
      Output('account-search-terms-display', 'children'),
-     Output('account-download-container', 'style')],
+     Output('account-download-container', 'style'),
+     Output('account-table-key-store', 'data')],
     [Input('account-tabs', 'value'),
      Input('account-search-input', 'value'),
      Input('account-clear-button', 'n_clicks')],
@@ -1407,6 +1495,7 @@ def update_account_display(tab_value, search_term, clear_clicks, network_data_di
     tab_children = []
     search_terms_display = ""
     download_container_style = {'display': 'none'}
+    table_key = None
     
     # Handle clear button click
     if ctx.triggered and ctx.triggered[0]['prop_id'] == 'account-clear-button.n_clicks':
@@ -1431,14 +1520,8 @@ def update_account_display(tab_value, search_term, clear_clicks, network_data_di
         ], className="bg-white rounded-xl shadow-sm p-8")
         stats_summary = "No data available"
     else:
-        # Convert stored data back to DataFrames
-        network_data_loaded = {}
-        for key, df_dict in network_data_dict.items():
-            if df_dict:
-                network_data_loaded[key] = pd.DataFrame(df_dict)
-        
         # Get data for current tab
-        current_df = network_data_loaded.get(tab_value)
+        current_df = network_frames.get(tab_value)
         
         if current_df is None or current_df.empty:
             table_content = html.Div([
@@ -1447,8 +1530,13 @@ def update_account_display(tab_value, search_term, clear_clicks, network_data_di
             ], className="bg-white rounded-xl shadow-sm p-8")
             stats_summary = f"{NETWORKS[tab_value]}: 0 records"
         else:
-            # Apply filtering
-            filtered_df = filter_account_dataframe(current_df, search_term)
+            # Apply filtering; results are kept in the frame store per (tab, search)
+            search_key = ' '.join(str(search_term or '').lower().split())
+            table_key = FrameStore.make_key(f'accounts-{tab_value}', search_key)
+            filtered_df = frame_store().get(table_key)
+            if filtered_df is None:
+                filtered_df = filter_account_dataframe(current_df, search_term, network_indexes.get(tab_value))
+                frame_store().put(filtered_df, f'accounts-{tab_value}', search_key)
             
             if filtered_df.empty:
                 table_content = html.Div([
@@ -1472,12 +1560,14 @@ def update_account_display(tab_value, search_term, clear_clicks, network_data_di
                 table = dash_table.DataTable(
                     id='account-data-table',
                     columns=columns,
-                    data=filtered_df.to_dict('records'),
-                    page_size=15,
+                    data=filtered_df.iloc[:ACCOUNT_PAGE_SIZE].to_dict('records'),
+                    page_size=ACCOUNT_PAGE_SIZE,
                     page_current=0,
-                    page_action='native',
-                    sort_action='native',
+                    page_count=page_count(len(filtered_df), ACCOUNT_PAGE_SIZE),
+                    page_action='custom',
+                    sort_action='custom',
                     sort_mode='single',
+                    sort_by=[],
                     filter_action='none',
                     style_table={
                         'overflowX': 'auto',
@@ -1544,10 +1634,7 @@ def update_account_display(tab_value, search_term, clear_clicks, network_data_di
     # Update tab labels with counts
     tab_children = []
     for network in NETWORKS.keys():
-        count = 0
-        if network in network_data_dict and network_data_dict[network]:
-            df = pd.DataFrame(network_data_dict[network])
-            count = len(df)
+        count = (network_data_dict or {}).get(network, 0)
         
         tab_children.append(
             dcc.Tab(
@@ -1569,7 +1656,12 @@ def update_account_display(tab_value, search_term, clear_clicks, network_data_di
             )
         )
     
-    return table_content, search_value, last_updated, stats_summary, tab_children, search_terms_display, download_container_style
+    return (table_content, search_value, last_updated, stats_summary, tab_children, search_terms_display,
+            download_container_style, table_key)
+
+
+# Serve account table pages and sorting from the filtered frame in the store
+register_paged_table(app, 'account-data-table', 'account-table-key-store', ACCOUNT_PAGE_SIZE)
 
 # Separate callback for Account Mapping download functionality
 @app.callback(
@@ -1581,13 +1673,13 @@ def update_account_display(tab_value, search_term, clear_clicks, network_data_di
     prevent_initial_call=True
 )
 def download_account_data(n_clicks, tab_value, search_term, network_data_dict):
-    if n_clicks and network_data_dict and tab_value in network_data_dict:
+    if n_clicks and tab_value in network_frames:
         # Get data for current tab
-        current_df = pd.DataFrame(network_data_dict[tab_value])
+        current_df = network_frames[tab_value]
         
         # Apply filtering if search term exists
         if search_term and str(search_term).strip():
-            filtered_df = filter_account_dataframe(current_df, search_term)
+            filtered_df = filter_account_dataframe(current_df, search_term, network_indexes.get(tab_value))
         else:
             filtered_df = current_df
         
@@ -1,8 +1,16 @@
 import json
-import re
+import os
+import sys
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple, Any
 import convert_time
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fixlib.session_config import PropertyResolver
+
+# Adapters share a handful of timers: each distinct cron expression is parsed once per process
+parse_cron_expression = lru_cache(maxsize=None)(convert_time.parse_cron_expression)
+
 def load_properties(filepath: str) -> Dict[str, str]:
     """
     Load a Java-style properties file into a dictionary.
@@ -29,13 +37,10 @@ def load_properties(filepath: str) -> Dict[str, str]:
 
 def substitute_placeholders(value: Any, props: Dict[str, str]) -> Any:
     """
-    If value is a string of the form ${key}, replace it with props[key].
-    Otherwise return value unchanged.
+    Replace the ${key} placeholders of a string with props[key]; unknown
+    placeholders and non-string values are returned unchanged.
     """
-    if isinstance(value, str) and value.startswith('${') and value.endswith('}'):
-        key = value[2:-1]  # remove ${ and }
-        return props.get(key, value)  # if key not found, keep original
-    return value
+    return PropertyResolver(props)(value)
 
 def get_adapter_sessions(
     adapter_routing_path: str,
@@ -79,6 +84,8 @@ def get_adapter_sessions(
     props = {}
     if properties_path:
         props = load_properties(properties_path)
+    # One resolver for every adapter, so repeated values are resolved once
+    substitute = PropertyResolver(props)
 
     # Build a mapping from session name to the full session dictionary
     session_map: Dict[str, Dict] = {}
@@ -156,13 +163,13 @@ def get_adapter_sessions(
 
         # Substitute placeholders if properties were loaded
         if props:
-            sendercompid = substitute_placeholders(sendercompid, props)
-            targetcompid = substitute_placeholders(targetcompid, props)
+            sendercompid = substitute(sendercompid)
+            targetcompid = substitute(targetcompid)
             # Note: timers are not placeholders, but we still apply substitution just in case
-            start_time = substitute_placeholders(start_time, props)
-            start_tz = substitute_placeholders(start_tz, props)
-            end_time = substitute_placeholders(end_time, props)
-            end_tz = substitute_placeholders(end_tz, props)
+            start_time = substitute(start_time)
+            start_tz = substitute(start_tz)
+            end_time = substitute(end_time)
+            end_tz = substitute(end_tz)
 
         results.append({
             "network": network,
@@ -171,9 +178,9 @@ def get_adapter_sessions(
             "session_name": adapter_name,
             "session_sendercompid": sendercompid,
             "session_targetcompid": targetcompid,
-            "start_time": convert_time.parse_cron_expression(start_time) if start_time else None,
+            "start_time": parse_cron_expression(start_time) if start_time else None,
             "start_timezone": start_tz,
-            "end_time": convert_time.parse_cron_expression(end_time) if end_time else None,
+            "end_time": parse_cron_expression(end_time) if end_time else None,
             "end_timezone": end_tz
         })
 
@@ -1,8 +1,14 @@
 import csv
 import configparser
+import os
+import sys
 from pathlib import Path
 from collections import defaultdict
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fixlib.account_links import load_account_links, network_name
+
+
 def load_nyfix_account_mapping(mapping_file_path, ini_file_path):
     """
     Load the NYFIX account mapping file using the INI configuration.
@@ -131,28 +137,16 @@ def link_accounts_to_destinations(mapping_file_path, mapping_ini_path, routing_f
         dict: Dictionary with ACCOUNT as key and list of unique DESTINATIONS as value
     """
     
-    print("Loading account mappings...")
-    onbehalf_to_account = load_nyfix_account_mapping(mapping_file_path, mapping_ini_path)
-    print(f"Loaded {len(onbehalf_to_account)} ONBEHALFOFCOMPID to ACCOUNT mappings")
-    
-    print("\nLoading routing mappings...")
-    onbehalf_to_destinations = load_nyfix_routing(routing_file_path)
-    print(f"Loaded {len(onbehalf_to_destinations)} ONBEHALFOFCOMPID to DESTINATION mappings")
-    
-    # Join the mappings
-    account_to_destinations = defaultdict(set)
-    unmatched_onbehalf = []
-    
-    for onbehalf, destinations in onbehalf_to_destinations.items():
-        if onbehalf in onbehalf_to_account:
-            account = onbehalf_to_account[onbehalf]
-            account_to_destinations[account].update(destinations)
-        else:
-            unmatched_onbehalf.append(onbehalf)
+    # Both files go through the shared link cache: parsed once, joined with one merge
+    network = network_name(routing_file_path)
+    print("Loading account mappings and routing...")
+    links = load_account_links([mapping_file_path, mapping_ini_path], [routing_file_path], network=network)
+    print(f"Loaded {links.mappings['KEY'].nunique()} ONBEHALFOFCOMPID to ACCOUNT mappings")
+    routed = links.routes[links.routes['KEY_COLUMN'] == 'ONBEHALFOFCOMPID']
+    print(f"Loaded {routed['KEY'].nunique()} ONBEHALFOFCOMPID to DESTINATION mappings")
     
-    # Convert sets to sorted lists
-    result = {account: sorted(list(destinations)) 
-              for account, destinations in account_to_destinations.items()}
+    result = links.to_dict(network)
+    unmatched_onbehalf = links.unmatched_keys(network)
     
     return result, unmatched_onbehalf
 
@@ -1,14 +1,18 @@
-import configparser
 import json
 import pandas as pd
 import os
+import sys
 from pathlib import Path
 from typing import List, Dict, Union, Optional
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fixlib.session_config import DEFAULT_WORKERS, load_session_files
+
 def read_ini_files_to_json(
     ini_files: Union[str, List[str], Path, List[Path]],
     json_path: Union[str, Path],
-    flatten_sections: bool = False
+    flatten_sections: bool = False,
+    workers: int = DEFAULT_WORKERS
 ) -> Dict[str, Dict]:
     """
     Read multiple INI files and save to JSON format.
@@ -18,6 +22,7 @@ def read_ini_files_to_json(
         json_path: Path to save the JSON output
         flatten_sections: If True, flatten sections into single dict with 
                          section.key naming. If False, keep nested structure.
+        workers: Threads parsing the INI files that changed since the last call
     
     Returns:
         Dictionary containing all INI data
@@ -48,50 +53,45 @@ def read_ini_files_to_json(
             file_paths.extend(parent.glob(pattern))
     
     # Remove duplicates
-    file_paths = list(set(file_paths))
+    file_paths = sorted(set(file_paths))
     
     if not file_paths:
         raise FileNotFoundError(f"No INI files found matching: {ini_files}")
     
+    # Unchanged files come from the parsed-file cache, changed ones are parsed in parallel
+    rule_set = load_session_files([str(p) for p in file_paths], convert_numbers=False, case_sensitive=True,
+                                  workers=workers)
+    
     all_data = {}
     
-    for file_path in file_paths:
-        try:
-            config = configparser.ConfigParser()
-            
-            # Preserve case sensitivity
-            config.optionxform = str
-            
-            # Read INI file
-            config.read(file_path, encoding='utf-8')
-            
-            file_data = {}
-            
-            for section in config.sections():
-                if flatten_sections:
-                    # Flatten sections: section.key = value
-                    for key, value in config.items(section):
-                        file_data[f"{section}.{key}"] = value
-                else:
-                    # Nested structure
-                    file_data[section] = dict(config.items(section))
-            
-            # Handle DEFAULT section if exists
-            if config.defaults():
-                if flatten_sections:
-                    for key, value in config.defaults().items():
-                        file_data[f"DEFAULT.{key}"] = value
-                else:
-                    file_data["DEFAULT"] = dict(config.defaults())
-            
-            # Use filename as key in overall dictionary
-            all_data[file_path.name] = file_data
-            
-            print(f"Read: {file_path.name} ({len(file_data)} {'items' if flatten_sections else 'sections'})")
-            
-        except Exception as e:
-            print(f"Error reading {file_path}: {e}")
+    for path, parsed in rule_set.files.items():
+        if parsed.error is not None:
+            print(f"Error reading {path}: {parsed.error}")
             continue
+        
+        file_data = {}
+        
+        for section, items in parsed.sections.items():
+            if flatten_sections:
+                # Flatten sections: section.key = value
+                for key, value in items.items():
+                    file_data[f"{section}.{key}"] = value
+            else:
+                # Nested structure
+                file_data[section] = dict(items)
+        
+        # Handle DEFAULT section if exists
+        if parsed.defaults:
+            if flatten_sections:
+                for key, value in parsed.defaults.items():
+                    file_data[f"DEFAULT.{key}"] = value
+            else:
+                file_data["DEFAULT"] = dict(parsed.defaults)
+        
+        # Use filename as key in overall dictionary
+        all_data[parsed.name] = file_data
+        
+        print(f"Read: {parsed.name} ({len(file_data)} {'items' if flatten_sections else 'sections'})")
     
     # Save to JSON
     with open(json_path, 'w', encoding='utf-8') as f:
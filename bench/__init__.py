@@ -0,0 +1,4 @@
+"""
+Benchmarks for the FIX log parsers, audit builders and routers, on synthetic
+Ullink logs (see bench.ullink_log). Run with: python -m bench.run --help
+"""
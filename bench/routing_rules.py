@@ -0,0 +1,79 @@
+"""
+Synthetic routing rule files for the find_routing_path benchmarks.
+
+    write_alias_rules(directory, n)   alias_AutoRoute<NETWORK>.csv lines read by tools/routing.py
+                                      ("... ACCOUNT: 200xxxxx;CURRENCY: USD ==> DESTINATION: ...")
+    write_ds_rules(directory, n)      alias_<network>.csv tables read by tools/routing_ds.py
+                                      (SENDERCOMPID;TARGETSUBID;CURRENCY;ACCOUNT;DESTINATION)
+
+Criteria are drawn from the values the log generator uses, so a realistic
+share of the generated orders match one or more rules.
+"""
+
+import os
+import random
+from typing import List
+
+from bench.ullink_log import LogProfile
+
+NETWORKS = ['BLOOMBERG', 'ITG', 'FIDESSA', 'TRADEWEB', 'NYFIX']
+DESTINATIONS = ['MET_CLEARPOOL', 'MET_DARK', 'MET_LIT', 'ALGO_VWAP', 'ALGO_TWAP', 'CASH_DESK']
+SENDERS = ['BLP', 'ET', 'FLEX', 'BFGICRD']
+TARGET_SUB_IDS = ['ULB', 'FROG', '32646470']
+
+
+def _accounts(profile: LogProfile) -> List[str]:
+    """Exact accounts plus 200xxxxx-style patterns"""
+    accounts = profile.client_accounts + profile.venue_accounts + profile.clearing_accounts
+    return accounts + ['200xxxxx', '300xxxxx']
+
+
+def write_alias_rules(directory: str, rules: int, profile: LogProfile = None, seed: int = 0) -> List[str]:
+    """alias_AutoRoute*.csv files with `rules` rules spread over the networks; returns the paths"""
+    profile = profile or LogProfile()
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    accounts = _accounts(profile)
+    lines = {network: [] for network in NETWORKS}
+    for i in range(rules):
+        network = NETWORKS[i % len(NETWORKS)]
+        criteria = [f'ACCOUNT: {rng.choice(accounts)}']
+        if rng.random() < 0.6:
+            criteria.append(f'CURRENCY: {rng.choice(profile.currencies)}')
+        if rng.random() < 0.4:
+            criteria.append(f'TARGETSUBID: {rng.choice(TARGET_SUB_IDS)}')
+        lines[network].append(f"alias_AutoRoute{network};{';'.join(criteria)} ==> "
+                              f"DESTINATION: {rng.choice(DESTINATIONS)}")
+    paths = []
+    for network, network_lines in lines.items():
+        path = os.path.join(directory, f'alias_AutoRoute{network}.csv')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(network_lines) + '\n')
+        paths.append(path)
+    return paths
+
+
+def write_ds_rules(directory: str, rules: int, profile: LogProfile = None, seed: int = 0) -> List[str]:
+    """alias_<network>.csv rule tables with `rules` rows in total; returns the paths"""
+    profile = profile or LogProfile()
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    accounts = _accounts(profile)
+    rows = {network: [] for network in NETWORKS}
+    for i in range(rules):
+        network = NETWORKS[i % len(NETWORKS)]
+        rows[network].append(';'.join([
+            rng.choice(SENDERS) if rng.random() < 0.7 else '*',
+            rng.choice(TARGET_SUB_IDS) if rng.random() < 0.4 else '*',
+            rng.choice(profile.currencies) if rng.random() < 0.6 else '*',
+            rng.choice(accounts),
+            rng.choice(DESTINATIONS),
+        ]))
+    paths = []
+    for network, network_rows in rows.items():
+        path = os.path.join(directory, f'alias_{network.lower()}.csv')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('SENDERCOMPID;TARGETSUBID;CURRENCY;ACCOUNT;DESTINATION\n')
+            f.write('\n'.join(network_rows) + '\n')
+        paths.append(path)
+    return paths
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Run the benchmark suite and write a JSON report.
+
+    python -m bench.run                                  # 10k messages, every benchmark
+    python -m bench.run --sizes 10k,1m,10m -o after.json --compare before.json
+    python -m bench.run --benchmarks parse_log_line,create_audit_trail --sizes 1m
+
+Logs are generated once per size and profile under --work-dir and reused.
+Every (benchmark, size) runs in its own process, so the reported peak RSS
+is that benchmark's alone (worker pools are reported as children_peak_rss_mb)
+and an out-of-memory run is recorded as an error instead of ending the suite.
+Setup (imports, reading the log into memory, loading rules) is not timed;
+baseline_rss_mb is the memory held after setup.
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from bench.routing_rules import write_alias_rules, write_ds_rules
+from bench.suite import BENCHMARKS, REPO_ROOT, UNITS, BenchContext
+from bench.ullink_log import LogProfile, write_log
+
+SIZES = {'10k': 10_000, '1m': 1_000_000, '10m': 10_000_000}
+DEFAULT_WORK_DIR = os.path.join(tempfile.gettempdir(), 'sw_bench')
+DEFAULT_RULES = 500
+
+
+def parse_size(text: str) -> int:
+    """'10k', '1m', '250000' -> message count"""
+    text = text.strip().lower()
+    if text in SIZES:
+        return SIZES[text]
+    for suffix, factor in (('k', 1_000), ('m', 1_000_000)):
+        if text.endswith(suffix):
+            return int(float(text[:-1]) * factor)
+    return int(text)
+
+
+def _rss_mb() -> Optional[float]:
+    """Current resident set size (Linux), else None"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1e6
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _peak_rss_mb(who) -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(who).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / 1e6 if sys.platform == 'darwin' else peak / 1e3
+
+
+def _measure(name: str, ctx: BenchContext, queue):
+    """Child process: set up, time one run, report through the queue"""
+    setup, run = BENCHMARKS[name]
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        state = setup(ctx)
+        gc.collect()
+        baseline = _rss_mb()
+        start = time.perf_counter()
+        items = run(state)
+        seconds = time.perf_counter() - start
+    queue.put({
+        'items': items,
+        'seconds': round(seconds, 4),
+        'baseline_rss_mb': round(baseline, 1) if baseline is not None else None,
+        'peak_rss_mb': _peak_rss_mb(resource.RUSAGE_SELF) if resource else None,
+        'children_peak_rss_mb': _peak_rss_mb(resource.RUSAGE_CHILDREN) if resource else None,
+    })
+
+
+def run_benchmark(name: str, ctx: BenchContext, messages: int) -> Dict:
+    """One benchmark at one size, in a fresh process"""
+    result = {'benchmark': name, 'messages': messages, 'unit': UNITS[name]}
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_measure, args=(name, ctx, queue))
+    process.start()
+    measured = None
+    while measured is None and (process.is_alive() or not queue.empty()):
+        try:
+            measured = queue.get(timeout=1)
+        except Exception:
+            continue
+    process.join()
+    if measured is None:
+        result['error'] = f'benchmark process exited with code {process.exitcode}'
+        return result
+    result.update(measured)
+    # Throughput of what the run handled (orders, lookups, ...), not of the log size
+    if measured['seconds'] > 0:
+        result['items_per_second'] = round(measured['items'] / measured['seconds'], 1)
+    if measured['items']:
+        result['us_per_item'] = round(measured['seconds'] / measured['items'] * 1e6, 3)
+    return result
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_reports(baseline: Dict, current: Dict) -> List[Dict]:
+    """Per (benchmark, messages): seconds and peak RSS before and after, and the speedup"""
+    before = {(r['benchmark'], r['messages']): r for r in baseline.get('results', [])}
+    rows = []
+    for result in current.get('results', []):
+        old = before.get((result['benchmark'], result['messages']))
+        if old is None or 'seconds' not in old or 'seconds' not in result:
+            continue
+        rows.append({
+            'benchmark': result['benchmark'],
+            'messages': result['messages'],
+            'seconds_before': old['seconds'],
+            'seconds_after': result['seconds'],
+            'speedup': round(old['seconds'] / result['seconds'], 2) if result['seconds'] else None,
+            'peak_rss_mb_before': old.get('peak_rss_mb'),
+            'peak_rss_mb_after': result.get('peak_rss_mb'),
+        })
+    return rows
+
+
+def print_results(results: List[Dict]):
+    print(f"{'benchmark':32} {'messages':>10} {'seconds':>10} {'items/s':>12} {'unit':9} {'peak MB':>9}")
+    for r in results:
+        if 'error' in r:
+            print(f"{r['benchmark']:32} {r['messages']:>10} {r['error']}")
+            continue
+        print(f"{r['benchmark']:32} {r['messages']:>10} {r['seconds']:>10.3f} "
+              f"{r.get('items_per_second', 0):>12,.0f} {r['unit']:9} {r.get('peak_rss_mb') or 0:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the FIX log parsers, audit builders and routers')
+    parser.add_argument('--sizes', default='10k', help='Comma-separated message counts: 10k, 1m, 10m or a number')
+    parser.add_argument('--benchmarks', default=','.join(BENCHMARKS),
+                        help=f"Comma-separated subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument('--work-dir', default=DEFAULT_WORK_DIR, help='Where generated logs and rules are kept')
+    parser.add_argument('--rules', type=int, default=DEFAULT_RULES, help='Routing rules per router')
+    parser.add_argument('--replace-depth', type=int, default=2, help='35=G per order')
+    parser.add_argument('--fills', type=int, default=4, help='Fills per order')
+    parser.add_argument('--cancel-ratio', type=float, default=0.1, help='Share of orders cancelled')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes for the log scanners')
+    parser.add_argument('-o', '--output', default='bench_report.json', help='JSON report file')
+    parser.add_argument('--compare', help='Earlier JSON report to compare this run against')
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.benchmarks.split(',') if n.strip()]
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Unknown benchmarks: {', '.join(unknown)}")
+    sizes = [parse_size(s) for s in args.sizes.split(',') if s.strip()]
+    profile = LogProfile(replace_depth=args.replace_depth, fills=args.fills,
+                         cancel_ratio=args.cancel_ratio, seed=args.seed)
+
+    # Rule snapshots of the routers stay inside the work dir
+    os.environ['RULE_CACHE_DIR'] = os.path.join(args.work_dir, 'rule_cache')
+    alias_dir = os.path.join(args.work_dir, 'rules', f'alias_{args.rules}_{args.seed}')
+    ds_dir = os.path.join(args.work_dir, 'rules', f'ds_{args.rules}_{args.seed}')
+    write_alias_rules(alias_dir, args.rules, profile, args.seed)
+    write_ds_rules(ds_dir, args.rules, profile, args.seed)
+
+    results = []
+    for messages in sizes:
+        log_path = os.path.join(args.work_dir, 'logs', f'{profile.key()}_{messages}', 'ullink.log')
+        if not os.path.exists(log_path):
+            print(f"Generating {messages:,} messages -> {log_path}")
+        size = write_log(log_path, messages, profile)
+        ctx = BenchContext(log_path, alias_dir, ds_dir, args.workers)
+        for name in names:
+            print(f"Running {name} on {messages:,} messages ({size / 1e6:.1f} MB)")
+            result = run_benchmark(name, ctx, messages)
+            result['log_bytes'] = size
+            results.append(result)
+
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'profile': asdict(profile),
+        'rules': args.rules,
+        'workers': args.workers,
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print_results(results)
+    print(f"Report written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {args.compare} ({baseline.get('commit')}):")
+        for row in compare_reports(baseline, report):
+            print(f"{row['benchmark']:32} {row['messages']:>10} {row['seconds_before']:>9.3f}s -> "
+                  f"{row['seconds_after']:>9.3f}s  x{row['speedup']}")
+
+
+if __name__ == "__main__":
+    main()
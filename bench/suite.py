@@ -0,0 +1,131 @@
+"""
+The benchmarks. Each is a (setup, run) pair: setup(ctx) loads the inputs
+(untimed), run(state) does the measured work and returns how many items
+(messages, orders or lookups) it handled; UNITS names the item per benchmark.
+
+The measured code is imported from its script in the repo, so a benchmark
+always runs the version of the parser/router that is checked out.
+"""
+
+import importlib.util
+import os
+import sys
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+
+@dataclass
+class BenchContext:
+    log_path: str               # generated log (alone in its directory)
+    alias_rules_dir: str        # rule files for tools/routing.py
+    ds_rules_dir: str           # rule files for tools/routing_ds.py
+    workers: Optional[int] = None
+
+
+def load_script(relative_path: str):
+    """Import a repo script by path (scripts live outside any package)"""
+    name = 'bench_' + os.path.splitext(relative_path.replace(os.sep, '_').replace('/', '_'))[0]
+    module = sys.modules.get(name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(REPO_ROOT, relative_path))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+def _order_messages(log_path: str, delimiter: str = '\x01'):
+    """FIX part of every 35=D/35=G line, re-delimited for the routers"""
+    messages = []
+    with open(log_path, 'r', encoding='latin-1') as f:
+        for line in f:
+            if '|35=D|' in line or '|35=G|' in line:
+                messages.append(line[line.index('8=FIX'):].rstrip('\n').replace('|', delimiter))
+    return messages
+
+
+# ------------------------------------------------------------------ parsers / audit builders
+
+def _setup_parse_log_line(ctx: BenchContext):
+    return load_script('sw_web/audit_trail/fix_parser_audit_trail.py').FIXParser(), ctx.log_path
+
+
+def _run_parse_log_line(state) -> int:
+    parser, log_path = state
+    parsed = 0
+    with open(log_path, 'r', encoding='latin-1') as f:
+        for line in f:
+            if parser.parse_log_line(line) is not None:
+                parsed += 1
+    return parsed
+
+
+def _setup_create_audit_trail(ctx: BenchContext):
+    module = load_script('sw_web/audit_trail/fix_parser_audit_trail.py')
+    with open(ctx.log_path, 'r', encoding='latin-1') as f:
+        return module, f.read()
+
+
+def _run_create_audit_trail(state) -> int:
+    module, log_data = state
+    return module.create_audit_trail(log_data)['summary']['total_messages']
+
+
+def _setup_build_order_audit_trail(ctx: BenchContext):
+    return load_script('tools/full_audit.py').FIXOrderAuditTrail(), ctx.log_path, ctx.workers
+
+
+def _run_build_order_audit_trail(state) -> int:
+    auditor, log_path, workers = state
+    return len(auditor.build_order_audit_trail([log_path], workers=workers))
+
+
+def _setup_scan_log_files(ctx: BenchContext):
+    return load_script('tools/get_order_type.py').FIXLogAnalyzer(), os.path.dirname(ctx.log_path), ctx.workers
+
+
+def _run_scan_log_files(state) -> int:
+    analyzer, log_dir, workers = state
+    orders, _ = analyzer.scan_log_files(log_dir, workers=workers)
+    return len(orders)
+
+
+# ------------------------------------------------------------------ routing
+
+def _setup_routing(ctx: BenchContext):
+    router = load_script('tools/routing.py').FIXRouter(ctx.alias_rules_dir)
+    return router, _order_messages(ctx.log_path)
+
+
+def _setup_routing_ds(ctx: BenchContext):
+    router = load_script('tools/routing_ds.py').FIXRouter(ctx.ds_rules_dir)
+    return router, _order_messages(ctx.log_path)
+
+
+def _run_find_routing_path(state) -> int:
+    router, messages = state
+    for message in messages:
+        router.find_routing_path(message)
+    return len(messages)
+
+
+BENCHMARKS: Dict[str, Tuple[Callable, Callable]] = {
+    'parse_log_line': (_setup_parse_log_line, _run_parse_log_line),
+    'create_audit_trail': (_setup_create_audit_trail, _run_create_audit_trail),
+    'build_order_audit_trail': (_setup_build_order_audit_trail, _run_build_order_audit_trail),
+    'scan_log_files': (_setup_scan_log_files, _run_scan_log_files),
+    'find_routing_path.routing': (_setup_routing, _run_find_routing_path),
+    'find_routing_path.routing_ds': (_setup_routing_ds, _run_find_routing_path),
+}
+
+# What the item count returned by each run() counts
+UNITS: Dict[str, str] = {
+    'parse_log_line': 'messages',
+    'create_audit_trail': 'messages',
+    'build_order_audit_trail': 'orders',
+    'scan_log_files': 'orders',
+    'find_routing_path.routing': 'lookups',
+    'find_routing_path.routing_ds': 'lookups',
+}
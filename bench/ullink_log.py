@@ -0,0 +1,212 @@
+"""
+Synthetic Ullink FIX logs shaped like sw_web/audit_trail/order_log.txt.
+
+Each parent order follows the path seen in production logs:
+
+    [I_BloombergAlgoFix42]    Receiving  35=D from the client (BLP -> 1MET)
+    [O_METClearpoolFix42]     Sending    35=D to the venue (ET -> METCPEX3, ClOrdID 'B6_' + client id)
+    [O_METClearpoolFix42]     Receiving  35=8 acks / fills / replace and cancel confirms
+    [I_BloombergAlgoFix42]    Sending    the same reports back to the client
+    [DC_MET_TO_FLEX_IS_FIX42] Sending    a drop copy of each report
+
+with replace chains (35=G, OrigClOrdID links) of configurable depth, a
+configurable number of partial fills, and an optional cancel (35=F).
+Several orders are in flight at once, so their lines interleave.
+"""
+
+import os
+import random
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Callable, Iterator, List, Optional, Tuple
+
+CLIENT_SESSION = 'I_BloombergAlgoFix42'
+VENUE_SESSION = 'O_METClearpoolFix42'
+DROP_COPY_SESSION = 'DC_MET_TO_FLEX_IS_FIX42'
+
+
+@dataclass
+class LogProfile:
+    """Shape of the generated order flow"""
+    replace_depth: int = 2          # 35=G per order (replace chain length)
+    fills: int = 4                  # partial fills per order before it is done
+    cancel_ratio: float = 0.1       # share of orders cancelled after their fills
+    concurrency: int = 50           # orders in flight at once (interleaved lines)
+    drop_copy: bool = True          # emit DC_MET_TO_FLEX_IS_FIX42 copies of each report
+    seed: int = 0
+    start: str = '2025-09-18 09:30:00'
+    symbols: List[str] = field(default_factory=lambda: ['IBM', 'MSFT', 'AAPL', 'NVDA', 'AMZN', 'JPM', 'XOM', 'KO'])
+    client_accounts: List[str] = field(default_factory=lambda: ['MS_PB', 'GS_PB', 'JPM_PB', 'BARCAP'])
+    venue_accounts: List[str] = field(default_factory=lambda: ['EISLE-LT', 'EISLE-HT', 'CPX-01'])
+    clearing_accounts: List[str] = field(default_factory=lambda: ['20012048', '20055310', '30012345', '40077001'])
+    markets: List[str] = field(default_factory=lambda: ['XNAS', 'XNYS', 'ARCX', 'BATS', 'JSJX', 'CDED'])
+    currencies: List[str] = field(default_factory=lambda: ['USD', 'USD', 'USD', 'CAD'])
+
+    def key(self) -> str:
+        """Short id of the profile for file names"""
+        return f'd{self.replace_depth}f{self.fills}c{int(self.cancel_ratio * 100)}s{self.seed}'
+
+
+def fix_message(fields: List[Tuple[str, str]], delimiter: str = '|') -> str:
+    """8/9/.../10 framed FIX message with a correct BodyLength and CheckSum (computed with SOH)"""
+    body = ''.join(f'{tag}={value}\x01' for tag, value in fields)
+    head = f'8=FIX.4.2\x019={len(body)}\x01'
+    checksum = sum((head + body).encode('latin-1')) % 256
+    return (head + body + f'10={checksum:03d}\x01').replace('\x01', delimiter)
+
+
+class _Order:
+    """One parent order; events() yields (session, direction, fields) in order"""
+
+    def __init__(self, number: int, profile: LogProfile, rng: random.Random):
+        self.profile = profile
+        self.rng = rng
+        self.client_id = f'5DLY{number:010X}'
+        self.symbol = rng.choice(profile.symbols)
+        self.security_id = f'{zlib.crc32(self.symbol.encode()) % 10 ** 7:07d}'
+        self.client_account = rng.choice(profile.client_accounts)
+        self.venue_account = rng.choice(profile.venue_accounts)
+        self.clearing_account = rng.choice(profile.clearing_accounts)
+        self.currency = rng.choice(profile.currencies)
+        self.side = rng.choice('12')
+        self.qty = rng.randrange(100, 50_000, 100)
+        self.price = round(rng.uniform(10, 500), 2)
+        self.order_id = f'2052509{number:011d}'
+
+    def _order_fields(self, msg_type: str, cl_ord_id: str, orig: Optional[str], venue: bool, stamp: str):
+        if venue:
+            fields = [('35', msg_type), ('49', 'ET'), ('56', 'METCPEX3'), ('52', stamp), ('50', '32646470'),
+                      ('57', 'ULB'), ('116', 'Steven Bardong'), ('1', self.venue_account),
+                      ('11', 'B6_' + cl_ord_id), ('15', self.currency), ('21', '1'), ('22', '2')]
+            if orig:
+                fields += [('37', self.order_id), ('41', 'B6_' + orig)]
+        else:
+            fields = [('35', msg_type), ('49', 'BLP'), ('56', '1MET'), ('52', stamp), ('50', '32646470'),
+                      ('57', 'ULB'), ('60', stamp), ('1', self.client_account), ('63', '0'),
+                      ('11', cl_ord_id), ('15', self.currency)]
+            if orig:
+                fields.append(('41', orig))
+        fields += [('38', str(self.qty)), ('40', '2'), ('44', f'{self.price:.2f}'), ('48', self.security_id),
+                   ('54', self.side), ('55', self.symbol), ('59', '0')]
+        return fields
+
+    def _report_fields(self, session: str, cl_ord_id: str, orig: Optional[str], exec_type: str, status: str,
+                       cum: int, avg: float, last_qty: int, last_px: float, exec_id: str, stamp: str):
+        if session == VENUE_SESSION:
+            head = [('35', '8'), ('49', 'METCPEX3'), ('56', 'ET'), ('52', stamp), ('57', '32646470'),
+                    ('1', self.venue_account)]
+            cl_ord_id, orig = 'B6_' + cl_ord_id, orig and 'B6_' + orig
+        elif session == CLIENT_SESSION:
+            head = [('35', '8'), ('49', '1MET'), ('56', 'BLP'), ('52', stamp), ('50', 'ULB'), ('57', '32646470'),
+                    ('1', self.client_account)]
+        else:
+            head = [('35', '8'), ('49', 'DC_MET'), ('56', 'LINKMIZINT'), ('52', stamp[:17]), ('50', 'ULB'),
+                    ('57', '32646470'), ('1', self.clearing_account)]
+        fields = head + [('6', f'{avg:g}'), ('11', cl_ord_id), ('14', str(cum)), ('15', self.currency),
+                         ('17', exec_id), ('20', '0'), ('22', '2'), ('31', f'{last_px:g}'), ('32', str(last_qty)),
+                         ('37', self.order_id), ('38', str(self.qty)), ('39', status), ('48', self.security_id),
+                         ('54', self.side), ('55', self.symbol), ('60', stamp), ('150', exec_type),
+                         ('151', str(self.qty - cum))]
+        if orig:
+            fields.append(('41', orig))
+        if last_qty:
+            fields += [('29', '1'), ('30', self.rng.choice(self.profile.markets))]
+        return fields
+
+    def events(self) -> Iterator[Tuple[str, str, Callable[[str], List[Tuple[str, str]]]]]:
+        """(session, 'Receiving'/'Sending', fields for a timestamp) in the order they are logged"""
+        rng = self.rng
+        profile = self.profile
+        cl_ord_id = self.client_id
+        cum, notional, exec_seq = 0, 0.0, 0
+
+        def order(msg_type, cl, orig):
+            yield CLIENT_SESSION, 'Receiving', partial(self._order_fields, msg_type, cl, orig, False)
+            yield VENUE_SESSION, 'Sending', partial(self._order_fields, msg_type, cl, orig, True)
+
+        def report(exec_type, status, last_qty=0, last_px=0.0, orig=None):
+            nonlocal exec_seq
+            exec_seq += 1
+            args = (cl_ord_id, orig, exec_type, status, cum, notional / cum if cum else 0.0,
+                    last_qty, last_px, f'{self.order_id}{exec_seq:04d}')
+            yield VENUE_SESSION, 'Receiving', partial(self._report_fields, VENUE_SESSION, *args)
+            yield CLIENT_SESSION, 'Sending', partial(self._report_fields, CLIENT_SESSION, *args)
+            if profile.drop_copy:
+                yield DROP_COPY_SESSION, 'Sending', partial(self._report_fields, DROP_COPY_SESSION, *args)
+
+        yield from order('D', cl_ord_id, None)
+        yield from report('0', '0')
+        fill_points = sorted(rng.sample(range(1, profile.fills + profile.replace_depth + 1), profile.replace_depth)) \
+            if profile.replace_depth else []
+        step = 0
+        fills_left = profile.fills
+        while fills_left or fill_points:
+            step += 1
+            if fill_points and fill_points[0] == step:
+                fill_points.pop(0)
+                orig, cl_ord_id = cl_ord_id, f'{self.client_id[:-1]}{chr(65 + step % 26)}{step:02d}'
+                self.price = round(self.price * rng.uniform(0.99, 1.01), 2)
+                yield from order('G', cl_ord_id, orig)
+                yield from report('5', '1' if cum else '0', orig=orig)
+                continue
+            fills_left -= 1
+            remaining = self.qty - cum
+            last_qty = remaining if not fills_left else max(1, min(remaining - fills_left, rng.randrange(1, remaining // 2 + 2)))
+            last_px = round(self.price * rng.uniform(0.998, 1.002), 4)
+            cum += last_qty
+            notional += last_qty * last_px
+            yield from report('F', '2' if cum >= self.qty else '1', last_qty, last_px)
+        if cum < self.qty and rng.random() < profile.cancel_ratio:
+            orig, cl_ord_id = cl_ord_id, f'{self.client_id}X'
+            yield from order('F', cl_ord_id, orig)
+            yield from report('4', '4', orig=orig)
+
+
+def generate_lines(messages: int, profile: Optional[LogProfile] = None) -> Iterator[str]:
+    """Ullink log lines (without newlines) carrying `messages` FIX messages"""
+    profile = profile or LogProfile()
+    rng = random.Random(profile.seed)
+    clock = datetime.strptime(profile.start, '%Y-%m-%d %H:%M:%S')
+    seq = {CLIENT_SESSION: 1000, VENUE_SESSION: 1000, DROP_COPY_SESSION: 100}
+    threads = {CLIENT_SESSION: '15583-48bd94d4', VENUE_SESSION: '16926-48bd94e2'}
+    active = []
+    next_order = 1
+    emitted = 0
+    while emitted < messages:
+        while len(active) < profile.concurrency:
+            active.append(iter(_Order(next_order, profile, rng).events()))
+            next_order += 1
+        slot = rng.randrange(len(active))
+        event = next(active[slot], None)
+        if event is None:
+            active[slot] = active[-1]
+            active.pop()
+            continue
+        session, direction, build = event
+        clock += timedelta(microseconds=rng.randrange(50, 5000))
+        stamp = clock.strftime('%Y%m%d-%H:%M:%S.%f')[:-3]
+        seq[session] += 1
+        fields = build(stamp)
+        fields.insert(1, ('34', str(seq[session])))
+        thread = (f'[{threads[session]}:{rng.getrandbits(40):010x}:{seq[session]}]'
+                  if session in threads else '[3753]')
+        prefix = clock.strftime('%Y-%m-%d %H:%M:%S.%f')
+        yield (f'{prefix[:23]}_{prefix[23:]} {thread} [{session}] (INFO) {direction} : '
+               f'{fix_message(fields)}')
+        emitted += 1
+
+
+def write_log(path: str, messages: int, profile: Optional[LogProfile] = None) -> int:
+    """Write a generated log to path (reused if it is already there); returns its size in bytes"""
+    if os.path.exists(path):
+        return os.path.getsize(path)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='latin-1', buffering=1024 * 1024) as f:
+        for line in generate_lines(messages, profile):
+            f.write(line)
+            f.write('\n')
+    os.replace(tmp_path, path)
+    return os.path.getsize(path)
@@ -1,9 +1,18 @@
+import os
+import sys
+from functools import lru_cache
 import pandas as pd
 # import dash_cytoscape as cyto
 import json
 import load_ulbridge_properties
 import convert_time
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fixlib.session_config import map_distinct, resolve_placeholders, session_table
+
+# Sessions share a handful of timers: each distinct trigger is parsed once per process
+parse_cron_line = lru_cache(maxsize=None)(convert_time.parse_cron_line)
+
 adapter_columns = [
     "session_name",
     "session_ip_port",
@@ -27,19 +36,13 @@ def load_adapter_data():
     try:
         with open('grouped_sessions.json', 'r') as f:
             data = json.load(f)
-        dfs = []
         print(
             f"Loading grouped_sessions.json data... {len(data)} categories found.")
-        for key, value in data.items():
-            # if (key == "session_name"):
-                # print(f"{key}: {value}")
-            if isinstance(value, list):
-                for item in value:
-                    # temp_df = pd.json_normalize(value, sep='_')
-                    temp_df = pd.json_normalize(item, sep='_')
-                    temp_df['category'] = key
-                    dfs.append(temp_df)
-        df = pd.concat(dfs, ignore_index=True)
+        # Every session of every category in one json_normalize call
+        df = session_table(data, sep='_')
+        if df.empty:
+            print("Warning: grouped_sessions.json has no sessions.")
+            return pd.DataFrame()
         all_columns = df.columns
         # for name in all_columns:
             # print(name)
@@ -63,11 +66,12 @@ def load_ullink_properties():
 def apply_properties(df):
     adapter_df = df
     ap = load_ullink_properties()
-    adapter_df.replace(ap, inplace=True)
-    adapter_df['Start Time'] = adapter_df['timers/doStart_trigger'].apply(
-        convert_time.parse_cron_line)
-    adapter_df['End Time'] = adapter_df['timers/doStopdoReset_trigger'].apply(
-        convert_time.parse_cron_line)
+    # ${...} placeholders and whole property keys, resolved once per distinct value
+    adapter_df = resolve_placeholders(adapter_df, ap, whole_values=True)
+    adapter_df['Start Time'] = map_distinct(
+        adapter_df['timers/doStart_trigger'], parse_cron_line)
+    adapter_df['End Time'] = map_distinct(
+        adapter_df['timers/doStopdoReset_trigger'], parse_cron_line)
 
     adapter_df = adapter_df[adapter_columns]
     # print(adapter_df.to_string())
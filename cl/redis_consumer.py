@@ -2,6 +2,17 @@
 """
 Redis Binary File Consumer
 Receive and reconstruct binary files from Redis Streams
+
+JSON-mode chunks are buffered until the completion message. Raw-mode chunks
+(see redis_sender.py --mode raw) are written straight into a preallocated
+file at their offset, so memory use does not grow with file size; the file is
+verified and moved into place once every chunk and the completion are in.
+
+Raw-mode reassembly state is kept on disk under <output_dir>/.transfers/, so
+several consumers of one group (--workers, or processes on the same output
+directory) can share a transfer and a restarted consumer resumes where it
+stopped. Messages are acknowledged only once their chunk is written; pending
+messages of a dead consumer are taken over with XAUTOCLAIM.
 """
 
 import redis
@@ -9,19 +20,172 @@ import os
 import json
 import base64
 import hashlib
+import random
+import shutil
+import time
 from collections import defaultdict
 from datetime import datetime
-from typing import Dict, List
+from multiprocessing import Process
+from typing import Dict, List, Optional
 import argparse
 
+# Raw-mode reassembly state, relative to the output directory
+STATE_DIR = '.transfers'
+# Pending messages idle this long (ms) are claimed from other consumers
+DEFAULT_CLAIM_IDLE_MS = 60000
+# Reconnect backoff: BASE * 2**attempt seconds, capped at MAX
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 30.0
+
+def _text(value) -> str:
+    return value.decode('utf-8') if isinstance(value, bytes) else str(value)
+
+
+def _write_json(path: str, data: Dict):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+class RawTransfer:
+    """
+    One raw-mode file being written chunk by chunk.
+    
+    State directory .transfers/<transfer_id>/ holds the preallocated data.part,
+    meta.json, one chunk bitmap per consumer (chunks.<consumer>) and
+    complete.json once the completion message was seen. Any consumer that
+    finds all bitmaps together full and the completion present finalizes it;
+    .transfers/<transfer_id>.done marks finished transfers so redelivered
+    chunks are ignored.
+    """
+    
+    def __init__(self, transfer_id: str, output_dir: str, file_name: str,
+                 file_size: int, total_chunks: int, consumer_name: str):
+        self.transfer_id = transfer_id
+        self.output_path = os.path.join(output_dir, file_name)
+        self.state_dir = os.path.join(output_dir, STATE_DIR, transfer_id)
+        self.part_path = os.path.join(self.state_dir, 'data.part')
+        self.file_size = file_size
+        self.total_chunks = total_chunks
+        self.consumer_name = consumer_name
+        os.makedirs(self.state_dir, exist_ok=True)
+        
+        meta_path = os.path.join(self.state_dir, 'meta.json')
+        if not os.path.exists(meta_path):
+            _write_json(meta_path, {'file_name': file_name, 'file_size': file_size,
+                                    'total_chunks': total_chunks})
+        
+        # Preallocate without truncating: other consumers may already have written chunks
+        fd = os.open(self.part_path, os.O_RDWR | os.O_CREAT, 0o644)
+        self.file = os.fdopen(fd, 'r+b')
+        if os.fstat(fd).st_size < file_size:
+            self.file.truncate(file_size)
+        
+        # This consumer's chunk bitmap, reloaded after a restart
+        self.bitmap_path = os.path.join(self.state_dir, f'chunks.{consumer_name}')
+        bitmap_size = (total_chunks + 7) // 8
+        if os.path.exists(self.bitmap_path):
+            with open(self.bitmap_path, 'rb') as f:
+                self.bitmap = bytearray(f.read().ljust(bitmap_size, b'\0'))
+            self.bitmap_file = open(self.bitmap_path, 'r+b')
+        else:
+            self.bitmap = bytearray(bitmap_size)
+            self.bitmap_file = open(self.bitmap_path, 'w+b')
+            self.bitmap_file.write(self.bitmap)
+            self.bitmap_file.flush()
+        
+        self.completion = self._read_completion()  # fields of the completion message once seen
+    
+    @staticmethod
+    def is_finished(output_dir: str, transfer_id: str) -> bool:
+        return os.path.exists(os.path.join(output_dir, STATE_DIR, f'{transfer_id}.done'))
+    
+    def write(self, chunk_index: int, offset: int, data: bytes):
+        """Write a chunk, then record it in the bitmap (so a crash never marks an unwritten chunk)"""
+        self.file.seek(offset)
+        self.file.write(data)
+        self.file.flush()
+        byte, bit = divmod(chunk_index, 8)
+        self.bitmap[byte] |= 1 << bit
+        self.bitmap_file.seek(byte)
+        self.bitmap_file.write(self.bitmap[byte:byte + 1])
+        self.bitmap_file.flush()
+    
+    def received_count(self) -> int:
+        """Chunks written by any consumer"""
+        received = int.from_bytes(self.bitmap, 'little')
+        for name in os.listdir(self.state_dir):
+            if name.startswith('chunks.') and name != os.path.basename(self.bitmap_path):
+                with open(os.path.join(self.state_dir, name), 'rb') as f:
+                    received |= int.from_bytes(f.read(), 'little')
+        return bin(received).count('1')
+    
+    def _read_completion(self) -> Optional[Dict]:
+        try:
+            with open(os.path.join(self.state_dir, 'complete.json'), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def mark_complete(self, fields: Dict):
+        _write_json(os.path.join(self.state_dir, 'complete.json'), fields)
+        self.completion = fields
+        self.total_chunks = int(fields.get('total_chunks', self.total_chunks))
+    
+    def ready(self) -> bool:
+        if self.completion is None:
+            self.completion = self._read_completion()
+        return self.completion is not None and self.received_count() >= self.total_chunks
+    
+    def claim(self) -> bool:
+        """Become the consumer that finalizes this transfer"""
+        claim_path = os.path.join(self.state_dir, 'finalizing')
+        try:
+            fd = os.open(claim_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            # Our own claim from before a restart can be taken up again
+            try:
+                with open(claim_path, encoding='utf-8') as f:
+                    return f.read() == self.consumer_name
+            except OSError:
+                return False
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(self.consumer_name)
+        return True
+    
+    def finish(self) -> str:
+        """Hash and move the data file into place, then drop the state; returns the SHA256"""
+        sha256_hash = hashlib.sha256()
+        self.file.flush()
+        self.file.seek(0)
+        for block in iter(lambda: self.file.read(1024 * 1024), b''):
+            sha256_hash.update(block)
+        self.close()
+        os.replace(self.part_path, self.output_path)
+        done_path = self.state_dir + '.done'
+        _write_json(done_path, {'output_path': self.output_path, 'sha256': sha256_hash.hexdigest()})
+        shutil.rmtree(self.state_dir, ignore_errors=True)
+        return sha256_hash.hexdigest()
+    
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+        if not self.bitmap_file.closed:
+            self.bitmap_file.close()
+
+
 class RedisBinaryConsumer:
-    def __init__(self, redis_url: str = None, consumer_group: str = "file-consumer", **redis_kwargs):
+    def __init__(self, redis_url: str = None, consumer_group: str = "file-consumer",
+                 consumer_name: str = None, **redis_kwargs):
         """
         Initialize Redis connection and consumer group
         
         Args:
             redis_url: Redis connection URL
             consumer_group: Consumer group name
+            consumer_name: Consumer name; a stable name lets a restarted consumer
+                           resume its own pending messages right away
             **redis_kwargs: Additional Redis connection parameters
         """
         if redis_url:
@@ -30,7 +194,7 @@ class RedisBinaryConsumer:
             self.redis_client = redis.Redis(**redis_kwargs)
         
         self.consumer_group = consumer_group
-        self.consumer_name = f"consumer-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+        self.consumer_name = consumer_name or f"consumer-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
         
         # Test connection
         try:
@@ -42,6 +206,8 @@ class RedisBinaryConsumer:
         
         # Storage for file reconstruction
         self.files_in_progress = defaultdict(dict)
+        # Raw-mode transfers: transfer_id -> RawTransfer
+        self.raw_transfers: Dict[str, RawTransfer] = {}
     
     def create_consumer_group(self, stream_name: str):
         """Create consumer group if it doesn't exist"""
@@ -60,7 +226,8 @@ class RedisBinaryConsumer:
                 raise
     
     def consume_files(self, stream_name: str, output_dir: str = "received_files", 
-                      block_time: int = 5000, count: int = 10):
+                      block_time: int = 5000, count: int = 10,
+                      claim_idle_ms: int = DEFAULT_CLAIM_IDLE_MS):
         """
         Consume binary files from Redis Stream
         
@@ -69,6 +236,7 @@ class RedisBinaryConsumer:
             output_dir: Directory to save received files
             block_time: Block time in milliseconds (0 for non-blocking)
             count: Maximum number of messages to fetch at once
+            claim_idle_ms: Claim other consumers' pending messages idle this long (0 disables)
         """
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
@@ -82,19 +250,33 @@ class RedisBinaryConsumer:
         print(f"💾 Saving to: {os.path.abspath(output_dir)}")
         print("Press Ctrl+C to stop\n")
         
-        last_id = '>'
+        # Start with our own pending messages (delivered before a restart, never acknowledged)
+        last_id = '0'
+        attempt = 0
+        next_claim = 0.0
         
         try:
             while True:
                 try:
+                    if claim_idle_ms and time.monotonic() >= next_claim:
+                        self._reclaim_idle_messages(stream_name, output_dir, claim_idle_ms, count)
+                        self._sweep_transfers(output_dir)
+                        next_claim = time.monotonic() + claim_idle_ms / 1000
+                    
                     # Read messages from stream
                     messages = self.redis_client.xreadgroup(
                         groupname=self.consumer_group,
                         consumername=self.consumer_name,
                         streams={stream_name: last_id},
                         count=count,
-                        block=block_time
+                        block=None if last_id == '0' else block_time
                     )
+                    attempt = 0
+                    
+                    if last_id == '0' and not any(message_list for _, message_list in messages or []):
+                        # Own backlog drained: switch to new messages
+                        last_id = '>'
+                        continue
                     
                     if not messages:
                         continue
@@ -102,36 +284,81 @@ class RedisBinaryConsumer:
                     # Process messages
                     for stream, message_list in messages:
                         for message_id, message_data in message_list:
-                            self._process_message(
-                                stream_name=stream.decode('utf-8') if isinstance(stream, bytes) else stream,
-                                message_id=message_id,
-                                message_data=message_data,
-                                output_dir=output_dir
-                            )
-                            
-                            # Acknowledge message
-                            self.redis_client.xack(
-                                stream_name,
-                                self.consumer_group,
-                                message_id
-                            )
-                            
-                            last_id = '>'
+                            self._handle_message(stream_name, message_id, message_data, output_dir)
                 
-                except redis.ConnectionError as e:
-                    print(f"⚠️  Connection error: {e}. Reconnecting...")
-                    # Add reconnection logic here if needed
-                    break
+                except (redis.ConnectionError, redis.TimeoutError) as e:
+                    delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt)
+                    delay *= random.uniform(0.5, 1.0)
+                    attempt += 1
+                    print(f"⚠️  Connection error: {e}. Reconnecting in {delay:.1f}s (attempt {attempt})...")
+                    time.sleep(delay)
+                    # Anything delivered but not acknowledged before the drop is still ours
+                    last_id = '0'
                 
         except KeyboardInterrupt:
             print("\n🛑 Stopping consumer...")
         finally:
+            for transfer in self.raw_transfers.values():
+                transfer.close()
             self.cleanup_pending_messages(stream_name)
             self.redis_client.close()
     
+    def _handle_message(self, stream_name: str, message_id, message_data: Dict, output_dir: str):
+        """Process one message and acknowledge it unless it has to be retried"""
+        if message_data:  # None/empty: trimmed from the stream while pending
+            processed = self._process_message(
+                stream_name=stream_name,
+                message_id=message_id,
+                message_data=message_data,
+                output_dir=output_dir
+            )
+            if processed is False:
+                return
+        
+        # Acknowledge message
+        self.redis_client.xack(
+            stream_name,
+            self.consumer_group,
+            message_id
+        )
+    
+    def _reclaim_idle_messages(self, stream_name: str, output_dir: str, claim_idle_ms: int, count: int):
+        """Take over and process messages left pending by stopped or stuck consumers"""
+        start_id = '0-0'
+        while True:
+            try:
+                result = self.redis_client.xautoclaim(
+                    stream_name, self.consumer_group, self.consumer_name,
+                    min_idle_time=claim_idle_ms, start_id=start_id, count=count
+                )
+            except redis.ResponseError as e:
+                print(f"⚠️  XAUTOCLAIM unavailable ({e}); not reclaiming idle messages")
+                return
+            start_id, claimed = result[0], result[1]
+            if claimed:
+                print(f"\n♻️  Claimed {len(claimed)} idle messages")
+            for message_id, message_data in claimed:
+                self._handle_message(stream_name, message_id, message_data, output_dir)
+            if _text(start_id) == '0-0':
+                return
+    
+    def _sweep_transfers(self, output_dir: str):
+        """Close transfers another consumer finalized; finalize ones whose last piece raced"""
+        for transfer_id, transfer in list(self.raw_transfers.items()):
+            if RawTransfer.is_finished(output_dir, transfer_id):
+                transfer.close()
+                del self.raw_transfers[transfer_id]
+            elif transfer.ready():
+                self._finish_raw_transfer(transfer)
+    
     def _process_message(self, stream_name: str, message_id: str, 
                          message_data: Dict, output_dir: str):
         """Process a single Redis Stream message"""
+        raw_type = message_data.get(b'type', message_data.get('type'))
+        if raw_type in (b'raw_chunk', 'raw_chunk'):
+            # Binary payload: keep the data field as bytes
+            return self._process_raw_chunk(message_data, output_dir, message_id)
+        
         # Convert byte keys to strings
         data = {}
         for key, value in message_data.items():
@@ -151,6 +378,8 @@ class RedisBinaryConsumer:
         
         if msg_type == 'chunk':
             self._process_chunk(data, output_dir, message_id)
+        elif msg_type == 'complete' and data.get('mode') == 'raw':
+            return self._process_raw_completion(data, output_dir)
         elif msg_type == 'complete':
             self._process_completion(data, output_dir)
         else:
@@ -185,6 +414,95 @@ class RedisBinaryConsumer:
         except (json.JSONDecodeError, KeyError, base64.binascii.Error) as e:
             print(f"⚠️  Error processing chunk {message_id}: {e}")
     
+    def _raw_transfer(self, fields: Dict, output_dir: str) -> Optional[RawTransfer]:
+        """The RawTransfer for a raw chunk or completion; None if it already finished"""
+        transfer_id = fields['transfer_id']
+        transfer = self.raw_transfers.get(transfer_id)
+        if transfer is None:
+            if RawTransfer.is_finished(output_dir, transfer_id):
+                return None
+            file_name = os.path.basename(fields['file_name'])
+            print(f"📥 Starting reception of: {file_name} [{transfer_id}]")
+            transfer = self.raw_transfers[transfer_id] = RawTransfer(
+                transfer_id, output_dir, file_name,
+                int(fields['file_size']), int(fields['total_chunks']), self.consumer_name)
+        return transfer
+    
+    def _process_raw_chunk(self, message_data: Dict, output_dir: str, message_id: str) -> bool:
+        """Write a raw chunk at its offset; False if it could not be written (left pending)"""
+        try:
+            fields = {_text(k): v for k, v in message_data.items()}
+            data = fields.pop('data', b'')
+            if isinstance(data, str):
+                # Client created with decode_responses=True cannot carry binary data safely
+                data = data.encode('utf-8', 'surrogateescape')
+            fields = {k: _text(v) for k, v in fields.items()}
+            
+            transfer = self._raw_transfer(fields, output_dir)
+            if transfer is None:
+                return True  # redelivered chunk of a finished file
+            transfer.write(int(fields['chunk_index']), int(fields['offset']), data)
+            
+            # Only the last chunks need the (cross-consumer) completeness check
+            if transfer.completion is not None or int(fields['chunk_index']) >= transfer.total_chunks - 1:
+                if transfer.ready():
+                    self._finish_raw_transfer(transfer)
+            return True
+        
+        except (KeyError, ValueError) as e:
+            print(f"⚠️  Error processing raw chunk {message_id}: {e}")
+            return True  # malformed, retrying will not help
+        except OSError as e:
+            print(f"⚠️  Error writing raw chunk {message_id}: {e}")
+            return False
+    
+    def _process_raw_completion(self, data: Dict, output_dir: str) -> bool:
+        """Record the completion; the file is finalized once all chunks are written"""
+        try:
+            transfer = self._raw_transfer(data, output_dir)
+            if transfer is None:
+                return True
+            transfer.mark_complete(data)
+        except (KeyError, ValueError) as e:
+            print(f"⚠️  Error processing completion for {data.get('file_name')}: {e}")
+            return True
+        except OSError as e:
+            print(f"⚠️  Error recording completion for {data.get('file_name')}: {e}")
+            return False
+        if transfer.ready():
+            self._finish_raw_transfer(transfer)
+        else:
+            missing = transfer.total_chunks - transfer.received_count()
+            print(f"\n⏳ {data.get('file_name')}: completion received, waiting for {missing} chunks")
+        return True
+    
+    def _finish_raw_transfer(self, transfer: RawTransfer):
+        """Verify and move a fully received raw transfer into place"""
+        del self.raw_transfers[transfer.transfer_id]
+        if not transfer.claim():
+            transfer.close()  # another consumer is finalizing it
+            return
+        expected_hash = transfer.completion.get('sha256', '')
+        try:
+            actual_hash = transfer.finish()
+        except OSError as e:
+            transfer.close()
+            print(f"❌ Error finalizing {transfer.output_path}: {e}")
+            return
+        
+        print(f"\n\n📦 Finalized: {transfer.output_path}")
+        print(f"   Size: {os.path.getsize(transfer.output_path):,} bytes (expected: {transfer.file_size:,})")
+        if expected_hash:
+            if actual_hash == expected_hash:
+                print("✅ SHA256 verification: PASS")
+            else:
+                print("❌ SHA256 verification: FAIL")
+                print(f"   Expected: {expected_hash}")
+                print(f"   Got:      {actual_hash}")
+        else:
+            print(f"   SHA256: {actual_hash}")
+        print("-" * 50)
+    
     def _process_completion(self, data: Dict, output_dir: str):
         """Process completion message and reconstruct file"""
         file_name = data.get('file_name', 'unknown')
@@ -285,6 +603,34 @@ class RedisBinaryConsumer:
             print(f"Error listing consumer groups: {e}")
             return []
 
+def run_consumer(redis_params: Dict, consumer_group: str, consumer_name: Optional[str], **consume_args):
+    """Entry point of one consumer (also the target of each --workers process)"""
+    try:
+        consumer = RedisBinaryConsumer(
+            consumer_group=consumer_group,
+            consumer_name=consumer_name,
+            **redis_params
+        )
+        consumer.consume_files(**consume_args)
+    except KeyboardInterrupt:
+        print("\n🛑 Consumer stopped by user")
+
+def run_workers(workers: int, redis_params: Dict, consumer_group: str, consumer_name: str, **consume_args):
+    """Run N consumers of the same group in separate processes, named <consumer_name>-<i>"""
+    processes = [
+        Process(target=run_consumer, args=(redis_params, consumer_group, f"{consumer_name}-{i}"),
+                kwargs=consume_args, name=f"{consumer_name}-{i}")
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.join()
+
 def main():
     parser = argparse.ArgumentParser(description='Consume binary files from Redis Streams')
     parser.add_argument('--redis-url', help='Redis URL (e.g., redis://localhost:6379)')
@@ -295,6 +641,11 @@ def main():
     parser.add_argument('--group', default='file-consumer', help='Consumer group name')
     parser.add_argument('--output-dir', default='received_files', help='Output directory')
     parser.add_argument('--block-time', type=int, default=5000, help='Block time in ms (0 for non-blocking)')
+    parser.add_argument('--count', type=int, default=10, help='Messages fetched per read')
+    parser.add_argument('--consumer-name', help='Stable consumer name (default: timestamp and pid)')
+    parser.add_argument('--workers', type=int, default=1, help='Consumer processes in the group')
+    parser.add_argument('--claim-idle-ms', type=int, default=DEFAULT_CLAIM_IDLE_MS,
+                        help='Claim pending messages idle this long from other consumers (0 disables)')
     
     args = parser.parse_args()
     
@@ -309,19 +660,21 @@ def main():
         if args.password:
             redis_params['password'] = args.password
     
+    consume_args = dict(
+        stream_name=args.stream,
+        output_dir=args.output_dir,
+        block_time=args.block_time,
+        count=args.count,
+        claim_idle_ms=args.claim_idle_ms
+    )
+    
     try:
-        # Initialize consumer
-        consumer = RedisBinaryConsumer(
-            consumer_group=args.group,
-            **redis_params
-        )
-        
-        # Start consuming
-        consumer.consume_files(
-            stream_name=args.stream,
-            output_dir=args.output_dir,
-            block_time=args.block_time
-        )
+        if args.workers > 1:
+            consumer_name = args.consumer_name or f"consumer-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+            run_workers(args.workers, redis_params, args.group, consumer_name, **consume_args)
+        else:
+            # Initialize consumer and start consuming
+            run_consumer(redis_params, args.group, args.consumer_name, **consume_args)
         
     except KeyboardInterrupt:
         print("\n🛑 Consumer stopped by user")
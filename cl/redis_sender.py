@@ -2,6 +2,12 @@
 """
 Redis Binary File Publisher
 Send binary files to Redis Streams (compatible with Render Redis)
+
+Two transfer modes:
+  json -- each chunk base64-encoded inside a JSON field, one round trip per chunk
+  raw  -- chunk bytes sent as-is in a binary field with their file offset, xadd
+          calls batched in a pipeline; several files can be sent concurrently
+          (their chunks interleave on the stream, keyed by transfer_id)
 """
 
 import redis
@@ -9,10 +15,17 @@ import os
 import hashlib
 import json
 import base64
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List
 import argparse
 from pathlib import Path
 
+# xadd calls sent per pipeline round trip in raw mode
+DEFAULT_WINDOW = 32
+# Stream length cap (approximate trimming); must exceed what consumers lag behind
+DEFAULT_MAXLEN = 1000
+
 class RedisBinaryPublisher:
     def __init__(self, redis_url: str = None, **redis_kwargs):
         """
@@ -138,6 +151,123 @@ class RedisBinaryPublisher:
             print(f"❌ Error publishing file: {e}")
             raise
     
+    def publish_file_raw(self, stream_name: str, file_path: str, chunk_size: int = 500000,
+                         window: int = DEFAULT_WINDOW, maxlen: int = DEFAULT_MAXLEN,
+                         show_progress: bool = True) -> Dict:
+        """
+        Publish a binary file as raw chunks (no base64/JSON), pipelining xadd calls
+        
+        Args:
+            stream_name: Redis Stream name
+            file_path: Path to binary file
+            chunk_size: Size of each chunk (default: 500KB)
+            window: Number of chunks sent per pipeline round trip
+            maxlen: Approximate stream length cap
+            show_progress: Print a progress line after each pipeline flush
+        
+        Returns:
+            Dictionary with transfer information
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+        
+        file_name = os.path.basename(file_path)
+        file_size = os.path.getsize(file_path)
+        total_chunks = max(1, -(-file_size // chunk_size))
+        transfer_id = uuid.uuid4().hex
+        file_hash = hashlib.sha256()
+        window = max(1, window)
+        
+        print(f"📤 Publishing (raw): {file_name} [{transfer_id}]")
+        print(f"📊 File size: {file_size:,} bytes, {total_chunks} chunks of {chunk_size:,} bytes")
+        
+        header = {
+            'type': 'raw_chunk',
+            'transfer_id': transfer_id,
+            'file_name': file_name,
+            'file_size': file_size,
+            'chunk_size': chunk_size,
+            'total_chunks': total_chunks,
+        }
+        
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            chunk_count = 0
+            with open(file_path, 'rb') as file:
+                while True:
+                    offset = file.tell()
+                    chunk = file.read(chunk_size)
+                    if not chunk and chunk_count:
+                        break
+                    file_hash.update(chunk)
+                    
+                    fields = dict(header, chunk_index=chunk_count, offset=offset, data=chunk)
+                    pipe.xadd(name=stream_name, fields=fields, maxlen=maxlen, approximate=True)
+                    chunk_count += 1
+                    
+                    if len(pipe) >= window:
+                        pipe.execute()
+                        if show_progress:
+                            progress = (file.tell() / file_size) * 100 if file_size else 100.0
+                            print(f"\r📤 Progress: {progress:.1f}% ({chunk_count} chunks)", end="")
+                    if not chunk:
+                        break  # empty file: one empty chunk
+            
+            # Completion travels in the same pipeline as the last chunks
+            pipe.xadd(
+                name=stream_name,
+                fields={
+                    'type': 'complete',
+                    'mode': 'raw',
+                    'transfer_id': transfer_id,
+                    'file_name': file_name,
+                    'total_chunks': chunk_count,
+                    'file_size': file_size,
+                    'sha256': file_hash.hexdigest(),
+                    'chunk_size': chunk_size,
+                },
+                maxlen=maxlen,
+                approximate=True
+            )
+            completion_id = pipe.execute()[-1]
+            if show_progress:
+                print()
+            
+            print(f"✅ {file_name} published: {chunk_count} chunks, SHA256 {file_hash.hexdigest()}")
+            
+            return {
+                'file_name': file_name,
+                'file_size': file_size,
+                'chunks': chunk_count,
+                'sha256': file_hash.hexdigest(),
+                'stream': stream_name,
+                'transfer_id': transfer_id,
+                'completion_id': str(completion_id, 'utf-8') if isinstance(completion_id, bytes) else completion_id
+            }
+            
+        except Exception as e:
+            print(f"❌ Error publishing file: {e}")
+            raise
+    
+    def publish_files(self, stream_name: str, file_paths: List[str], chunk_size: int = 500000,
+                      window: int = DEFAULT_WINDOW, workers: int = 4,
+                      maxlen: int = DEFAULT_MAXLEN) -> List[Dict]:
+        """
+        Publish several files in raw mode concurrently, one thread (and pipeline) per file
+        
+        Returns:
+            Transfer information per file, in the order given
+        """
+        if len(file_paths) == 1 or workers <= 1:
+            return [self.publish_file_raw(stream_name, path, chunk_size, window, maxlen)
+                    for path in file_paths]
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self.publish_file_raw, stream_name, path, chunk_size,
+                                       window, maxlen, False)
+                       for path in file_paths]
+            return [future.result() for future in futures]
+    
     def list_streams(self, pattern: str = "*") -> List[str]:
         """List all streams matching pattern"""
         return [key.decode('utf-8') if isinstance(key, bytes) else key 
@@ -165,7 +295,12 @@ def main():
     parser.add_argument('--password', help='Redis password')
     parser.add_argument('--stream', default='binary-files', help='Redis Stream name')
     parser.add_argument('--chunk-size', type=int, default=500000, help='Chunk size in bytes')
-    parser.add_argument('file', help='File to publish')
+    parser.add_argument('--mode', choices=['json', 'raw'], default='json',
+                        help='json: base64 chunks, one xadd per round trip; raw: binary chunks, pipelined')
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW, help='Chunks per pipeline round trip (raw mode)')
+    parser.add_argument('--workers', type=int, default=4, help='Files sent concurrently (raw mode)')
+    parser.add_argument('--maxlen', type=int, default=DEFAULT_MAXLEN, help='Approximate stream length cap (raw mode)')
+    parser.add_argument('file', nargs='+', help='File(s) to publish')
     
     args = parser.parse_args()
     
@@ -195,13 +330,18 @@ def main():
         
         print("-" * 50)
         
-        # Publish file
-        result = publisher.publish_file(args.stream, args.file, args.chunk_size)
+        # Publish file(s)
+        if args.mode == 'raw':
+            results = publisher.publish_files(args.stream, args.file, args.chunk_size,
+                                              args.window, args.workers, args.maxlen)
+        else:
+            results = [publisher.publish_file(args.stream, path, args.chunk_size) for path in args.file]
         
         # Print summary
-        print("\n📋 Publish Summary:")
-        for key, value in result.items():
-            print(f"   {key}: {value}")
+        for result in results:
+            print("\n📋 Publish Summary:")
+            for key, value in result.items():
+                print(f"   {key}: {value}")
         
         # Close connection
         publisher.close()
@@ -1,9 +1,14 @@
 import csv
 import configparser
+import os
+import sys
 from pathlib import Path
 from collections import defaultdict
 import pandas as pd
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fixlib.account_links import find_link_files, load_account_links, network_name
+
 
 def load_nyfix_account_mapping(mapping_file_path, ini_file_path):
     """
@@ -135,28 +140,16 @@ def link_accounts_to_destinations(mapping_file_path, mapping_ini_path, routing_f
         dict: Dictionary with ACCOUNT as key and list of unique DESTINATIONS as value
     """
     
-    print("Loading account mappings...")
-    onbehalf_to_account = load_nyfix_account_mapping(mapping_file_path, mapping_ini_path)
-    print(f"Loaded {len(onbehalf_to_account)} ONBEHALFOFCOMPID to ACCOUNT mappings")
-    
-    print("\nLoading routing mappings...")
-    onbehalf_to_destinations = load_nyfix_routing(routing_file_path)
-    print(f"Loaded {len(onbehalf_to_destinations)} ONBEHALFOFCOMPID to DESTINATION mappings")
-    
-    # Join the mappings
-    account_to_destinations = defaultdict(set)
-    unmatched_onbehalf = []
+    # Both files go through the shared link cache: parsed once, joined with one merge
+    network = network_name(routing_file_path)
+    print("Loading account mappings and routing...")
+    links = load_account_links([mapping_file_path, mapping_ini_path], [routing_file_path], network=network)
+    print(f"Loaded {links.mappings['KEY'].nunique()} ONBEHALFOFCOMPID to ACCOUNT mappings")
+    routed = links.routes[links.routes['KEY_COLUMN'] == 'ONBEHALFOFCOMPID']
+    print(f"Loaded {routed['KEY'].nunique()} ONBEHALFOFCOMPID to DESTINATION mappings")
     
-    for onbehalf, destinations in onbehalf_to_destinations.items():
-        if onbehalf in onbehalf_to_account:
-            account = onbehalf_to_account[onbehalf]
-            account_to_destinations[account].update(destinations)
-        else:
-            unmatched_onbehalf.append(onbehalf)
-    
-    # Convert sets to sorted lists
-    result = {account: sorted(list(destinations)) 
-              for account, destinations in account_to_destinations.items()}
+    result = links.to_dict(network)
+    unmatched_onbehalf = links.unmatched_keys(network)
     
     print(f"\nLinked {len(result)} accounts to destinations")
     print(f"Found {len(unmatched_onbehalf)} ONBEHALFOFCOMPID(s) in routing file without a matching account in mapping file")
@@ -306,11 +299,15 @@ def main():
             sample_account = next(iter(account_to_destinations.keys()))
             destinations = get_destinations_for_account(sample_account, account_to_destinations)
             print(f"\nExample: Account {sample_account} -> Destinations: {destinations}")
-            df = pd.DataFrame({"Account": list(account_to_destinations.keys()), 
-                               "Destinations": [', '.join(dests) for dests in account_to_destinations.values()]})
-            print("\nFull account to destination mapping:")
-            df['Adapter'] = 'NYFIX'  # Add a column to indicate the source adapter
-            print(df)
+        
+        # Every network under root_dir, linked in one pass over the cached tables
+        all_links = load_account_links(*find_link_files(root_dir))
+        pairs = all_links.links[['NETWORK', 'ACCOUNT', 'DESTINATION']].astype(object).drop_duplicates()
+        df = (pairs.groupby(['NETWORK', 'ACCOUNT'], sort=True)['DESTINATION']
+              .agg(lambda dests: ', '.join(sorted(dests))).reset_index()
+              .rename(columns={'NETWORK': 'Adapter', 'ACCOUNT': 'Account', 'DESTINATION': 'Destinations'}))
+        print("\nFull account to destination mapping (all networks):")
+        print(df[['Account', 'Destinations', 'Adapter']])
         
     except Exception as e:
         print(f"Error processing files: {e}")
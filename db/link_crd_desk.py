@@ -1,6 +1,15 @@
 import csv
+import os
+import sys
 from typing import Optional, Dict, List, Any
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fixlib.account_links import load_account_links
+from fixlib.rule_cache import rule_cache
+from fixlib.rule_index import RuleIndex
+
+ROUTE_COLUMNS = ('SENDERCOMPID', 'CURRENCY', 'TARGETSUBID', 'ETF', 'COUNTRYCODE')
+
 def load_alias_routes(filepath: str) -> List[Dict[str, str]]:
     """
     Load the routing alias CSV into a list of dictionaries.
@@ -30,6 +39,29 @@ def load_account_mapping(filepath: str) -> Dict[str, str]:
                 mapping[sender] = account
     return mapping
 
+class CrdRoutes:
+    """Alias rows compiled once per file version: a rule index plus each row's specificity"""
+
+    def __init__(self, files: Dict[str, List[Dict[str, str]]]):
+        self.routes = next(iter(files.values()), [])
+        self.index = RuleIndex([{c: route.get(c, '*') for c in ROUTE_COLUMNS} for route in self.routes],
+                               wildcards=('*',))
+        self.scores = [sum(route.get(c, '*') != '*' for c in ROUTE_COLUMNS) for route in self.routes]
+        self.memo: Dict[tuple, Optional[str]] = {}
+
+    def destination(self, fields: Dict[str, str]) -> Optional[str]:
+        key = self.index.key(fields)
+        if key not in self.memo:
+            best_match = None
+            best_score = -1
+            # matches() is in file order, so the first of equal scores wins
+            for rule_id in self.index.matches(fields):
+                if self.scores[rule_id] > best_score:
+                    best_score = self.scores[rule_id]
+                    best_match = self.routes[rule_id]['DESTINATION']
+            self.memo[key] = best_match
+        return self.memo[key]
+
 def get_destination_for_crd(
     sendercompid: str,
     currency: str = '*',
@@ -57,43 +89,15 @@ def get_destination_for_crd(
         str or None: The destination string, or None if no match (should not happen
                      because the file contains a fully wildcard row).
     """
-    routes = load_alias_routes(alias_file)
-
-    best_match = None
-    best_score = -1
-
-    for route in routes:
-        # Check if all fields match (exact or wildcard)
-        if not (route['SENDERCOMPID'] in (sendercompid, '*')):
-            continue
-        if not (route['CURRENCY'] in (currency, '*')):
-            continue
-        if not (route['TARGETSUBID'] in (targetsubid, '*')):
-            continue
-        if not (route['ETF'] in (etf, '*')):
-            continue
-        if not (route['COUNTRYCODE'] in (countrycode, '*')):
-            continue
-
-        # Compute specificity score: count of fields that are exact matches (not wildcard)
-        score = 0
-        if route['SENDERCOMPID'] != '*':
-            score += 1
-        if route['CURRENCY'] != '*':
-            score += 1
-        if route['TARGETSUBID'] != '*':
-            score += 1
-        if route['ETF'] != '*':
-            score += 1
-        if route['COUNTRYCODE'] != '*':
-            score += 1
-
-        if score > best_score:
-            best_score = score
-            best_match = route['DESTINATION']
-        # If equal score, keep the first (order in file acts as tie‑breaker)
-
-    return best_match
+    # Parsed and indexed once per version of the alias file
+    routes = rule_cache('crd_alias_routes').load([alias_file], load_alias_routes, CrdRoutes).compiled
+    return routes.destination({
+        'SENDERCOMPID': sendercompid,
+        'CURRENCY': currency,
+        'TARGETSUBID': targetsubid,
+        'ETF': etf,
+        'COUNTRYCODE': countrycode,
+    })
 
 def get_account_for_crd(
     sendercompid: str,
@@ -109,8 +113,8 @@ def get_account_for_crd(
     Returns:
         str or None: The account number if found, else None.
     """
-    mapping = load_account_mapping(enrichment_file)
-    return mapping.get(sendercompid)
+    links = load_account_links([enrichment_file], [], network='CRD')
+    return links.account_for(sendercompid, 'CRD')
 
 # Example usage:
 if __name__ == '__main__':
@@ -9,6 +9,8 @@ import os
 import re
 from urllib.parse import urlparse
 
+from fixlib.frame_store import frame_store
+
 # Sample data
 np.random.seed(42)
 df = pd.DataFrame({
@@ -182,7 +184,8 @@ app.layout = html.Div([
     html.Div(id='tabs-content', className="bg-white p-6 rounded-lg shadow-sm"),
     
     # Store components
-    dcc.Store(id='data-store', data=df.to_dict('records')),
+    # Only the key of the server-side frame goes to the browser
+    dcc.Store(id='data-store', data=frame_store().put(df, 'sample-data')),
     dcc.Store(id='loading-state', data=False),
     dcc.Store(id='domains-store', data=domains_data),
     dcc.Store(id='dialog-state', data=False)
@@ -458,7 +461,7 @@ def update_data(loading):
                 html.Span("Data updated successfully!", className="text-green-600")
             ])
             
-            return new_df.to_dict('records'), False, success_status
+            return frame_store().put(new_df, 'sample-data'), False, success_status
         else:
             # Show error status
             error_status = html.Div([
@@ -476,12 +479,15 @@ def update_data(loading):
            Input('data-store', 'data'),
            Input('domains-store', 'data')])
 def render_content(tab, data, domains_data):
-    df = pd.DataFrame(data)
+    df = frame_store().get(data)
+    if df is None:
+        return html.Div("Data expired. Please update data.", className="text-center text-gray-500 p-8")
     
     # Convert Date column from string to datetime if needed
     if 'Date' in df.columns and df['Date'].dtype == 'object':
         try:
-            df['Date'] = pd.to_datetime(df['Date'])
+            # The stored frame is shared: convert into a new frame instead of in place
+            df = df.assign(Date=pd.to_datetime(df['Date']))
         except:
             pass
     
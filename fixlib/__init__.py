@@ -0,0 +1,24 @@
+"""
+Shared FIX log tooling for the audit, routing and account apps.
+
+Scripts living in the sub-folders put the repository root on sys.path and
+import from here instead of carrying their own parser copies.
+"""
+
+from fixlib.tokenizer import (
+    DELIMITERS,
+    ENUM_TABLES,
+    EXEC_TYPES,
+    FIELD_NAMES,
+    FIXFields,
+    MSG_TYPES,
+    ORD_STATUS,
+    ORD_TYPES,
+    SIDES,
+    SOH,
+    TIME_IN_FORCE,
+    detect_delimiter,
+    find_fix_start,
+    iter_fields,
+    parse_fix,
+)
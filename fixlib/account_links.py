@@ -0,0 +1,232 @@
+"""
+Account -> ONBEHALFOFCOMPID/SENDERCOMPID -> destination linking for every network.
+
+Inputs (Ullink client data layout):
+
+    enrichments/enrichment_<NET>AccountMapping.csv   lookup value ; account (no header)
+    enrichments/enrichment_<NET>AccountMapping.ini   [lookup] <col>=ONBEHALFOFCOMPID, [result] <col>=ACCOUNT
+    conf/aliases/alias_AutoRoute<NET>.csv            routing table with a header row
+
+Every file goes through the shared rule cache, so it is parsed once and again
+only after it changes. The tables are concatenated across networks and linked
+with one pandas merge on (NETWORK, KEY_COLUMN, KEY). The result keeps the
+merged relation as categorical frames and precomputes the dicts behind the
+point lookups:
+
+    links = load_account_links(*find_link_files('client_data'))
+    links.destinations('20010964')          # every network
+    links.destinations('20010964', 'NYFIX')
+    links.account_for('URDG42', 'NYFIX')
+    links.links                             # NETWORK, ACCOUNT, KEY_COLUMN, KEY, DESTINATION
+"""
+
+import configparser
+import csv
+import glob
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from fixlib.rule_cache import rule_cache
+
+MAPPING_PREFIX, MAPPING_SUFFIX = 'enrichment_', 'AccountMapping'
+ROUTING_PREFIX = 'alias_AutoRoute'
+# Routing columns a mapping key can be matched against, when the INI does not name one
+KEY_COLUMNS = ('SENDERCOMPID', 'ONBEHALFOFCOMPID')
+WILDCARD = '*'
+
+ROUTE_COLUMNS = ['NETWORK', 'KEY_COLUMN', 'KEY', 'DESTINATION']
+MAPPING_COLUMNS = ['NETWORK', 'KEY_COLUMN', 'KEY', 'ACCOUNT']
+LINK_COLUMNS = ['NETWORK', 'ACCOUNT', 'KEY_COLUMN', 'KEY', 'DESTINATION']
+
+
+def network_name(path: str) -> str:
+    """NYFIX for enrichment_NYFIXAccountMapping.csv/.ini and alias_AutoRouteNYFIX.csv"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if stem.startswith(MAPPING_PREFIX) and stem.endswith(MAPPING_SUFFIX):
+        return stem[len(MAPPING_PREFIX):-len(MAPPING_SUFFIX)]
+    if stem.startswith(ROUTING_PREFIX):
+        return stem[len(ROUTING_PREFIX):]
+    return stem
+
+
+def find_link_files(root_dir: str) -> Tuple[List[str], List[str]]:
+    """(mapping CSV + INI files, routing CSV files) under root_dir, its enrichments/ and conf/aliases/"""
+    mapping_files, routing_files = [], []
+    for directory in (root_dir, os.path.join(root_dir, 'enrichments')):
+        for ext in ('csv', 'ini'):
+            mapping_files += glob.glob(os.path.join(directory, f'{MAPPING_PREFIX}*{MAPPING_SUFFIX}.{ext}'))
+    for directory in (root_dir, os.path.join(root_dir, 'conf', 'aliases')):
+        routing_files += glob.glob(os.path.join(directory, f'{ROUTING_PREFIX}*.csv'))
+    return sorted(mapping_files), sorted(routing_files)
+
+
+# ------------------------------------------------------------------ per-file parsing (cached)
+
+def _read_ini(path: str) -> Dict[str, Dict[str, str]]:
+    config = configparser.ConfigParser()
+    with open(path, 'r') as ini_file:
+        config.read_file(ini_file)
+    return {section: dict(config[section]) for section in config.sections()}
+
+
+def _read_mapping(path: str) -> pd.DataFrame:
+    """Raw mapping rows, every column as text (the INI says which ones are used)"""
+    with open(path, 'r', newline='') as csv_file:
+        rows = [row for row in csv.reader(csv_file, delimiter=';') if row]
+    return pd.DataFrame(rows, dtype=object)
+
+
+def _read_routing(path: str) -> pd.DataFrame:
+    """Long (KEY_COLUMN, KEY, DESTINATION) rows for every non-wildcard key column of the routing file"""
+    # csv.reader, not read_csv: rows may be ragged (a trailing ';', extra or missing fields)
+    # and every row is read by the header's column positions
+    with open(path, 'r', newline='') as csv_file:
+        reader = csv.reader(csv_file, delimiter=';')
+        header = [column.strip() for column in next(reader, [])]
+        rows = [row for row in reader if row]
+    if 'DESTINATION' in header:
+        dest_idx = header.index('DESTINATION')
+        key_idx = [(column, header.index(column)) for column in KEY_COLUMNS if column in header]
+    else:
+        print(f"Warning: No DESTINATION column in {path}, "
+              f"assuming the first column is ONBEHALFOFCOMPID and the last is DESTINATION")
+        dest_idx, key_idx = -1, [('ONBEHALFOFCOMPID', 0)]
+
+    records = []
+    for row in rows:
+        destination = row[dest_idx].strip() if dest_idx < len(row) else ''
+        if not destination:
+            continue
+        for column, idx in key_idx:
+            key = row[idx].strip() if idx < len(row) else ''
+            if key and key != WILDCARD:
+                records.append((column, key, destination))
+    return pd.DataFrame(records, columns=ROUTE_COLUMNS[1:], dtype=object).drop_duplicates(ignore_index=True)
+
+
+def _parse_link_file(path: str):
+    name = os.path.basename(path)
+    if name.endswith('.ini'):
+        return _read_ini(path)
+    if name.startswith(ROUTING_PREFIX):
+        return _read_routing(path)
+    return _read_mapping(path)
+
+
+# ------------------------------------------------------------------ linking
+
+def _ini_columns(ini: Optional[Dict[str, Dict[str, str]]]) -> Tuple[int, int, Optional[str]]:
+    """(lookup column, account column, routing column the lookup values belong to)"""
+    lookup_col, result_col, key_column = 0, 1, None
+    for key, value in (ini or {}).get('lookup', {}).items():
+        if value.strip() in KEY_COLUMNS and key.strip().isdigit():
+            lookup_col, key_column = int(key), value.strip()
+    for key, value in (ini or {}).get('result', {}).items():
+        if value.strip() == 'ACCOUNT' and key.strip().isdigit():
+            result_col = int(key)
+    return lookup_col, result_col, key_column
+
+
+def _mapping_table(network: str, raw: pd.DataFrame, ini) -> pd.DataFrame:
+    lookup_col, result_col, key_column = _ini_columns(ini)
+    if raw.empty or max(lookup_col, result_col) >= raw.shape[1]:
+        return pd.DataFrame(columns=MAPPING_COLUMNS)
+    key = raw[lookup_col].str.strip()
+    account = raw[result_col].str.strip()
+    keep = key.notna() & account.notna() & ~key.isin(['', WILDCARD]) & ~account.isin(['', WILDCARD, 'ACCOUNT'])
+    table = pd.DataFrame({'KEY': key[keep], 'ACCOUNT': account[keep]})
+    # Later rows win, like loading the file into a dict
+    table = table.drop_duplicates('KEY', keep='last')
+    key_columns = [key_column] if key_column else list(KEY_COLUMNS)
+    return pd.concat([table.assign(NETWORK=network, KEY_COLUMN=column) for column in key_columns],
+                     ignore_index=True)[MAPPING_COLUMNS]
+
+
+def _categorical(frame: pd.DataFrame) -> pd.DataFrame:
+    return frame.astype({column: 'category' for column in frame.columns})
+
+
+class AccountLinks:
+    """Linked mapping and routing tables of all networks, with dict-backed point lookups"""
+
+    def __init__(self, files: Dict[str, object], network: Optional[str] = None):
+        inis = {network or network_name(p): parsed for p, parsed in files.items() if p.endswith('.ini')}
+        mappings, routes = [], []
+        for path, parsed in files.items():
+            if path.endswith('.ini'):
+                continue
+            net = network or network_name(path)
+            if os.path.basename(path).startswith(ROUTING_PREFIX):
+                routes.append(parsed.assign(NETWORK=net)[ROUTE_COLUMNS])
+            else:
+                mappings.append(_mapping_table(net, parsed, inis.get(net)))
+
+        self.mappings = _categorical(pd.concat(mappings, ignore_index=True) if mappings
+                                     else pd.DataFrame(columns=MAPPING_COLUMNS))
+        self.routes = _categorical(pd.concat(routes, ignore_index=True).drop_duplicates(ignore_index=True)
+                                   if routes else pd.DataFrame(columns=ROUTE_COLUMNS))
+
+        keys = ['NETWORK', 'KEY_COLUMN', 'KEY']
+        mappings = self.mappings.astype(object)
+        routes = self.routes.astype(object)
+        joined = routes.merge(mappings, on=keys, how='left', indicator=True)
+        self.links = _categorical(joined.loc[joined['_merge'] == 'both', LINK_COLUMNS]
+                                  .drop_duplicates(ignore_index=True))
+        # Keys the routing tables use in a column a mapping file covers, that it does not resolve
+        covered = joined.merge(mappings[['NETWORK', 'KEY_COLUMN']].drop_duplicates(), on=['NETWORK', 'KEY_COLUMN'])
+        self.unmatched = _categorical(covered.loc[covered['_merge'] == 'left_only', keys]
+                                      .drop_duplicates(ignore_index=True))
+
+        # Sorted once, so each lookup list is filled in order without per-group frames
+        pairs = (self.links[['NETWORK', 'ACCOUNT', 'DESTINATION']].astype(object).drop_duplicates()
+                 .sort_values(['DESTINATION', 'NETWORK', 'ACCOUNT']))
+        self._by_network: Dict[Tuple[str, str], List[str]] = {}
+        self._by_account: Dict[str, List[str]] = {}
+        for network, account, destination in zip(pairs['NETWORK'], pairs['ACCOUNT'], pairs['DESTINATION']):
+            self._by_network.setdefault((network, account), []).append(destination)
+            dests = self._by_account.setdefault(account, [])
+            if not dests or dests[-1] != destination:
+                dests.append(destination)
+        self._accounts = dict(zip(zip(mappings['NETWORK'], mappings['KEY']), mappings['ACCOUNT']))
+
+    def destinations(self, account: str, network: Optional[str] = None) -> List[str]:
+        """Sorted destinations orders of the account can be routed to"""
+        if network is None:
+            return self._by_account.get(account, [])
+        return self._by_network.get((network, account), [])
+
+    def account_for(self, key: str, network: str) -> Optional[str]:
+        """Account a SENDERCOMPID/ONBEHALFOFCOMPID maps to on a network"""
+        return self._accounts.get((network, key))
+
+    def to_dict(self, network: Optional[str] = None) -> Dict[str, List[str]]:
+        """{account: sorted destinations}, for one network or all of them"""
+        if network is None:
+            return dict(self._by_account)
+        return {account: dests for (net, account), dests in self._by_network.items() if net == network}
+
+    def unmatched_keys(self, network: Optional[str] = None) -> List[str]:
+        """Routing keys (ONBEHALFOFCOMPID/SENDERCOMPID) no mapping resolves"""
+        unmatched = self.unmatched if network is None else self.unmatched[self.unmatched['NETWORK'] == network]
+        return list(dict.fromkeys(unmatched['KEY'].astype(object)))
+
+    def to_arrow(self):
+        """links as a pyarrow Table (dictionary-encoded columns)"""
+        import pyarrow as pa
+        return pa.Table.from_pandas(self.links, preserve_index=False)
+
+
+def load_account_links(mapping_files: Iterable[str], routing_files: Iterable[str],
+                       network: Optional[str] = None, max_age: float = 0.0) -> AccountLinks:
+    """
+    Linked tables for these files, rebuilt only when one of them changed.
+    mapping_files may include the INI files; network tags every file with one
+    network instead of deriving it from the file names.
+    """
+    paths = list(mapping_files) + list(routing_files)
+    name = 'account_links' if network is None else f'account_links_{network}'
+    rule_set = rule_cache(name).load(paths, _parse_link_file,
+                                     lambda files: AccountLinks(files, network), max_age=max_age)
+    return rule_set.compiled
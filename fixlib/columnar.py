@@ -0,0 +1,298 @@
+"""
+Typed column buffers for parsed FIX messages.
+
+Instead of one dict per message turned into a DataFrame at the end (every
+value a Python string), FixColumnBuilder appends each field straight into a
+per-tag buffer of the right type:
+
+    category -- int32 codes plus one copy of each distinct value
+                (MsgType, Side, OrdStatus, ExecType, symbols, sessions, ...)
+    float    -- float64 (prices, quantities; unparsable values become NaN)
+    int      -- int64 with a validity mask (MsgSeqNum, BodyLength)
+    time     -- timestamps (FIX 52/60 or log prefixes), decoded in bulk to datetime64[ns]
+    text     -- everything else (ClOrdID, ExecID, Text, ...)
+
+to_frame() builds the DataFrame from the buffers without re-parsing strings;
+categories come out sorted, so sorting a categorical column is alphabetical.
+to_frame(start) builds only the rows from `start` on, and append_frame() puts
+them after an earlier frame of the same builder with the column types kept.
+to_arrow() / to_parquet() need pyarrow.
+"""
+
+import math
+from array import array
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from fixlib.timestamps import NAT, TimestampDecoder
+from fixlib.tokenizer import Buffer, _value, find_fix_start, iter_fields
+
+CATEGORY = 'category'
+FLOAT = 'float'
+INT = 'int'
+TIME = 'time'
+TEXT = 'text'
+
+# Column kind per FIX tag; tags not listed are kept as text
+TAG_KINDS = {
+    **dict.fromkeys(['1', '8', '15', '20', '21', '22', '29', '30', '35', '39', '40', '48', '49', '50',
+                     '54', '55', '56', '57', '59', '63', '115', '116', '150', '434'], CATEGORY),
+    **dict.fromkeys(['6', '14', '31', '32', '38', '44', '99', '151'], FLOAT),
+    **dict.fromkeys(['9', '34'], INT),
+    **dict.fromkeys(['52', '60'], TIME),
+}
+
+class _CategoryColumn:
+    def __init__(self):
+        self.codes = array('i')
+        self.lookup: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def append(self, row: int, value: str):
+        code = self.lookup.get(value)
+        if code is None:
+            code = self.lookup[value] = len(self.values)
+            self.values.append(value)
+        if len(self.codes) > row:
+            self.codes[row] = code
+            return
+        if len(self.codes) < row:
+            self.codes.extend([-1] * (row - len(self.codes)))
+        self.codes.append(code)
+
+    def build(self, rows: int, start: int, decoder: Optional[Dict[str, str]]):
+        codes = np.full(rows - start, -1, dtype=np.int32)
+        filled = np.frombuffer(self.codes, dtype=np.int32)[start:rows]
+        codes[:len(filled)] = filled
+        labels = [decoder.get(v, v) for v in self.values] if decoder else list(self.values)
+        if len(set(labels)) != len(labels):
+            # Two codes decode to the same label: fall back to categorizing the labels
+            mapped = np.array(labels + [None], dtype=object)[codes]
+            return pd.Categorical(mapped)
+        # Sorted categories, so sorting the column is alphabetical
+        order = sorted(range(len(labels)), key=labels.__getitem__)
+        rank = np.empty(len(labels) + 1, dtype=np.int32)
+        rank[order] = np.arange(len(labels), dtype=np.int32)
+        rank[-1] = -1
+        return pd.Categorical.from_codes(rank[codes], [labels[i] for i in order])
+
+
+class _FloatColumn:
+    def __init__(self):
+        self.data = array('d')
+
+    def append(self, row: int, value: str):
+        try:
+            number = float(value)
+        except ValueError:
+            number = math.nan
+        if len(self.data) > row:
+            self.data[row] = number
+            return
+        if len(self.data) < row:
+            self.data.extend([math.nan] * (row - len(self.data)))
+        self.data.append(number)
+
+    def build(self, rows: int, start: int, decoder=None):
+        data = np.full(rows - start, np.nan)
+        filled = np.frombuffer(self.data, dtype=np.float64)[start:rows]
+        data[:len(filled)] = filled
+        return data
+
+
+class _IntColumn:
+    def __init__(self):
+        self.data = array('q')
+        self.valid = bytearray()
+
+    def append(self, row: int, value):
+        try:
+            number, ok = int(value), 1
+        except (TypeError, ValueError):
+            number, ok = 0, 0
+        if len(self.data) > row:
+            self.data[row] = number
+            self.valid[row] = ok
+            return
+        if len(self.data) < row:
+            missing = row - len(self.data)
+            self.data.extend([0] * missing)
+            self.valid.extend(bytes(missing))
+        self.data.append(number)
+        self.valid.append(ok)
+
+    def build(self, rows: int, start: int, decoder=None):
+        data = np.zeros(rows - start, dtype=np.int64)
+        mask = np.ones(rows - start, dtype=bool)
+        filled = np.frombuffer(self.data, dtype=np.int64)[start:rows]
+        data[:len(filled)] = filled
+        mask[:len(filled)] = np.frombuffer(self.valid, dtype=np.uint8)[start:rows] == 0
+        return pd.arrays.IntegerArray(data, mask)
+
+
+class _TimeColumn:
+    """Raw timestamps are decoded in bulk at build time and kept as int64 nanoseconds"""
+
+    def __init__(self):
+        self.decoder = TimestampDecoder()  # date cache for this column's file
+        self.ns = array('q')                # decoded rows
+        self.pending: List[Any] = []        # raw values of the rows after them
+
+    def append(self, row: int, value):
+        if row < len(self.ns):
+            self.ns[row] = int(self.decoder.to_datetime64([value]).view(np.int64)[0])
+            return
+        row -= len(self.ns)
+        if len(self.pending) > row:
+            self.pending[row] = value
+            return
+        if len(self.pending) < row:
+            self.pending.extend([None] * (row - len(self.pending)))
+        self.pending.append(value)
+
+    def build(self, rows: int, start: int, decoder=None):
+        if self.pending:
+            self.ns.frombytes(self.decoder.to_datetime64(self.pending).tobytes())
+            self.pending = []
+        data = np.full(rows - start, NAT, dtype=np.int64)
+        filled = np.frombuffer(self.ns, dtype=np.int64)[start:rows]
+        data[:len(filled)] = filled
+        return data.view('datetime64[ns]')
+
+
+class _TextColumn:
+    def __init__(self):
+        self.data: List[Optional[str]] = []
+
+    def append(self, row: int, value):
+        if len(self.data) > row:
+            self.data[row] = value
+            return
+        if len(self.data) < row:
+            self.data.extend([None] * (row - len(self.data)))
+        self.data.append(value)
+
+    def build(self, rows: int, start: int, decoder=None):
+        data = self.data[start:rows]
+        data.extend([None] * (rows - start - len(data)))
+        if decoder:
+            data = [decoder.get(v, v) if v is not None else None for v in data]
+        return np.array(data, dtype=object)
+
+
+_COLUMN_TYPES = {
+    CATEGORY: _CategoryColumn,
+    FLOAT: _FloatColumn,
+    INT: _IntColumn,
+    TIME: _TimeColumn,
+    TEXT: _TextColumn,
+}
+
+
+class FixColumnBuilder:
+    """
+    Appends FIX messages into typed per-tag column buffers.
+
+    names       -- tag -> column name; unnamed tags use `unknown` (e.g. 'Tag_{}') or the bare tag
+    decoders    -- tag -> {code: label}, applied once per distinct value when the frame is built
+    kinds       -- tag -> column kind (default TAG_KINDS; other tags are text)
+    extra_kinds -- kind of the extra (non-tag) columns passed to append(), default text
+    """
+
+    def __init__(self, names: Optional[Dict[str, str]] = None,
+                 decoders: Optional[Dict[str, Dict[str, str]]] = None,
+                 unknown: Optional[str] = None,
+                 kinds: Optional[Dict[str, str]] = None,
+                 extra_kinds: Optional[Dict[str, str]] = None):
+        self.names = names or {}
+        self.decoders = decoders or {}
+        self.unknown = unknown
+        self.kinds = TAG_KINDS if kinds is None else kinds
+        self.extra_kinds = extra_kinds or {}
+        self.columns: Dict[str, Any] = {}    # tag or extra name -> buffer, first-seen order
+        self.labels: Dict[str, str] = {}     # tag or extra name -> column name
+        self.rows = 0
+
+    def _column(self, key: str, extra: bool):
+        column = self.columns.get(key)
+        if column is None:
+            if extra:
+                kind, label = self.extra_kinds.get(key, TEXT), key
+            else:
+                kind = self.kinds.get(key, TEXT)
+                label = self.names.get(key) or (self.unknown.format(key) if self.unknown else key)
+            column = self.columns[key] = _COLUMN_TYPES[kind]()
+            self.labels[key] = label
+        return column
+
+    def append(self, fields: Union[Mapping[str, str], Iterable[Tuple[str, str]]], **extra):
+        """Add one message from tag/value pairs (or a tag -> value dict) plus extra columns"""
+        row = self.rows
+        items = fields.items() if isinstance(fields, Mapping) else fields
+        for tag, value in items:
+            self._column(tag, False).append(row, value)
+        for key, value in extra.items():
+            if value is not None:
+                self._column(key, True).append(row, value)
+        self.rows += 1
+
+    def append_fix(self, buf: Buffer, start: int = 0, end: Optional[int] = None, **extra) -> bool:
+        """Scan one FIX message (anything before '8=FIX' is skipped) straight into the buffers"""
+        if end is None:
+            end = len(buf)
+        fix_start = find_fix_start(buf, start, end)
+        if fix_start < 0:
+            return False
+        self.append(((tag, _value(buf, vs, ve)) for tag, vs, ve in iter_fields(buf, fix_start, end)), **extra)
+        return True
+
+    def column_names(self) -> List[str]:
+        """Column names in first-seen order"""
+        return [self.labels[key] for key in self.columns]
+
+    def to_frame(self, start: int = 0) -> pd.DataFrame:
+        """Rows from `start` on as a typed DataFrame (index restarts at 0)"""
+        data = {}
+        for key, column in self.columns.items():
+            data[self.labels[key]] = column.build(self.rows, min(start, self.rows), self.decoders.get(key))
+        return pd.DataFrame(data, index=pd.RangeIndex(max(self.rows - start, 0)))
+
+    def to_arrow(self, start: int = 0):
+        """Rows from `start` on as a pyarrow Table (categoricals become dictionary arrays)"""
+        import pyarrow as pa
+        return pa.Table.from_pandas(self.to_frame(start), preserve_index=False)
+
+    def to_parquet(self, path: str, start: int = 0):
+        import pyarrow.parquet as pq
+        pq.write_table(self.to_arrow(start), path)
+
+
+def _missing_column(like: pd.Series, rows: int) -> pd.Series:
+    """All-missing column of `like`'s type, for rows of a part that never had the column"""
+    if like.dtype == object:
+        return pd.Series([None] * rows, dtype=object)
+    return like.iloc[:0].reindex(pd.RangeIndex(rows))
+
+
+def append_frame(head: pd.DataFrame, tail: pd.DataFrame, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    head followed by tail, where tail is a later to_frame(start) of the builder
+    head came from. Column types are kept: categoricals get the union of both
+    category sets (still sorted) and a column only one part has is missing in
+    the other. Equal to building the whole frame again, without re-reading
+    the rows of head.
+    """
+    if columns is None:
+        columns = list(dict.fromkeys([*head.columns, *tail.columns]))
+    data = {}
+    for name in columns:
+        first = head[name] if name in head.columns else _missing_column(tail[name], len(head))
+        second = tail[name] if name in tail.columns else _missing_column(head[name], len(tail))
+        if isinstance(first.dtype, pd.CategoricalDtype) and isinstance(second.dtype, pd.CategoricalDtype):
+            data[name] = union_categoricals([first.array, second.array], sort_categories=True)
+        else:
+            data[name] = pd.concat([first, second], ignore_index=True).array
+    return pd.DataFrame(data, index=pd.RangeIndex(len(head) + len(tail)))
@@ -0,0 +1,152 @@
+"""
+Server-side DataFrame store for Dash callbacks.
+
+Instead of shipping a whole dataset through a dcc.Store as to_dict('records')
+JSON (and rebuilding it with pd.DataFrame(data) in every callback), a callback
+puts the frame here and stores only its key; other callbacks fetch the frame
+by key and send the browser just what it shows (one table page, aggregates).
+
+Keys are "<dataset id>@<version>", so a new parse or a new live-tail batch
+gets a new key while the old one stays valid until evicted. Frames live in a
+process-local LRU bounded by item count and memory; an optional shared
+backend (Redis, or a diskcache directory) makes keys valid across worker
+processes and restarts:
+
+    FRAME_STORE_URL=redis://localhost:6379/0    # or
+    FRAME_STORE_URL=/var/cache/dash_frames      # diskcache directory
+
+Frames returned by get() are shared: treat them as read-only.
+"""
+
+import os
+import pickle
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+import pandas as pd
+
+DEFAULT_MAX_ITEMS = 64
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+# Seconds a frame is kept by the shared backend
+DEFAULT_BACKEND_TTL = 24 * 3600
+
+
+def frame_bytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class RedisBackend:
+    """Pickled frames in Redis with a TTL (needs the redis package)"""
+
+    def __init__(self, url: str, ttl: int = DEFAULT_BACKEND_TTL, prefix: str = 'frame:'):
+        import redis
+        self.client = redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        blob = self.client.get(self.prefix + key)
+        return pickle.loads(blob) if blob is not None else None
+
+    def set(self, key: str, df: pd.DataFrame):
+        self.client.set(self.prefix + key, pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL), ex=self.ttl)
+
+
+class DiskBackend:
+    """Frames in a diskcache directory with a TTL (needs the diskcache package)"""
+
+    def __init__(self, directory: str, ttl: int = DEFAULT_BACKEND_TTL):
+        import diskcache
+        self.cache = diskcache.Cache(directory)
+        self.ttl = ttl
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        return self.cache.get(key)
+
+    def set(self, key: str, df: pd.DataFrame):
+        self.cache.set(key, df, expire=self.ttl)
+
+
+def backend_from_url(url: Optional[str]):
+    if not url:
+        return None
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisBackend(url)
+    return DiskBackend(url)
+
+
+class FrameStore:
+    """Process-local LRU of DataFrames, optionally backed by a shared store"""
+
+    def __init__(self, max_items: int = DEFAULT_MAX_ITEMS, max_bytes: int = DEFAULT_MAX_BYTES,
+                 backend=None):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.backend = backend
+        self.frames: 'OrderedDict[str, Tuple[pd.DataFrame, int]]' = OrderedDict()
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def make_key(dataset_id: str, version: Any) -> str:
+        return f"{dataset_id}@{version}"
+
+    def _remember(self, key: str, df: pd.DataFrame):
+        size = frame_bytes(df)
+        with self.lock:
+            old = self.frames.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            self.frames[key] = (df, size)
+            self.total_bytes += size
+            # Evict least recently used, but always keep the newest frame
+            while len(self.frames) > 1 and (len(self.frames) > self.max_items or
+                                            self.total_bytes > self.max_bytes):
+                _, (_, evicted) = self.frames.popitem(last=False)
+                self.total_bytes -= evicted
+
+    def put(self, df: pd.DataFrame, dataset_id: Optional[str] = None, version: Any = None) -> str:
+        """Store a frame; returns its key (dataset_id and version default to fresh ids)"""
+        key = self.make_key(dataset_id or uuid.uuid4().hex, version if version is not None else uuid.uuid4().hex[:12])
+        self._remember(key, df)
+        if self.backend is not None:
+            try:
+                self.backend.set(key, df)
+            except Exception as e:
+                print(f"Frame store backend write failed for {key}: {e}")
+        return key
+
+    def get(self, key: Optional[str]) -> Optional[pd.DataFrame]:
+        """The frame for a key, or None if unknown or evicted everywhere"""
+        if not key:
+            return None
+        with self.lock:
+            entry = self.frames.get(key)
+            if entry is not None:
+                self.frames.move_to_end(key)
+                return entry[0]
+        if self.backend is None:
+            return None
+        try:
+            df = self.backend.get(key)
+        except Exception as e:
+            print(f"Frame store backend read failed for {key}: {e}")
+            return None
+        if df is not None:
+            self._remember(key, df)
+        return df
+
+
+_store: Optional[FrameStore] = None
+_store_lock = threading.Lock()
+
+
+def frame_store() -> FrameStore:
+    """The process-wide store (backend from the FRAME_STORE_URL environment variable)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = FrameStore(backend=backend_from_url(os.environ.get('FRAME_STORE_URL')))
+        return _store
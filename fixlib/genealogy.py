@@ -0,0 +1,141 @@
+"""
+Order genealogy: cancel/replace chains over ClOrdID (11) -> OrigClOrdID (41) links.
+
+Links are collected in one pass into a reverse index (child -> OrigClOrdID) and
+a forward index (parent -> children). resolve() then walks every tree once with
+an iterative DFS, so root, depth and the full chain of any ClOrdID are O(1)
+lookups afterwards. Cycles (bad data, reused ClOrdIDs) are broken instead of
+looping forever.
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class Genealogy:
+    """Forward/reverse ClOrdID indexes with linear-time chain resolution"""
+
+    def __init__(self):
+        self.nodes: Dict[str, None] = {}                      # first-seen order
+        self.parent: Dict[str, str] = {}                      # child -> OrigClOrdID
+        self.children: Dict[str, List[str]] = defaultdict(list)  # parent -> children
+        self.edges: Dict[Tuple[str, str], Any] = {}           # (parent, child) -> first payload
+        self._root: Optional[Dict[str, str]] = None
+        self._depth: Dict[str, int] = {}
+        self._chains: Dict[str, List[str]] = {}
+
+    @classmethod
+    def from_parent_map(cls, parent_child_map: Dict[str, str]) -> 'Genealogy':
+        """Build from an existing child -> parent dict"""
+        genealogy = cls()
+        for child, parent in parent_child_map.items():
+            genealogy.add(child, parent)
+        return genealogy
+
+    def add(self, clordid: str, orig_clordid: Optional[str] = None, payload: Any = None):
+        """
+        Record a ClOrdID and, if given, its OrigClOrdID link. The payload (e.g. the
+        message that carried the link) is kept for the first occurrence of each link.
+        The most recent OrigClOrdID of a ClOrdID wins.
+        """
+        if not clordid:
+            return
+        self.nodes.setdefault(clordid)
+        if orig_clordid and orig_clordid != clordid:
+            self.nodes.setdefault(orig_clordid)
+            edge = (orig_clordid, clordid)
+            if edge not in self.edges:
+                self.edges[edge] = payload
+                self.children[orig_clordid].append(clordid)
+            self.parent[clordid] = orig_clordid
+        self._root = None
+
+    # ------------------------------------------------------------------ resolution
+
+    def resolve(self):
+        """Compute root, depth and chain membership for every node (O(nodes + links))"""
+        root: Dict[str, str] = {}
+        depth: Dict[str, int] = {}
+        chains: Dict[str, List[str]] = {}
+
+        def walk(start: str):
+            chain = chains[start] = []
+            stack = [(start, 0)]
+            while stack:
+                node, level = stack.pop()
+                if node in root:
+                    continue
+                root[node] = start
+                depth[node] = level
+                chain.append(node)
+                # reversed so that the first recorded child is visited first
+                for child in reversed(self.children.get(node, ())):
+                    if child not in root and self.parent.get(child) == node:
+                        stack.append((child, level + 1))
+
+        for node in self.nodes:
+            if node not in self.parent:
+                walk(node)
+
+        # Whatever is left hangs off a cycle: break it at the first repeated node
+        for node in self.nodes:
+            if node in root:
+                continue
+            seen = set()
+            current = node
+            while current in self.parent and current not in seen and current not in root:
+                seen.add(current)
+                current = self.parent[current]
+            walk(current if current not in root else node)
+
+        self._root, self._depth, self._chains = root, depth, chains
+
+    def _resolved(self):
+        if self._root is None:
+            self.resolve()
+        return self._root
+
+    def root(self, clordid: str) -> str:
+        """Original ClOrdID of the chain (the id itself if it is unknown)"""
+        return self._resolved().get(clordid, clordid)
+
+    def depth(self, clordid: str) -> int:
+        """Number of amendments between the root and this ClOrdID"""
+        self._resolved()
+        return self._depth.get(clordid, 0)
+
+    def chain(self, clordid: str) -> List[str]:
+        """Every ClOrdID in the same tree, root first, depth-first in link order"""
+        root = self.root(clordid)
+        return list(self._chains.get(root, [clordid]))
+
+    def chains(self) -> Dict[str, List[str]]:
+        """root -> chain for every tree, roots in first-seen order"""
+        self._resolved()
+        return {root: list(chain) for root, chain in self._chains.items()}
+
+    def lineage(self, clordid: str) -> List[str]:
+        """Path from the root down to this ClOrdID"""
+        root = self._resolved()
+        path = [clordid]
+        current = clordid
+        while current in self.parent and current != root.get(clordid, clordid):
+            current = self.parent[current]
+            path.append(current)
+        path.reverse()
+        return path
+
+    def first_child(self, clordid: str) -> Optional[Tuple[str, Any]]:
+        """(first ClOrdID that amended this one, payload of that link) or None"""
+        for child in self.children.get(clordid, ()):
+            return child, self.edges[(clordid, child)]
+        return None
+
+    def descendants(self, clordid: str) -> Iterable[str]:
+        """First-child walk forward from a ClOrdID, stopping on cycles"""
+        seen = {clordid}
+        current = self.first_child(clordid)
+        while current is not None and current[0] not in seen:
+            seen.add(current[0])
+            yield current[0]
+            current = self.first_child(current[0])
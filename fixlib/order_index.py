@@ -0,0 +1,256 @@
+"""
+Persistent, incremental order index for FIX logs (SQLite).
+
+Every order-related message is recorded once as (file, byte offset, length)
+together with its ClOrdID, OrigClOrdID, OrderID, Account and Symbol, each of
+which is indexed. Re-indexing resumes from the last indexed offset of each
+file, so a lookup costs a few index probes plus targeted seek() reads instead
+of a rescan of every log.
+"""
+
+import os
+import sqlite3
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from fixlib.scan import iter_lines, map_file, scan_files
+from fixlib.tokenizer import FIXFields
+
+# Message types the audit tools care about
+ORDER_MSG_TYPES = ('D', '8', 'F', 'G', '9', '3')
+
+# Index column -> FIX tag
+KEY_TAGS = {
+    'clordid': '11',
+    'orig_clordid': '41',
+    'orderid': '37',
+    'account': '1',
+    'symbol': '55',
+}
+
+# Bytes compared at the head of a file to detect rotation/replacement
+HEAD_BYTES = 256
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    file_id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    head BLOB,
+    indexed_offset INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS messages (
+    file_id INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    msg_type TEXT,
+    clordid TEXT,
+    orig_clordid TEXT,
+    orderid TEXT,
+    account TEXT,
+    symbol TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_messages_clordid ON messages (clordid);
+CREATE INDEX IF NOT EXISTS ix_messages_orig_clordid ON messages (orig_clordid);
+CREATE INDEX IF NOT EXISTS ix_messages_orderid ON messages (orderid);
+CREATE INDEX IF NOT EXISTS ix_messages_account ON messages (account);
+CREATE INDEX IF NOT EXISTS ix_messages_symbol ON messages (symbol);
+CREATE INDEX IF NOT EXISTS ix_messages_file ON messages (file_id, offset);
+"""
+
+
+def _index_chunk(log_file: str, start: int, end: int) -> Tuple[str, List[Tuple]]:
+    """Collect (offset, length, msg_type, keys...) rows for one byte range (worker process)"""
+    rows = []
+    with map_file(log_file) as mm:
+        for line_start, line_end in iter_lines(mm, start, end):
+            if mm.find(b'8=FIX', line_start, line_end) < 0:
+                continue
+            fields = FIXFields(mm, line_start, line_end)
+            msg_type = fields.msg_type
+            if msg_type not in ORDER_MSG_TYPES:
+                continue
+            rows.append((line_start, line_end - line_start, msg_type) +
+                        tuple(fields.get(tag) for tag in KEY_TAGS.values()))
+    return log_file, rows
+
+
+def _same_head(head: bytes, known_head: Optional[bytes]) -> bool:
+    common = min(len(head), len(known_head or b''))
+    return head[:common] == (known_head or b'')[:common]
+
+
+class OrderIndex:
+    """SQLite-backed ClOrdID/OrigClOrdID/OrderID/Account/Symbol -> message location index"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------ indexing
+
+    def _file_state(self, path: str) -> Tuple[Optional[int], Optional[bytes], int]:
+        row = self.conn.execute(
+            'SELECT file_id, head, indexed_offset FROM files WHERE path = ?', (path,)
+        ).fetchone()
+        return row if row else (None, None, 0)
+
+    def update(self, log_files: Sequence[str], workers: Optional[int] = None) -> int:
+        """
+        Index whatever was appended to each file since the last run.
+        Files that shrank or whose first bytes changed (rotation) are re-indexed
+        from the start. A trailing line without a newline is indexed but re-read on
+        the next run, in case it was still being written. Returns new message count.
+        """
+        spans = {}
+        resume = {}
+        file_ids = {}
+        for log_file in log_files:
+            path = os.path.abspath(log_file)
+            try:
+                with map_file(path) as mm:
+                    size = len(mm)
+                    head = bytes(mm[:HEAD_BYTES])
+                    complete = mm.rfind(b'\n') + 1
+            except OSError as e:
+                print(f"Error reading file {path}: {e}")
+                continue
+
+            file_id, known_head, offset = self._file_state(path)
+            if file_id is None:
+                file_id = self.conn.execute(
+                    'INSERT INTO files (path, head, indexed_offset) VALUES (?, ?, 0)', (path, head)
+                ).lastrowid
+            elif size < offset or not _same_head(head, known_head):
+                print(f"{os.path.basename(path)} was rotated or truncated, re-indexing")
+                offset = 0
+            # Drop anything indexed past the resume point (a previously partial last line)
+            self.conn.execute('DELETE FROM messages WHERE file_id = ? AND offset >= ?', (file_id, offset))
+            self.conn.execute('UPDATE files SET head = ? WHERE file_id = ?', (head, file_id))
+
+            if size > offset:
+                spans[path] = (offset, size)
+                resume[path] = max(offset, complete)
+                file_ids[path] = file_id
+        self.conn.commit()
+
+        if not spans:
+            return 0
+
+        added = 0
+        with self.conn:
+            for path, rows in scan_files(list(spans), _index_chunk, workers=workers, spans=spans):
+                file_id = file_ids[path]
+                self.conn.executemany(
+                    'INSERT INTO messages (file_id, offset, length, msg_type, clordid, '
+                    'orig_clordid, orderid, account, symbol) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    ((file_id,) + row for row in rows)
+                )
+                added += len(rows)
+            for path, offset in resume.items():
+                self.conn.execute(
+                    'UPDATE files SET indexed_offset = ? WHERE file_id = ?', (offset, file_ids[path])
+                )
+        return added
+
+    # ------------------------------------------------------------------ lookups
+
+    @staticmethod
+    def _check_keys(criteria):
+        unknown = set(criteria) - set(KEY_TAGS)
+        if unknown:
+            raise ValueError(f"Unknown index keys: {', '.join(sorted(unknown))}")
+
+    def locate(self, **criteria: str) -> List[Tuple[str, int, int]]:
+        """
+        (path, offset, length) of every message matching all given keys, in file order.
+        Keys: clordid, orig_clordid, orderid, account, symbol.
+        """
+        self._check_keys(criteria)
+        where = ' AND '.join(f'm.{key} = ?' for key in criteria) or '1'
+        return self.conn.execute(
+            'SELECT f.path, m.offset, m.length FROM messages m JOIN files f USING (file_id) '
+            f'WHERE {where} ORDER BY m.file_id, m.offset',
+            tuple(criteria.values())
+        ).fetchall()
+
+    def related_locations(self, **criteria: str) -> List[Tuple[str, int, int]]:
+        """
+        Locations of the messages matching `criteria` plus every message linked to
+        them through ClOrdID, OrigClOrdID or OrderID (the whole replace chain).
+        """
+        self._check_keys(criteria)
+        rows = self.conn.execute(
+            'SELECT clordid, orig_clordid, orderid FROM messages WHERE ' +
+            (' AND '.join(f'{key} = ?' for key in criteria) or '1'),
+            tuple(criteria.values())
+        ).fetchall()
+        clordids: Set[str] = set()
+        orderids: Set[str] = set()
+        for clordid, orig, orderid in rows:
+            clordids.update(v for v in (clordid, orig) if v)
+            if orderid:
+                orderids.add(orderid)
+
+        # Expand until closed; each round is one probe per index
+        frontier_cl, frontier_ord = set(clordids), set(orderids)
+        while frontier_cl or frontier_ord:
+            new_cl, new_ord = set(), set()
+            for clordid, orig, orderid in self._linked(frontier_cl, frontier_ord):
+                for value in (clordid, orig):
+                    if value and value not in clordids:
+                        clordids.add(value)
+                        new_cl.add(value)
+                if orderid and orderid not in orderids:
+                    orderids.add(orderid)
+                    new_ord.add(orderid)
+            frontier_cl, frontier_ord = new_cl, new_ord
+
+        return self._locations(clordids, orderids)
+
+    def _in_query(self, select: str, clordids: Iterable[str], orderids: Iterable[str]):
+        self.conn.execute('CREATE TEMP TABLE IF NOT EXISTS q_cl (v TEXT PRIMARY KEY)')
+        self.conn.execute('CREATE TEMP TABLE IF NOT EXISTS q_ord (v TEXT PRIMARY KEY)')
+        self.conn.execute('DELETE FROM q_cl')
+        self.conn.execute('DELETE FROM q_ord')
+        self.conn.executemany('INSERT OR IGNORE INTO q_cl VALUES (?)', ((v,) for v in clordids))
+        self.conn.executemany('INSERT OR IGNORE INTO q_ord VALUES (?)', ((v,) for v in orderids))
+        return self.conn.execute(
+            f'{select} WHERE m.clordid IN (SELECT v FROM q_cl) '
+            'OR m.orig_clordid IN (SELECT v FROM q_cl) '
+            'OR m.orderid IN (SELECT v FROM q_ord)'
+        ).fetchall()
+
+    def _linked(self, clordids, orderids):
+        return self._in_query('SELECT m.clordid, m.orig_clordid, m.orderid FROM messages m',
+                              clordids, orderids)
+
+    def _locations(self, clordids, orderids) -> List[Tuple[str, int, int]]:
+        rows = self._in_query(
+            'SELECT f.path, m.offset, m.length, m.file_id FROM messages m JOIN files f USING (file_id)',
+            clordids, orderids)
+        rows.sort(key=lambda r: (r[3], r[1]))
+        return [(path, offset, length) for path, offset, length, _ in rows]
+
+
+def read_messages(locations: Iterable[Tuple[str, int, int]]) -> Iterator[Tuple[str, int, bytes]]:
+    """Yield (path, offset, raw line bytes) with one open handle per file"""
+    by_file: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+    for path, offset, length in locations:
+        by_file[path].append((offset, length))
+    for path, spans in by_file.items():
+        with open(path, 'rb') as f:
+            for offset, length in sorted(spans):
+                f.seek(offset)
+                yield path, offset, f.read(length)
@@ -0,0 +1,342 @@
+"""
+Server-side paging, sorting and filtering for dash_table.DataTable.
+
+A table declared with page_action/sort_action/filter_action='custom' is sent
+only the page it shows. The callback that computes the table's frame (after
+the dashboard's own search boxes and dropdowns) puts it in the frame store
+and writes the key to a dcc.Store; register_paged_table() wires the table's
+page_current, page_size, sort_by and filter_query to TablePager.page(), which
+turns the DataTable filter expression into pandas masks, sorts, and returns
+one page of records plus the total row count.
+
+The row order of recent (key, filter, sort) queries is cached, so paging
+through a result or flipping back to an earlier filter does not filter or
+sort again; the string forms of filtered columns are cached the same way.
+
+Supported filter syntax is what the DataTable filter row produces:
+"{col} op value" terms joined by "&&", with op one of = != < <= > >=,
+eq ne lt le gt ge contains datestartswith (optionally prefixed i/s for
+case-insensitive/sensitive), and "is blank" / "is nil" (or "is not ...").
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from fixlib.frame_store import FrameStore, frame_store
+from fixlib.text_index import as_text
+
+DEFAULT_MAX_QUERIES = 128
+DEFAULT_MAX_TEXT_COLUMNS = 64
+
+_TERM = re.compile(r'''
+    \{(?P<column>(?:[^}\\]|\\.)+)\}\s*
+    (?P<op>is\s+(?:not\s+)?\w+
+          |[is]?(?:eq|ne|lt|le|gt|ge|contains|datestartswith)(?=\s|$)
+          |!=|<=|>=|=|<|>)
+    \s*(?P<value>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|`[^`]*`|[^\s&|]+)?
+''', re.X)
+_AND = re.compile(r'\s*&&\s*')
+
+_SYMBOLS = {'=': 'eq', '!=': 'ne', '<': 'lt', '<=': 'le', '>': 'gt', '>=': 'ge'}
+_COMPARE = {
+    'eq': lambda s, v: s == v,
+    'ne': lambda s, v: s != v,
+    'lt': lambda s, v: s < v,
+    'le': lambda s, v: s <= v,
+    'gt': lambda s, v: s > v,
+    'ge': lambda s, v: s >= v,
+}
+
+
+def _unquote(value: Optional[str]) -> Optional[str]:
+    if value and len(value) > 1 and value[0] in '"\'`' and value[-1] == value[0]:
+        quote, value = value[0], value[1:-1]
+        if quote != '`':
+            value = re.sub(r'\\(.)', r'\1', value)
+    return value
+
+
+def parse_filter_query(query: Optional[str]) -> List[Tuple[str, str, Optional[str]]]:
+    """
+    (column, operator, value) terms of a DataTable filter_query.
+    Operators are normalised to eq/ne/lt/le/gt/ge/contains/datestartswith,
+    prefixed with 'i' when case-insensitive, or 'is blank'/'is not blank'/...
+    Raises ValueError for expressions the filter row does not produce (||, parentheses).
+    """
+    terms = []
+    query = (query or '').strip()
+    pos = 0
+    while pos < len(query):
+        match = _TERM.match(query, pos)
+        if match is None:
+            raise ValueError(f"Unsupported filter expression at: {query[pos:]!r}")
+        column = re.sub(r'\\(.)', r'\1', match.group('column'))
+        op = match.group('op')
+        if op.split()[0] == 'is':
+            op = ' '.join(op.split())
+            value = None
+        else:
+            op = _SYMBOLS.get(op, op)
+            if op[0] == 's':
+                op = op[1:]
+            value = _unquote(match.group('value'))
+        terms.append((column, op, value))
+        pos = match.end()
+        separator = _AND.match(query, pos)
+        if separator is not None and separator.end() > pos:
+            pos = separator.end()
+        elif pos < len(query) and query[pos:].strip():
+            raise ValueError(f"Unsupported filter expression at: {query[pos:]!r}")
+        else:
+            break
+    return terms
+
+
+class TablePager:
+    """Filter/sort/page stored frames with an LRU of recent query results (row positions)"""
+
+    def __init__(self, store: Optional[FrameStore] = None, max_queries: int = DEFAULT_MAX_QUERIES,
+                 max_text_columns: int = DEFAULT_MAX_TEXT_COLUMNS):
+        self.store = store
+        self.max_queries = max_queries
+        self.max_text_columns = max_text_columns
+        self.queries: 'OrderedDict[tuple, np.ndarray]' = OrderedDict()
+        self.text_columns: 'OrderedDict[tuple, pd.Series]' = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _remember(cache: OrderedDict, key, value, limit: int):
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > limit:
+            cache.popitem(last=False)
+
+    def _text(self, frame_key: str, df: pd.DataFrame, column: str, lower: bool) -> pd.Series:
+        """Column as strings (NaN -> ''), lower-cased if asked; cached per frame"""
+        cache_key = (frame_key, column, lower)
+        with self.lock:
+            text = self.text_columns.get(cache_key)
+        if text is None:
+            text = as_text(df[column])
+            if lower:
+                text = text.str.lower()
+            with self.lock:
+                self._remember(self.text_columns, cache_key, text, self.max_text_columns)
+        return text
+
+    def _term_mask(self, frame_key: str, df: pd.DataFrame, column: str, op: str,
+                   value: Optional[str]) -> pd.Series:
+        if column not in df.columns:
+            return pd.Series(False, index=df.index)
+        series = df[column]
+
+        if op.startswith('is '):
+            negate = op.startswith('is not ')
+            kind = op.split()[-1]
+            if kind == 'nil':
+                mask = series.isna()
+            elif kind == 'blank':
+                mask = series.isna() | (self._text(frame_key, df, column, False).str.strip() == '')
+            else:
+                raise ValueError(f"Unsupported filter operator: {op}")
+            return ~mask if negate else mask
+
+        if value is None:
+            return pd.Series(True, index=df.index)
+        insensitive = op[0] == 'i'
+        op = op[1:] if insensitive else op
+
+        if op == 'contains':
+            text = self._text(frame_key, df, column, insensitive)
+            return text.str.contains(value.lower() if insensitive else value, regex=False)
+        if op == 'datestartswith':
+            text = self._text(frame_key, df, column, False)
+            return text.str.startswith(value)
+        if op not in _COMPARE:
+            raise ValueError(f"Unsupported filter operator: {op}")
+
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            try:
+                return _COMPARE[op](series, float(value)).fillna(False)
+            except ValueError:
+                pass
+        text = self._text(frame_key, df, column, insensitive)
+        return _COMPARE[op](text, value.lower() if insensitive else value)
+
+    def filter_mask(self, frame_key: str, df: pd.DataFrame, filter_query: Optional[str]) -> Optional[np.ndarray]:
+        """Boolean array of the rows matching filter_query (None when nothing is filtered)"""
+        terms = parse_filter_query(filter_query)
+        if not terms:
+            return None
+        mask = np.ones(len(df), dtype=bool)
+        for column, op, value in terms:
+            mask &= self._term_mask(frame_key, df, column, op, value).to_numpy(dtype=bool)
+        return mask
+
+    @staticmethod
+    def _sort_positions(df: pd.DataFrame, positions: np.ndarray, sort_by: List[Dict]) -> np.ndarray:
+        columns = [s['column_id'] for s in sort_by if s.get('column_id') in df.columns]
+        ascending = [s.get('direction') != 'desc' for s in sort_by if s.get('column_id') in df.columns]
+        if not columns:
+            return positions
+        subset = df.iloc[positions][columns].reset_index(drop=True)
+        try:
+            order = subset.sort_values(columns, ascending=ascending, kind='stable', na_position='last').index
+        except TypeError:
+            # Mixed types in a column: sort by the text form
+            order = subset.astype(str).sort_values(columns, ascending=ascending, kind='stable').index
+        return positions[order.to_numpy()]
+
+    def rows(self, frame_key: Optional[str], filter_query: Optional[str] = None,
+             sort_by: Optional[List[Dict]] = None) -> Optional[np.ndarray]:
+        """Row positions of the stored frame matching the query, in display order (None if the key expired)"""
+        store = self.store or frame_store()
+        df = store.get(frame_key)
+        if df is None:
+            return None
+        sort_key = tuple((s.get('column_id'), s.get('direction')) for s in sort_by or [])
+        cache_key = (frame_key, (filter_query or '').strip(), sort_key)
+        with self.lock:
+            positions = self.queries.get(cache_key)
+            if positions is not None:
+                self.queries.move_to_end(cache_key)
+                return positions
+
+        try:
+            mask = self.filter_mask(frame_key, df, filter_query)
+        except ValueError as e:
+            print(f"Ignoring table filter: {e}")
+            mask = None
+        positions = np.arange(len(df)) if mask is None else np.flatnonzero(mask)
+        if sort_key:
+            positions = self._sort_positions(df, positions, sort_by)
+        with self.lock:
+            self._remember(self.queries, cache_key, positions, self.max_queries)
+        return positions
+
+    def frame(self, frame_key: Optional[str], filter_query: Optional[str] = None,
+              sort_by: Optional[List[Dict]] = None) -> Optional[pd.DataFrame]:
+        """The whole query result as a DataFrame (for exports)"""
+        positions = self.rows(frame_key, filter_query, sort_by)
+        if positions is None:
+            return None
+        return (self.store or frame_store()).get(frame_key).iloc[positions]
+
+    def page(self, frame_key: Optional[str], page_current: int = 0, page_size: int = 20,
+             sort_by: Optional[List[Dict]] = None, filter_query: Optional[str] = None) -> Tuple[List[Dict], int]:
+        """One page of the query result as records, plus the total number of matching rows"""
+        positions = self.rows(frame_key, filter_query, sort_by)
+        if positions is None:
+            return [], 0
+        df = (self.store or frame_store()).get(frame_key)
+        if df is None:
+            return [], 0
+        start = (page_current or 0) * page_size
+        return page_records(df.iloc[positions[start:start + page_size]]), len(positions)
+
+
+def page_records(df: pd.DataFrame) -> List[Dict]:
+    """Rows as JSON-ready records: timestamps to the millisecond, missing values (NaN, NaT, NA) as None"""
+    columns = {}
+    for column in df.columns:
+        series = df[column]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            series = series.dt.strftime('%Y-%m-%d %H:%M:%S.%f').str[:-3]
+        series = series.astype(object)
+        columns[column] = series.where(series.notna(), None)
+    return pd.DataFrame(columns, index=df.index).to_dict('records')
+
+
+def page_count(total: int, page_size: int) -> int:
+    """DataTable page_count for a row count (at least one page)"""
+    return max(1, -(-total // page_size))
+
+
+def page_tooltips(records: List[Dict]) -> List[Dict]:
+    """Markdown tooltip per cell for one page of records"""
+    return [
+        {column: {'value': str(value), 'type': 'markdown'} for column, value in row.items()}
+        for row in records
+    ]
+
+
+_pager: Optional[TablePager] = None
+_pager_lock = threading.Lock()
+
+
+def table_pager() -> TablePager:
+    """The process-wide pager over frame_store()"""
+    global _pager
+    with _pager_lock:
+        if _pager is None:
+            _pager = TablePager()
+        return _pager
+
+
+def register_paged_table(app, table_id: str, key_store_id: str, page_size: int = 20,
+                         tooltips: bool = False):
+    """
+    Serve a custom-paged DataTable from the frame whose key is in key_store_id.
+    The table goes back to its first page when the key or the filter changes.
+    """
+    from dash import Input, Output, callback_context
+
+    outputs = [Output(table_id, 'data'), Output(table_id, 'page_count'), Output(table_id, 'page_current')]
+    if tooltips:
+        outputs.append(Output(table_id, 'tooltip_data'))
+
+    @app.callback(
+        outputs,
+        [Input(table_id, 'page_current'),
+         Input(table_id, 'page_size'),
+         Input(table_id, 'sort_by'),
+         Input(table_id, 'filter_query'),
+         Input(key_store_id, 'data')],
+        prevent_initial_call=True
+    )
+    def update_paged_table(page_current, size, sort_by, filter_query, frame_key):
+        triggered = {t['prop_id'] for t in callback_context.triggered}
+        if triggered & {f'{table_id}.filter_query', f'{key_store_id}.data'}:
+            page_current = 0
+        size = size or page_size
+        records, total = table_pager().page(frame_key, page_current or 0, size, sort_by, filter_query)
+        result = [records, page_count(total, size), page_current or 0]
+        if tooltips:
+            result.append(page_tooltips(records))
+        return result
+
+    return update_paged_table
+
+
+def register_table_export(app, button_id: str, download_id: str, table_id: str, key_store_id: str,
+                          filename: str):
+    """
+    Download the whole filtered and sorted result of a custom-paged table.
+    Its data only holds the current page, so the DataTable's own export_format
+    would export one page; this exports from the stored frame instead.
+    The filename extension picks the format (.xlsx, else CSV).
+    """
+    from dash import Input, Output, State, dcc, no_update
+
+    @app.callback(
+        Output(download_id, 'data'),
+        Input(button_id, 'n_clicks'),
+        [State(table_id, 'filter_query'),
+         State(table_id, 'sort_by'),
+         State(key_store_id, 'data')],
+        prevent_initial_call=True
+    )
+    def export_paged_table(n_clicks, filter_query, sort_by, frame_key):
+        df = table_pager().frame(frame_key, filter_query, sort_by) if n_clicks else None
+        if df is None or df.empty:
+            return no_update
+        if filename.endswith('.xlsx'):
+            return dcc.send_data_frame(df.to_excel, filename, index=False)
+        return dcc.send_data_frame(df.to_csv, filename, index=False)
+
+    return export_paged_table
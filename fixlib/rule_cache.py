@@ -0,0 +1,200 @@
+"""
+Process-wide cache of parsed routing rule files with change detection.
+
+Each file is remembered with its mtime, size and a content hash. On load(),
+unchanged files (same mtime and size, or same hash after a touch) reuse their
+parsed form and only modified or new files are parsed again. The parsed files
+and whatever the caller compiles from them are published together as one
+immutable RuleSet by a single reference assignment, so readers holding the
+previous RuleSet never see a half-loaded table.
+
+Parsed files are also pickled to a snapshot on disk, so a fresh process (a Dash
+worker restart, a CLI run) only re-stats the files instead of parsing them.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional
+
+# Snapshot location; override with the RULE_CACHE_DIR environment variable
+DEFAULT_SNAPSHOT_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'sw_rules')
+
+# Marks a cache entry whose file changed since it was parsed
+_STALE = object()
+
+
+def _digest(path: str) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+class RuleSet:
+    """Immutable snapshot: path -> parsed file (load order) plus the compiled rules"""
+
+    __slots__ = ('files', 'compiled', 'version')
+
+    def __init__(self, files: Dict[str, Any], compiled: Any, version: int):
+        self.files = files
+        self.compiled = compiled
+        self.version = version
+
+
+class RuleFileCache:
+    """
+    Parsed-file cache for one rule file format.
+    All loads through one cache must use the same parse_file (the cache name
+    identifies the format); format_version invalidates older snapshots.
+    """
+
+    def __init__(self, name: str, format_version: int = 1, snapshot_dir: Optional[str] = None):
+        self.name = name
+        self.format_version = format_version
+        snapshot_dir = snapshot_dir or os.environ.get('RULE_CACHE_DIR', DEFAULT_SNAPSHOT_DIR)
+        self.snapshot_path = os.path.join(snapshot_dir, f'{name}.pkl') if snapshot_dir else None
+        self.entries: Dict[str, tuple] = {}   # path -> (mtime_ns, size, digest, parsed)
+        self.rule_sets: Dict[tuple, RuleSet] = {}   # file list -> latest RuleSet
+        self.checked_at: Dict[tuple, float] = {}
+        self.dirty = False                           # entries differ from the snapshot
+        self.lock = threading.Lock()
+        self._read_snapshot()
+
+    # ------------------------------------------------------------------ snapshot
+
+    def _read_snapshot(self):
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                version, entries = pickle.load(f)
+            if version == self.format_version:
+                self.entries = entries
+        except Exception as e:
+            print(f"Ignoring rule cache snapshot {self.snapshot_path}: {e}")
+
+    def _write_snapshot(self):
+        if not self.snapshot_path:
+            return
+        try:
+            directory = os.path.dirname(self.snapshot_path)
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((self.format_version, self.entries), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.snapshot_path)
+        except Exception as e:
+            print(f"Could not write rule cache snapshot {self.snapshot_path}: {e}")
+
+    # ------------------------------------------------------------------ loading
+
+    def _lookup(self, path: str):
+        """(stat, digest, parsed) for one file; parsed is _STALE if its content changed"""
+        st = os.stat(path)
+        entry = self.entries.get(path)
+        if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            return st, entry[2], entry[3]
+        digest = _digest(path)
+        if entry and entry[2] == digest:
+            # Touched but identical
+            self.entries[path] = (st.st_mtime_ns, st.st_size, digest, entry[3])
+            self.dirty = True
+            return st, digest, entry[3]
+        return st, digest, _STALE
+
+    @staticmethod
+    def _parse_stale(paths, parse_file: Callable[[str], Any], workers: int):
+        """path -> parsed (or the OSError reading it), in a thread pool when workers > 1"""
+        def parse(path):
+            try:
+                return parse_file(path)
+            except OSError as e:
+                return e
+        if workers > 1 and len(paths) > 1:
+            with ThreadPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+                return dict(zip(paths, pool.map(parse, paths)))
+        return {path: parse(path) for path in paths}
+
+    def load(self, paths: Iterable[str], parse_file: Callable[[str], Any],
+             compile_rules: Optional[Callable[[Dict[str, Any]], Any]] = None,
+             max_age: float = 0.0, workers: int = 1) -> RuleSet:
+        """
+        Current RuleSet for this list of files, re-parsing only files that changed.
+
+        parse_file    -- path -> parsed rules (must be picklable)
+        compile_rules -- {path: parsed} -> compiled structure, run only when something changed
+        max_age       -- skip the file checks if the last one is younger than this (seconds)
+        workers       -- parse changed files in a thread pool of this size
+        """
+        key = tuple(os.path.abspath(p) for p in paths)
+        current = self.rule_sets.get(key)
+        if current is not None and max_age and time.monotonic() - self.checked_at.get(key, 0) < max_age:
+            return current
+
+        with self.lock:
+            current = self.rule_sets.get(key)
+            found = {}
+            stale = {}
+            changed = current is None
+            for path in key:
+                try:
+                    st, digest, parsed = self._lookup(path)
+                except OSError as e:
+                    self._drop(path, e)
+                    changed = changed or (current is not None and path in current.files)
+                    continue
+                if parsed is _STALE:
+                    stale[path] = (st, digest)
+                else:
+                    found[path] = parsed
+
+            parsed_stale = self._parse_stale(list(stale), parse_file, workers)
+            files = {}
+            for path in key:
+                if path in found:
+                    files[path] = found[path]
+                elif path in stale:
+                    parsed = parsed_stale[path]
+                    if isinstance(parsed, OSError):
+                        self._drop(path, parsed)
+                        changed = changed or (current is not None and path in current.files)
+                        continue
+                    st, digest = stale[path]
+                    files[path] = parsed
+                    self.entries[path] = (st.st_mtime_ns, st.st_size, digest, parsed)
+                    self.dirty = True
+                    changed = True
+            self.checked_at[key] = time.monotonic()
+
+            if changed:
+                compiled = compile_rules(files) if compile_rules else None
+                version = current.version + 1 if current else 1
+                # Publish parsed files and compiled rules in one assignment
+                current = self.rule_sets[key] = RuleSet(files, compiled, version)
+            if self.dirty:
+                self._write_snapshot()
+                self.dirty = False
+            return current
+
+    def _drop(self, path: str, error: OSError):
+        print(f"Error reading rule file {path}: {error}")
+        self.dirty = self.entries.pop(path, None) is not None or self.dirty
+
+
+_caches: Dict[str, RuleFileCache] = {}
+_caches_lock = threading.Lock()
+
+
+def rule_cache(name: str, format_version: int = 1) -> RuleFileCache:
+    """The process-wide cache for a rule file format"""
+    with _caches_lock:
+        cache = _caches.get(name)
+        if cache is None or cache.format_version != format_version:
+            cache = _caches[name] = RuleFileCache(name, format_version)
+        return cache
@@ -0,0 +1,148 @@
+"""
+Vectorized first-match routing of order DataFrames (pandas).
+
+Routing rules are grouped by shape: which columns a rule pins to a literal,
+which it matches with a pattern (200xxxxx) and which it leaves open. For each
+shape the distinct order keys are hash-joined to the rules on the literal
+columns, pattern columns are filtered with vectorized regex masks, and the
+lowest rule position per order wins. The only Python-level loops are over rule
+shapes and distinct patterns, never over orders.
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+# Condition values that match anything
+WILDCARDS = frozenset(('', '*'))
+
+# pattern_regex(column, value) -> regex for values that are patterns, None for literals
+PatternRegex = Callable[[str, str], Optional[str]]
+
+NO_MATCH = -1
+
+
+def _as_text(series: pd.Series) -> pd.Series:
+    """Strings with None for missing values (object dtype, so None never equals a literal)"""
+    return series.astype(object).where(series.notna(), None).map(
+        lambda v: v if v is None or isinstance(v, str) else str(v))
+
+
+def _rule_shapes(rules: pd.DataFrame, columns: Sequence[str], wildcards,
+                 pattern_regex: Optional[PatternRegex]) -> pd.Series:
+    """Per rule, one character per column: 'x' literal, 'p' pattern, '-' open"""
+    shape = pd.Series('', index=rules.index, dtype=object)
+    for column in columns:
+        values = rules[column]
+        kind = pd.Series('x', index=rules.index, dtype=object)
+        kind[values.isna() | values.isin(list(wildcards))] = '-'
+        if pattern_regex is not None:
+            literal = kind == 'x'
+            is_pattern = values[literal].map(lambda v: pattern_regex(column, v) is not None).astype(bool)
+            kind[is_pattern[is_pattern].index] = 'p'
+        shape = shape + kind
+    return shape
+
+
+def first_match(rules: pd.DataFrame, orders: pd.DataFrame, columns: Sequence[str],
+                pattern_regex: Optional[PatternRegex] = None,
+                wildcards: Iterable[str] = WILDCARDS,
+                optional_columns: Iterable[str] = ()) -> pd.Series:
+    """
+    Position (0-based row number in `rules`) of the first rule matching each order,
+    NO_MATCH where nothing matches; aligned with orders.index.
+
+    rules            -- one rule per row, in priority order, one column per condition
+    orders           -- one order per row with the same condition columns (missing
+                        columns count as missing values)
+    pattern_regex    -- regex (matched at the start of the value) for pattern conditions
+    optional_columns -- columns whose condition is skipped when the order has no value;
+                        on the others a missing value only matches an open condition
+    """
+    wildcards = frozenset(wildcards)
+    optional_columns = [c for c in optional_columns if c in columns]
+    rules = pd.DataFrame({c: _as_text(rules[c]) if c in rules.columns else None for c in columns})
+    rules['_pos'] = range(len(rules))
+    keys = pd.DataFrame(
+        {c: _as_text(orders[c]) if c in orders.columns else pd.Series(None, index=orders.index, dtype=object)
+         for c in columns},
+        index=orders.index)
+
+    # Route each distinct combination of condition values once
+    key_ids = keys.groupby(list(columns), dropna=False, sort=False).ngroup() if columns else \
+        pd.Series(0, index=orders.index)
+    uniq = keys.assign(_key=key_ids.values).drop_duplicates('_key').reset_index(drop=True)
+
+    matched: List[pd.DataFrame] = []
+    shapes = _rule_shapes(rules, columns, wildcards, pattern_regex)
+    # Which optional columns each distinct key is missing, one '0'/'1' per column
+    missing_optional = pd.Series('', index=uniq.index, dtype=object)
+    for column in optional_columns:
+        missing_optional = missing_optional + uniq[column].isna().map({True: '1', False: '0'})
+
+    for shape, shape_rules in rules.groupby(shapes, sort=False):
+        for missing, shape_keys in uniq.groupby(missing_optional, sort=False):
+            skipped = {c for c, flag in zip(optional_columns, missing) if flag == '1'}
+            literal_cols = [c for c, kind in zip(columns, shape) if kind == 'x' and c not in skipped]
+            pattern_cols = [c for c, kind in zip(columns, shape) if kind == 'p' and c not in skipped]
+            matched.append(_join_shape(shape_keys, shape_rules, literal_cols, pattern_cols, pattern_regex))
+
+    if matched:
+        best = pd.concat(matched, ignore_index=True).groupby('_key')['_pos'].min()
+    else:
+        best = pd.Series(dtype='int64')
+    positions = key_ids.map(best).fillna(NO_MATCH).astype('int64')
+    positions.index = orders.index
+    return positions
+
+
+def _join_shape(keys: pd.DataFrame, rules: pd.DataFrame, literal_cols: List[str],
+                pattern_cols: List[str], pattern_regex: Optional[PatternRegex]) -> pd.DataFrame:
+    """(_key, _pos) pairs for one rule shape"""
+    if not literal_cols and not pattern_cols:
+        # Open on every column: the first such rule matches every order
+        return pd.DataFrame({'_key': keys['_key'].values, '_pos': rules['_pos'].min()})
+
+    rule_side = rules[['_pos'] + literal_cols + pattern_cols].rename(
+        columns={c: f'{c}_rule' for c in pattern_cols})
+    order_side = keys[['_key'] + literal_cols + pattern_cols]
+    if literal_cols:
+        pairs = order_side.merge(rule_side, on=literal_cols, how='inner')
+    else:
+        pairs = order_side.merge(rule_side, how='cross')
+
+    for column in pattern_cols:
+        if pairs.empty:
+            break
+        keep = pd.Series(False, index=pairs.index)
+        values = pairs[column]
+        for pattern, group in pairs.groupby(f'{column}_rule', sort=False).groups.items():
+            regex = pattern_regex(column, pattern)
+            keep[group] = values[group].str.match(regex, na=False)
+        pairs = pairs[keep]
+    return pairs[['_key', '_pos']]
+
+
+def diff_routes(orders: pd.DataFrame, before: pd.Series, after: pd.Series,
+                keep_columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Orders whose destination differs between two rule versions, with
+    'destination_before' / 'destination_after' columns (None = unrouted).
+    """
+    before = before.where(before.notna(), None)
+    after = after.where(after.notna(), None)
+    changed = before.astype(object).ne(after.astype(object)) & ~(before.isna() & after.isna())
+    result = orders.loc[changed, list(keep_columns) if keep_columns else orders.columns].copy()
+    result['destination_before'] = before[changed]
+    result['destination_after'] = after[changed]
+    return result
+
+
+def reroute_summary(diff: pd.DataFrame) -> pd.DataFrame:
+    """Order counts per (destination_before, destination_after) flow"""
+    if diff.empty:
+        return pd.DataFrame(columns=['destination_before', 'destination_after', 'orders'])
+    return (diff.fillna({'destination_before': '(unrouted)', 'destination_after': '(unrouted)'})
+                .groupby(['destination_before', 'destination_after'])
+                .size().reset_index(name='orders')
+                .sort_values('orders', ascending=False, ignore_index=True))
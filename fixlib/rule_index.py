@@ -0,0 +1,222 @@
+"""
+Compiled routing-rule index for the alias_AutoRoute*.csv tables.
+
+A routing table is an ordered list of rules, each a set of column -> pattern
+conditions, where the first matching rule wins. Instead of testing every rule
+for every order, RuleIndex compiles the rules once into, per column:
+
+    exact    -- hash of literal value -> bitmask of the rules requiring it
+    free     -- bitmask of the rules that do not constrain the column
+    patterns -- the few non-literal conditions (200xxxxx masks, ABC* prefixes),
+                compiled once, each with the bitmask of rules using it
+
+Bit i stands for rule i. Matching an order is one dict probe per column plus a
+handful of big-int ANDs, and the winner is the lowest set bit, so the priority
+order of the files is kept. Batch lookups resolve each distinct combination of
+routing values only once.
+"""
+
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Condition values that match anything
+WILDCARDS = frozenset(('', '*'))
+
+# compile_pattern(column, value) -> predicate for non-literal conditions, or None
+PatternCompiler = Callable[[str, str], Optional[Callable[[str], bool]]]
+
+
+def is_missing(value: Any) -> bool:
+    """None or NaN (pandas leaves NaN in empty CSV cells and missing frame values)"""
+    return value is None or value != value
+
+
+def _bit_ids(bits: int) -> List[int]:
+    ids = []
+    while bits:
+        low = bits & -bits
+        ids.append(low.bit_length() - 1)
+        bits ^= low
+    return ids
+
+
+class _Column:
+    __slots__ = ('exact', 'exact_ids', 'free', 'wild_ids', 'patterns')
+
+    def __init__(self, all_bits: int):
+        self.exact: Dict[str, int] = {}
+        self.exact_ids: Dict[str, List[int]] = defaultdict(list)
+        self.free = all_bits          # cleared for every rule that constrains the column
+        self.wild_ids: List[int] = []  # rules with an explicit wildcard (used for scoring)
+        self.patterns: List[Tuple[str, Callable[[str], bool], int, List[int]]] = []
+
+
+class RuleIndex:
+    """Per-column hash/bitmask index over an ordered list of routing rules"""
+
+    def __init__(self, rules: Sequence[Dict[str, Any]],
+                 compile_pattern: Optional[PatternCompiler] = None,
+                 wildcards: Iterable[str] = WILDCARDS,
+                 missing_matches: bool = False,
+                 cache_size: int = 65536):
+        """
+        rules           -- condition dicts in priority order; None/NaN values are ignored
+        compile_pattern -- returns a predicate for values that are patterns, None for literals
+        wildcards       -- condition values that match any (or no) value
+        missing_matches -- whether a condition on a field the order lacks still matches
+        """
+        self.rules = list(rules)
+        self.count = len(self.rules)
+        self.all_bits = (1 << self.count) - 1
+        self.missing_matches = missing_matches
+        self.sizes: List[int] = []
+        wildcards = frozenset(wildcards)
+
+        columns: Dict[str, _Column] = {}
+        pattern_slots: Dict[Tuple[str, str], int] = {}
+        for rule_id, rule in enumerate(self.rules):
+            bit = 1 << rule_id
+            size = 0
+            for name, value in rule.items():
+                if is_missing(value):
+                    continue
+                value = str(value)
+                size += 1
+                column = columns.get(name)
+                if column is None:
+                    column = columns[name] = _Column(self.all_bits)
+                if value in wildcards:
+                    column.wild_ids.append(rule_id)
+                    continue
+                column.free &= ~bit
+                predicate = compile_pattern(name, value) if compile_pattern else None
+                if predicate is None:
+                    column.exact[value] = column.exact.get(value, 0) | bit
+                    column.exact_ids[value].append(rule_id)
+                    continue
+                slot = pattern_slots.get((name, value))
+                if slot is None:
+                    pattern_slots[(name, value)] = len(column.patterns)
+                    column.patterns.append((value, predicate, bit, [rule_id]))
+                else:
+                    literal, predicate, mask, ids = column.patterns[slot]
+                    ids.append(rule_id)
+                    column.patterns[slot] = (literal, predicate, mask | bit, ids)
+            self.sizes.append(size)
+
+        # Columns nobody constrains never filter anything
+        self.columns = {name: col for name, col in columns.items()
+                        if col.free != self.all_bits or col.wild_ids}
+        self.column_names = tuple(self.columns)
+        self._first_for_key = lru_cache(maxsize=cache_size)(self._lowest_for_key)
+
+    # ------------------------------------------------------------------ keys
+
+    def key(self, fields: Dict[str, Any]) -> Tuple[Optional[str], ...]:
+        """The order's values for the indexed columns (None where missing)"""
+        key = []
+        for name in self.column_names:
+            value = fields.get(name)
+            key.append(None if is_missing(value) else str(value))
+        return tuple(key)
+
+    def _mask_for_key(self, key: Tuple[Optional[str], ...]) -> int:
+        bits = self.all_bits
+        for column, value in zip(self.columns.values(), key):
+            if value is None:
+                allowed = self.all_bits if self.missing_matches else column.free
+            else:
+                allowed = column.free | column.exact.get(value, 0)
+                for _, predicate, mask, _ in column.patterns:
+                    if mask & ~allowed and predicate(value):
+                        allowed |= mask
+            bits &= allowed
+            if not bits:
+                break
+        return bits
+
+    def _lowest_for_key(self, key: Tuple[Optional[str], ...]) -> Optional[int]:
+        bits = self._mask_for_key(key)
+        return (bits & -bits).bit_length() - 1 if bits else None
+
+    # ------------------------------------------------------------------ lookups
+
+    def first(self, fields: Dict[str, Any]) -> Optional[int]:
+        """Index of the highest-priority matching rule, or None"""
+        return self._first_for_key(self.key(fields))
+
+    def matches(self, fields: Dict[str, Any]) -> List[int]:
+        """Indexes of every matching rule, in priority order"""
+        return _bit_ids(self._mask_for_key(self.key(fields)))
+
+    def first_many(self, records: Iterable[Dict[str, Any]]) -> List[Optional[int]]:
+        """first() for a batch of orders; each distinct combination is resolved once"""
+        memo: Dict[Tuple, Optional[int]] = {}
+        results = []
+        for fields in records:
+            key = self.key(fields)
+            if key not in memo:
+                memo[key] = self._lowest_for_key(key)
+            results.append(memo[key])
+        return results
+
+    def match_frame(self, frame, field_columns: Optional[Dict[str, str]] = None) -> List[Optional[int]]:
+        """
+        first() for every row of a DataFrame, without building per-row dicts.
+        field_columns maps rule column -> frame column where the names differ;
+        rule columns absent from the frame count as missing fields.
+        """
+        field_columns = field_columns or {}
+        length = len(frame)
+        values = []
+        for name in self.column_names:
+            source = field_columns.get(name, name)
+            if source in frame.columns:
+                values.append([None if is_missing(v) else str(v) for v in frame[source].tolist()])
+            else:
+                values.append([None] * length)
+        memo: Dict[Tuple, Optional[int]] = {}
+        results = []
+        for key in zip(*values) if values else ((),) * length:
+            if key not in memo:
+                memo[key] = self._lowest_for_key(key)
+            results.append(memo[key])
+        return results
+
+    def best_scored(self, fields: Dict[str, Any], exact: float = 3, pattern: float = 2,
+                    wildcard: float = 1) -> Optional[Tuple[int, float]]:
+        """
+        Highest (points / (exact * conditions)) rule over the fields the order has:
+        `exact` points for a literal hit, `pattern` for a pattern hit, `wildcard`
+        for a wildcard condition on a present field. Ties go to the earlier rule.
+        Only rules sharing at least one field value with the order are visited.
+        Returns (rule index, ratio) or None.
+        """
+        points: Dict[int, float] = defaultdict(float)
+        for name, column in self.columns.items():
+            value = fields.get(name)
+            if is_missing(value):
+                continue
+            value = str(value)
+            for rule_id in column.wild_ids:
+                points[rule_id] += wildcard
+            for rule_id in column.exact_ids.get(value, ()):
+                points[rule_id] += exact
+            for literal, predicate, _, ids in column.patterns:
+                if literal == value:
+                    hit = exact
+                elif predicate(value):
+                    hit = pattern
+                else:
+                    continue
+                for rule_id in ids:
+                    points[rule_id] += hit
+
+        best = None
+        best_ratio = 0.0
+        for rule_id in sorted(points):
+            ratio = points[rule_id] / (exact * self.sizes[rule_id])
+            if ratio > best_ratio:
+                best, best_ratio = rule_id, ratio
+        return (best, best_ratio) if best is not None else None
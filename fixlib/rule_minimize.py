@@ -0,0 +1,295 @@
+"""
+Minimizer for first-match routing tables (the alias CSVs: criteria columns
+holding a literal or '*', then DESTINATION).
+
+    analysis = analyze_rules(rows, columns)
+    analysis.shadowed      row -> earlier row that already matches everything it matches
+    analysis.redundant     row -> later row that takes over its orders with the same destination
+    analysis.kept_rows()   the table without them: routes every order the same way
+    analysis.minimized     the kept rows with literal CURRENCY values merged into sets
+
+Every row is a cube: fixed values on some columns, anything on the others.
+Criteria values are open-ended (a new currency or sub id can show up at any
+time), so a row is unreachable only when one earlier row covers it on its
+own, i.e. the earlier row fixes a subset of its columns to the same values.
+That test is a hash probe per subset of the row's fixed columns (2^k probes
+for k fixed columns, k is small), which keeps the analysis linear in the
+number of rows.
+
+Removing or merging rows is checked against first-match order:
+
+    shadowed   an earlier row covers the whole row
+    redundant  the first later row covering it has the same destination, and no
+               row in between that overlaps it (outside what earlier rows take)
+               routes elsewhere; decided bottom-up, so removing every flagged
+               row at once keeps all outcomes
+    merged     a row joins an earlier row that differs only in the merge column
+               and has the same destination, if no row in between that overlaps
+               it routes elsewhere
+
+Patterns such as 200xxxxx are recognised with the routers' compile_pattern
+(column, value) -> predicate or None. A pattern cell counts as a wildcard when
+looking for rows that overlap, so conflicts are never missed, and a row with
+one is never taken as covering another row or merged.
+
+Merged sets describe the table more compactly, but RuleIndex, rule_frame and
+the routing tools match "EUR,USD" as one literal value: only kept_rows() can
+be loaded by them.
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from fixlib.rule_index import WILDCARDS, PatternCompiler, is_missing
+
+Key = Tuple[int, Tuple[str, ...]]
+
+
+def _subsets(mask: int):
+    """Every subset of a bitmask, the mask itself first and 0 last"""
+    sub = mask
+    while True:
+        yield sub
+        if not sub:
+            return
+        sub = (sub - 1) & mask
+
+
+class MinimizedRule:
+    """One row of the minimized table; the merge column may hold several values"""
+
+    __slots__ = ('conditions', 'destination', 'sources')
+
+    def __init__(self, conditions: Dict[str, Any], destination: str, sources: List[int]):
+        self.conditions = conditions   # column -> value, or sorted tuple of values for the merge column
+        self.destination = destination
+        self.sources = sources         # original row numbers, first one is the position
+
+    def row(self, separator: str = ',', wildcard: str = '*') -> Dict[str, str]:
+        """Flat dict for writing back to a CSV (merged values joined by separator)"""
+        row = {}
+        for column, value in self.conditions.items():
+            if value is None:
+                value = wildcard
+            elif isinstance(value, tuple):
+                value = separator.join(value)
+            row[column] = value
+        return row
+
+    def __repr__(self):
+        fixed = ', '.join(f'{c}={v}' for c, v in self.conditions.items() if v is not None)
+        return f'MinimizedRule({fixed or "*"} -> {self.destination}, rows={self.sources})'
+
+
+class RuleTableAnalysis:
+    """Shadowed, redundant and merged rows of one routing table"""
+
+    def __init__(self, rows: Sequence[Dict[str, Any]], columns: Sequence[str],
+                 destination: str = 'DESTINATION', merge_column: Optional[str] = 'CURRENCY',
+                 wildcards=WILDCARDS, compile_pattern: Optional[PatternCompiler] = None):
+        self.rows = rows
+        self.columns = list(columns)
+        self.destination = destination
+        self.merge_column = merge_column if merge_column in self.columns else None
+        self.wildcards = frozenset(wildcards)
+
+        self.masks: List[int] = []
+        self.values: List[Tuple[str, ...]] = []    # values of the fixed columns, in column order
+        self.dests: List[str] = []
+        self.patterns: List[Dict[str, str]] = []    # column -> pattern value, left out of the cube
+        for row in rows:
+            mask, values, patterns = 0, [], {}
+            for bit, column in enumerate(self.columns):
+                value = row.get(column)
+                if is_missing(value):
+                    continue
+                value = str(value).strip()
+                if value in self.wildcards:
+                    continue
+                if compile_pattern is not None and compile_pattern(column, value) is not None:
+                    patterns[column] = value
+                    continue
+                mask |= 1 << bit
+                values.append(value)
+            self.masks.append(mask)
+            self.patterns.append(patterns)
+            self.values.append(tuple(values))
+            self.dests.append(row.get(destination))
+
+        self.shadowed: Dict[int, int] = {}
+        self.redundant: Dict[int, int] = {}
+        self.removed = [False] * len(rows)
+        self.minimized: List[MinimizedRule] = []
+
+        self._first: Dict[Key, int] = {}          # exact cube -> first row with it
+        self._overlap: Dict[int, Dict[int, Dict[Tuple[str, ...], List[int]]]] = {}
+        self._find_shadowed()
+        self._index_overlaps()
+        self._find_redundant()
+        self._merge()
+
+    # ------------------------------------------------------------------ cubes
+
+    def _project(self, mask: int, values: Tuple[str, ...], sub: int) -> Tuple[str, ...]:
+        """Values of `mask` restricted to the columns of `sub` (a subset of mask)"""
+        if sub == mask:
+            return values
+        out = []
+        i = 0
+        bit = 1
+        while bit <= mask:
+            if mask & bit:
+                if sub & bit:
+                    out.append(values[i])
+                i += 1
+            bit <<= 1
+        return tuple(out)
+
+    def _combine(self, row: int, other: int) -> Tuple[int, Tuple[str, ...]]:
+        """Intersection cube of two overlapping rows"""
+        mask = self.masks[row] | self.masks[other]
+        mine = dict(zip(self._bits(self.masks[row]), self.values[row]))
+        mine.update(zip(self._bits(self.masks[other]), self.values[other]))
+        return mask, tuple(mine[bit] for bit in self._bits(mask))
+
+    @staticmethod
+    def _bits(mask: int) -> List[int]:
+        bits = []
+        bit = 1
+        while bit <= mask:
+            if mask & bit:
+                bits.append(bit)
+            bit <<= 1
+        return bits
+
+    def _first_cover(self, mask: int, values: Tuple[str, ...]) -> Optional[int]:
+        """First row covering the whole cube (its fixed columns are a subset, same values)"""
+        first = None
+        for sub in _subsets(mask):
+            row = self._first.get((sub, self._project(mask, values, sub)))
+            if row is not None and (first is None or row < first):
+                first = row
+        return first
+
+    # ------------------------------------------------------------------ passes
+
+    def _find_shadowed(self):
+        for row, (mask, values) in enumerate(zip(self.masks, self.values)):
+            cover = self._first_cover(mask, values)
+            if cover is not None:
+                self.shadowed[row] = cover
+                self.removed[row] = True
+            if not self.patterns[row]:
+                # A pattern row matches less than its cube, so it covers nothing
+                self._first.setdefault((mask, values), row)
+
+    def _index_overlaps(self):
+        """signature -> fixed sub-signature -> projected values -> rows (ascending)"""
+        for row, (mask, values) in enumerate(zip(self.masks, self.values)):
+            if self.removed[row]:
+                continue
+            by_sub = self._overlap.setdefault(mask, {})
+            for sub in _subsets(mask):
+                by_sub.setdefault(sub, {}).setdefault(self._project(mask, values, sub), []).append(row)
+
+    def _conflict(self, row: int, lo: int, hi: int) -> bool:
+        """
+        True if a kept row strictly between lo and hi overlaps `row` and routes
+        elsewhere, on orders that no row before lo takes first.
+        """
+        mask, values, dest = self.masks[row], self.values[row], self.dests[row]
+        for signature, by_sub in self._overlap.items():
+            sub = signature & mask
+            rows = by_sub[sub].get(self._project(mask, values, sub))
+            if not rows:
+                continue
+            for i in range(bisect_right(rows, lo), bisect_left(rows, hi)):
+                other = rows[i]
+                if self.removed[other] or self.dests[other] == dest:
+                    continue
+                cover = self._first_cover(*self._combine(row, other))
+                if cover is not None and cover < lo and not self.removed[cover]:
+                    continue
+                return True
+        return False
+
+    def _find_redundant(self):
+        nearest: Dict[Key, int] = {}     # cube -> closest kept row after the current one
+        for row in range(len(self.rows) - 1, -1, -1):
+            if self.removed[row]:
+                continue
+            mask, values = self.masks[row], self.values[row]
+            fallback = None
+            for sub in _subsets(mask):
+                later = nearest.get((sub, self._project(mask, values, sub)))
+                if later is not None and (fallback is None or later < fallback):
+                    fallback = later
+            if (fallback is not None and self.dests[fallback] == self.dests[row]
+                    and not self._conflict(row, row, fallback)):
+                self.redundant[row] = fallback
+                self.removed[row] = True
+            elif not self.patterns[row]:
+                nearest[(mask, values)] = row
+
+    def _merge(self):
+        merge_bit = 1 << self.columns.index(self.merge_column) if self.merge_column else 0
+        open_groups: Dict[Tuple, MinimizedRule] = {}
+        for row in range(len(self.rows)):
+            if self.removed[row]:
+                continue
+            mask, values = self.masks[row], self.values[row]
+            conditions = dict.fromkeys(self.columns)
+            conditions.update(zip((self.columns[b.bit_length() - 1] for b in self._bits(mask)), values))
+            conditions.update(self.patterns[row])
+            if not mask & merge_bit or self.patterns[row]:
+                self.minimized.append(MinimizedRule(conditions, self.dests[row], [row]))
+                continue
+            value = conditions[self.merge_column]
+            group_key = (mask, self._project(mask, values, mask & ~merge_bit), self.dests[row])
+            group = open_groups.get(group_key)
+            if group is not None and not self._conflict(row, group.sources[0], row):
+                if value not in group.conditions[self.merge_column]:
+                    group.conditions[self.merge_column] += (value,)
+                group.sources.append(row)
+                continue
+            conditions[self.merge_column] = (value,)
+            group = open_groups[group_key] = MinimizedRule(conditions, self.dests[row], [row])
+            self.minimized.append(group)
+        for rule in self.minimized:
+            values = rule.conditions.get(self.merge_column)
+            if isinstance(values, tuple):
+                rule.conditions[self.merge_column] = values[0] if len(values) == 1 else tuple(sorted(values))
+
+    # ------------------------------------------------------------------ results
+
+    def kept_rows(self) -> List[Dict[str, Any]]:
+        """The original rows minus shadowed and redundant ones (same outcomes, unmerged)"""
+        return [row for i, row in enumerate(self.rows) if not self.removed[i]]
+
+    def minimized_rows(self, separator: str = ',') -> List[Dict[str, str]]:
+        """
+        Merged table as flat dicts including the destination column. The
+        routers do not expand joined sets, so this is for review, not loading.
+        """
+        return [dict(rule.row(separator), **{self.destination: rule.destination}) for rule in self.minimized]
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            'rows': len(self.rows),
+            'shadowed': len(self.shadowed),
+            'redundant': len(self.redundant),
+            'kept': len(self.rows) - len(self.shadowed) - len(self.redundant),
+            'minimized': len(self.minimized),
+        }
+
+
+def analyze_rules(rows: Sequence[Dict[str, Any]], columns: Optional[Sequence[str]] = None,
+                  destination: str = 'DESTINATION', merge_column: Optional[str] = 'CURRENCY',
+                  wildcards=WILDCARDS, compile_pattern: Optional[PatternCompiler] = None) -> RuleTableAnalysis:
+    """
+    Analyze a first-match table; columns default to every key of the first row
+    except destination. Pass the routers' compile_pattern when cells can hold patterns.
+    """
+    if columns is None:
+        columns = [c for c in (rows[0] if rows else {}) if c != destination]
+    return RuleTableAnalysis(rows, columns, destination, merge_column, wildcards, compile_pattern)
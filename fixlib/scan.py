@@ -0,0 +1,113 @@
+"""
+Memory-mapped, multi-process FIX log scanner.
+
+Each log file is memory-mapped and cut into newline-aligned byte ranges; the
+ranges are handed to a process pool and parsed independently. Callers supply a
+picklable chunk function (path, start, end) -> partial result and merge the
+partial results, which come back in file/offset order.
+"""
+
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+MIN_CHUNK_SIZE = 1024 * 1024
+MAX_CHUNK_SIZE = 64 * 1024 * 1024
+
+
+@contextmanager
+def map_file(path: str):
+    """Read-only mmap of a whole file (empty files yield b'')"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield mm
+        finally:
+            mm.close()
+
+
+def split_ranges(path: str, chunk_size: int = MAX_CHUNK_SIZE,
+                 start: int = 0, stop: Optional[int] = None) -> List[Tuple[int, int]]:
+    """Split file[start:stop] into [start, end) byte ranges that end just after a newline"""
+    ranges = []
+    with map_file(path) as mm:
+        size = len(mm) if stop is None else min(stop, len(mm))
+        while start < size:
+            end = start + chunk_size
+            if end >= size:
+                end = size
+            else:
+                newline = mm.find(b'\n', end - 1)
+                end = size if newline < 0 else newline + 1
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def iter_lines(buf, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+    """Yield (line_start, line_end) offsets in buf[start:end], without the line terminator"""
+    if end is None:
+        end = len(buf)
+    find = buf.find
+    pos = start
+    while pos < end:
+        newline = find(b'\n', pos, end)
+        next_pos = end if newline < 0 else newline + 1
+        line_end = end if newline < 0 else newline
+        if line_end > pos and buf[line_end - 1] == 13:  # '\r'
+            line_end -= 1
+        if line_end > pos:
+            yield pos, line_end
+        pos = next_pos
+
+
+def default_chunk_size(log_files: Sequence[str], workers: int) -> int:
+    """Aim for a few chunks per worker, within [MIN_CHUNK_SIZE, MAX_CHUNK_SIZE]"""
+    total = 0
+    for path in log_files:
+        try:
+            total += os.path.getsize(path)
+        except OSError:
+            continue
+    target = -(-total // max(1, workers * 4))
+    return max(MIN_CHUNK_SIZE, min(MAX_CHUNK_SIZE, target))
+
+
+def scan_files(log_files: Sequence[str], chunk_fn: Callable[[str, int, int], Any],
+               workers: Optional[int] = None, chunk_size: Optional[int] = None,
+               spans: Optional[Dict[str, Tuple[int, int]]] = None) -> List[Any]:
+    """
+    Run chunk_fn(path, start, end) over every newline-aligned range of every file.
+
+    workers    -- process count; None means os.cpu_count(), 1 runs in-process
+    chunk_size -- target bytes per range; derived from the total size if None
+    spans      -- optional path -> (start, stop) to scan only part of a file
+
+    Returns the chunk results in file/offset order. chunk_fn must be picklable
+    (a module-level function or a bound method of a picklable object).
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, workers)
+    if chunk_size is None:
+        chunk_size = default_chunk_size(log_files, workers)
+
+    tasks = []
+    for path in log_files:
+        try:
+            start, stop = spans.get(path, (0, None)) if spans else (0, None)
+            tasks.extend((path, s, e) for s, e in split_ranges(path, chunk_size, start, stop))
+        except (OSError, ValueError) as e:
+            print(f"Error reading file {path}: {e}")
+
+    if workers == 1 or len(tasks) <= 1:
+        return [chunk_fn(*task) for task in tasks]
+
+    paths, starts, ends = zip(*tasks)
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+        return list(pool.map(chunk_fn, paths, starts, ends))
@@ -0,0 +1,230 @@
+"""
+Ullink session configuration (.ini) ingestion.
+
+Every session .ini goes through the shared rule cache: it is parsed once
+(changed files in a thread pool) and again only after its mtime, size or
+content changes, and the parsed form is kept in the on-disk snapshot, so a
+directory of a few thousand sessions costs one stat per file when nothing
+changed.
+
+    rule_set = load_session_files(find_session_files('conf/sessions'))
+    grouped = group_sessions(rule_set.files)         # category -> session -> section -> key -> value
+    write_grouped_sessions(grouped, 'grouped_sessions.json')
+    df = session_table(grouped)                      # one row per session, section_key columns
+    df = resolve_placeholders(df, properties)        # ${key} -> property value
+    df['Start Time'] = map_distinct(df['timers/doStart_trigger'], parse_cron)
+"""
+
+import configparser
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from fixlib.rule_cache import RuleSet, rule_cache
+
+DEFAULT_CATEGORIES = ('client', 'DROP_COPY')
+# Parsing is mostly file I/O on shared config mounts, so threads keep up
+DEFAULT_WORKERS = min(16, (os.cpu_count() or 1) + 4)
+
+_PLACEHOLDER = re.compile(r'\$\{([^}]*)\}')
+
+
+def convert_value(value: str):
+    """int, then float, else the string itself"""
+    try:
+        return int(value)
+    except ValueError:
+        try:
+            return float(value)
+        except ValueError:
+            return value
+
+
+class SessionFile:
+    """Parsed sections of one .ini (DEFAULT values included in every section)"""
+
+    __slots__ = ('name', 'sections', 'defaults', 'error')
+
+    def __init__(self, name: str, sections: Dict[str, Dict[str, Any]], defaults: Dict[str, Any],
+                 error: Optional[str] = None):
+        self.name = name
+        self.sections = sections
+        self.defaults = defaults
+        self.error = error          # why the file could not be parsed, sections are empty then
+
+    @property
+    def stem(self) -> str:
+        return os.path.splitext(self.name)[0]
+
+    @property
+    def category(self):
+        """'category' value of the last section that has one"""
+        category = None
+        for values in self.sections.values():
+            if 'category' in values:
+                category = values['category']
+        return category
+
+
+def parse_session_file(path: str, convert_numbers: bool = True, case_sensitive: bool = False) -> SessionFile:
+    name = os.path.basename(path)
+    config = configparser.ConfigParser()
+    if case_sensitive:
+        config.optionxform = str
+    try:
+        with open(path, 'r', encoding='utf-8') as ini_file:
+            config.read_file(ini_file)
+    except (configparser.Error, UnicodeDecodeError) as e:
+        return SessionFile(name, {}, {}, str(e))
+    convert = convert_value if convert_numbers else str
+    sections = {section: {key: convert(value) for key, value in config.items(section)}
+                for section in config.sections()}
+    defaults = {key: convert(value) for key, value in config.defaults().items()}
+    return SessionFile(name, sections, defaults)
+
+
+def find_session_files(directory: str, patterns: Iterable[str] = ('*.ini',)) -> List[str]:
+    """Sorted session files of a directory"""
+    paths = set()
+    for pattern in patterns:
+        paths.update(str(p) for p in Path(directory).glob(pattern))
+    return sorted(paths)
+
+
+def load_session_files(paths: Iterable[str], convert_numbers: bool = True, case_sensitive: bool = False,
+                       workers: int = DEFAULT_WORKERS, max_age: float = 0.0) -> RuleSet:
+    """RuleSet whose .files maps each path to its SessionFile, re-parsing only changed files"""
+    name = f"session_ini{'_num' if convert_numbers else ''}{'_cs' if case_sensitive else ''}"
+    return rule_cache(name).load(
+        paths, lambda path: parse_session_file(path, convert_numbers, case_sensitive),
+        max_age=max_age, workers=workers)
+
+
+def group_sessions(files: Dict[str, SessionFile],
+                   categories: Iterable[str] = DEFAULT_CATEGORIES) -> Dict[Any, Dict[str, Dict]]:
+    """
+    category -> session name -> sections. Unknown categories get their own
+    group; files without a category or that failed to parse are left out.
+    """
+    grouped: Dict[Any, Dict[str, Dict]] = {category: {} for category in categories}
+    for session in files.values():
+        category = session.category
+        if session.error is None and category is not None:
+            grouped.setdefault(category, {})[session.stem] = session.sections
+    return grouped
+
+
+def write_grouped_sessions(grouped: Dict, output_file: str) -> bool:
+    """Write the grouped sessions as JSON; False (nothing written) if the file already holds them"""
+    text = json.dumps(grouped, indent=2)
+    try:
+        with open(output_file, 'r') as f:
+            if f.read() == text:
+                return False
+    except (OSError, UnicodeDecodeError):
+        pass
+    tmp_path = f'{output_file}.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+    os.replace(tmp_path, output_file)
+    return True
+
+
+def session_table(grouped: Dict[str, Any], sep: str = '_') -> pd.DataFrame:
+    """
+    One row per session with 'section<sep>key' columns and a category column,
+    from a single json_normalize over every category. A category may hold a
+    list of session dicts or a {session name: sections} dict.
+    """
+    records: List[Dict] = []
+    categories: List[Any] = []
+    for category, sessions in grouped.items():
+        if isinstance(sessions, dict):
+            sessions = sessions.values()
+        elif not isinstance(sessions, list):
+            continue
+        for session in sessions:
+            records.append(session)
+            categories.append(category)
+    df = pd.json_normalize(records, sep=sep)
+    df['category'] = categories
+    return df
+
+
+# ------------------------------------------------------------------ enrichment
+
+class PropertyResolver:
+    """
+    Resolves ${key} placeholders against a properties dict (keys given bare or
+    as '${key}'); unknown placeholders are kept. Each distinct value is
+    resolved once.
+
+    whole_values -- also replace a value that is itself a property key, like
+                    DataFrame.replace(properties)
+    """
+
+    __slots__ = ('properties', 'whole_values', '_memo')
+
+    def __init__(self, properties: Dict[str, Any], whole_values: bool = False):
+        self.properties = properties
+        self.whole_values = whole_values
+        self._memo: Dict[str, Any] = {}
+
+    def _lookup(self, match) -> str:
+        key = match.group(1)
+        if key in self.properties:
+            return str(self.properties[key])
+        return str(self.properties.get(match.group(0), match.group(0)))
+
+    def __call__(self, value):
+        if not isinstance(value, str):
+            return value
+        if self.whole_values and value in self.properties:
+            return self.properties[value]
+        if '${' not in value:
+            return value
+        resolved = self._memo.get(value)
+        if resolved is None:
+            if value.startswith('${') and value.find('}') == len(value) - 1:
+                # the usual case, the whole value is one placeholder: keep the property as is
+                resolved = self.properties.get(value[2:-1], self.properties.get(value, value))
+            else:
+                resolved = _PLACEHOLDER.sub(self._lookup, value)
+            self._memo[value] = resolved
+        return resolved
+
+
+def map_distinct(values: pd.Series, func: Callable[[Any], Any]) -> pd.Series:
+    """values.apply(func), calling func once per distinct value (NaN included)"""
+    codes, distinct = pd.factorize(values, use_na_sentinel=False)
+    results = np.empty(len(distinct), dtype=object)
+    for i, value in enumerate(distinct):
+        results[i] = func(value)
+    return pd.Series(results[codes], index=values.index, name=values.name)
+
+
+def resolve_placeholders(df: pd.DataFrame, properties: Dict[str, Any], columns: Optional[Iterable[str]] = None,
+                         whole_values: bool = False) -> pd.DataFrame:
+    """Copy of df with the placeholders of its text columns resolved, one pass per distinct value"""
+    resolver = PropertyResolver(properties, whole_values)
+    df = df.copy()
+    for column in (df.columns if columns is None else columns):
+        series = df[column]
+        if series.dtype != object and not pd.api.types.is_string_dtype(series):
+            continue
+        changed = {}
+        for value in series.dropna().unique():
+            resolved = resolver(value)
+            if resolved is not value:
+                changed[value] = resolved
+        if changed:
+            hit = series.isin(list(changed))
+            resolved = series.astype(object)
+            resolved[hit] = series[hit].map(changed).astype(object)
+            df[column] = resolved
+    return df
@@ -0,0 +1,213 @@
+"""
+Rotation-aware tailing of Ullink log files for the live dashboards.
+
+LogTailer remembers a byte offset per file and, on each poll(), returns only
+the complete lines appended since the previous poll. A file that was renamed
+away and recreated (logrotate create) is drained before the new file is
+followed from its start; a file truncated in place (copytruncate) is re-read
+from offset 0.
+
+TailSession pairs a tailer with an incremental state object (anything with a
+feed(lines) -> delta method) so a Dash interval callback only parses new bytes.
+Sessions are kept in a process-wide registry keyed by an opaque id that the
+page holds in a dcc.Store. A session no interval has polled for
+SESSION_IDLE_SECONDS (closed tab, lost browser) is closed on the next registry
+access, and at most MAX_SESSIONS are open at once, the least recently used
+being closed first.
+
+Only files under the log root (TAIL_LOG_ROOT, default ./logs) may be
+followed; resolve_log_path maps what a user typed to a path under it.
+"""
+
+import os
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Upper bound on bytes read from one file per poll, so a first poll on a large
+# intraday log is spread over several refreshes instead of blocking one
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+# A session whose page stopped polling is closed after this long
+SESSION_IDLE_SECONDS = 300
+MAX_SESSIONS = 16
+
+
+class _FollowedFile:
+    __slots__ = ('path', 'handle', 'ident', 'offset', 'partial')
+
+    def __init__(self, path: str):
+        self.path = path
+        self.handle = None
+        self.ident = None
+        self.offset = 0
+        self.partial = b''
+
+    def open(self, from_end: bool = False) -> bool:
+        try:
+            handle = open(self.path, 'rb')
+        except OSError:
+            return False
+        st = os.fstat(handle.fileno())
+        self.handle = handle
+        self.ident = (st.st_dev, st.st_ino)
+        self.offset = st.st_size if from_end else 0
+        self.partial = b''
+        handle.seek(self.offset)
+        return True
+
+    def close(self):
+        if self.handle is not None:
+            self.handle.close()
+        self.handle = None
+        self.ident = None
+
+    def read(self, max_bytes: int) -> List[bytes]:
+        data = self.handle.read(max_bytes)
+        if not data:
+            return []
+        self.offset += len(data)
+        data = self.partial + data
+        lines = data.split(b'\n')
+        self.partial = lines.pop()
+        return lines
+
+
+class LogTailer:
+    """Follow one or more log files and return newly appended complete lines"""
+
+    def __init__(self, paths: Sequence[str], from_end: bool = False,
+                 encoding: str = 'utf-8', max_bytes: int = DEFAULT_MAX_BYTES):
+        self.encoding = encoding
+        self.max_bytes = max_bytes
+        self.files = [_FollowedFile(os.path.abspath(path)) for path in paths]
+        for followed in self.files:
+            followed.open(from_end=from_end)
+
+    def close(self):
+        for followed in self.files:
+            followed.close()
+
+    def poll(self) -> List[Tuple[str, str]]:
+        """(path, line) for every complete line appended since the last poll"""
+        new_lines = []
+        for followed in self.files:
+            for line in self._poll_file(followed):
+                new_lines.append((followed.path, line.rstrip(b'\r').decode(self.encoding, 'ignore')))
+        return new_lines
+
+    def _poll_file(self, followed: _FollowedFile) -> List[bytes]:
+        if followed.handle is None:
+            # Not there yet (or between rotate and create): pick it up from the start
+            if not followed.open():
+                return []
+
+        try:
+            st = os.stat(followed.path)
+        except OSError:
+            st = None
+
+        lines = []
+        if st is None or (st.st_dev, st.st_ino) != followed.ident:
+            # Rotated: finish the old file, then switch to the new one
+            lines.extend(followed.read(-1))
+            if followed.partial:
+                lines.append(followed.partial)
+            followed.close()
+            if st is not None and followed.open():
+                lines.extend(followed.read(self.max_bytes))
+            return lines
+
+        if st.st_size < followed.offset:
+            # Truncated in place
+            followed.handle.seek(0)
+            followed.offset = 0
+            followed.partial = b''
+
+        lines.extend(followed.read(self.max_bytes))
+        return lines
+
+
+class TailSession:
+    """A tailer plus the incremental state its lines are fed into"""
+
+    def __init__(self, paths: Sequence[str], state: Any, **tailer_options):
+        self.paths = list(paths)
+        self.tailer = LogTailer(paths, **tailer_options)
+        self.state = state
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+
+    def poll(self):
+        """Feed newly appended lines into the state; returns the state's delta"""
+        self.last_used = time.monotonic()
+        with self.lock:
+            lines = [line for _, line in self.tailer.poll()]
+            return self.state.feed(lines)
+
+    def close(self):
+        with self.lock:
+            self.tailer.close()
+
+
+def log_root() -> str:
+    return os.path.realpath(os.environ.get('TAIL_LOG_ROOT', 'logs'))
+
+
+def resolve_log_path(path: str, root: Optional[str] = None) -> Optional[str]:
+    """Real path of `path` (relative ones taken from the root), None if it is outside the root"""
+    root = os.path.realpath(root) if root else log_root()
+    resolved = os.path.realpath(os.path.join(root, os.path.expanduser(path)))
+    if os.path.commonpath([root, resolved]) != root:
+        return None
+    return resolved
+
+
+_sessions: Dict[str, TailSession] = {}
+_sessions_lock = threading.Lock()
+
+
+def _expire_sessions(keep: Optional[int] = None) -> List[TailSession]:
+    """Drop idle sessions and the least recently used beyond `keep`; caller holds _sessions_lock"""
+    keep = MAX_SESSIONS if keep is None else keep
+    cutoff = time.monotonic() - SESSION_IDLE_SECONDS
+    expired = [sid for sid, session in _sessions.items() if session.last_used < cutoff]
+    by_use = sorted((sid for sid in _sessions if sid not in expired), key=lambda sid: _sessions[sid].last_used)
+    expired.extend(by_use[:max(0, len(by_use) - keep)])
+    return [_sessions.pop(sid) for sid in expired]
+
+
+def _close_all(sessions: List[TailSession]):
+    # Outside _sessions_lock: close() waits for a poll that may be in progress
+    for session in sessions:
+        session.close()
+
+
+def open_session(paths: Sequence[str], state_factory: Callable[[], Any], **tailer_options) -> str:
+    """Start tailing `paths` into a fresh state; returns the session id"""
+    session_id = uuid.uuid4().hex
+    session = TailSession(paths, state_factory(), **tailer_options)
+    with _sessions_lock:
+        expired = _expire_sessions(MAX_SESSIONS - 1)
+        _sessions[session_id] = session
+    _close_all(expired)
+    return session_id
+
+
+def get_session(session_id: Optional[str]) -> Optional[TailSession]:
+    if not session_id:
+        return None
+    with _sessions_lock:
+        expired = _expire_sessions()
+        session = _sessions.get(session_id)
+        if session is not None:
+            session.last_used = time.monotonic()
+    _close_all(expired)
+    return session
+
+
+def close_session(session_id: Optional[str]):
+    with _sessions_lock:
+        session = _sessions.pop(session_id, None) if session_id else None
+    if session is not None:
+        session.close()
@@ -0,0 +1,242 @@
+"""
+Inverted index for the multi-term search boxes of the FIX log and account viewers.
+
+Search semantics are those of the original column scans: the text is split on
+whitespace into terms, a row matches a term if any indexed column contains it
+(case-insensitive substring), and a row must match every term.
+
+Instead of lower-casing and scanning every column for every term, each row's
+values are split into word tokens once, and the index maps token -> row ids
+plus trigram -> tokens. A word-only term is answered from the index alone:
+the tokens containing it (found through the trigrams, or by a scan of the
+vocabulary for one- and two-letter terms) give the rows. A term with
+punctuation ("35=D", "ibm.n") is narrowed by its word parts and then checked
+against the candidate rows only. Terms are ANDed by intersecting row ids.
+
+add() indexes appended rows, so a growing frame (live tail) extends its
+index instead of rebuilding it; row ids are positions in the frame.
+"""
+
+import re
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+_WORD = re.compile(r'\w+')
+_EMPTY = np.empty(0, dtype=np.int64)
+
+# Indexes kept by register_index() (one per frame store key)
+MAX_INDEXES = 64
+
+
+def text_columns(df: pd.DataFrame) -> List[str]:
+    """Columns holding text (object, string or categorical dtype)"""
+    return [col for col in df.columns
+            if pd.api.types.is_object_dtype(df[col]) or pd.api.types.is_string_dtype(df[col])
+            or isinstance(df[col].dtype, pd.CategoricalDtype)]
+
+
+def as_text(series: pd.Series) -> pd.Series:
+    """Values as strings, missing values as '' (categoricals included)"""
+    return series.astype(object).fillna('').astype(str)
+
+
+def _trigrams(token: str) -> Set[str]:
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+def scan_rows(df: pd.DataFrame, columns: Iterable[str], term: str,
+              rows: Optional[np.ndarray] = None) -> np.ndarray:
+    """Positions (within rows, or all of df) where any of the columns contains term, ignoring case"""
+    subset = df if rows is None else df.iloc[rows]
+    mask = np.zeros(len(subset), dtype=bool)
+    for col in columns:
+        if col in subset.columns:
+            mask |= as_text(subset[col]).str.lower().str.contains(term, regex=False).to_numpy(dtype=bool)
+    positions = np.flatnonzero(mask)
+    return positions if rows is None else rows[positions]
+
+
+class TextIndex:
+    """Token -> row ids and trigram -> token ids over the text columns of a frame"""
+
+    def __init__(self, columns: Optional[Iterable[str]] = None):
+        # None: index every text column of the frames passed to add()
+        self.fixed_columns = list(columns) if columns is not None else None
+        self.columns: List[str] = list(self.fixed_columns or [])
+        self.rows = 0
+        self.vocab: List[str] = []
+        self.token_ids: Dict[str, int] = {}
+        self.postings: List[array] = []
+        # trigram -> sorted token id arrays (one per add(), merged on first use)
+        self.grams: Dict[str, List[np.ndarray]] = {}
+        self.lock = threading.Lock()
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, columns: Optional[Iterable[str]] = None) -> 'TextIndex':
+        index = cls(columns)
+        index.add(df)
+        return index
+
+    def add(self, df: pd.DataFrame):
+        """Index rows appended to the frame (df holds just the new rows)"""
+        columns = [c for c in (self.fixed_columns if self.fixed_columns is not None else text_columns(df))
+                   if c in df.columns]
+        # (row id, token) pairs of all columns, tokenized by pandas rather than per cell
+        pieces = []
+        for col in columns:
+            values = pd.Series(df[col].to_numpy(), index=np.arange(self.rows, self.rows + len(df)))
+            values = values[values.notna()]
+            if len(values):
+                pieces.append(values.astype(str).str.lower().str.findall(_WORD.pattern).explode().dropna())
+        with self.lock:
+            for col in columns:
+                if col not in self.columns:
+                    self.columns.append(col)
+            if pieces:
+                self._add_pairs(pd.concat(pieces))
+            self.rows += len(df)
+
+    def _add_pairs(self, pairs: pd.Series):
+        if not len(pairs):
+            # Only blank or punctuation-only values: no tokens to index
+            return
+        codes, tokens = pd.factorize(pairs.to_numpy())
+        row_ids = pairs.index.to_numpy(dtype=np.int64)
+        order = np.lexsort((row_ids, codes))
+        codes, row_ids = codes[order], row_ids[order]
+        # Same token twice in a row (two columns, or repeated) counts once
+        keep = np.ones(len(codes), dtype=bool)
+        keep[1:] = (codes[1:] != codes[:-1]) | (row_ids[1:] != row_ids[:-1])
+        codes, row_ids = codes[keep], row_ids[keep]
+        bounds = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1], True])
+
+        first_new = len(self.vocab)
+        for code, start, end in zip(codes[bounds[:-1]].tolist(), bounds[:-1].tolist(), bounds[1:].tolist()):
+            token = tokens[code]
+            token_id = self.token_ids.get(token)
+            if token_id is None:
+                token_id = self.token_ids[token] = len(self.vocab)
+                self.vocab.append(token)
+                self.postings.append(array('q'))
+            self.postings[token_id].frombytes(row_ids[start:end].tobytes())
+        if len(self.vocab) > first_new:
+            self._add_grams(first_new)
+
+    def _add_grams(self, first_new: int):
+        """Trigram entries of the tokens from first_new on"""
+        tokens = pd.Series(self.vocab[first_new:], dtype=object)
+        token_ids = np.arange(first_new, len(self.vocab))
+        lengths = tokens.str.len().to_numpy()
+        grams, gram_token_ids = [], []
+        for k in range(int(lengths.max()) - 2):
+            long_enough = lengths >= k + 3
+            grams.append(tokens[long_enough].str.slice(k, k + 3).to_numpy())
+            gram_token_ids.append(token_ids[long_enough])
+        if not grams:
+            return
+        codes, uniques = pd.factorize(np.concatenate(grams))
+        gram_token_ids = np.concatenate(gram_token_ids)
+        order = np.argsort(codes, kind='stable')
+        codes, gram_token_ids = codes[order], gram_token_ids[order]
+        bounds = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1], True])
+        for code, start, end in zip(codes[bounds[:-1]].tolist(), bounds[:-1].tolist(), bounds[1:].tolist()):
+            self.grams.setdefault(uniques[code], []).append(np.unique(gram_token_ids[start:end]))
+
+    def _gram_tokens(self, gram: str) -> np.ndarray:
+        chunks = self.grams.get(gram)
+        if not chunks:
+            return _EMPTY
+        if len(chunks) > 1:
+            # Token ids only grow, so the chunks concatenate in order
+            chunks[:] = [np.concatenate(chunks)]
+        return chunks[0]
+
+    def _word_rows(self, word: str) -> np.ndarray:
+        """Sorted ids of rows with a token containing word"""
+        with self.lock:
+            if len(word) >= 3:
+                id_sets = sorted((self._gram_tokens(g) for g in _trigrams(word)), key=len)
+                candidates = id_sets[0]
+                for ids in id_sets[1:]:
+                    candidates = np.intersect1d(candidates, ids, assume_unique=True)
+                token_ids = [i for i in candidates.tolist() if word in self.vocab[i]]
+            else:
+                token_ids = [i for i, token in enumerate(self.vocab) if word in token]
+            if not token_ids:
+                return _EMPTY
+            if len(token_ids) == 1:
+                return np.array(self.postings[token_ids[0]], dtype=np.int64)
+            return np.unique(np.concatenate([np.array(self.postings[i], dtype=np.int64) for i in token_ids]))
+
+    def search(self, text: str, df: pd.DataFrame) -> Optional[np.ndarray]:
+        """
+        Sorted positions of the rows of df matching every term of text (None if text has no terms).
+        df is the indexed frame, or a prefix of it.
+        """
+        terms = [term.lower() for term in (text or '').split()]
+        if not terms:
+            return None
+        result = None
+        for term in terms:
+            words = _WORD.findall(term)
+            if words:
+                rows = self._word_rows(words[0])
+                for word in words[1:]:
+                    rows = np.intersect1d(rows, self._word_rows(word), assume_unique=True)
+            else:
+                rows = np.arange(min(self.rows, len(df)), dtype=np.int64)
+            if result is not None:
+                rows = np.intersect1d(result, rows, assume_unique=True)
+            rows = rows[rows < len(df)]
+            if words != [term] and len(rows):
+                # Punctuation, or several words: check the candidates themselves
+                rows = scan_rows(df, self.columns, term, rows)
+            result = rows
+            if not len(result):
+                break
+        return result
+
+
+def search_positions(df: pd.DataFrame, text: str, index: Optional[TextIndex] = None,
+                     columns: Optional[Iterable[str]] = None) -> Optional[np.ndarray]:
+    """Positions of the rows matching every term of text, from the index if there is one, else by scanning"""
+    if index is not None:
+        return index.search(text, df)
+    terms = [term.lower() for term in (text or '').split()]
+    if not terms:
+        return None
+    columns = list(columns) if columns is not None else text_columns(df)
+    rows = None
+    for term in terms:
+        rows = scan_rows(df, columns, term, rows)
+        if not len(rows):
+            break
+    return rows
+
+
+_indexes: 'OrderedDict[str, TextIndex]' = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def register_index(key: str, index: TextIndex):
+    """Keep the index of the frame stored under key (LRU of MAX_INDEXES)"""
+    with _indexes_lock:
+        _indexes[key] = index
+        _indexes.move_to_end(key)
+        while len(_indexes) > MAX_INDEXES:
+            _indexes.popitem(last=False)
+
+
+def get_index(key: Optional[str]) -> Optional[TextIndex]:
+    if not key:
+        return None
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is not None:
+            _indexes.move_to_end(key)
+        return index
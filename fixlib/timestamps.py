@@ -0,0 +1,183 @@
+"""
+Timestamp decoding for Ullink logs and FIX messages.
+
+Handles the two layouts found in the logs:
+
+    2025-09-18 09:41:30.187_326    log line prefix (millis, '_' then micros)
+    20250918-13:41:30.192          FIX UTCTimestamp, tags 52/60 (0, 3, 6 or 9 fraction digits)
+
+Every field sits at a fixed offset, so instead of strptime per value the
+bulk path copies a column of strings into a byte matrix and computes
+hours/minutes/seconds/fraction with numpy arithmetic on the digit columns.
+The date part is looked up in a per-decoder cache (a log file holds one or
+two dates), so it is parsed once per distinct date, not once per row.
+
+Use one TimestampDecoder per file or stream:
+
+    decoder = TimestampDecoder()
+    decoder.to_datetime64(values)    # bulk -> datetime64[ns] array (NaT for bad values)
+    decoder.parse(text)              # one value -> datetime or None
+    decoder.log_prefix(line)         # the timestamp a log line starts with
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+NAT = np.iinfo(np.int64).min
+NS_PER_SECOND = 1_000_000_000
+NS_PER_DAY = 86_400 * NS_PER_SECOND
+
+# Widest value decoded (log prefix with a 9-digit fraction); longer values are cut
+_WIDTH = 32
+_ZERO, _NINE = ord('0'), ord('9')
+_EPOCH = datetime(1970, 1, 1)
+# Multiplier turning an n-digit fraction into nanoseconds
+_FRACTION_SCALE = np.array([10 ** (9 - n) for n in range(10)], dtype=np.int64)
+
+# (date length, date format, offset of HH:MM:SS) per layout
+LOG_LAYOUT = (10, '%Y-%m-%d', 11)
+FIX_LAYOUT = (8, '%Y%m%d', 9)
+
+
+def _layout(text: str) -> Optional[Tuple[int, str, int]]:
+    if len(text) >= 19 and text[4] == '-':
+        return LOG_LAYOUT
+    if len(text) >= 17 and text[8] == '-':
+        return FIX_LAYOUT
+    return None
+
+
+class TimestampDecoder:
+    """Decodes log-prefix and FIX timestamps, caching the date part by its text"""
+
+    def __init__(self):
+        self.dates: Dict[str, Optional[datetime]] = {}
+
+    def _date(self, text: str, fmt: str) -> Optional[datetime]:
+        try:
+            return self.dates[text]
+        except KeyError:
+            pass
+        try:
+            date = datetime.strptime(text, fmt)
+        except ValueError:
+            date = None
+        self.dates[text] = date
+        return date
+
+    # ------------------------------------------------------------------ one value
+
+    def parse(self, text: Optional[str]) -> Optional[datetime]:
+        """One timestamp as a datetime (microsecond precision), None if it is not one"""
+        if not text:
+            return None
+        layout = _layout(text)
+        if layout is None:
+            return None
+        date_len, fmt, t = layout
+        date = self._date(text[:date_len], fmt)
+        clock = text[t:t + 8]
+        if date is None or clock[2:3] != ':' or clock[5:6] != ':':
+            return None
+        try:
+            hours, minutes, seconds = int(clock[:2]), int(clock[3:5]), int(clock[6:8])
+        except ValueError:
+            return None
+        micros = 0
+        if text[t + 8:t + 9] == '.':
+            digits = ''
+            for ch in text[t + 9:]:
+                if '0' <= ch <= '9':
+                    digits += ch
+                elif ch != '_':
+                    break
+            if digits:
+                micros = int(digits[:6].ljust(6, '0'))
+        if hours > 23 or minutes > 59 or seconds > 60:
+            return None
+        return date + timedelta(hours=hours, minutes=minutes, seconds=seconds, microseconds=micros)
+
+    def log_prefix(self, line: str) -> Optional[datetime]:
+        """The 'YYYY-MM-DD HH:MM:SS.mmm_uuu' timestamp a log line starts with"""
+        end = line.find(' ', 11)
+        return self.parse(line[:end] if end >= 0 else line)
+
+    # ------------------------------------------------------------------ bulk
+
+    def _days(self, dates: np.ndarray, date_len: int, fmt: str) -> np.ndarray:
+        """Days since the epoch per row of a (rows, date_len) byte matrix (-1 if invalid)"""
+        keys = np.ascontiguousarray(dates).view(f'S{date_len}').ravel()
+        if (keys == keys[0]).all():
+            uniques, inverse = keys[:1], np.zeros(len(keys), dtype=np.intp)
+        else:
+            uniques, inverse = np.unique(keys, return_inverse=True)
+        days = np.empty(len(uniques), dtype=np.int64)
+        for i, key in enumerate(uniques):
+            date = self._date(key.decode('ascii', 'replace'), fmt)
+            days[i] = (date - _EPOCH).days if date is not None else -1
+        return days[inverse.ravel()]
+
+    def _decode_layout(self, mat: np.ndarray, layout: Tuple[int, str, int]) -> np.ndarray:
+        """Nanoseconds since the epoch for the rows of a byte matrix in one layout (NAT if invalid)"""
+        date_len, fmt, t = layout
+        days = self._days(mat[:, :date_len], date_len, fmt)
+        clock = mat[:, t:t + 8].astype(np.int64) - _ZERO
+        digits = clock[:, [0, 1, 3, 4, 6, 7]]
+        valid = ((digits >= 0) & (digits <= 9)).all(axis=1) & (days >= 0)
+        valid &= (mat[:, t + 2] == ord(':')) & (mat[:, t + 5] == ord(':'))
+        hours, minutes = clock[:, 0] * 10 + clock[:, 1], clock[:, 3] * 10 + clock[:, 4]
+        secs = clock[:, 6] * 10 + clock[:, 7]
+        valid &= (hours <= 23) & (minutes <= 59) & (secs <= 60)
+        seconds = hours * 3600 + minutes * 60 + secs
+
+        # Fraction: digits after '.', skipping the '_' before the micros, up to 9 digits
+        fraction = np.zeros(len(mat), dtype=np.int64)
+        count = np.zeros(len(mat), dtype=np.int64)
+        active = mat[:, t + 8] == ord('.')
+        for col in range(t + 9, min(_WIDTH, t + 20)):
+            if not active.any():
+                break
+            byte = mat[:, col]
+            digit = active & (byte >= _ZERO) & (byte <= _NINE) & (count < 9)
+            fraction = np.where(digit, fraction * 10 + (byte.astype(np.int64) - _ZERO), fraction)
+            count += digit
+            active &= digit | (byte == ord('_'))
+
+        ns = days * NS_PER_DAY + seconds * NS_PER_SECOND + fraction * _FRACTION_SCALE[count]
+        return np.where(valid, ns, NAT)
+
+    def to_datetime64(self, values: Iterable) -> np.ndarray:
+        """
+        Timestamps as a datetime64[ns] array: strings in either layout are decoded
+        by fixed-offset slicing, datetimes are converted, anything else is NaT.
+        """
+        values = np.asarray(values if isinstance(values, (np.ndarray, pd.Series)) else list(values),
+                            dtype=object)
+        result = np.full(len(values), NAT, dtype=np.int64)
+        is_text = np.fromiter((isinstance(v, str) for v in values), dtype=bool, count=len(values))
+        text_rows = np.flatnonzero(is_text)
+        if len(text_rows):
+            try:
+                mat = values[text_rows].astype(f'S{_WIDTH}').view(np.uint8).reshape(-1, _WIDTH)
+            except UnicodeEncodeError:
+                # Non-ASCII junk: decode what can be decoded one at a time
+                mat = np.array([v.encode('ascii', 'replace')[:_WIDTH] for v in values[text_rows]],
+                               dtype=f'S{_WIDTH}').view(np.uint8).reshape(-1, _WIDTH)
+            log_rows = mat[:, 4] == ord('-')
+            fix_rows = ~log_rows & (mat[:, 8] == ord('-'))
+            for rows, layout in ((log_rows, LOG_LAYOUT), (fix_rows, FIX_LAYOUT)):
+                if rows.any():
+                    result[text_rows[rows]] = self._decode_layout(mat[rows], layout)
+        other_rows = np.flatnonzero(~is_text & pd.notna(values))
+        if len(other_rows):
+            converted = pd.to_datetime(pd.Series(values[other_rows]), errors='coerce')
+            result[other_rows] = converted.to_numpy(dtype='datetime64[ns]').view(np.int64)
+        return result.view('datetime64[ns]')
+
+
+def to_datetime64(values: Iterable) -> np.ndarray:
+    """Bulk decode with a throwaway decoder (see TimestampDecoder.to_datetime64)"""
+    return TimestampDecoder().to_datetime64(values)
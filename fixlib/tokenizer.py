@@ -0,0 +1,375 @@
+"""
+Shared FIX tokenizer
+Single-pass, regex-free tag=value scanner used by the log viewers and audit tools.
+
+Works on str or bytes buffers (a whole log line, a slice of a memory-mapped file, ...).
+The field delimiter (SOH, '|' or ';') is detected from the BeginString field, tags are
+located with str/bytes.find only, and enum values are decoded from the precomputed
+tables below only when a field is actually read.
+"""
+
+import mmap
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+Buffer = Union[str, bytes, bytearray, mmap.mmap]
+
+SOH = '\x01'
+DELIMITERS = ('\x01', '|', ';')
+_STR_TOKENS = ('8=FIX', '=', DELIMITERS)
+_BYTES_TOKENS = (b'8=FIX', b'=', tuple(d.encode() for d in DELIMITERS))
+
+# FIX 4.2 field names (union of the tags used by the apps in this repo)
+FIELD_NAMES = {
+    '1': 'Account',
+    '6': 'AvgPx',
+    '8': 'BeginString',
+    '9': 'BodyLength',
+    '10': 'CheckSum',
+    '11': 'ClOrdID',
+    '14': 'CumQty',
+    '15': 'Currency',
+    '17': 'ExecID',
+    '20': 'ExecTransType',
+    '21': 'HandlInst',
+    '22': 'SecurityIDSource',
+    '29': 'LastCapacity',
+    '30': 'LastMkt',
+    '31': 'LastPx',
+    '32': 'LastQty',
+    '34': 'MsgSeqNum',
+    '35': 'MsgType',
+    '37': 'OrderID',
+    '38': 'OrderQty',
+    '39': 'OrdStatus',
+    '40': 'OrdType',
+    '41': 'OrigClOrdID',
+    '44': 'Price',
+    '48': 'SecurityID',
+    '49': 'SenderCompID',
+    '50': 'SenderSubID',
+    '52': 'SendingTime',
+    '54': 'Side',
+    '55': 'Symbol',
+    '56': 'TargetCompID',
+    '57': 'TargetSubID',
+    '58': 'Text',
+    '59': 'TimeInForce',
+    '60': 'TransactTime',
+    '63': 'SettlType',
+    '75': 'TradeDate',
+    '99': 'StopPx',
+    '115': 'OnBehalfOfCompID',
+    '116': 'OnBehalfOfSubID',
+    '150': 'ExecType',
+    '151': 'LeavesQty',
+    '434': 'CxlRejResponseTo',
+}
+
+MSG_TYPES = {
+    '0': 'Heartbeat',
+    '1': 'Test Request',
+    '2': 'Resend Request',
+    '3': 'Reject',
+    '4': 'Sequence Reset',
+    '5': 'Logout',
+    '8': 'Execution Report',
+    '9': 'Order Cancel Reject',
+    'A': 'Logon',
+    'D': 'New Order Single',
+    'F': 'Order Cancel Request',
+    'G': 'Order Cancel/Replace Request',
+}
+
+SIDES = {
+    '1': 'Buy',
+    '2': 'Sell',
+    '3': 'BuyMinus',
+    '4': 'SellPlus',
+    '5': 'SellShort',
+    '6': 'SellShortExempt',
+    '7': 'Undisclosed',
+    '8': 'Cross',
+    '9': 'CrossShort',
+}
+
+ORD_STATUS = {
+    '0': 'New',
+    '1': 'Partially Filled',
+    '2': 'Filled',
+    '3': 'Done for Day',
+    '4': 'Canceled',
+    '5': 'Replaced',
+    '6': 'Pending Cancel',
+    '7': 'Stopped',
+    '8': 'Rejected',
+    '9': 'Suspended',
+    'A': 'Pending New',
+    'B': 'Calculated',
+    'C': 'Expired',
+    'D': 'Accepted for Bidding',
+    'E': 'Pending Replace',
+}
+
+EXEC_TYPES = {
+    '0': 'New',
+    '1': 'Partial Fill',
+    '2': 'Fill',
+    '3': 'Done for Day',
+    '4': 'Canceled',
+    '5': 'Replace',
+    '6': 'Pending Cancel',
+    '7': 'Stopped',
+    '8': 'Rejected',
+    '9': 'Suspended',
+    'A': 'Pending New',
+    'B': 'Calculated',
+    'C': 'Expired',
+    'D': 'Restated',
+    'E': 'Pending Replace',
+    'F': 'Trade',
+    'G': 'Trade Correct',
+    'H': 'Trade Cancel',
+    'I': 'Order Status',
+}
+
+ORD_TYPES = {
+    '1': 'Market',
+    '2': 'Limit',
+    '3': 'Stop',
+    '4': 'Stop Limit',
+    '5': 'Market On Close',
+    'P': 'Pegged',
+}
+
+TIME_IN_FORCE = {
+    '0': 'Day',
+    '1': 'GTC',
+    '2': 'OPG',
+    '3': 'IOC',
+    '4': 'FOK',
+    '5': 'GTX',
+    '6': 'GTD',
+    '7': 'ATC',
+}
+
+# tag -> code table, consulted lazily by FIXFields.decoded()
+ENUM_TABLES = {
+    '35': MSG_TYPES,
+    '54': SIDES,
+    '39': ORD_STATUS,
+    '150': EXEC_TYPES,
+    '40': ORD_TYPES,
+    '59': TIME_IN_FORCE,
+}
+
+# bytes tag -> str tag; the set of tags seen in practice is small
+_BYTES_TAGS: Dict[bytes, str] = {}
+
+
+def _tag_str(raw) -> str:
+    tag = _BYTES_TAGS.get(raw)
+    if tag is None:
+        tag = bytes(raw).decode('ascii', 'replace')
+        _BYTES_TAGS[bytes(raw)] = tag
+    return tag
+
+
+def _tokens(buf: Buffer):
+    """Return the (begin marker, '=', delimiters) tokens matching the buffer type"""
+    return _STR_TOKENS if isinstance(buf, str) else _BYTES_TOKENS
+
+
+def find_fix_start(buf: Buffer, start: int = 0, end: Optional[int] = None) -> int:
+    """Offset of the first '8=FIX' in buf[start:end], or -1"""
+    if end is None:
+        end = len(buf)
+    return buf.find(_tokens(buf)[0], start, end)
+
+
+def detect_delimiter(buf: Buffer, start: int = 0, end: Optional[int] = None):
+    """
+    Detect the field delimiter of the message starting at `start`.
+    Looks right after the BeginString value first (it is never longer than a few
+    characters), then falls back to the first delimiter present in the buffer.
+    Returns the delimiter in the buffer's own type, or None.
+    """
+    if end is None:
+        end = len(buf)
+    _, _, delims = _tokens(buf)
+    window_end = min(end, start + 16)
+    best = -1
+    found = None
+    for delim in delims:
+        pos = buf.find(delim, start, window_end)
+        if pos >= 0 and (best < 0 or pos < best):
+            best, found = pos, delim
+    if found is not None:
+        return found
+    for delim in delims:
+        if buf.find(delim, start, end) >= 0:
+            return delim
+    return None
+
+
+def iter_fields(buf: Buffer, start: int = 0, end: Optional[int] = None,
+                delim=None) -> Iterator[Tuple[str, int, int]]:
+    """
+    Lazily yield (tag, value_start, value_end) for each field in buf[start:end].
+    Tags are always str; values are left in the buffer until sliced by the caller.
+    """
+    if end is None:
+        end = len(buf)
+    _, eq, _ = _tokens(buf)
+    if delim is None:
+        delim = detect_delimiter(buf, start, end)
+        if delim is None:
+            # single field without a delimiter
+            delim = SOH if isinstance(buf, str) else SOH.encode()
+    is_str = isinstance(buf, str)
+    find = buf.find
+    rfind = buf.rfind
+    pos = start
+    while pos < end:
+        eq_pos = find(eq, pos, end)
+        if eq_pos < 0:
+            break
+        # skip empty / tagless segments such as '||' or 'junk|35=D'
+        skipped = rfind(delim, pos, eq_pos)
+        if skipped >= 0:
+            pos = skipped + 1
+        value_end = find(delim, eq_pos + 1, end)
+        if value_end < 0:
+            value_end = end
+        if pos < eq_pos:
+            tag = buf[pos:eq_pos] if is_str else _tag_str(buf[pos:eq_pos])
+            yield tag, eq_pos + 1, value_end
+        pos = value_end + 1
+
+
+def _value(buf: Buffer, start: int, end: int) -> str:
+    value = buf[start:end]
+    if isinstance(value, str):
+        return value
+    return bytes(value).decode('latin-1')
+
+
+class FIXFields:
+    """
+    Lazy view over one FIX message inside a larger buffer.
+    The tag -> offset index is built on first access; values are sliced and
+    decoded only when read.
+    """
+
+    __slots__ = ('buf', 'start', 'end', 'delim', '_index')
+
+    def __init__(self, buf: Buffer, start: int = 0, end: Optional[int] = None, delim=None):
+        if end is None:
+            end = len(buf)
+        fix_start = find_fix_start(buf, start, end)
+        if fix_start >= 0:
+            start = fix_start
+        self.buf = buf
+        self.start = start
+        self.end = end
+        self.delim = delim if delim is not None else detect_delimiter(buf, start, end)
+        self._index: Optional[Dict[str, Tuple[int, int]]] = None
+
+    @property
+    def index(self) -> Dict[str, Tuple[int, int]]:
+        """tag -> (value_start, value_end); the last occurrence of a tag wins"""
+        if self._index is None:
+            self._index = {
+                tag: (vs, ve)
+                for tag, vs, ve in iter_fields(self.buf, self.start, self.end, self.delim)
+            }
+        return self._index
+
+    def __contains__(self, tag: str) -> bool:
+        return tag in self.index
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def get(self, tag: str, default: Optional[str] = None) -> Optional[str]:
+        """Raw string value of a tag"""
+        span = self.index.get(tag)
+        if span is None:
+            return default
+        return _value(self.buf, span[0], span[1])
+
+    def __getitem__(self, tag: str) -> str:
+        value = self.get(tag)
+        if value is None:
+            raise KeyError(tag)
+        return value
+
+    def decoded(self, tag: str, default: Optional[str] = None,
+                tables: Dict[str, Dict[str, str]] = ENUM_TABLES) -> Optional[str]:
+        """Value of a tag with its enum code translated (unknown codes pass through)"""
+        value = self.get(tag)
+        if value is None:
+            return default
+        table = tables.get(tag)
+        return table.get(value, value) if table else value
+
+    @property
+    def msg_type(self) -> str:
+        return self.get('35', '')
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        for tag, (vs, ve) in self.index.items():
+            yield tag, _value(self.buf, vs, ve)
+
+    def to_dict(self, names: Optional[Dict[str, str]] = None,
+                decoders: Optional[Dict[str, Dict[str, str]]] = None,
+                unknown: Optional[str] = None) -> Dict[str, str]:
+        """Materialise the message; see parse_fix for the arguments"""
+        return _build_dict(self.items(), names, decoders, unknown)
+
+    @property
+    def raw(self) -> str:
+        return _value(self.buf, self.start, self.end)
+
+
+def _build_dict(items, names, decoders, unknown) -> Dict[str, str]:
+    fields = {}
+    for tag, value in items:
+        if decoders:
+            table = decoders.get(tag)
+            if table:
+                value = table.get(value, value)
+        key = names.get(tag) if names else None
+        if key is None:
+            key = unknown.format(tag) if unknown else tag
+        fields[key] = value
+    return fields
+
+
+def parse_fix(buf: Buffer, names: Optional[Dict[str, str]] = None,
+              decoders: Optional[Dict[str, Dict[str, str]]] = None,
+              unknown: Optional[str] = None,
+              start: int = 0, end: Optional[int] = None) -> Dict[str, str]:
+    """
+    Parse one FIX message into a dict in a single scan.
+
+    names    -- tag -> field name; tags missing from it are keyed by `unknown`
+    decoders -- tag -> {code: label} applied to values (e.g. {'54': SIDES})
+    unknown  -- format string for unnamed tags, e.g. 'Tag_{}'; default is the bare tag
+
+    Anything before '8=FIX' (a log line prefix) is skipped.
+    """
+    if not buf:
+        return {}
+    if end is None:
+        end = len(buf)
+    fix_start = find_fix_start(buf, start, end)
+    if fix_start >= 0:
+        start = fix_start
+    items = (
+        (tag, _value(buf, vs, ve))
+        for tag, vs, ve in iter_fields(buf, start, end)
+    )
+    return _build_dict(items, names, decoders, unknown)
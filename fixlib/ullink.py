@@ -0,0 +1,130 @@
+"""
+Ullink log line decoder.
+
+A Ullink FIX log line has a fixed prefix:
+
+    2025-09-18 09:41:30.187_326 [15583-48bd94d4:985fd603ca:1829] [I_BloombergAlgoFix42] (INFO) Receiving : 8=FIX.4.2|9=...
+
+decode_line walks it once with str.find and index arithmetic (no regex) and
+returns a slotted UllinkLine. The FIX part is kept as offsets into the line:
+the MsgType is found with a single find, and the tag -> value dict is built
+only when .fields is first read.
+"""
+
+from typing import Dict, Optional
+
+from fixlib.tokenizer import detect_delimiter, find_fix_start, parse_fix
+
+INCOMING = 'Incoming'
+OUTGOING = 'Outgoing'
+UNKNOWN = 'Unknown'
+
+_DIRECTIONS = {'Receiving': INCOMING, 'Sending': OUTGOING}
+
+
+def _is_timestamp(line: str) -> bool:
+    """'YYYY-MM-DD HH:MM:SS.f' at the start of the line"""
+    return (len(line) > 20 and line[4] == '-' and line[7] == '-' and line[10] == ' '
+            and line[13] == ':' and line[16] == ':' and line[19] == '.' and line[20].isdigit()
+            and line[:4].isdigit() and line[11:13].isdigit())
+
+
+def _bracket(line: str, pos: int):
+    """(content, position after ']') of a '[...]' starting at pos, or ('', pos)"""
+    if line.startswith('[', pos):
+        end = line.find(']', pos + 1)
+        if end > pos + 1:
+            return line[pos + 1:end], end + 1
+    return '', pos
+
+
+class UllinkLine:
+    """One decoded log line; fields/raw_message/msg_type_code are read lazily from the line"""
+
+    __slots__ = ('line', 'timestamp', 'thread_id', 'connection', 'direction', 'fix_start', 'fix_end', '_fields')
+
+    def __init__(self, line: str, timestamp: str, thread_id: str, connection: str, direction: str,
+                 fix_start: int, fix_end: int):
+        self.line = line
+        self.timestamp = timestamp
+        self.thread_id = thread_id
+        self.connection = connection
+        self.direction = direction
+        self.fix_start = fix_start
+        self.fix_end = fix_end
+        self._fields: Optional[Dict[str, str]] = None
+
+    @property
+    def fields(self) -> Dict[str, str]:
+        """tag -> raw value, parsed on first access"""
+        if self._fields is None:
+            self._fields = parse_fix(self.line, start=self.fix_start, end=self.fix_end)
+        return self._fields
+
+    @property
+    def raw_message(self) -> str:
+        return self.line[self.fix_start:self.fix_end]
+
+    @property
+    def msg_type_code(self) -> str:
+        """Tag 35 without parsing the message"""
+        if self._fields is not None:
+            return self._fields.get('35', '')
+        line = self.line
+        delim = detect_delimiter(line, self.fix_start, self.fix_end)
+        if delim is None:
+            return ''
+        pos = line.find(delim + '35=', self.fix_start, self.fix_end)
+        if pos < 0:
+            return ''
+        pos += len(delim) + 3
+        end = line.find(delim, pos, self.fix_end)
+        return line[pos:end if end >= 0 else self.fix_end]
+
+    def __repr__(self):
+        return (f'{type(self).__name__}({self.timestamp!r}, {self.connection!r}, {self.direction!r}, '
+                f'35={self.msg_type_code!r})')
+
+
+def decode_line(line: str, cls=UllinkLine) -> Optional[UllinkLine]:
+    """
+    Decode one log line; None if it does not start with a timestamp or carries
+    no FIX message. The timestamp stops before the '_micros' suffix, like the
+    millisecond timestamps the audit tools sort and display.
+    """
+    if not _is_timestamp(line):
+        # tolerate a BOM or indentation before the timestamp
+        stripped = line.lstrip('\ufeff \t')
+        if stripped is line or not _is_timestamp(stripped):
+            return None
+        line = stripped
+    pos = 21
+    length = len(line)
+    while pos < length and line[pos].isdigit():
+        pos += 1
+    timestamp = line[:pos]
+
+    # skip the '_326' micros, then the [thread] [session] (LEVEL) blocks
+    pos = line.find(' ', pos)
+    if pos < 0:
+        return None
+    thread_id, pos = _bracket(line, pos + 1)
+    connection, pos = _bracket(line, pos + 1) if thread_id else ('', pos)
+    if line.startswith(' (', pos):
+        level_end = line.find(') ', pos + 2)
+        if level_end >= 0:
+            pos = level_end + 2
+
+    # 'Receiving : 8=FIX...' / 'Sending : 8=FIX...'
+    word_end = line.find(' ', pos)
+    direction = _DIRECTIONS.get(line[pos:word_end]) if word_end >= 0 else None
+    fix_start = word_end + 3 if direction and line.startswith(' : 8=FIX', word_end) else -1
+    if fix_start < 0:
+        # prefix differs from the usual layout: search the rest of the line
+        fix_start = find_fix_start(line, pos)
+        if fix_start < 0:
+            return None
+        head = line[:fix_start]
+        direction = INCOMING if 'Receiving' in head else OUTGOING if 'Sending' in head else UNKNOWN
+    fix_end = len(line.rstrip('\r\n'))
+    return cls(line, timestamp, thread_id, connection, direction, fix_start, fix_end)
@@ -168,9 +168,11 @@ class SimilarWebAPIClient:
     A client class for making dynamic requests to SimilarWeb API endpoints
     """
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, session: Optional[requests.Session] = None):
         self.api_key = api_key
         self.config = SIMILARWEB_API_CONFIG
+        # One pooled session so consecutive calls reuse the HTTPS connection
+        self.session = session or requests.Session()
     
     def build_url(self, endpoint_name: str, domain_name: str) -> str:
         """Build the complete URL for an endpoint"""
@@ -203,7 +205,7 @@ class SimilarWebAPIClient:
         params = self.build_params(endpoint_name, **kwargs)
         headers = endpoint_config["headers"]
         
-        response = requests.get(url, params=params, headers=headers)
+        response = self.session.get(url, params=params, headers=headers)
         return response
     
     def get_visits(self, domain_name: str = "amazon.com", **kwargs) -> requests.Response:
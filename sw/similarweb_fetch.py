@@ -0,0 +1,291 @@
+"""
+Concurrent, rate-limited SimilarWeb fetch engine with an on-disk response cache.
+
+Runs a manifest of endpoint x domain x params requests (url_list.py or
+doubao_url.py format) on a thread pool sharing one pooled requests.Session.
+A token bucket keeps the request rate under the API quota, and 429/5xx or
+connection errors are retried with exponential backoff (honouring Retry-After).
+
+Successful responses are cached per (endpoint, domain, params), api_key
+excluded. Data for a period that is closed (its end date plus a settle delay
+has passed, and mtd is off) never changes, so it is cached without expiry;
+open periods expire after a TTL that depends on the granularity.
+
+    python similarweb_fetch.py ../url_list.py --api-key KEY --workers 8 --rate 5 -o results.json
+    python similarweb_fetch.py ../url_list.py --api-key test --base-url http://127.0.0.1:8000
+"""
+
+import argparse
+import ast
+import calendar
+import hashlib
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_BASE_URL = "https://api.similarweb.com"
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'similarweb')
+
+# Cache lifetime (seconds) of data for a period that is still open
+GRANULARITY_TTL = {
+    'daily': 6 * 3600,
+    'weekly': 12 * 3600,
+    'monthly': 24 * 3600,
+}
+DEFAULT_TTL = 6 * 3600
+# Days after a period ends before its data is treated as final
+SETTLE_DAYS = 10
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class FetchJob:
+    """One API call: endpoint path (e.g. 'total-traffic-and-engagement/visits'), domain, query params"""
+
+    __slots__ = ('endpoint', 'domain', 'params', 'api_version')
+
+    def __init__(self, endpoint: str, domain: str, params: Dict[str, Any], api_version: str = 'v1'):
+        self.endpoint = endpoint.strip('/')
+        self.domain = domain
+        self.params = {k: str(v) for k, v in params.items() if k != 'api_key'}
+        self.api_version = api_version
+
+    def cache_key(self) -> str:
+        key = json.dumps([self.api_version, self.endpoint, self.domain, sorted(self.params.items())])
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def __repr__(self):
+        return f"FetchJob({self.endpoint!r}, {self.domain!r}, {self.params!r})"
+
+
+def load_manifest(path: str) -> List[FetchJob]:
+    """Jobs from a url_list.py (domain/endpoint/params) or doubao_url.py (scheme/netloc/path/params) file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        entries = ast.literal_eval(f.read())
+
+    jobs = []
+    for entry in entries:
+        if 'endpoint' in entry:
+            jobs.append(FetchJob(entry['endpoint'], entry['domain'], entry.get('params', {}),
+                                 entry.get('api_version', 'v1')))
+        else:
+            # /v1/website/<domain>/<endpoint...>
+            parts = entry['path'].strip('/').split('/')
+            jobs.append(FetchJob('/'.join(parts[3:]), parts[2], entry.get('params', {}), parts[0]))
+    return jobs
+
+
+def _period_end(value: str) -> Optional[date]:
+    """Last day covered by a YYYY-MM or YYYY-MM-DD end_date"""
+    try:
+        if len(value) == 7:
+            year, month = int(value[:4]), int(value[5:7])
+            return date(year, month, calendar.monthrange(year, month)[1])
+        return datetime.strptime(value[:10], '%Y-%m-%d').date()
+    except ValueError:
+        return None
+
+
+def cache_ttl(params: Dict[str, str], today: Optional[date] = None,
+              settle_days: int = SETTLE_DAYS) -> Optional[float]:
+    """Seconds a response stays fresh; None means it never expires (closed period)"""
+    today = today or date.today()
+    end = _period_end(params.get('end_date', ''))
+    if end is not None and params.get('mtd', 'false') != 'true' and \
+            today >= end + timedelta(days=settle_days):
+        return None
+    return GRANULARITY_TTL.get(params.get('granularity', ''), DEFAULT_TTL)
+
+
+class ResponseCache:
+    """JSON files under cache_dir/<key[:2]>/<key>.json with an optional expiry"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f'{key}.json')
+
+    def get(self, key: str) -> Optional[Dict]:
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        expires_at = entry.get('expires_at')
+        if expires_at is not None and time.time() >= expires_at:
+            return None
+        return entry
+
+    def put(self, key: str, entry: Dict, ttl: Optional[float]):
+        entry = dict(entry, fetched_at=time.time(),
+                     expires_at=None if ttl is None else time.time() + ttl)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` requests per second, bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class SimilarWebFetcher:
+    """
+    Thread-pool fetcher over one pooled Session, rate limited, with retries and caching
+    """
+
+    def __init__(self, api_key: str, base_url: str = DEFAULT_BASE_URL, max_workers: int = 8,
+                 rate: float = 5.0, burst: Optional[float] = None, retries: int = 5,
+                 backoff: float = 1.0, timeout: float = 30.0,
+                 cache_dir: Optional[str] = DEFAULT_CACHE_DIR, settle_days: int = SETTLE_DAYS):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.settle_days = settle_days
+        self.bucket = TokenBucket(rate, burst)
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'accept': 'application/json'})
+
+    def url(self, job: FetchJob) -> str:
+        return f"{self.base_url}/{job.api_version}/website/{job.domain}/{job.endpoint}"
+
+    def fetch(self, job: FetchJob) -> Dict[str, Any]:
+        """
+        Result dict: job, status, data (parsed JSON or None), error, from_cache, attempts
+        """
+        key = job.cache_key()
+        if self.cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return {'job': job, 'status': cached['status'], 'data': cached['data'],
+                        'error': None, 'from_cache': True, 'attempts': 0}
+
+        params = dict(job.params, api_key=self.api_key)
+        attempt = 0
+        while True:
+            attempt += 1
+            self.bucket.acquire()
+            retry_after = None
+            try:
+                response = self.session.get(self.url(job), params=params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                status, error = None, str(e)
+            else:
+                status = response.status_code
+                if status == 200:
+                    try:
+                        data = response.json()
+                    except ValueError as e:
+                        return {'job': job, 'status': status, 'data': None, 'error': f"Invalid JSON: {e}",
+                                'from_cache': False, 'attempts': attempt}
+                    if self.cache:
+                        self.cache.put(key, {'status': status, 'data': data, 'url': self.url(job)},
+                                       cache_ttl(job.params, settle_days=self.settle_days))
+                    return {'job': job, 'status': status, 'data': data, 'error': None,
+                            'from_cache': False, 'attempts': attempt}
+                error = f"{status}: {response.text[:200]}"
+                retry_after = response.headers.get('Retry-After')
+                if status not in RETRY_STATUS:
+                    return {'job': job, 'status': status, 'data': None, 'error': error,
+                            'from_cache': False, 'attempts': attempt}
+
+            if attempt > self.retries:
+                return {'job': job, 'status': status, 'data': None, 'error': error,
+                        'from_cache': False, 'attempts': attempt}
+            try:
+                delay = float(retry_after)
+            except (TypeError, ValueError):
+                delay = self.backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
+            time.sleep(delay)
+
+    def fetch_many(self, jobs: List[FetchJob]) -> List[Dict[str, Any]]:
+        """fetch() for every job on the thread pool; results in job order"""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(self.fetch, jobs))
+
+    def close(self):
+        self.session.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fetch a SimilarWeb request manifest concurrently')
+    parser.add_argument('manifest', help='url_list.py / doubao_url.py style manifest')
+    parser.add_argument('--api-key', default=os.environ.get('SIMILARWEB_API_KEY'), help='SimilarWeb API key')
+    parser.add_argument('--base-url', default=DEFAULT_BASE_URL, help='API root (point at a stub server for testing)')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent requests')
+    parser.add_argument('--rate', type=float, default=5.0, help='Requests per second')
+    parser.add_argument('--retries', type=int, default=5, help='Retries on 429/5xx and connection errors')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='Response cache directory')
+    parser.add_argument('--no-cache', action='store_true', help='Do not read or write the response cache')
+    parser.add_argument('-o', '--output', help='Write results as JSON to this file')
+    args = parser.parse_args()
+
+    if not args.api_key:
+        parser.error('--api-key (or SIMILARWEB_API_KEY) is required')
+
+    jobs = load_manifest(args.manifest)
+    fetcher = SimilarWebFetcher(args.api_key, base_url=args.base_url, max_workers=args.workers,
+                                rate=args.rate, retries=args.retries,
+                                cache_dir=None if args.no_cache else args.cache_dir)
+    started = time.monotonic()
+    try:
+        results = fetcher.fetch_many(jobs)
+    finally:
+        fetcher.close()
+
+    cached = sum(1 for r in results if r['from_cache'])
+    failed = [r for r in results if r['error']]
+    print(f"{len(results)} requests in {time.monotonic() - started:.1f}s "
+          f"({cached} from cache, {len(failed)} failed)")
+    for r in failed:
+        print(f"  {r['job'].domain} {r['job'].endpoint}: {r['error']}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump([{'domain': r['job'].domain, 'endpoint': r['job'].endpoint, 'params': r['job'].params,
+                        'status': r['status'], 'data': r['data'], 'error': r['error']}
+                       for r in results], f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,20 +1,22 @@
 import json
-import re
+import os
+import sys
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, asdict
 from collections import defaultdict
 
-@dataclass
-class FIXMessage:
-    timestamp: str
-    thread_id: str
-    connection: str
-    direction: str  # I_ (Incoming) or O_ (Outgoing)
-    msg_type: str
-    msg_type_code: str
-    fields: Dict[str, str]
-    raw_message: str
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from fixlib.genealogy import Genealogy
+from fixlib.columnar import CATEGORY, TIME, FixColumnBuilder
+from fixlib.tokenizer import parse_fix
+from fixlib.ullink import UllinkLine, decode_line
+
+class FIXMessage(UllinkLine):
+    """Decoded log line (timestamp, thread_id, connection, direction, lazy fields/raw_message/msg_type_code)"""
+    __slots__ = ('msg_type',)
     
 class FIXParser:
     def __init__(self):
@@ -86,65 +88,16 @@ class FIXParser:
         
     def parse_fix_message(self, fix_string: str) -> Dict[str, str]:
         """Parse FIX message string into field dictionary"""
-        fields = {}
-        if not fix_string:
-            return fields
-            
-        # Split by SOH character (|) or actual SOH if present
-        parts = fix_string.split('|')
-        
-        for part in parts:
-            if '=' in part:
-                try:
-                    tag, value = part.split('=', 1)
-                    fields[tag] = value
-                except ValueError:
-                    continue
-                    
-        return fields
+        return parse_fix(fix_string)
     
     def parse_log_line(self, line: str) -> Optional[FIXMessage]:
-        """Parse a single log line and extract FIX message"""
-        # Extract timestamp
-        timestamp_match = re.search(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d+)', line)
-        if not timestamp_match:
-            return None
-        timestamp = timestamp_match.group(1)
-        
-        # Extract thread and connection info
-        thread_match = re.search(r'\[([^\]]+)\]', line)
-        thread_id = thread_match.group(1) if thread_match else ""
-        
-        # Extract connection info
-        connection_match = re.search(r'\[([^\]]+)\].*?\[([^\]]+)\]', line)
-        connection = connection_match.group(2) if connection_match else ""
-        
-        # Determine direction
-        direction = "Incoming" if "Receiving" in line else "Outgoing" if "Sending" in line else "Unknown"
-        
-        # Extract FIX message
-        fix_match = re.search(r'(8=FIX[^|]*(?:\|[^|]*)*)', line)
-        if not fix_match:
+        """Parse a single log line and extract FIX message (fields are parsed on first access)"""
+        msg = decode_line(line, FIXMessage)
+        if msg is None:
             return None
-        fix_string = fix_match.group(1)
-        
-        # Parse FIX fields
-        fields = self.parse_fix_message(fix_string)
-        
-        # Get message type
-        msg_type_code = fields.get('35', '')
-        msg_type = self.msg_types.get(msg_type_code, f'Unknown ({msg_type_code})')
-        
-        return FIXMessage(
-            timestamp=timestamp,
-            thread_id=thread_id,
-            connection=connection,
-            direction=direction,
-            msg_type=msg_type,
-            msg_type_code=msg_type_code,
-            fields=fields,
-            raw_message=fix_string
-        )
+        msg_type_code = msg.msg_type_code
+        msg.msg_type = self.msg_types.get(msg_type_code, f'Unknown ({msg_type_code})')
+        return msg
     
     def get_field_name(self, tag: str) -> str:
         """Get human-readable field name"""
@@ -207,78 +160,67 @@ def build_order_genealogy(messages: List[FIXMessage]) -> Dict[str, OrderChain]:
                 if orig_cl_ord_id and orig_cl_ord_id != cl_ord_id:
                     parent_child_map[cl_ord_id] = orig_cl_ord_id
     
-    # Second pass: build order chains
-    processed_orders = set()
+    # Second pass: resolve every chain at once (forward + reverse index, one DFS per tree)
+    genealogy = Genealogy.from_parent_map(parent_child_map)
+    for order_id in order_details:
+        genealogy.add(order_id)
     
+    processed_roots = set()
     for order_id in order_details:
-        if order_id in processed_orders:
+        root_order = genealogy.root(order_id)
+        if root_order in processed_roots:
             continue
-            
-        # Find the root order (original order)
-        root_order = find_root_order(order_id, parent_child_map)
-        
-        if root_order in processed_orders:
+        processed_roots.add(root_order)
+        if root_order not in order_details:
             continue
-            
-        # Build the complete chain from root
-        chain_orders = build_chain_from_root(root_order, parent_child_map, order_details)
         
-        # Mark all orders in this chain as processed
-        processed_orders.update(chain_orders)
+        chain_orders = genealogy.chain(root_order)
         
-        # Create OrderChain object
-        if chain_orders and root_order in order_details:
-            root_details = order_details[root_order]
-            final_order = chain_orders[-1]
-            final_details = order_details[final_order]
-            
-            order_chain = OrderChain(
-                original_order_id=root_order,
-                chain_orders=chain_orders,
-                parent_child_map={child: parent for child, parent in parent_child_map.items() 
-                                if child in chain_orders or parent in chain_orders},
-                order_details={oid: order_details[oid] for oid in chain_orders if oid in order_details},
-                total_quantity=root_details.get('order_qty', 0),
-                symbol=root_details.get('symbol', ''),
-                side=root_details.get('side', ''),
-                creation_time=root_details.get('timestamp', ''),
-                final_time=final_details.get('timestamp', '')
-            )
-            
-            order_chains[root_order] = order_chain
+        # Sort by timestamp to ensure chronological order
+        if all(order_id in order_details for order_id in chain_orders):
+            chain_orders.sort(key=lambda oid: order_details[oid].get('timestamp', ''))
+        
+        root_details = order_details[root_order]
+        final_order = chain_orders[-1]
+        final_details = order_details[final_order]
+        
+        order_chain = OrderChain(
+            original_order_id=root_order,
+            chain_orders=chain_orders,
+            parent_child_map={child: genealogy.parent[child] for child in chain_orders
+                              if child in genealogy.parent},
+            order_details={oid: order_details[oid] for oid in chain_orders if oid in order_details},
+            total_quantity=root_details.get('order_qty', 0),
+            symbol=root_details.get('symbol', ''),
+            side=root_details.get('side', ''),
+            creation_time=root_details.get('timestamp', ''),
+            final_time=final_details.get('timestamp', '')
+        )
+        
+        order_chains[root_order] = order_chain
     
     return order_chains
 
 def find_root_order(order_id: str, parent_child_map: Dict[str, str]) -> str:
     """Find the root (original) order in the chain"""
-    current_order = order_id
-    visited = set()
-    
-    while current_order in parent_child_map and current_order not in visited:
-        visited.add(current_order)
-        current_order = parent_child_map[current_order]
-    
-    return current_order
+    # One walk up the links, no index of the whole map for a single lookup
+    current = order_id
+    seen = {order_id}
+    parent = parent_child_map.get(current)
+    while parent and parent not in seen:
+        seen.add(parent)
+        current = parent
+        parent = parent_child_map.get(current)
+    if parent:
+        # Cycle: Genealogy decides where it is broken
+        return Genealogy.from_parent_map(parent_child_map).root(order_id)
+    return current
 
 def build_chain_from_root(root_order: str, parent_child_map: Dict[str, str], order_details: Dict[str, Dict]) -> List[str]:
     """Build ordered chain starting from root order"""
-    chain = [root_order]
-    
-    # Find all children of current orders in the chain
-    while True:
-        current_length = len(chain)
-        current_orders = set(chain)
-        
-        # Look for children of any order currently in the chain
-        for child, parent in parent_child_map.items():
-            if parent in current_orders and child not in current_orders:
-                # Insert child after its parent
-                parent_index = chain.index(parent)
-                chain.insert(parent_index + 1, child)
-        
-        # If no new orders were added, we're done
-        if len(chain) == current_length:
-            break
+    genealogy = Genealogy.from_parent_map(parent_child_map)
+    genealogy.add(root_order)
+    chain = genealogy.chain(root_order)
     
     # Sort by timestamp to ensure chronological order
     if all(order_id in order_details for order_id in chain):
@@ -353,8 +295,8 @@ def analyze_order_replacements(messages: List[FIXMessage]) -> List[Dict[str, Any
             # Find the original order or previous replacement
             original_order = None
             for msg in messages:
-                if (msg.fields.get('11') == orig_cl_ord_id and 
-                    msg.msg_type_code in ['D', 'G']):  # New Order or Replace
+                if (msg.msg_type_code in ['D', 'G'] and  # New Order or Replace
+                    msg.fields.get('11') == orig_cl_ord_id):
                     original_order = msg
                     break
             
@@ -567,19 +509,82 @@ def safe_int(value: str, default: int = 0) -> int:
     except (ValueError, TypeError):
         return default
 
-def create_audit_trail(log_data: str) -> Dict[str, Any]:
-    """Create comprehensive audit trail from FIX log data"""
+# Kinds of the non-tag columns of messages_frame()
+MESSAGE_KINDS = {
+    'timestamp': TIME,
+    'direction': CATEGORY,
+    'connection': CATEGORY,
+    'msg_type': CATEGORY,
+}
+
+# Message types create_audit_trail reads fields of (orders, replaces, executions)
+ANALYZED_TYPES = frozenset(('D', 'G', '8'))
+
+class MessageColumns:
+    """Typed message columns fed one decoded log line at a time, without a fields dict per message"""
+    __slots__ = ('builder', 'timestamps')
+    
+    def __init__(self):
+        self.builder = FixColumnBuilder(names=FIXParser().field_names, extra_kinds=MESSAGE_KINDS)
+        self.timestamps: List[str] = []
+    
+    def append(self, msg: FIXMessage):
+        # Scanned from the log line itself, msg.fields stays unparsed
+        self.builder.append_fix(msg.line, msg.fix_start, msg.fix_end, timestamp=msg.timestamp,
+                                direction=msg.direction, connection=msg.connection, msg_type=msg.msg_type)
+        self.timestamps.append(msg.timestamp)
+    
+    def time_range(self):
+        """(first, last) timestamp, '' when empty"""
+        return (min(self.timestamps), max(self.timestamps)) if self.timestamps else ('', '')
+    
+    def frame(self) -> pd.DataFrame:
+        """Rows in timestamp order (stable, like sorting the messages); columns in first-seen order of the log"""
+        df = self.builder.to_frame()
+        timestamps = self.timestamps
+        if any(timestamps[i] > timestamps[i + 1] for i in range(len(timestamps) - 1)):
+            order = sorted(range(len(timestamps)), key=timestamps.__getitem__)
+            df = df.take(order).reset_index(drop=True)
+        return df
+
+def messages_frame(messages: List[FIXMessage]) -> pd.DataFrame:
+    """Messages as typed columns: one per tag (named like the audit trail fields) plus timestamp/direction/connection/msg_type"""
+    columns = MessageColumns()
+    for msg in messages:
+        columns.append(msg)
+    return columns.frame()
+
+def create_audit_trail(log_data: str, columnar: bool = False) -> Dict[str, Any]:
+    """
+    Create comprehensive audit trail from FIX log data.
+    With columnar=True 'messages' is a typed DataFrame (see MessageColumns) built as the
+    lines are read instead of one dict per message; it is not JSON-serializable but
+    exports to Parquet.
+    """
     parser = FIXParser()
     messages = []
+    columns = MessageColumns() if columnar else None
     
     # Parse all log lines
     for line in log_data.strip().split('\n'):
         msg = parser.parse_log_line(line)
         if msg:
-            messages.append(msg)
+            if columns is None:
+                messages.append(msg)
+            else:
+                # Straight into the typed columns; only messages the analysis reads are kept
+                columns.append(msg)
+                if msg.msg_type_code in ANALYZED_TYPES:
+                    messages.append(msg)
     
     # Sort by timestamp
     messages.sort(key=lambda x: x.timestamp)
+    if columns is None:
+        total_messages = len(messages)
+        start_time, end_time = (messages[0].timestamp, messages[-1].timestamp) if messages else ('', '')
+    else:
+        total_messages = len(columns.timestamps)
+        start_time, end_time = columns.time_range()
     
     # Analyze order replacements
     replacements = analyze_order_replacements(messages)
@@ -628,10 +633,10 @@ def create_audit_trail(log_data: str) -> Dict[str, Any]:
     # Build audit trail
     audit_trail = {
         'summary': {
-            'total_messages': len(messages),
-            'order_date': messages[0].timestamp.split()[0] if messages else '',
-            'start_time': messages[0].timestamp if messages else '',
-            'end_time': messages[-1].timestamp if messages else '',
+            'total_messages': total_messages,
+            'order_date': start_time.split()[0] if start_time else '',
+            'start_time': start_time,
+            'end_time': end_time,
             'original_quantity': original_qty,
             'filled_quantity': total_qty,
             'remaining_quantity': max(0, original_qty - total_qty),
@@ -642,7 +647,7 @@ def create_audit_trail(log_data: str) -> Dict[str, Any]:
             'symbol': executions[0]['symbol'] if executions else '',
             'venues': list(set(exec['last_mkt'] for exec in executions if exec['last_mkt']))
         },
-        'messages': [
+        'messages': columns.frame() if columnar else [
             {
                 'timestamp': msg.timestamp,
                 'direction': msg.direction,
@@ -898,6 +903,16 @@ def export_replacements_only(audit_trail: Dict[str, Any], filename: str = 'repla
     
     print(f"✅ Replacements data exported to '{filename}'")
 
+def export_messages_parquet(audit_trail: Dict[str, Any], filename: str = 'messages.parquet'):
+    """Export the typed messages of a columnar audit trail to Parquet (needs pyarrow)"""
+    messages = audit_trail['messages']
+    if not isinstance(messages, pd.DataFrame):
+        print("Parquet export needs create_audit_trail(..., columnar=True)")
+        return
+    messages.to_parquet(filename, index=False)
+    
+    print(f"✅ {len(messages)} messages exported to '{filename}'")
+
 # Advanced analysis functions
 def calculate_execution_metrics(audit_trail: Dict[str, Any]) -> Dict[str, Any]:
     """Calculate advanced execution metrics"""
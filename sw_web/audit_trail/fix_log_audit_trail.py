@@ -1,15 +1,26 @@
 import dash
-from dash import dcc, html, Input, Output, State, callback_context
+from dash import dcc, html, Input, Output, Patch, State, callback_context
+from dash.exceptions import PreventUpdate
 import pandas as pd
-import re
-from datetime import datetime
+import os
+import sys
 from collections import defaultdict
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from fixlib.columnar import CATEGORY, FLOAT, TIME, FixColumnBuilder
+from fixlib.genealogy import Genealogy
+from fixlib.tail import close_session, get_session, log_root, open_session, resolve_log_path
+from fixlib.timestamps import TimestampDecoder
+from fixlib.tokenizer import parse_fix
+
 app = dash.Dash(__name__)
 app.title = "FIX Order Audit Trail Analyzer"
 
+# Refresh period of the live tail (ms)
+LIVE_REFRESH_MS = 2000
+
 # External CSS for Tailwind (using CDN)
 app.index_string = '''
 <!DOCTYPE html>
@@ -94,7 +105,28 @@ app.layout = html.Div([
                 html.Button("Analyze Log", 
                           id='analyze-button', 
                           className="mt-4 bg-gradient-to-r from-green-500 to-green-600 hover:from-green-600 hover:to-green-700 text-white font-semibold py-3 px-8 rounded-lg transition duration-200 shadow-md transform hover:scale-105"
-                )
+                ),
+                
+                # Live tail of log files on disk
+                html.Div([
+                    dcc.Input(
+                        id='live-log-paths',
+                        type='text',
+                        placeholder='Log file path(s) under the log root, comma separated',
+                        className="flex-grow p-2 border border-gray-300 rounded-lg font-mono text-sm mr-3"
+                    ),
+                    html.Button("▶ Start Live", 
+                              id='live-start-button',
+                              n_clicks=0,
+                              className="bg-gradient-to-r from-blue-500 to-blue-600 hover:from-blue-600 hover:to-blue-700 text-white font-semibold py-2 px-6 rounded-lg shadow-md mr-3"
+                    ),
+                    html.Button("■ Stop", 
+                              id='live-stop-button',
+                              n_clicks=0,
+                              className="bg-gradient-to-r from-red-500 to-red-600 hover:from-red-600 hover:to-red-700 text-white font-semibold py-2 px-6 rounded-lg shadow-md"
+                    ),
+                ], className="flex items-center mt-4"),
+                html.Div(id='live-status', className="mt-2 text-sm text-gray-600")
             ], className="bg-white p-6 rounded-xl shadow-sm border border-gray-200")
         ], className="p-6"),
         
@@ -175,91 +207,225 @@ app.layout = html.Div([
     dcc.Store(id='audit-data-store'),
     dcc.Store(id='orders-store'),
     dcc.Store(id='replacement-chains-store'),
-    dcc.Store(id='order-id-map-store')
+    dcc.Store(id='order-id-map-store'),
+    
+    # Live tail session
+    dcc.Store(id='live-session-store'),
+    dcc.Interval(id='live-interval', interval=LIVE_REFRESH_MS, n_intervals=0, disabled=True)
 ], className="min-h-screen pt-20")
 
 def parse_fix_message(line):
     """Parse a FIX message line and return a dictionary of tag-value pairs."""
-    fix_data = {}
     if 'Sending : ' in line or 'Receiving : ' in line:
-        fix_part = line.split(':', 2)[-1].strip()
-        for field in fix_part.split('|'):
-            if '=' in field:
-                tag, value = field.split('=', 1)
-                try:
-                    fix_data[int(tag)] = value
-                except ValueError:
-                    fix_data[tag] = value
-    return fix_data
-
-def process_fix_log(log_content):
-    """Process FIX log content and return structured data."""
-    orders = defaultdict(list)
-    replacement_chains = {}
-    order_id_map = {}  # Map ClOrdID to OrderID (Tag 37)
-    order_timestamps = {}  # Track timestamps for each order
-    lines = log_content.split('\n')
-    
-    for line in lines:
-        if not line.strip():
-            continue
-            
-        try:
-            # Extract timestamp
-            timestamp_str = line.split(' ')[0] + ' ' + line.split(' ')[1].split('_')[0]
-            timestamp = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S.%f')
-            
-            direction = 'OUT' if 'Sending : ' in line else 'IN'
-            connector = line.split(']')[1].strip().strip('[]') if ']' in line else 'Unknown'
-            
-            fix_data = parse_fix_message(line)
-            msg_type = fix_data.get(35, '')
-            
-            if msg_type in ['D', 'G', 'F', '8']:
-                cl_ord_id = fix_data.get(11, '')
-                orig_cl_ord_id = fix_data.get(41, '')
-                order_id = fix_data.get(37, '')  # Tag 37 - OrderID
-                avg_px = fix_data.get(6, '')  # Tag 6 - AvgPx
-                
-                event = {
-                    'timestamp': timestamp,
-                    'direction': direction,  # IN or OUT
-                    'connector': connector,
-                    'msg_type': msg_type,
-                    'cl_ord_id': cl_ord_id,
-                    'orig_cl_ord_id': orig_cl_ord_id,
-                    'order_id': order_id,  # Tag 37
-                    'order_qty': fix_data.get(38, ''),
-                    'cum_qty': fix_data.get(14, ''),
-                    'price': fix_data.get(6, ''),
-                    'avg_px': avg_px,  # Tag 6 - AvgPx
-                    'exec_type': fix_data.get(150, '0'),
-                    'ord_status': fix_data.get(39, '0'),  # Tag 39 - OrdStatus
-                    'symbol': fix_data.get(48, ''),
-                    'raw_line': line.strip()
-                }
+        return parse_fix(line)
+    return {}
+
+# Column kinds of the columnar event frame (AuditTrailState(columnar=True)); the rest is text
+EVENT_KINDS = {
+    'timestamp': TIME,
+    'direction': CATEGORY,
+    'connector': CATEGORY,
+    'msg_type': CATEGORY,
+    'order_qty': FLOAT,
+    'cum_qty': FLOAT,
+    'price': FLOAT,
+    'avg_px': FLOAT,
+    'exec_type': CATEGORY,
+    'ord_status': CATEGORY,
+    'symbol': CATEGORY,
+}
+
+class AuditTrailState:
+    """Orders, replace chains and OrderID/timestamp maps built up line by line."""
+
+    def __init__(self, columnar=False):
+        self.orders = defaultdict(list)
+        self.replacement_chains = {}
+        self.order_id_map = {}  # Map ClOrdID to OrderID (Tag 37)
+        self.order_timestamps = {}  # Track timestamps for each order
+        self.event_log = []  # order events in log order (dict mode)
+        self.clock = TimestampDecoder()  # log line timestamps, date part cached per file
+        # Columnar mode: events go into typed column buffers instead of per-order dicts
+        self.events = FixColumnBuilder(extra_kinds=EVENT_KINDS) if columnar else None
+
+    def feed(self, lines):
+        """Add log lines to the state and return the number of new order events."""
+        added = 0
+        for line in lines:
+            if not line.strip():
+                continue
                 
-                # Track OrderID mapping
-                if order_id and cl_ord_id:
-                    order_id_map[cl_ord_id] = order_id
+            try:
+                # Extract timestamp (fixed-offset decode, date part cached)
+                timestamp = self.clock.log_prefix(line)
+                if timestamp is None:
+                    continue
                 
-                # Track timestamps
-                if cl_ord_id not in order_timestamps:
-                    order_timestamps[cl_ord_id] = {'first_seen': timestamp, 'last_seen': timestamp}
-                else:
-                    order_timestamps[cl_ord_id]['last_seen'] = timestamp
+                direction = 'OUT' if 'Sending : ' in line else 'IN'
+                connector = line.split(']')[1].strip().strip('[]') if ']' in line else 'Unknown'
                 
-                # Track replacement relationships
-                if msg_type in ['G', 'F'] and orig_cl_ord_id and cl_ord_id:
-                    replacement_chains[cl_ord_id] = orig_cl_ord_id
+                fix_data = parse_fix_message(line)
+                msg_type = fix_data.get('35', '')
                 
-                if cl_ord_id:
-                    orders[cl_ord_id].append(event)
+                if msg_type in ['D', 'G', 'F', '8']:
+                    cl_ord_id = fix_data.get('11', '')
+                    orig_cl_ord_id = fix_data.get('41', '')
+                    order_id = fix_data.get('37', '')  # Tag 37 - OrderID
+                    avg_px = fix_data.get('6', '')  # Tag 6 - AvgPx
                     
-        except Exception as e:
-            continue
-            
-    return orders, replacement_chains, order_id_map, order_timestamps
+                    # Track OrderID mapping
+                    if order_id and cl_ord_id:
+                        self.order_id_map[cl_ord_id] = order_id
+                    
+                    # Track timestamps
+                    if cl_ord_id not in self.order_timestamps:
+                        self.order_timestamps[cl_ord_id] = {'first_seen': timestamp, 'last_seen': timestamp}
+                    else:
+                        self.order_timestamps[cl_ord_id]['last_seen'] = timestamp
+                    
+                    # Track replacement relationships
+                    if msg_type in ['G', 'F'] and orig_cl_ord_id and cl_ord_id:
+                        self.replacement_chains[cl_ord_id] = orig_cl_ord_id
+                    
+                    if cl_ord_id and self.events is not None:
+                        self.events.append((), timestamp=timestamp, direction=direction, connector=connector,
+                                           msg_type=msg_type, cl_ord_id=cl_ord_id, orig_cl_ord_id=orig_cl_ord_id,
+                                           order_id=order_id, order_qty=fix_data.get('38'),
+                                           cum_qty=fix_data.get('14'), price=avg_px, avg_px=avg_px,
+                                           exec_type=fix_data.get('150', '0'), ord_status=fix_data.get('39', '0'),
+                                           symbol=fix_data.get('48'), raw_line=line.strip())
+                        added += 1
+                    elif cl_ord_id:
+                        event = {
+                            'timestamp': timestamp,
+                            'direction': direction,  # IN or OUT
+                            'connector': connector,
+                            'msg_type': msg_type,
+                            'cl_ord_id': cl_ord_id,
+                            'orig_cl_ord_id': orig_cl_ord_id,
+                            'order_id': order_id,  # Tag 37
+                            'order_qty': fix_data.get('38', ''),
+                            'cum_qty': fix_data.get('14', ''),
+                            'price': fix_data.get('6', ''),
+                            'avg_px': avg_px,  # Tag 6 - AvgPx
+                            'exec_type': fix_data.get('150', '0'),
+                            'ord_status': fix_data.get('39', '0'),  # Tag 39 - OrdStatus
+                            'symbol': fix_data.get('48', ''),
+                            'raw_line': line.strip()
+                        }
+                        self.orders[cl_ord_id].append(event)
+                        self.event_log.append(event)
+                        added += 1
+                        
+            except Exception as e:
+                continue
+                
+        return added
+
+    def frame(self, start=0):
+        """Order events (columnar mode) as a typed DataFrame, one row per event in log order."""
+        return self.events.to_frame(start)
+
+    def result(self):
+        return self.orders, self.replacement_chains, self.order_id_map, self.order_timestamps
+
+class LiveAuditState(AuditTrailState):
+    """
+    AuditTrailState of a live session, plus a cursor into its event log and the
+    aggregates behind the summary cards, so each tick renders only the new events.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.reset_view()
+
+    def reset_view(self):
+        """Forget what the page shows (before a full render)"""
+        self.shown = 0              # events of event_log already in the table
+        self.last_timestamp = None  # latest timestamp among them
+        self.rank = {}              # ClOrdID -> position in self.orders
+        self.exec_rows = []         # audit rows the timeline figure plots
+        self.total_qty = 0
+        self.filled_qty = 0
+        self.avg_px = 0
+        self.symbol, self.symbol_rank = 'BRXYZ91', -1
+        self.symbol_orders = set()  # orders whose symbol was seen
+        self.final_status, self.status_rank = 'Unknown', -1
+
+    def take(self):
+        """
+        Audit rows of the events not shown yet, in table order, with the cursor
+        and aggregates moved past them; None if one of them sorts before a row
+        already shown (the table has to be rebuilt then).
+        """
+        new = self.event_log[self.shown:]
+        for event in new:
+            self.rank.setdefault(event['cl_ord_id'], len(self.rank))
+        if self.last_timestamp is not None and any(e['timestamp'] <= self.last_timestamp for e in new):
+            return None
+        # Same order as generate_audit_data: timestamp, then order, then position in the order
+        order = sorted(range(len(new)), key=lambda i: (new[i]['timestamp'], self.rank[new[i]['cl_ord_id']], i))
+        rows = [audit_row(new[i]) for i in order]
+        for row in rows:
+            self._aggregate(row)
+        self.shown = len(self.event_log)
+        if rows:
+            self.last_timestamp = rows[-1]['raw_event']['timestamp']
+        return rows
+
+    def _aggregate(self, row):
+        event = row['raw_event']
+        cl_ord_id = event['cl_ord_id']
+        rank = self.rank[cl_ord_id]
+        # Like render_outputs: the symbol of the last order that has one
+        if event.get('symbol') and cl_ord_id not in self.symbol_orders:
+            self.symbol_orders.add(cl_ord_id)
+            if rank > self.symbol_rank:
+                self.symbol, self.symbol_rank = event['symbol'], rank
+        for field, attr in (('order_qty', 'total_qty'), ('cum_qty', 'filled_qty')):
+            if event.get(field):
+                try:
+                    setattr(self, attr, max(getattr(self, attr), int(event[field])))
+                except ValueError:
+                    pass
+        if event['msg_type'] == '8':
+            # Like get_final_order_status: the last execution of the last order that has one
+            if rank >= self.status_rank:
+                self.final_status, self.status_rank = final_status_name(event.get('ord_status', '0')), rank
+            if event['avg_px'] and event['avg_px'] != '0':
+                try:
+                    self.avg_px = float(event['avg_px'])
+                except ValueError:
+                    pass
+            if event['price'] and event['price'] != '0':
+                self.exec_rows.append(row)
+
+    def summary(self):
+        """Values of the seven summary cards"""
+        chains = self.replacement_chains
+        order_chain = next(iter(chains.values())) if chains else next(iter(self.orders), 'N/A')
+        return [
+            f"{self.shown}",
+            order_chain,
+            self.symbol,
+            f"{self.total_qty:,}",
+            f"{self.filled_qty:,}",
+            f"${self.avg_px:.2f}" if self.avg_px > 0 else "$0.00",
+            self.final_status,
+        ]
+
+def process_fix_log(log_content, columnar=False):
+    """
+    Process FIX log content and return structured data.
+    With columnar=True the first item is a typed events DataFrame (categorical
+    msg_type/direction/status/symbol, float quantities and prices, datetime64
+    timestamps) instead of the per-order dicts; see fixlib.columnar for Parquet export.
+    """
+    state = AuditTrailState(columnar)
+    state.feed(log_content.split('\n'))
+    if columnar:
+        return (state.frame(),) + state.result()[1:]
+    return state.result()
 
 def build_order_hierarchy_text(replacement_chains, order_id_map, order_timestamps, orders):
     """Build enhanced order hierarchy display with timeline information."""
@@ -273,6 +439,9 @@ def build_order_hierarchy_text(replacement_chains, order_id_map, order_timestamp
     parents = set(replacement_chains.values())
     root_orders = parents - children
     
+    # Forward child index built once instead of rescanning the map at every step
+    genealogy = Genealogy.from_parent_map(replacement_chains)
+    
     hierarchy_sections = []
     
     for root in sorted(root_orders):
@@ -280,9 +449,11 @@ def build_order_hierarchy_text(replacement_chains, order_id_map, order_timestamp
         client_chain = [current]
         broker_chain = []
         timeline_data = []
+        visited = set()
         
         # Build the complete chain
-        while current:
+        while current and current not in visited:
+            visited.add(current)
             # Add to broker chain if available
             broker_id = order_id_map.get(current)
             if broker_id:
@@ -307,15 +478,11 @@ def build_order_hierarchy_text(replacement_chains, order_id_map, order_timestamp
                 })
             
             # Move to next in chain
-            if current in replacement_chains.values():
-                children_of_current = [child for child, parent in replacement_chains.items() if parent == current]
-                if children_of_current:
-                    current = children_of_current[0]
-                    client_chain.append(current)
-                else:
-                    break
-            else:
+            link = genealogy.first_child(current)
+            if link is None or link[0] in visited:
                 break
+            current = link[0]
+            client_chain.append(current)
         
         # Create timeline visualization
         timeline_fig = create_order_timeline_figure(timeline_data)
@@ -481,6 +648,23 @@ def calculate_avg_px(audit_data):
     # Return the last AvgPx value (most recent execution)
     return avg_px_values[-1] if avg_px_values else 0
 
+# OrdStatus (39) names of the final status card
+FINAL_STATUS_NAMES = {
+    '0': 'New',
+    '1': 'Partially Filled',
+    '2': 'Filled',
+    '4': 'Canceled',
+    '5': 'Replaced',
+    '6': 'Pending Cancel',
+    '8': 'Rejected',
+    'A': 'Pending New',
+    'C': 'Expired',
+    'E': 'Pending Replace'
+}
+
+def final_status_name(ord_status):
+    return FINAL_STATUS_NAMES.get(ord_status, f'Unknown ({ord_status})')
+
 def get_final_order_status(orders):
     """Get the final status of the order from the last execution report."""
     final_status = "Unknown"
@@ -491,27 +675,13 @@ def get_final_order_status(orders):
         
         for event in reversed(events):
             if event['msg_type'] == '8':  # Execution Report
-                ord_status = event.get('ord_status', '0')
-                status_map = {
-                    '0': 'New',
-                    '1': 'Partially Filled',
-                    '2': 'Filled',
-                    '4': 'Canceled',
-                    '5': 'Replaced',
-                    '6': 'Pending Cancel',
-                    '8': 'Rejected',
-                    'A': 'Pending New',
-                    'C': 'Expired',
-                    'E': 'Pending Replace'
-                }
-                final_status = status_map.get(ord_status, f'Unknown ({ord_status})')
+                final_status = final_status_name(event.get('ord_status', '0'))
                 break
     
     return final_status
 
 def generate_audit_data(orders):
     """Generate audit trail data from parsed orders."""
-    audit_data = []
     all_events = []
     
     for order_id, events in orders.items():
@@ -520,54 +690,55 @@ def generate_audit_data(orders):
     # Sort by timestamp
     all_events.sort(key=lambda x: x['timestamp'])
     
-    for event in all_events:
-        msg_type_desc = {
-            'D': 'New Order',
-            'G': 'Replace Request',
-            'F': 'Cancel Request',
-            '8': 'Execution Report'
-        }.get(event['msg_type'], 'Unknown')
-        
-        status_desc = {
-            '0': 'New',
-            '1': 'Partial Fill',
-            '2': 'Filled',
-            '3': 'Done for Day',
-            '4': 'Canceled',
-            '5': 'Replaced',
-            '6': 'Pending Cancel',
-            '7': 'Stopped',
-            '8': 'Rejected',
-            '9': 'Suspended',
-            'A': 'Pending New',
-            'B': 'Calculated',
-            'C': 'Expired',
-            'D': 'Accepted for Bidding',
-            'E': 'Pending Replace',
-            'F': 'Restated',
-            'G': 'Pending Last Look',
-            'H': 'Pending Cancel Replace'
-        }.get(event['ord_status'], f'Unknown ({event["ord_status"]})')
-        
-        audit_data.append({
-            'timestamp': event['timestamp'].strftime('%H:%M:%S.%f')[:-3],
-            'direction': event['direction'],  # IN or OUT
-            'connector': event['connector'],
-            'msg_type': msg_type_desc,
-            'order_id': event['cl_ord_id'],
-            'broker_order_id': event['order_id'],  # Tag 37
-            'orig_order_id': event['orig_cl_ord_id'],
-            'price': f"${event['price']}" if event['price'] and event['price'] != '0' else 'MARKET',
-            'avg_px': f"${event['avg_px']}" if event['avg_px'] and event['avg_px'] != '0' else '-',
-            'quantity': f"{int(event['order_qty']):,}" if event['order_qty'] else '0',
-            'cum_qty': f"{int(event['cum_qty']):,}" if event['cum_qty'] else '0',
-            'venue': 'MET Clearpool',
-            'status': status_desc,
-            'ord_status_code': event['ord_status'],
-            'raw_event': event
-        })
-    
-    return audit_data
+    return [audit_row(event) for event in all_events]
+
+def audit_row(event):
+    """Audit trail row of one order event."""
+    msg_type_desc = {
+        'D': 'New Order',
+        'G': 'Replace Request',
+        'F': 'Cancel Request',
+        '8': 'Execution Report'
+    }.get(event['msg_type'], 'Unknown')
+    
+    status_desc = {
+        '0': 'New',
+        '1': 'Partial Fill',
+        '2': 'Filled',
+        '3': 'Done for Day',
+        '4': 'Canceled',
+        '5': 'Replaced',
+        '6': 'Pending Cancel',
+        '7': 'Stopped',
+        '8': 'Rejected',
+        '9': 'Suspended',
+        'A': 'Pending New',
+        'B': 'Calculated',
+        'C': 'Expired',
+        'D': 'Accepted for Bidding',
+        'E': 'Pending Replace',
+        'F': 'Restated',
+        'G': 'Pending Last Look',
+        'H': 'Pending Cancel Replace'
+    }.get(event['ord_status'], f'Unknown ({event["ord_status"]})')
+    
+    return {
+        'timestamp': event['timestamp'].strftime('%H:%M:%S.%f')[:-3],
+        'direction': event['direction'],  # IN or OUT
+        'connector': event['connector'],
+        'msg_type': msg_type_desc,
+        'order_id': event['cl_ord_id'],
+        'broker_order_id': event['order_id'],  # Tag 37
+        'orig_order_id': event['orig_cl_ord_id'],
+        'price': f"${event['price']}" if event['price'] and event['price'] != '0' else 'MARKET',
+        'avg_px': f"${event['avg_px']}" if event['avg_px'] and event['avg_px'] != '0' else '-',
+        'quantity': f"{int(event['order_qty']):,}" if event['order_qty'] else '0',
+        'cum_qty': f"{int(event['cum_qty']):,}" if event['cum_qty'] else '0',
+        'venue': 'MET Clearpool',
+        'status': status_desc,
+        'ord_status_code': event['ord_status'],
+        'raw_event': event
+    }
 
 def create_order_timeline_figure(timeline_data):
     """Create a Gantt-style timeline for order chains."""
@@ -713,6 +884,55 @@ def create_timeline_figure(audit_data):
     
     return fig
 
+def audit_table_row(event):
+    """Table row of one audit trail row."""
+    # Determine message type styling
+    msg_type_class = {
+        'New Order': 'bg-green-100 text-green-800',
+        'Execution Report': 'bg-blue-100 text-blue-800',
+        'Replace Request': 'bg-yellow-100 text-yellow-800',
+        'Cancel Request': 'bg-red-100 text-red-800'
+    }.get(event['msg_type'], 'bg-gray-100 text-gray-800')
+    
+    # Determine direction styling
+    direction_class = "bg-blue-100 text-blue-800" if event['direction'] == 'OUT' else "bg-green-100 text-green-800"
+    direction_text = "OUTGOING" if event['direction'] == 'OUT' else "INCOMING"
+    
+    # Determine status styling
+    status_class = ""
+    if 'Filled' in event['status']:
+        status_class = "bg-green-100 text-green-800"
+    elif 'Cancel' in event['status']:
+        status_class = "bg-red-100 text-red-800"
+    elif 'Pending' in event['status']:
+        status_class = "bg-yellow-100 text-yellow-800"
+    elif 'Rejected' in event['status']:
+        status_class = "bg-red-100 text-red-800"
+    
+    return html.Tr(className="hover:bg-gray-50", children=[
+        html.Td(event['timestamp'], className="px-4 py-2 whitespace-nowrap text-sm text-gray-900 font-mono"),
+        html.Td(
+            html.Span(direction_text, className=f"px-2 py-1 text-xs font-medium rounded-full {direction_class}"),
+            className="px-4 py-2 whitespace-nowrap"
+        ),
+        html.Td(
+            html.Span(event['msg_type'], className=f"px-2 py-1 text-xs font-medium rounded-full {msg_type_class}"),
+            className="px-4 py-2 whitespace-nowrap"
+        ),
+        html.Td(event['order_id'], className="px-4 py-2 whitespace-nowrap text-sm text-gray-900 font-mono font-semibold"),
+        html.Td(event['broker_order_id'] or '-', className="px-4 py-2 whitespace-nowrap text-sm text-blue-600 font-mono"),
+        html.Td(event['orig_order_id'] or '-', className="px-4 py-2 whitespace-nowrap text-sm text-gray-600 font-mono"),
+        html.Td(event['price'], className="px-4 py-2 whitespace-nowrap text-sm text-gray-900 font-mono font-semibold"),
+        html.Td(event['avg_px'], className="px-4 py-2 whitespace-nowrap text-sm text-purple-600 font-mono font-semibold"),
+        html.Td(event['quantity'], className="px-4 py-2 whitespace-nowrap text-sm text-gray-900 font-mono"),
+        html.Td(event['cum_qty'], className="px-4 py-2 whitespace-nowrap text-sm text-gray-900 font-mono font-semibold"),
+        html.Td(
+            html.Span(event['status'], className=f"px-2 py-1 text-xs font-medium rounded-full {status_class}"),
+            className="px-4 py-2 whitespace-nowrap"
+        ),
+        html.Td(event['ord_status_code'], className="px-4 py-2 whitespace-nowrap text-sm text-gray-500 font-mono")
+    ])
+
 def create_audit_table(audit_data):
     """Create HTML table for audit trail with Tailwind CSS including Direction column."""
     # Create table header
@@ -731,56 +951,7 @@ def create_audit_table(audit_data):
         html.Th("Status Code", className="px-4 py-2 bg-gray-50 text-left text-xs font-medium text-gray-500 uppercase tracking-wider")
     ]))
     
-    # Create table rows
-    rows = []
-    for event in audit_data:
-        # Determine message type styling
-        msg_type_class = {
-            'New Order': 'bg-green-100 text-green-800',
-            'Execution Report': 'bg-blue-100 text-blue-800',
-            'Replace Request': 'bg-yellow-100 text-yellow-800',
-            'Cancel Request': 'bg-red-100 text-red-800'
-        }.get(event['msg_type'], 'bg-gray-100 text-gray-800')
-        
-        # Determine direction styling
-        direction_class = "bg-blue-100 text-blue-800" if event['direction'] == 'OUT' else "bg-green-100 text-green-800"
-        direction_text = "OUTGOING" if event['direction'] == 'OUT' else "INCOMING"
-        
-        # Determine status styling
-        status_class = ""
-        if 'Filled' in event['status']:
-            status_class = "bg-green-100 text-green-800"
-        elif 'Cancel' in event['status']:
-            status_class = "bg-red-100 text-red-800"
-        elif 'Pending' in event['status']:
-            status_class = "bg-yellow-100 text-yellow-800"
-        elif 'Rejected' in event['status']:
-            status_class = "bg-red-100 text-red-800"
-        
-        row = html.Tr(className="hover:bg-gray-50", children=[
-            html.Td(event['timestamp'], className="px-4 py-2 whitespace-nowrap text-sm text-gray-900 font-mono"),
-            html.Td(
-                html.Span(direction_text, className=f"px-2 py-1 text-xs font-medium rounded-full {direction_class}"),
-                className="px-4 py-2 whitespace-nowrap"
-            ),
-            html.Td(
-                html.Span(event['msg_type'], className=f"px-2 py-1 text-xs font-medium rounded-full {msg_type_class}"),
-                className="px-4 py-2 whitespace-nowrap"
-            ),
-            html.Td(event['order_id'], className="px-4 py-2 whitespace-nowrap text-sm text-gray-900 font-mono font-semibold"),
-            html.Td(event['broker_order_id'] or '-', className="px-4 py-2 whitespace-nowrap text-sm text-blue-600 font-mono"),
-            html.Td(event['orig_order_id'] or '-', className="px-4 py-2 whitespace-nowrap text-sm text-gray-600 font-mono"),
-            html.Td(event['price'], className="px-4 py-2 whitespace-nowrap text-sm text-gray-900 font-mono font-semibold"),
-            html.Td(event['avg_px'], className="px-4 py-2 whitespace-nowrap text-sm text-purple-600 font-mono font-semibold"),
-            html.Td(event['quantity'], className="px-4 py-2 whitespace-nowrap text-sm text-gray-900 font-mono"),
-            html.Td(event['cum_qty'], className="px-4 py-2 whitespace-nowrap text-sm text-gray-900 font-mono font-semibold"),
-            html.Td(
-                html.Span(event['status'], className=f"px-2 py-1 text-xs font-medium rounded-full {status_class}"),
-                className="px-4 py-2 whitespace-nowrap"
-            ),
-            html.Td(event['ord_status_code'], className="px-4 py-2 whitespace-nowrap text-sm text-gray-500 font-mono")
-        ])
-        rows.append(row)
+    rows = [audit_table_row(event) for event in audit_data]
     
     table_body = html.Tbody(rows, className="bg-white divide-y divide-gray-200")
     
@@ -823,6 +994,179 @@ def navigate_to_page(audit_clicks, timeline_clicks):
             'nav-button active bg-gradient-to-r from-blue-500 to-blue-600 text-white font-semibold py-3 px-6 rounded-lg shadow-md mr-3', 
             'nav-button bg-gradient-to-r from-purple-500 to-purple-600 text-white font-semibold py-3 px-6 rounded-lg shadow-md')
 
+def render_outputs(orders, replacement_chains, order_id_map, order_timestamps):
+    """Build the summary cards, table, timeline and stores for the main callback."""
+    audit_data = generate_audit_data(orders)
+    
+    # Calculate summary statistics
+    total_messages = len(audit_data)
+    
+    # Build order hierarchy text with Tag 37 tracking
+    hierarchy_text = build_order_hierarchy_text(replacement_chains, order_id_map, order_timestamps, orders)
+    order_chain = next(iter(replacement_chains.values())) if replacement_chains else list(orders.keys())[0] if orders else 'N/A'
+    
+    # Find symbol
+    symbol = 'BRXYZ91'
+    for events in orders.values():
+        for event in events:
+            if event.get('symbol'):
+                symbol = event['symbol']
+                break
+    
+    # Calculate total and filled quantities
+    total_qty = 0
+    filled_qty = 0
+    
+    for events in orders.values():
+        for event in events:
+            if event.get('order_qty'):
+                try:
+                    total_qty = max(total_qty, int(event['order_qty']))
+                except:
+                    pass
+            if event.get('cum_qty'):
+                try:
+                    filled_qty = max(filled_qty, int(event['cum_qty']))
+                except:
+                    pass
+    
+    # Calculate average price using Tag 6 (AvgPx)
+    avg_px = calculate_avg_px(audit_data)
+    
+    # Get final order status
+    final_status = get_final_order_status(orders)
+    
+    # Create audit table
+    table = create_audit_table(audit_data)
+    
+    # Create timeline figure
+    timeline_fig = create_timeline_figure(audit_data)
+    
+    # Store data for other pages
+    store_data = {
+        'audit_data': audit_data,
+        'orders': {k: v for k, v in orders.items()},
+        'replacement_chains': replacement_chains,
+        'order_id_map': order_id_map,
+        'order_timestamps': order_timestamps
+    }
+    
+    return [
+        f"{total_messages}",
+        order_chain,
+        symbol,
+        f"{total_qty:,}",
+        f"{filled_qty:,}",
+        f"${avg_px:.2f}" if avg_px > 0 else "$0.00",
+        final_status,
+        table,
+        timeline_fig,
+        hierarchy_text,
+        store_data,
+        dict(orders),
+        replacement_chains,
+        order_id_map
+    ]
+
+def _patch_orders(patch, order_events, known, rank):
+    """Append the new events of known orders, add the new orders whole"""
+    for cl_ord_id, events in order_events.items():
+        if rank[cl_ord_id] < known:
+            patch[cl_ord_id].extend(events)
+        else:
+            patch[cl_ord_id] = events
+
+def render_live_update(state):
+    """
+    Outputs of one live tick: the new rows are appended to the table and the
+    stores with Patch, the timeline and hierarchy are rebuilt only when what
+    they show changed. The first tick, or an event older than the rows already
+    shown, renders everything.
+    """
+    known, plotted = len(state.rank), len(state.exec_rows)
+    rows = state.take() if state.shown else None
+    if rows is None:
+        outputs = render_outputs(*state.result())
+        state.reset_view()
+        state.take()
+        return outputs
+    
+    table = Patch()
+    table['props']['children'][1]['props']['children'].extend([audit_table_row(row) for row in rows])
+    
+    timeline_fig = create_timeline_figure(state.exec_rows) if len(state.exec_rows) > plotted else dash.no_update
+    
+    touched = dict.fromkeys(row['order_id'] for row in rows)
+    chains = state.replacement_chains
+    in_chains = any(cl_ord_id in chains or cl_ord_id in chains.values() for cl_ord_id in touched)
+    hierarchy_text = (build_order_hierarchy_text(chains, state.order_id_map, state.order_timestamps, state.orders)
+                      if in_chains else dash.no_update)
+    
+    order_events = {}
+    for row in rows:
+        order_events.setdefault(row['order_id'], []).append(row['raw_event'])
+    chain_changes = {k: chains[k] for k in touched if k in chains}
+    id_changes = {k: state.order_id_map[k] for k in touched if k in state.order_id_map}
+    
+    store_data = Patch()
+    store_data['audit_data'].extend(rows)
+    _patch_orders(store_data['orders'], order_events, known, state.rank)
+    store_data['replacement_chains'].update(chain_changes)
+    store_data['order_id_map'].update(id_changes)
+    store_data['order_timestamps'].update({k: state.order_timestamps[k] for k in touched})
+    orders_data = Patch()
+    _patch_orders(orders_data, order_events, known, state.rank)
+    chains_data = Patch()
+    chains_data.update(chain_changes)
+    id_map_data = Patch()
+    id_map_data.update(id_changes)
+    
+    return state.summary() + [
+        table,
+        timeline_fig,
+        hierarchy_text,
+        store_data,
+        orders_data,
+        chains_data if chain_changes else dash.no_update,
+        id_map_data if id_changes else dash.no_update
+    ]
+
+# Live tail start/stop
+@app.callback(
+    [Output('live-session-store', 'data'),
+     Output('live-interval', 'disabled'),
+     Output('live-status', 'children')],
+    [Input('live-start-button', 'n_clicks'),
+     Input('live-stop-button', 'n_clicks')],
+    [State('live-log-paths', 'value'),
+     State('live-session-store', 'data')]
+)
+def toggle_live(start_clicks, stop_clicks, paths_value, session_id):
+    ctx = callback_context
+    if not ctx.triggered:
+        raise PreventUpdate
+    
+    # Whatever was being followed before is dropped in both cases
+    close_session(session_id)
+    
+    if ctx.triggered[0]['prop_id'].split('.')[0] == 'live-stop-button':
+        return None, True, "Live tail stopped"
+    
+    typed = [p.strip() for p in (paths_value or '').split(',') if p.strip()]
+    if not typed:
+        return None, True, "Enter at least one log file path"
+    # Only files under the configured log root may be followed
+    paths = [resolve_log_path(p) for p in typed]
+    outside = [p for p, resolved in zip(typed, paths) if resolved is None]
+    if outside:
+        return None, True, f"Not under the log root {log_root()}: {', '.join(outside)}"
+    missing = [p for p, resolved in zip(typed, paths) if not os.path.isfile(resolved)]
+    if missing:
+        return None, True, f"File not found: {', '.join(missing)}"
+    
+    new_session = open_session(paths, LiveAuditState)
+    return new_session, False, f"Following {len(paths)} file(s), refreshing every {LIVE_REFRESH_MS // 1000}s"
+
 # Main analysis callback
 @app.callback(
     [Output('total-messages', 'children'),
@@ -839,86 +1183,31 @@ def navigate_to_page(audit_clicks, timeline_clicks):
      Output('orders-store', 'data'),
      Output('replacement-chains-store', 'data'),
      Output('order-id-map-store', 'data')],
-    [Input('analyze-button', 'n_clicks')],
-    [State('fix-log-input', 'value')]
+    [Input('analyze-button', 'n_clicks'),
+     Input('live-interval', 'n_intervals')],
+    [State('fix-log-input', 'value'),
+     State('live-session-store', 'data')]
 )
-def update_output(n_clicks, log_content):
-    if n_clicks == 0 or not log_content:
+def update_output(n_clicks, n_intervals, log_content, session_id):
+    ctx = callback_context
+    live_tick = bool(ctx.triggered) and ctx.triggered[0]['prop_id'].startswith('live-interval')
+    
+    if live_tick:
+        # Only the lines appended since the last tick are parsed and sent
+        session = get_session(session_id)
+        if session is None or not session.poll():
+            raise PreventUpdate
+        try:
+            with session.lock:
+                return render_live_update(session.state)
+        except Exception as e:
+            return [f"Error: {str(e)}"] * 8 + [go.Figure(), f"Error: {str(e)}", None, None, None, None]
+    
+    if not n_clicks or not log_content:
         return ['0', 'N/A', 'N/A', '0', '0', '$0.00', 'Unknown', '', go.Figure(), "No data to display", None, None, None, None]
     
     try:
-        orders, replacement_chains, order_id_map, order_timestamps = process_fix_log(log_content)
-        audit_data = generate_audit_data(orders)
-        
-        # Calculate summary statistics
-        total_messages = len(audit_data)
-        
-        # Build order hierarchy text with Tag 37 tracking
-        hierarchy_text = build_order_hierarchy_text(replacement_chains, order_id_map, order_timestamps, orders)
-        order_chain = next(iter(replacement_chains.values())) if replacement_chains else list(orders.keys())[0] if orders else 'N/A'
-        
-        # Find symbol
-        symbol = 'BRXYZ91'
-        for events in orders.values():
-            for event in events:
-                if event.get('symbol'):
-                    symbol = event['symbol']
-                    break
-        
-        # Calculate total and filled quantities
-        total_qty = 0
-        filled_qty = 0
-        
-        for events in orders.values():
-            for event in events:
-                if event.get('order_qty'):
-                    try:
-                        total_qty = max(total_qty, int(event['order_qty']))
-                    except:
-                        pass
-                if event.get('cum_qty'):
-                    try:
-                        filled_qty = max(filled_qty, int(event['cum_qty']))
-                    except:
-                        pass
-        
-        # Calculate average price using Tag 6 (AvgPx)
-        avg_px = calculate_avg_px(audit_data)
-        
-        # Get final order status
-        final_status = get_final_order_status(orders)
-        
-        # Create audit table
-        table = create_audit_table(audit_data)
-        
-        # Create timeline figure
-        timeline_fig = create_timeline_figure(audit_data)
-        
-        # Store data for other pages
-        store_data = {
-            'audit_data': audit_data,
-            'orders': {k: v for k, v in orders.items()},
-            'replacement_chains': replacement_chains,
-            'order_id_map': order_id_map,
-            'order_timestamps': order_timestamps
-        }
-        
-        return [
-            f"{total_messages}",
-            order_chain,
-            symbol,
-            f"{total_qty:,}",
-            f"{filled_qty:,}",
-            f"${avg_px:.2f}" if avg_px > 0 else "$0.00",
-            final_status,
-            table,
-            timeline_fig,
-            hierarchy_text,
-            store_data,
-            dict(orders),
-            replacement_chains,
-            order_id_map
-        ]
+        return render_outputs(*process_fix_log(log_content))
         
     except Exception as e:
         return [f"Error: {str(e)}"] * 8 + [go.Figure(), f"Error: {str(e)}", None, None, None, None]
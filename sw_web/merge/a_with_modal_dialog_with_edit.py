@@ -3,6 +3,12 @@ from dash import State, dcc, html, Input, Output, dash_table
 import pandas as pd
 import dash_cytoscape as cyto
 import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from fixlib.frame_store import FrameStore, frame_store
+from fixlib.paged_table import page_count, register_paged_table, register_table_export
 
 # Load data from external JSON file
 def load_client_data():
@@ -212,6 +218,11 @@ if 'End Time' in df.columns:
 if not df.empty:
     df['Actions'] = '...'
 
+# Rows per page of the client table; pages are served from the frame store
+PAGE_SIZE = 15
+ALL_CLIENTS_KEY = FrameStore.make_key('clients', 'all')
+frame_store().put(df, 'clients', 'all')
+
 merged_accounts_df = get_merged_accounts()
 
 adapter_data = load_adapter_data()
@@ -975,8 +986,11 @@ def create_dashboard_layout():
                                 # Ensure Actions column is last and styled
                                 {"name": "Actions", "id": "Actions"}
                             ]) if not df.empty else [],
-                            data=df.to_dict("records") if len(df) > 0 else [],
-                            page_size=15,
+                            data=df.iloc[:PAGE_SIZE].to_dict("records") if len(df) > 0 else [],
+                            page_size=PAGE_SIZE,
+                            page_current=0,
+                            page_count=page_count(len(df), PAGE_SIZE),
+                            page_action="custom",
                             style_table={"overflowX": "auto", "minWidth": "100%"},
                             style_cell={
                                 'padding': '12px', 
@@ -1013,11 +1027,18 @@ def create_dashboard_layout():
                                     'color': '#3b82f6'
                                 }
                             ],
-                            sort_action="native",
-                            filter_action="native",
-                            export_format="xlsx",
-                            export_headers="display"
-                        )
+                            sort_action="custom",
+                            sort_mode="multi",
+                            sort_by=[],
+                            filter_action="custom",
+                            filter_query="",
+                            filter_options={"case": "insensitive"}
+                        ),
+                        dcc.Store(id="table-key-store", data=ALL_CLIENTS_KEY),
+                        # Exports the whole filtered and sorted result (the table only holds one page)
+                        html.Button("Export", id="export-table-btn",
+                                    className="mt-3 px-4 py-2 bg-blue-600 text-white rounded-md hover:bg-blue-700"),
+                        dcc.Download(id="download-table-xlsx")
                     ])
                 ], className="bg-white p-4 rounded-lg shadow-md"),
 
@@ -1577,7 +1598,7 @@ def update_oms_dropdown(selected_network, client_search, account_search, service
 
 # Callback 3: Filter table and update summary based on all selections and searches (only when on home page)
 @app.callback(
-    Output("data-table", "data"),
+    Output("table-key-store", "data"),
     Output("summary-output", "children"),
     Input("value-dropdown", "value"),
     Input("network-tabs", "value"),
@@ -1592,10 +1613,10 @@ def update_table_and_summary(selected_oms, selected_network, client_search, acco
         return dash.no_update, dash.no_update
     
     if len(df) == 0:
-        return [], html.Div("No data available. Please check if client.json exists.", className="text-red-600")
+        return None, html.Div("No data available. Please check if client.json exists.", className="text-red-600")
     
-    # Start with all data
-    filtered_df = df.copy()
+    # Start with all data (filters below build new frames, df itself is never modified)
+    filtered_df = df
     filter_descriptions = []
     
     # Apply global search filters first (regardless of network/OMS)
@@ -1659,7 +1680,19 @@ def update_table_and_summary(selected_oms, selected_network, client_search, acco
             ])
         ])
     
-    return filtered_df.to_dict("records"), summary
+    # The table pages, sorts and column-filters this frame on the server
+    if filtered_df is not df:
+        table_key = frame_store().put(filtered_df, 'clients')
+    else:
+        table_key = ALL_CLIENTS_KEY
+        if frame_store().get(table_key) is None:
+            frame_store().put(df, 'clients', 'all')
+    return table_key, summary
+
+
+register_paged_table(app, "data-table", "table-key-store", PAGE_SIZE)
+register_table_export(app, "export-table-btn", "download-table-xlsx", "data-table", "table-key-store",
+                      "clients.xlsx")
 
 # Callback to open and populate the modal
 @app.callback(
@@ -1673,11 +1706,9 @@ def update_table_and_summary(selected_oms, selected_network, client_search, acco
     Input("modal-close-x-button", "n_clicks"),
     Input("row-data-modal", "n_clicks"),
     State("data-table", "data"),
-    State("data-table", "page_current"),
-    State("data-table", "page_size"),
     prevent_initial_call=True
 )
-def handle_modal_action_menu(active_cell, close_main, close_x, overlay, table_data, page_current, page_size):
+def handle_modal_action_menu(active_cell, close_main, close_x, overlay, table_data):
     ctx = dash.callback_context
     if not ctx.triggered: 
         return dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update
@@ -1689,10 +1720,8 @@ def handle_modal_action_menu(active_cell, close_main, close_x, overlay, table_da
 
     # Open modal if a cell is clicked
     if triggered_id == "data-table" and active_cell:
-        page_current = page_current or 0 # page_current can be None on first load
-        page_size = page_size or 15
-        absolute_row_index = (page_current * page_size) + active_cell['row']
-        selected_row = table_data[absolute_row_index]
+        # The table only holds the current page, so the cell row indexes it directly
+        selected_row = table_data[active_cell['row']]
 
         # If 'Actions' column is clicked, show the menu
         if active_cell['column_id'] == 'Actions':
@@ -1795,35 +1824,50 @@ def show_edit_view(n_clicks, selected_row):
 
     return edit_form
 
-# Callback to save edited data (This is a placeholder and would need more logic to persist changes)
+# Callback to save edited data. The table only holds the current page, so the edit goes
+# into a new version of the table's stored frame: paging, sorting and filtering keep it
+# (a new search starts again from the loaded client data).
 @app.callback(
-    Output("data-table", "data", allow_duplicate=True),
+    Output("table-key-store", "data", allow_duplicate=True),
     Output("row-data-modal", "style", allow_duplicate=True),
     Input("save-edit-btn", "n_clicks"),
     State({'type': 'edit-input', 'index': dash.ALL}, 'value'),
     State({'type': 'edit-input', 'index': dash.ALL}, 'id'),
     State("selected-row-store", "data"),
-    State("data-table", "data"),
+    State("table-key-store", "data"),
     prevent_initial_call=True
 )
-def save_edited_data(n_clicks, values, ids, original_row, table_data):
+def save_edited_data(n_clicks, values, ids, original_row, table_key):
     if not n_clicks:
         return dash.no_update, dash.no_update
 
     # Create a dictionary of the updated values
     updated_row = {id['index']: value for id, value in zip(ids, values)}
 
-    # Find the original row in the table data and update it
+    # Find the original row in the table's frame and update it in a copy
     # This example uses 'Account' as a unique key. You might need a more robust key.
-    account_key = original_row.get('Account')
-    for i, row in enumerate(table_data):
-        if row.get('Account') == account_key:
-            table_data[i].update(updated_row)
-            break
-    
-    # Close the modal and update the table
-    return table_data, {'display': 'none'}
-
+    table_df = frame_store().get(table_key)
+    account_key = (original_row or {}).get('Account')
+    if table_df is None or 'Account' not in table_df.columns:
+        return dash.no_update, {'display': 'none'}
+    matches = (table_df['Account'] == account_key).to_numpy().nonzero()[0]
+    if not len(matches):
+        return dash.no_update, {'display': 'none'}
+
+    edited_df = table_df.copy()
+    for column, value in updated_row.items():
+        if column not in edited_df.columns:
+            continue
+        position = edited_df.columns.get_loc(column)
+        try:
+            edited_df.iloc[matches[0], position] = value
+        except (TypeError, ValueError):
+            # e.g. text typed into a numeric column
+            edited_df[column] = edited_df[column].astype(object)
+            edited_df.iloc[matches[0], position] = value
+
+    # Close the modal and serve the table from the edited frame
+    return frame_store().put(edited_df, 'clients'), {'display': 'none'}
 
 if __name__ == "__main__":
     app.run(debug=True)
@@ -1,24 +1,21 @@
-import json
-import configparser
 import os
-from pathlib import Path
+import sys
 
-def load_and_group_ini_files(directory='.', output_file='grouped_sessions.json'):
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from fixlib.session_config import (DEFAULT_CATEGORIES, DEFAULT_WORKERS, find_session_files, group_sessions,
+                                   load_session_files, write_grouped_sessions)
+
+def load_and_group_ini_files(directory='.', output_file='grouped_sessions.json', workers=DEFAULT_WORKERS):
     """
     Load all INI files from a directory and group them by category.
     
     Args:
         directory: Directory containing the .ini files (default: current directory)
         output_file: Path to the output JSON file
+        workers: Threads parsing the INI files that changed
     """
-    # Dictionary to store grouped sessions
-    grouped_sessions = {
-        'client': {},
-        'DROP_COPY': {}
-    }
-    
     # Get all .ini files in the directory
-    ini_files = list(Path(directory).glob('*.ini'))
+    ini_files = find_session_files(directory)
     
     if not ini_files:
         print(f"No .ini files found in {directory}")
@@ -26,57 +23,24 @@ def load_and_group_ini_files(directory='.', output_file='grouped_sessions.json')
     
     print(f"Found {len(ini_files)} INI files")
     
-    # Process each INI file
-    for ini_file in ini_files:
-        try:
-            config = configparser.ConfigParser()
-            config.read(ini_file)
-            
-            # Get the session name from filename (without extension)
-            session_name = ini_file.stem
-            
-            # Convert INI to dictionary
-            session_data = {}
-            category = None
-            
-            for section in config.sections():
-                session_data[section] = {}
-                
-                for key, value in config.items(section):
-                    # Try to convert numeric values
-                    try:
-                        session_data[section][key] = int(value)
-                    except ValueError:
-                        try:
-                            session_data[section][key] = float(value)
-                        except ValueError:
-                            session_data[section][key] = value
-                
-                # Check if this section has a category field
-                if 'category' in session_data[section]:
-                    category = session_data[section]['category']
-            
-            # Group by category
-            if category and category in grouped_sessions:
-                grouped_sessions[category][session_name] = session_data
-                print(f"  ✓ {session_name} -> {category}")
-            else:
-                # If no category found or unknown category, log it
-                if category:
-                    print(f"  ⚠ {session_name} has unknown category: {category}")
-                    # Create a new category for unknown ones
-                    if category not in grouped_sessions:
-                        grouped_sessions[category] = {}
-                    grouped_sessions[category][session_name] = session_data
-                else:
-                    print(f"  ⚠ {session_name} has no category field")
-        
-        except Exception as e:
-            print(f"  ✗ Error processing {ini_file.name}: {e}")
+    # Parse the files that changed since the last run (in parallel); the rest come from the cache
+    rule_set = load_session_files(ini_files, workers=workers)
+    grouped_sessions = group_sessions(rule_set.files)
+    
+    for session in rule_set.files.values():
+        category = session.category
+        if session.error is not None:
+            print(f"  ✗ Error processing {session.name}: {session.error}")
+        elif category is None:
+            print(f"  ⚠ {session.stem} has no category field")
+        elif category in DEFAULT_CATEGORIES:
+            print(f"  ✓ {session.stem} -> {category}")
+        else:
+            print(f"  ⚠ {session.stem} has unknown category: {category}")
     
-    # Write to JSON file
-    with open(output_file, 'w') as f:
-        json.dump(grouped_sessions, f, indent=2)
+    # Write to JSON file, only if a session changed
+    if not write_grouped_sessions(grouped_sessions, output_file):
+        print(f"{output_file} is up to date")
     
     # Print summary
     print(f"\n{'='*50}")
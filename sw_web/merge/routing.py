@@ -1,6 +1,14 @@
+import os
+import sys
 import pandas as pd
 from typing import Dict, List, Any
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from fixlib.rule_frame import diff_routes, first_match, reroute_summary
+
+# Order columns used by get_routing_desk, in rule field names
+DESK_COLUMNS = ['ACCOUNT', '#TARGETSUBID', 'ETF']
+
 class RoutingEngine:
     def __init__(self, lookup_fields: List[str], results: Dict[str, int]):
         self.lookup_fields = lookup_fields
@@ -47,6 +55,44 @@ class RoutingEngine:
                     return desk_field
         return None
 
+    def get_routing_desks(self, rules: List[Dict], orders: pd.DataFrame) -> pd.Series:
+        """
+        get_routing_desk for a whole DataFrame of orders with ACCOUNT, #TARGETSUBID
+        and ETF columns, using joins and masks instead of one call per order.
+        Returns the desk per order (None where no rule applies), aligned with orders.
+        """
+        # Only rules that name a desk can be returned
+        desk_rules = []
+        desks = []
+        for rule in rules:
+            desk_field = list(rule.values())[-1] if rule else None
+            if desk_field and desk_field != '*':
+                # A field missing from a short line never equals a given value
+                desk_rules.append({c: rule.get(c, '') for c in DESK_COLUMNS})
+                desks.append(desk_field)
+        
+        keys = pd.DataFrame(index=orders.index)
+        for column in DESK_COLUMNS:
+            values = orders[column] if column in orders.columns else pd.Series(None, index=orders.index, dtype=object)
+            # Empty #TARGETSUBID / ETF means "not given", as in evaluate_rule
+            keys[column] = values.where(values.notna() & (values != ''), None) if column != 'ACCOUNT' else values
+        
+        positions = first_match(pd.DataFrame(desk_rules, columns=DESK_COLUMNS), keys, DESK_COLUMNS,
+                                wildcards=('*',), optional_columns=['#TARGETSUBID', 'ETF'])
+        desk_lookup = pd.Series(desks + [None], dtype=object)
+        return pd.Series(desk_lookup.iloc[positions.values].values, index=orders.index, dtype=object)
+    
+    def compare_rule_versions(self, current_rules: List[Dict], proposed_rules: List[Dict],
+                              orders: pd.DataFrame):
+        """
+        Orders whose desk changes between two versions of the client rules, and the
+        number of orders per old desk -> new desk flow.
+        """
+        diff = diff_routes(orders,
+                           self.get_routing_desks(current_rules, orders),
+                           self.get_routing_desks(proposed_rules, orders))
+        return diff, reroute_summary(diff)
+
 def main():
     # Given routing lookup configuration
     lookup_config = {
@@ -9,6 +9,11 @@ from typing import Dict, List, Optional, Tuple
 import colorsys
 import random
 from collections import defaultdict
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from fixlib.rule_cache import rule_cache
 
 # Initialize Dash app
 app = dash.Dash(__name__)
@@ -20,68 +25,77 @@ column_names = []
 all_accounts = set()
 accounts_df = None
 
-def load_data():
-    """Load routing data from files"""
-    global routing_rules, column_names, all_accounts, accounts_df
-    
-    # Parse INI file
-    config = configparser.ConfigParser()
-    config.read('enrichments/enrichment_Flex17_MultiDesk_Routing.ini')
-    
-    separator = config.get('separator', 'value', fallback=';')
-    
-    # Get column names from INI
-    column_map = {}
-    if config.has_section('lookup'):
-        for key, value in config.items('lookup'):
-            column_map[int(key)] = value
+RULES_INI = 'enrichments/enrichment_Flex17_MultiDesk_Routing.ini'
+RULES_CSV = 'enrichments/enrichment_Flex17_MultiDesk_Routing.csv'
+# Seconds between checks of the rule files for changes
+RELOAD_CHECK_SECONDS = 5.0
+
+def parse_rule_file(path):
+    """INI -> (separator, column names); CSV -> (line number, stripped line) pairs"""
+    if path.endswith('.ini'):
+        config = configparser.ConfigParser()
+        config.read(path)
+        
+        separator = config.get('separator', 'value', fallback=';')
+        
+        # Get column names from INI
+        column_map = {}
+        if config.has_section('lookup'):
+            for key, value in config.items('lookup'):
+                column_map[int(key)] = value
+        return separator, [column_map.get(i, f'Column_{i}') for i in range(13)]
     
-    # Create column names list
-    column_names = [column_map.get(i, f'Column_{i}') for i in range(13)]
+    with open(path, 'r', encoding='utf-8') as f:
+        return [(line_num, line.strip()) for line_num, line in enumerate(f) if line.strip()]
+
+def build_rules(files):
+    """Routing rules, column names, accounts and the accounts table from the parsed INI and CSV"""
+    separator, names = files.get(os.path.abspath(RULES_INI), (';', [f'Column_{i}' for i in range(13)]))
+    rules = []
+    accounts = set()
+    for line_num, line in files.get(os.path.abspath(RULES_CSV), []):
+        parts = line.split(separator)
+        if len(parts) < 13:
+            parts += [''] * (13 - len(parts))
+        
+        parts = [p.strip() for p in parts]
+        
+        account = parts[0] if len(parts) > 0 else ''
+        desk = parts[12] if len(parts) > 12 else ''
+        
+        if account and account != '*':
+            accounts.add(account)
+        
+        rules.append({
+            'id': line_num,
+            'line': line,
+            'account': account,
+            'desk': desk,
+            'etf': parts[9] if len(parts) > 9 else '',
+            'has_prog': (len(parts) > 3 and parts[3] == 'PROG') or 
+                       (len(parts) > 4 and parts[4] == 'PROG'),
+            'has_pt': len(parts) > 5 and parts[5] == 'PT',
+            'is_wildcard': account in ('', '*'),
+            'all_columns': parts
+        })
     
-    # Read CSV file
-    routing_rules = []
-    with open('enrichments/enrichment_Flex17_MultiDesk_Routing.csv', 'r', encoding='utf-8') as f:
-        for line_num, line in enumerate(f):
-            line = line.strip()
-            if not line:
-                continue
-                
-            parts = line.split(separator)
-            if len(parts) < 13:
-                parts += [''] * (13 - len(parts))
-            
-            parts = [p.strip() for p in parts]
-            
-            account = parts[0] if len(parts) > 0 else ''
-            desk = parts[12] if len(parts) > 12 else ''
-            
-            if account and account != '*':
-                all_accounts.add(account)
-            
-            routing_rules.append({
-                'id': line_num,
-                'line': line,
-                'account': account,
-                'desk': desk,
-                'etf': parts[9] if len(parts) > 9 else '',
-                'has_prog': (len(parts) > 3 and parts[3] == 'PROG') or 
-                           (len(parts) > 4 and parts[4] == 'PROG'),
-                'has_pt': len(parts) > 5 and parts[5] == 'PT',
-                'is_wildcard': account in ('', '*'),
-                'all_columns': parts
-            })
+    return rules, names, accounts, pd.DataFrame(account_summaries(rules, accounts))
+
+def account_summaries(rules, accounts):
+    """One accounts-table row per account"""
+    wildcard_rules = [r for r in rules if r['is_wildcard']]
+    wildcard_desks = set([r['desk'] for r in wildcard_rules if r['desk']])
+    rules_by_account = defaultdict(list)
+    for r in rules:
+        rules_by_account[r['account']].append(r)
     
-    # Create accounts dataframe for the table
     accounts_list = []
-    for account in sorted(all_accounts):
-        account_rules = [r for r in routing_rules if r['account'] == account]
-        wildcard_rules = [r for r in routing_rules if r['is_wildcard']]
+    for account in sorted(accounts):
+        account_rules = rules_by_account.get(account, [])
         total_rules = len(account_rules) + len(wildcard_rules)
         
         # Get unique desks for this account
         desks = set([r['desk'] for r in account_rules if r['desk']])
-        wildcard_desks = set([r['desk'] for r in wildcard_rules if r['desk']])
         all_desks = list(desks.union(wildcard_desks))
         
         accounts_list.append({
@@ -93,13 +107,20 @@ def load_data():
             'has_pt': 'Yes' if any(r['has_pt'] for r in account_rules) else 'No',
             'has_etf': 'Yes' if any(r['etf'] for r in account_rules) else 'No'
         })
+    return accounts_list
+
+def load_data(max_age=0.0):
+    """Load routing data from files, re-parsing only when they changed"""
+    global routing_rules, column_names, all_accounts, accounts_df
     
-    accounts_df = pd.DataFrame(accounts_list)
-    
-    return routing_rules, column_names
+    rule_set = rule_cache('enrichment_multidesk_accounts').load(
+        [RULES_INI, RULES_CSV], parse_rule_file, build_rules, max_age=max_age)
+    # Rebind every global from one fully built version; callbacks use the returned tuple
+    routing_rules, column_names, all_accounts, accounts_df = rule_set.compiled
+    return rule_set.compiled
 
 # Load initial data
-routing_rules, column_names = load_data()
+load_data()
 
 # Modal dialog for account rules
 account_modal = html.Div([
@@ -494,6 +515,8 @@ def handle_account_modal(view_clicks, close_clicks, account_selected_rows, rule_
         return modal_style, "Account Routing Rules", "", [], "Select a rule to see details", {'display': 'none'}
     
     trigger_id = ctx.triggered[0]['prop_id'].split('.')[0]
+    # Rules of the current file version (re-checked at most every RELOAD_CHECK_SECONDS)
+    rules, names, _, _ = load_data(max_age=RELOAD_CHECK_SECONDS)
     
     # Handle modal close
     if trigger_id == 'close-modal':
@@ -507,8 +530,8 @@ def handle_account_modal(view_clicks, close_clicks, account_selected_rows, rule_
         account = accounts_table_data[selected_row]['account']
         
         # Get all rules for this account
-        account_rules = [r for r in routing_rules if r['account'] == account]
-        wildcard_rules = [r for r in routing_rules if r['is_wildcard']]
+        account_rules = [r for r in rules if r['account'] == account]
+        wildcard_rules = [r for r in rules if r['is_wildcard']]
         all_rules = account_rules + wildcard_rules
         
         # Prepare table data
@@ -546,7 +569,7 @@ def handle_account_modal(view_clicks, close_clicks, account_selected_rows, rule_
         rule = modal_rules_data[selected_row]
         
         # Find the full rule object
-        rule_obj = next((r for r in routing_rules if r['id'] == rule['id']), None)
+        rule_obj = next((r for r in rules if r['id'] == rule['id']), None)
         
         if not rule_obj:
             return dash.no_update, dash.no_update, dash.no_update, dash.no_update, "Rule details not found", {'display': 'none'}
@@ -566,7 +589,7 @@ def handle_account_modal(view_clicks, close_clicks, account_selected_rows, rule_
                 html.Tbody([
                     html.Tr([
                         html.Td(i),
-                        html.Td(column_names[i] if i < len(column_names) else f'Column_{i}'),
+                        html.Td(names[i] if i < len(names) else f'Column_{i}'),
                         html.Td(rule_obj['all_columns'][i] if i < len(rule_obj['all_columns']) else '')
                     ]) for i in range(13)
                 ])
@@ -697,28 +720,9 @@ def handle_confirmation_modal(add_clicks, close_clicks, cancel_clicks, ok_clicks
     [Input('refresh-accounts', 'n_clicks')]
 )
 def refresh_accounts(refresh_clicks):
-    # Recreate accounts dataframe
-    accounts_list = []
-    for account in sorted(all_accounts):
-        account_rules = [r for r in routing_rules if r['account'] == account]
-        wildcard_rules = [r for r in routing_rules if r['is_wildcard']]
-        total_rules = len(account_rules) + len(wildcard_rules)
-        
-        desks = set([r['desk'] for r in account_rules if r['desk']])
-        wildcard_desks = set([r['desk'] for r in wildcard_rules if r['desk']])
-        all_desks = list(desks.union(wildcard_desks))
-        
-        accounts_list.append({
-            'account': account,
-            'rule_count': len(account_rules),
-            'total_rules': total_rules,
-            'desks': ', '.join(all_desks) if all_desks else 'None',
-            'has_prog': 'Yes' if any(r['has_prog'] for r in account_rules) else 'No',
-            'has_pt': 'Yes' if any(r['has_pt'] for r in account_rules) else 'No',
-            'has_etf': 'Yes' if any(r['etf'] for r in account_rules) else 'No'
-        })
-    
-    return accounts_list
+    # Pick up edited rule files; the accounts table is rebuilt only when they changed
+    _, _, _, accounts = load_data()
+    return accounts.to_dict('records')
 
 # Callbacks for visualization (from previous code)
 def generate_light_color(seed=None):
@@ -781,8 +785,9 @@ def update_selected_accounts(input_value):
     if not input_value:
         return []
     
+    _, _, known_accounts, _ = load_data(max_age=RELOAD_CHECK_SECONDS)
     accounts = [acc.strip() for acc in input_value.split(',') if acc.strip()]
-    return [acc for acc in accounts if acc in all_accounts]
+    return [acc for acc in accounts if acc in known_accounts]
 
 # Add custom CSS
 app.index_string = '''
@@ -7,6 +7,11 @@ import pandas as pd
 import configparser
 from typing import Dict, List, Optional, Tuple
 import io
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from fixlib.rule_cache import rule_cache
 
 # Initialize Dash app
 app = dash.Dash(__name__)
@@ -17,52 +22,62 @@ routing_rules = []
 column_names = []
 FILE_PATH='enrichments'
 
-def load_data():
-    """Load routing data from files"""
+RULES_INI = f'{FILE_PATH}/enrichment_Flex17_MultiDesk_Routing.ini'
+RULES_CSV = f'{FILE_PATH}/enrichment_Flex17_MultiDesk_Routing.csv'
+# Seconds between checks of the rule files for changes
+RELOAD_CHECK_SECONDS = 5.0
+
+def parse_rule_file(path):
+    """INI -> (separator, column names); CSV -> (line number, stripped line) pairs"""
+    if path.endswith('.ini'):
+        config = configparser.ConfigParser()
+        config.read(path)
+        
+        separator = config.get('separator', 'value', fallback=';')
+        
+        # Get column names from INI
+        column_map = {}
+        if config.has_section('lookup'):
+            for key, value in config.items('lookup'):
+                column_map[int(key)] = value
+        return separator, [column_map.get(i, f'Column_{i}') for i in range(13)]
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        return [(line_num, line.strip()) for line_num, line in enumerate(f) if line.strip()]
+
+def build_rules(files):
+    """Routing rules and column names from the parsed INI and CSV"""
+    separator, names = files.get(os.path.abspath(RULES_INI), (';', [f'Column_{i}' for i in range(13)]))
+    rules = []
+    for line_num, line in files.get(os.path.abspath(RULES_CSV), []):
+        parts = line.split(separator)
+        if len(parts) < 13:
+            parts += [''] * (13 - len(parts))
+        
+        parts = [p.strip() for p in parts]
+        
+        rules.append({
+            'id': line_num,
+            'line': line,
+            'account': parts[0] if len(parts) > 0 else '',
+            'desk': parts[12] if len(parts) > 12 else '',
+            'etf': parts[9] if len(parts) > 9 else '',
+            'has_prog': (len(parts) > 3 and parts[3] == 'PROG') or 
+                       (len(parts) > 4 and parts[4] == 'PROG'),
+            'has_pt': len(parts) > 5 and parts[5] == 'PT',
+            'is_wildcard': parts[0] in ('', '*'),
+            'all_columns': parts
+        })
+    return rules, names
+
+def load_data(max_age=0.0):
+    """Load routing data from files, re-parsing only when they changed"""
     global routing_rules, column_names
     
-    # Parse INI file
-    config = configparser.ConfigParser()
-    config.read(f'{FILE_PATH}/enrichment_Flex17_MultiDesk_Routing.ini')
-    
-    separator = config.get('separator', 'value', fallback=';')
-    
-    # Get column names from INI
-    column_map = {}
-    if config.has_section('lookup'):
-        for key, value in config.items('lookup'):
-            column_map[int(key)] = value
-    
-    # Create column names list
-    column_names = [column_map.get(i, f'Column_{i}') for i in range(13)]
-    
-    # Read CSV file
-    routing_rules = []
-    with open(f'{FILE_PATH}/enrichment_Flex17_MultiDesk_Routing.csv', 'r', encoding='utf-8') as f:
-        for line_num, line in enumerate(f):
-            line = line.strip()
-            if not line:
-                continue
-                
-            parts = line.split(separator)
-            if len(parts) < 13:
-                parts += [''] * (13 - len(parts))
-            
-            parts = [p.strip() for p in parts]
-            
-            routing_rules.append({
-                'id': line_num,
-                'line': line,
-                'account': parts[0] if len(parts) > 0 else '',
-                'desk': parts[12] if len(parts) > 12 else '',
-                'etf': parts[9] if len(parts) > 9 else '',
-                'has_prog': (len(parts) > 3 and parts[3] == 'PROG') or 
-                           (len(parts) > 4 and parts[4] == 'PROG'),
-                'has_pt': len(parts) > 5 and parts[5] == 'PT',
-                'is_wildcard': parts[0] in ('', '*'),
-                'all_columns': parts
-            })
-    
+    rule_set = rule_cache('enrichment_multidesk_flow').load(
+        [RULES_INI, RULES_CSV], parse_rule_file, build_rules, max_age=max_age)
+    # Rebind both globals from one fully built version
+    routing_rules, column_names = rule_set.compiled
     return routing_rules, column_names
 
 # Load initial data
@@ -518,6 +533,7 @@ app.layout = html.Div([
      State('etf-input', 'value')]
 )
 def update_routing(n_clicks, account, etf):
+    load_data(max_age=RELOAD_CHECK_SECONDS)
     if not account:
         return go.Figure(), "Please enter an account", [], ""
     
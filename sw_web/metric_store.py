@@ -0,0 +1,157 @@
+"""
+Partitioned Parquet store for monthly SimilarWeb metrics.
+
+Rows are stored one Parquet file per (domain, month) partition:
+
+    <root>/domain=<domain>/month=<YYYY-MM>/part.parquet
+    <root>/_manifest.json
+
+The manifest records, per partition, which metric columns it holds and how
+many rows, so "is (domain, metric, month) already there?" is answered without
+touching data files, and loads open only the partitions they need. Appending a
+month writes only that month's partitions; Excel is produced on demand by
+export_excel() and is never read back.
+"""
+
+import json
+import os
+import tempfile
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+MANIFEST_NAME = '_manifest.json'
+PARTITION_FILE = 'part.parquet'
+
+
+def _safe(value: str) -> str:
+    """Domain names as directory names (domains never contain '/', but be safe)"""
+    return str(value).replace('/', '_').replace(os.sep, '_')
+
+
+class MetricStore:
+    """Append-only monthly metric store with a (domain, month) -> metrics manifest"""
+
+    def __init__(self, root: str, domain_column: str = 'domain', date_column: str = 'date'):
+        self.root = root
+        self.domain_column = domain_column
+        self.date_column = date_column
+        self.manifest_path = os.path.join(root, MANIFEST_NAME)
+        self.manifest = self._read_manifest()
+
+    # ------------------------------------------------------------------ manifest
+
+    def _read_manifest(self) -> Dict:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'partitions': {}}
+
+    def _write_json(self, path: str, data: Dict):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _key(domain: str, month: str) -> str:
+        return f'{domain}|{month}'
+
+    def partitions(self) -> List[Dict]:
+        """Manifest entries: domain, month, metrics, rows, file, updated_at"""
+        return list(self.manifest['partitions'].values())
+
+    def months(self) -> List[str]:
+        return sorted({p['month'] for p in self.partitions()})
+
+    def domains(self) -> List[str]:
+        return sorted({p['domain'] for p in self.partitions()})
+
+    def has(self, domain: str, metric: str, month: str) -> bool:
+        entry = self.manifest['partitions'].get(self._key(domain, month))
+        return entry is not None and metric in entry['metrics']
+
+    def missing(self, domains: Iterable[str], metrics: Iterable[str], months: Iterable[str]) -> List[tuple]:
+        """(domain, metric, month) cells not in the store yet, i.e. what still needs fetching"""
+        metrics = list(metrics)
+        months = list(months)
+        return [(domain, metric, month)
+                for domain in domains for month in months for metric in metrics
+                if not self.has(domain, metric, month)]
+
+    @property
+    def total_rows(self) -> int:
+        return sum(p['rows'] for p in self.partitions())
+
+    # ------------------------------------------------------------------ writing
+
+    def _partition_path(self, domain: str, month: str) -> str:
+        return os.path.join(self.root, f'domain={_safe(domain)}', f'month={month}', PARTITION_FILE)
+
+    def append(self, df: pd.DataFrame, overwrite: bool = False) -> int:
+        """
+        Add rows, writing only the (domain, month) partitions they fall in.
+        Rows for a date already stored in a partition replace the old ones;
+        with overwrite=True each touched partition is replaced outright.
+        Returns the number of partitions written.
+        """
+        if df.empty:
+            return 0
+        df = df.copy()
+        df[self.date_column] = pd.to_datetime(df[self.date_column])
+        months = df[self.date_column].dt.strftime('%Y-%m')
+
+        written = 0
+        for (domain, month), part in df.groupby([df[self.domain_column], months], sort=False):
+            domain = str(domain)
+            path = self._partition_path(domain, month)
+            if not overwrite and os.path.exists(path):
+                existing = pd.read_parquet(path)
+                part = pd.concat([existing[~existing[self.date_column].isin(part[self.date_column])], part],
+                                 ignore_index=True)
+            part = part.sort_values(self.date_column, kind='stable').reset_index(drop=True)
+
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            part.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+
+            metrics = [c for c in part.columns
+                       if c not in (self.domain_column, self.date_column) and part[c].notna().any()]
+            self.manifest['partitions'][self._key(domain, month)] = {
+                'domain': domain,
+                'month': month,
+                'metrics': metrics,
+                'rows': len(part),
+                'file': os.path.relpath(path, self.root),
+                'updated_at': datetime.now().isoformat(timespec='seconds'),
+            }
+            written += 1
+
+        self._write_json(self.manifest_path, self.manifest)
+        return written
+
+    # ------------------------------------------------------------------ reading
+
+    def read(self, domains: Optional[Sequence[str]] = None, months: Optional[Sequence[str]] = None,
+             columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Rows of the selected partitions (all by default), in date order"""
+        selected = [p for p in self.partitions()
+                    if (domains is None or p['domain'] in domains) and (months is None or p['month'] in months)]
+        selected.sort(key=lambda p: (p['month'], p['domain']))
+        if columns is not None:
+            columns = list(dict.fromkeys([self.domain_column, self.date_column, *columns]))
+        frames = [pd.read_parquet(os.path.join(self.root, p['file']), columns=columns) for p in selected]
+        if not frames:
+            return pd.DataFrame(columns=columns or [self.domain_column, self.date_column])
+        df = pd.concat(frames, ignore_index=True)
+        return df.sort_values(self.date_column, kind='stable', ignore_index=True)
+
+    def export_excel(self, path: str, **read_args) -> int:
+        """Write (a selection of) the store to an Excel workbook; returns the row count"""
+        df = self.read(**read_args)
+        df.to_excel(path, index=False)
+        return len(df)
@@ -2,6 +2,12 @@ import dash
 from dash import dcc, html, Input, Output, dash_table
 import pandas as pd
 import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fixlib.frame_store import FrameStore, frame_store
+from fixlib.paged_table import page_count, register_paged_table, register_table_export
 
 # Load data from external JSON file
 def load_client_data():
@@ -94,6 +100,11 @@ def load_client_data():
 # Load the data
 df = load_client_data()
 
+# Rows per page of the client table; pages are served from the frame store
+PAGE_SIZE = 15
+ALL_CLIENTS_KEY = FrameStore.make_key('clients', 'all')
+frame_store().put(df, 'clients', 'all')
+
 # Initialize Dash app
 app = dash.Dash(__name__, suppress_callback_exceptions=True)
 
@@ -298,8 +309,11 @@ def create_dashboard_layout():
                         dash_table.DataTable(
                             id="data-table",
                             columns=[{"name": col, "id": col} for col in df.columns] if len(df) > 0 else [],
-                            data=df.to_dict("records") if len(df) > 0 else [],
-                            page_size=15,
+                            data=df.iloc[:PAGE_SIZE].to_dict("records") if len(df) > 0 else [],
+                            page_size=PAGE_SIZE,
+                            page_current=0,
+                            page_count=page_count(len(df), PAGE_SIZE),
+                            page_action="custom",
                             style_table={"overflowX": "auto", "minWidth": "100%"},
                             style_cell={
                                 'padding': '12px',
@@ -323,11 +337,18 @@ def create_dashboard_layout():
                                     'backgroundColor': '#f9fafb'
                                 }
                             ],
-                            sort_action="native",
-                            filter_action="native",
-                            export_format="xlsx",
-                            export_headers="display"
-                        )
+                            sort_action="custom",
+                            sort_mode="multi",
+                            sort_by=[],
+                            filter_action="custom",
+                            filter_query="",
+                            filter_options={"case": "insensitive"}
+                        ),
+                        dcc.Store(id="table-key-store", data=ALL_CLIENTS_KEY),
+                        # Exports the whole filtered and sorted result (the table only holds one page)
+                        html.Button("Export", id="export-table-btn",
+                                    className="mt-3 px-4 py-2 bg-blue-600 text-white rounded-md hover:bg-blue-700"),
+                        dcc.Download(id="download-table-xlsx")
                     ])
                 ], className="bg-white p-6 rounded-lg shadow-md"),
             ], className="main-content flex-1 p-6"),
@@ -1105,7 +1126,7 @@ def update_oms_dropdown(selected_network, client_search, account_search, current
 
 # Callback 3: Filter table and update summary based on all selections and searches (only when on dashboard)
 @app.callback(
-    Output("data-table", "data"),
+    Output("table-key-store", "data"),
     Output("summary-output", "children"),
     Input("value-dropdown", "value"),
     Input("network-tabs", "value"),
@@ -1119,10 +1140,10 @@ def update_table_and_summary(selected_oms, selected_network, client_search, acco
         return dash.no_update, dash.no_update
     
     if len(df) == 0:
-        return [], html.Div("No data available. Please check if client.json exists.", className="text-red-600")
+        return None, html.Div("No data available. Please check if client.json exists.", className="text-red-600")
     
-    # Start with all data
-    filtered_df = df.copy()
+    # Start with all data (filters below build new frames, df itself is never modified)
+    filtered_df = df
     filter_descriptions = []
     
     # Apply global search filters first (regardless of network/OMS)
@@ -1169,7 +1190,19 @@ def update_table_and_summary(selected_oms, selected_network, client_search, acco
         ], className="p-4 bg-blue-50 rounded-lg border border-blue-200"),
     ])
     
-    return filtered_df.to_dict("records"), summary
+    # The table pages, sorts and column-filters this frame on the server
+    if filtered_df is not df:
+        table_key = frame_store().put(filtered_df, 'clients')
+    else:
+        table_key = ALL_CLIENTS_KEY
+        if frame_store().get(table_key) is None:
+            frame_store().put(df, 'clients', 'all')
+    return table_key, summary
+
+
+register_paged_table(app, "data-table", "table-key-store", PAGE_SIZE)
+register_table_export(app, "export-table-btn", "download-table-xlsx", "data-table", "table-key-store",
+                      "clients.xlsx")
 
 if __name__ == "__main__":
     app.run(debug=True)
@@ -6,91 +6,82 @@ import numpy as np
 import time
 import os
 from datetime import datetime, timedelta
+import sys
+
+from metric_store import MetricStore
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fixlib.frame_store import frame_store
 
 # Get the current working directory
 current_dir = os.getcwd()
 print(f"Current working directory: {current_dir}")
 
-# Check if data file exists, if not create sample data
+# Monthly data lives in a partitioned Parquet store; the Excel file is only an export
 data_file = os.path.join(current_dir, "monthly_data.xlsx")
-print(f"Data file path: {data_file}")
+store_dir = os.path.join(current_dir, "monthly_data_store")
+print(f"Data store path: {store_dir}")
+store = MetricStore(store_dir, domain_column='Category', date_column='Date')
 
-if not os.path.exists(data_file):
-    # Create sample data
-    np.random.seed(42)
-    df = pd.DataFrame({
-        'Category': ['A', 'B', 'C', 'D', 'E'] * 20,
-        'Value': np.random.randn(100),
-        'Date': pd.date_range('2023-01-01', periods=100, freq='D')
-    })
-    df.to_excel(data_file, index=False)
-    print(f"Created sample data file: {data_file}")
+if not store.partitions():
+    if os.path.exists(data_file):
+        # One-time import of the workbook the app used to maintain
+        store.append(pd.read_excel(data_file))
+        print(f"Imported {data_file} into {store_dir}")
+    else:
+        # Create sample data
+        np.random.seed(42)
+        df = pd.DataFrame({
+            'Category': ['A', 'B', 'C', 'D', 'E'] * 20,
+            'Value': np.random.randn(100),
+            'Date': pd.date_range('2023-01-01', periods=100, freq='D')
+        })
+        store.append(df)
+        print(f"Created sample data in: {store_dir}")
 else:
-    print(f"Data file already exists: {data_file}")
+    print(f"Data store already exists: {store_dir} ({len(store.partitions())} partitions)")
 
-# Function to load data from Excel
-def load_data_from_excel():
+# Function to load data from the store
+def load_data_from_store():
     try:
-        df = pd.read_excel(data_file)
-        print(f"Loaded data from {data_file}, shape: {df.shape}")
-        print(df)
-        
-        # Convert Date column from string to datetime
-        if 'Date' in df.columns:
-            df['Date'] = pd.to_datetime(df['Date'])
-            print("Converted Date column to datetime")
-        
+        df = store.read()
+        print(f"Loaded data from {store_dir}, shape: {df.shape}")
         return df
     except Exception as e:
         print(f"Error loading data: {e}")
         # Return empty dataframe if there's an error
         return pd.DataFrame()
 
-# Function to simulate API call and update Excel file
+# Function to simulate API call and append the new month to the store
 def update_data_via_api():
     try:
-        # Simulate API call delay
-        time.sleep(2)
-        
-        # Check if we already updated this month
-        last_update_file = os.path.join(current_dir, "last_update.txt")
         current_month = datetime.now().strftime("%Y-%m")
         print(f"Current month: {current_month}")
         
-        if os.path.exists(last_update_file):
-            with open(last_update_file, 'r') as f:
-                last_update_month = f.read().strip()
-            print(f"Last update month: {last_update_month}")
-            if last_update_month == current_month:
-                return "already_updated", "Data already updated this month."
+        # The manifest says which (category, metric, month) cells already exist
+        categories = ['A', 'B', 'C', 'D', 'E']
+        missing = store.missing(categories, ['Value'], [current_month])
+        if not missing:
+            return "already_updated", "Data already updated this month."
         
-        # Load existing data
-        if os.path.exists(data_file):
-            existing_df = pd.read_excel(data_file)
-            print(f"Existing data shape: {existing_df.shape}")
-        else:
-            existing_df = pd.DataFrame()
-            print("No existing data file found")
+        # Simulate API call delay
+        time.sleep(2)
         
         # Simulate API response - generate new monthly data
         new_month_data = pd.DataFrame({
-            'Category': ['A', 'B', 'C', 'D', 'E'] * 4,
+            'Category': categories * 4,
             'Value': np.random.randn(20),
             'Date': pd.date_range(datetime.now().replace(day=1), periods=20, freq='D')
         })
+        new_month_data = new_month_data[new_month_data['Category'].isin({m[0] for m in missing})]
         print(f"New monthly data shape: {new_month_data.shape}")
         
-        # Combine with existing data
-        if not existing_df.empty:
-            updated_df = pd.concat([existing_df, new_month_data], ignore_index=True)
-        else:
-            updated_df = new_month_data
-        
-        # Save to Excel
-        updated_df.to_excel(data_file, index=False)
-        print(f"Saved updated data to {data_file}, shape: {updated_df.shape}")
+        # Append: only this month's partitions are written
+        written = store.append(new_month_data)
+        print(f"Wrote {written} partitions to {store_dir}, total rows: {store.total_rows}")
         
         # Record update time
+        last_update_file = os.path.join(current_dir, "last_update.txt")
         with open(last_update_file, 'w') as f:
             f.write(current_month)
         print(f"Recorded update time: {current_month}")
@@ -105,7 +96,7 @@ def update_data_via_api():
 app = dash.Dash(__name__)
 
 # Load initial data
-initial_df = load_data_from_excel()
+initial_df = load_data_from_store()
 print(f"Initial data shape: {initial_df.shape}")
 
 # Define the layout with Tailwind CSS
@@ -125,7 +116,14 @@ app.layout = html.Div([
                 n_clicks=0,
                 className="bg-blue-500 hover:bg-blue-700 text-white font-bold py-2 px-4 rounded"
             ),
-            html.Div(id="update-status", className="ml-4 text-sm")
+            html.Button(
+                "Export to Excel",
+                id="export-button",
+                n_clicks=0,
+                className="ml-2 bg-gray-500 hover:bg-gray-700 text-white font-bold py-2 px-4 rounded"
+            ),
+            html.Div(id="update-status", className="ml-4 text-sm"),
+            html.Div(id="export-status", className="ml-4 text-sm")
         ], className="flex items-center")
     ], className="bg-white p-6 shadow-sm mb-6 flex justify-between items-center"),
     
@@ -144,7 +142,7 @@ app.layout = html.Div([
                 className="bg-white p-6 rounded-lg shadow-lg text-center",
                 children=[
                     html.Div("Updating monthly data...", className="text-lg font-semibold mb-2"),
-                    html.Div("Calling API and updating Excel file", className="text-gray-600")
+                    html.Div("Calling API and updating the data store", className="text-gray-600")
                 ]
             )
         ]
@@ -160,8 +158,8 @@ app.layout = html.Div([
     # Tab content
     html.Div(id='tabs-content', className="bg-white p-6 rounded-lg shadow-sm"),
     
-    # Store component to keep track of the data
-    dcc.Store(id='data-store', data=initial_df.to_dict('records')),
+    # Store component to keep the key of the server-side data frame
+    dcc.Store(id='data-store', data=frame_store().put(initial_df, 'monthly-data')),
     
     # Store to track update attempts
     dcc.Store(id='update-attempts', data=0),
@@ -195,30 +193,42 @@ clientside_callback(
     prevent_initial_call=True
 )
 
-# Callback to update file info
+# Callback to update store info
 @callback(
     Output('file-info', 'children'),
     Input('interval-component', 'n_intervals')
 )
 def update_file_info(n_intervals):
-    file_exists = os.path.exists(data_file)
-    file_size = os.path.getsize(data_file) if file_exists else 0
-    file_time = datetime.fromtimestamp(os.path.getmtime(data_file)).strftime('%Y-%m-%d %H:%M:%S') if file_exists else "N/A"
+    partitions = store.partitions()
+    store_time = max((p['updated_at'] for p in partitions), default="N/A").replace('T', ' ')
     
     return html.Div([
-        html.Span("File: ", className="font-semibold"),
-        html.Span(f"{data_file}", className="text-blue-600"),
+        html.Span("Store: ", className="font-semibold"),
+        html.Span(f"{store_dir}", className="text-blue-600"),
         html.Span(" | ", className="mx-2"),
-        html.Span("Exists: ", className="font-semibold"),
-        html.Span(f"{'Yes' if file_exists else 'No'}", className="text-green-600" if file_exists else "text-red-600"),
+        html.Span("Partitions: ", className="font-semibold"),
+        html.Span(f"{len(partitions)}", className="text-green-600" if partitions else "text-red-600"),
         html.Span(" | ", className="mx-2"),
-        html.Span("Size: ", className="font-semibold"),
-        html.Span(f"{file_size} bytes", className="text-purple-600"),
+        html.Span("Months: ", className="font-semibold"),
+        html.Span(f"{len(store.months())}", className="text-purple-600"),
         html.Span(" | ", className="mx-2"),
         html.Span("Modified: ", className="font-semibold"),
-        html.Span(f"{file_time}", className="text-gray-600")
+        html.Span(f"{store_time}", className="text-gray-600")
     ])
 
+# Callback to export the store to Excel
+@callback(
+    Output('export-status', 'children'),
+    Input('export-button', 'n_clicks'),
+    prevent_initial_call=True
+)
+def export_to_excel(n_clicks):
+    try:
+        rows = store.export_excel(data_file)
+        return html.Span(f"Exported {rows} records to {data_file}", className="text-green-600")
+    except Exception as e:
+        return html.Span(f"Export failed: {e}", className="text-red-600")
+
 # Callback to update last update info
 @callback(
     Output('last-update-info', 'children'),
@@ -226,6 +236,7 @@ def update_file_info(n_intervals):
     Input('data-store', 'data')
 )
 def update_last_update_info(n_intervals, data):
+    df = frame_store().get(data)
     last_update_file = os.path.join(current_dir, "last_update.txt")
     if os.path.exists(last_update_file):
         with open(last_update_file, 'r') as f:
@@ -235,7 +246,7 @@ def update_last_update_info(n_intervals, data):
             html.Span(f"{last_update_month}", className="text-blue-600"),
             html.Span(" | ", className="mx-2"),
             html.Span("Total records: ", className="font-semibold"),
-            html.Span(f"{len(data)}", className="text-green-600")
+            html.Span(f"{len(df) if df is not None else 0}", className="text-green-600")
         ])
     else:
         return html.Div([
@@ -267,10 +278,10 @@ def update_monthly_data(n_clicks, attempts, loading):
         
         # Load updated data
         if result == "success":
-            updated_df = load_data_from_excel()
+            updated_df = load_data_from_store()
             status = html.Span(message, className="text-green-600")
             loading = False
-            return updated_df.to_dict('records'), attempts + 1, loading, status
+            return frame_store().put(updated_df, 'monthly-data'), attempts + 1, loading, status
         elif result == "already_updated":
             status = html.Span(message, className="text-yellow-600")
             loading = False
@@ -299,15 +310,15 @@ def safe_date_format(date_obj, format_str='%Y-%m-%d'):
           Input('tabs', 'value'),
           Input('data-store', 'data'))
 def render_content(tab, data):
-    if not data:
+    df = frame_store().get(data)
+    if df is None or df.empty:
         return html.Div("No data available. Please update monthly data.", className="text-center text-gray-500 p-8")
     
-    df = pd.DataFrame(data)
-    
     # Convert Date column from string to datetime if needed
     if 'Date' in df.columns and df['Date'].dtype == 'object':
         try:
-            df['Date'] = pd.to_datetime(df['Date'])
+            # The stored frame is shared: convert into a new frame instead of in place
+            df = df.assign(Date=pd.to_datetime(df['Date']))
         except:
             pass
     
@@ -362,7 +373,8 @@ def render_content(tab, data):
         # Ensure Date column is datetime for plotting
         if 'Date' in df.columns and df['Date'].dtype == 'object':
             try:
-                df['Date'] = pd.to_datetime(df['Date'])
+                # The stored frame is shared: convert into a new frame instead of in place
+                df = df.assign(Date=pd.to_datetime(df['Date']))
             except:
                 pass
                 
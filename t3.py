@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
 
+from t3m_recalc import append_and_recompute, compute_periods
+
 ## Step 1: Create Initial DataFrame
 data = {
     'Date': ['2024-01-01', '2024-02-01', '2024-03-01', '2024-04-01', 
@@ -20,29 +22,13 @@ df = pd.DataFrame(data)
 df['Date'] = pd.to_datetime(df['Date'])
 
 ## Step 2: Calculate T3M Metrics
-def calculate_t3m_metrics(df):
-    # Sort by date to ensure proper rolling calculations
-    df = df.sort_values('Date').copy()
-    
-    # Calculate T3M Bounce Rate (3-month rolling average)
-    bounce_rate_col = 'openai.com - Bounce Rate'
-    t3m_col = 'openai.com - Bounce Rate (T3M)'
-    
-    df[t3m_col] = df[bounce_rate_col].rolling(3, min_periods=1).mean()
-    
-    # Calculate M/M % change (compared to previous month's T3M)
-    mm_col = 'openai.com - Bounce Rate (T3M) M/M %'
-    df[mm_col] = df[t3m_col].pct_change(periods=1) * 100
-    # Calculate M/M % change (compared to previous month's T3M)
+# T3M over partial windows at the start (min_periods=1), changes in percent
+T3M_PERIODS = ['T3M', 'M/M (T3M) % Change', 'Q/Q (T3M) % Change', 'Y/Y (T3M) % Change']
 
-    qq_col = 'openai.com - Bounce Rate (T3M) Q/Q %'
-    df[qq_col] = df[t3m_col].pct_change(periods=3) * 100
-    
-    # Calculate Y/Y % change (compared to same quarter last year)
-    yy_col = 'openai.com - Bounce Rate (T3M) Y/Y %'
-    df[yy_col] = df[t3m_col].pct_change(periods=12) * 100
-    
-    return df
+def calculate_t3m_metrics(df):
+    # Sorts by date and computes every period for the bounce-rate series in one pass
+    return compute_periods(df, ['openai.com - Bounce Rate'], periods=T3M_PERIODS,
+                           min_periods=1, scale=100)
 
 # Initial calculation
 df = calculate_t3m_metrics(df)
@@ -61,13 +47,11 @@ new_data = {
 new_df = pd.DataFrame(new_data)
 new_df['Date'] = pd.to_datetime(new_df['Date'])
 
-# Append new data
-df = pd.concat([df, new_df], ignore_index=True)
+# Append new data; only the trailing window of the series is recalculated
+df = append_and_recompute(df, new_df, ['openai.com - Bounce Rate'], periods=T3M_PERIODS,
+                          min_periods=1, scale=100)
 print (df)
 
-# Recalculate metrics
-df = calculate_t3m_metrics(df)
-
 print("\nDataFrame After Adding New Data:")
 print(df[['Date', 'openai.com - Bounce Rate', 'openai.com - Bounce Rate (T3M)', 'openai.com - Bounce Rate (T3M) M/M %',
           'openai.com - Bounce Rate (T3M) Q/Q %', 'openai.com - Bounce Rate (T3M) Y/Y %']].tail(20))
@@ -1,64 +1,200 @@
+"""
+T3M (trailing 3-month) and period-over-period metrics for SimilarWeb series.
+
+Every period of sw_web/timeperiod_cmp.json is computed for every metric
+column ("site.com - Metric" in wide frames) and, for long frames, every domain
+group, in one vectorized NumPy pass: values are stacked into an (rows x
+columns) array sorted by group and date, lags are array shifts masked where
+they would cross into the previous group, and T3M is the mean of three lags.
+
+append_and_recompute() adds months and recomputes only the trailing window a
+new row can depend on (TRAILING_ROWS per series), keeping earlier results.
+"""
+
 import pandas as pd
 import numpy as np
 
-def calculate_t3m_metrics(df):
+# label -> (based on T3M?, lag in months, column suffix)
+PERIODS = {
+    "M/M % Change": (False, 1, "M/M %"),
+    "Q/Q % Change": (False, 3, "Q/Q %"),
+    "Y/Y % Change": (False, 12, "Y/Y %"),
+    "T3M": (True, 0, "(T3M)"),
+    "M/M (T3M) % Change": (True, 1, "(T3M) M/M %"),
+    "Q/Q (T3M) % Change": (True, 3, "(T3M) Q/Q %"),
+    "Y/Y (T3M) % Change": (True, 12, "(T3M) Y/Y %"),
+}
+
+# The periods offered in sw_web/timeperiod_cmp.json
+DEFAULT_PERIODS = ["M/M % Change", "Q/Q % Change", "Y/Y % Change",
+                   "T3M", "Q/Q (T3M) % Change", "Y/Y (T3M) % Change"]
+
+T3M_WINDOW = 3
+# Rows a Y/Y (T3M) value depends on: its own month, 12 back, and that month's 2 predecessors
+TRAILING_ROWS = 12 + T3M_WINDOW
+
+
+def derived_column(column, period):
+    return f"{column} {PERIODS[period][2]}"
+
+
+def is_derived_column(column):
+    return '(T3M)' in column or column.endswith('%')
+
+
+def metric_columns(df, date_column='Date', group_column=None):
+    """Numeric source columns: everything except date, group and derived columns"""
+    return [c for c in df.columns
+            if c not in (date_column, group_column) and not is_derived_column(c)
+            and pd.api.types.is_numeric_dtype(df[c])]
+
+
+def _lag(values, pos, k):
+    """values shifted down k rows within each group (NaN where the group has no row k back)"""
+    if k == 0:
+        return values
+    out = np.full_like(values, np.nan)
+    if k < len(values):
+        out[k:] = values[:-k]
+    out[pos < k] = np.nan
+    return out
+
+
+def _t3m(values, pos, min_periods):
+    """Rolling 3-row mean within each group, NaN-aware like rolling(3, min_periods)"""
+    lags = np.stack([_lag(values, pos, k) for k in range(T3M_WINDOW)])
+    count = np.sum(~np.isnan(lags), axis=0)
+    total = np.nansum(lags, axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = total / count
+    mean[count < min_periods] = np.nan
+    return mean
+
+
+def _derive(values, pos, periods, min_periods, scale):
+    """period -> (rows x columns) array, for values sorted by group then date"""
+    results = {}
+    t3m = None
+    for period in periods:
+        on_t3m, lag, _ = PERIODS[period]
+        base = values
+        if on_t3m:
+            if t3m is None:
+                t3m = _t3m(values, pos, min_periods)
+            base = t3m
+        if lag == 0:
+            results[period] = base
+            continue
+        with np.errstate(divide='ignore', invalid='ignore'):
+            results[period] = (base / _lag(base, pos, lag) - 1) * scale
+    return results
+
+
+def _sorted_frame(df, date_column, group_column):
+    df = df.copy()
+    df[date_column] = pd.to_datetime(df[date_column])
+    keys = [group_column, date_column] if group_column else [date_column]
+    df = df.sort_values(keys, kind='stable').reset_index(drop=True)
+    if group_column:
+        pos = df.groupby(group_column, sort=False).cumcount().to_numpy()
+    else:
+        pos = np.arange(len(df))
+    return df, pos
+
+
+def _assign(df, columns, periods, derived, rows=None):
+    """Write derived arrays into df (all rows, or only `rows`), one block per period"""
+    for period in periods:
+        names = [derived_column(c, period) for c in columns]
+        block = pd.DataFrame(derived[period], columns=names,
+                             index=df.index if rows is None else df.index[rows])
+        if rows is None:
+            df = df.drop(columns=[n for n in names if n in df.columns])
+            df = pd.concat([df, block], axis=1)
+        else:
+            for name in names:
+                if name not in df.columns:
+                    df[name] = np.nan
+            df.loc[block.index, names] = block
+    return df
+
+
+def compute_periods(df, value_columns=None, periods=DEFAULT_PERIODS, date_column='Date',
+                    group_column=None, min_periods=T3M_WINDOW, scale=1.0):
     """
-    Recalculate T3M (Trailing 3-Month) metrics for visits and bounce rate
-    Including Q/Q % and Y/Y % calculations
+    All requested periods for every metric column (and every group of a long frame).
+    
+    df            -- wide frame (Date + "site.com - Metric" columns), or long frame
+                     with a group_column (e.g. domain) and metric columns
+    periods       -- labels from PERIODS (default: those of timeperiod_cmp.json)
+    min_periods   -- months a T3M value needs (3 = full window, 1 = partial start)
+    scale         -- 100 for percentages, 1 for fractions
+    Returns the frame sorted by group and date with "<column> <suffix>" columns added.
     """
-    # Make a copy to avoid modifying original
-    df_calc = df.copy()
-    
-    # Ensure Date column is datetime
-    df_calc['Date'] = pd.to_datetime(df_calc['Date'])
-    df_calc = df_calc.sort_values('Date').reset_index(drop=True)
-    
-    # Extract base column names (assuming pattern: "site.com - Metric")
-    # You'll need to adjust these column names to match your actual data
-    visits_col = 'adobe.com - Visits'  # Adjust as needed
-    bounce_rate_col = 'openai.com - Bounce Rate'  # Adjust as needed
-    
-    # Calculate T3M for Visits
-    visits_t3m_col = f'{visits_col.split(" - ")[0]} - Visits (T3M)'
-    df_calc[visits_t3m_col] = df_calc[visits_col].rolling(window=3, min_periods=3).mean()
-    
-    # Calculate T3M for Bounce Rate
-    bounce_t3m_col = f'{bounce_rate_col.split(" - ")[0]} - Bounce Rate (T3M)'
-    df_calc[bounce_t3m_col] = df_calc[bounce_rate_col].rolling(window=3, min_periods=3).mean()
-    
-    # Calculate Q/Q % (Quarter over Quarter) - comparing current T3M to T3M from 3 months ago
-    qq_col = f'{bounce_t3m_col} Q/Q %'
-    df_calc[qq_col] = df_calc[bounce_t3m_col].pct_change(periods=3)
-    
-    # Calculate Y/Y % (Year over Year) - comparing current T3M to T3M from 12 months ago
-    yy_col = f'{bounce_t3m_col} Y/Y %'
-    df_calc[yy_col] = df_calc[bounce_t3m_col].pct_change(periods=12)
-    
-    return df_calc
+    df, pos = _sorted_frame(df, date_column, group_column)
+    columns = list(value_columns) if value_columns is not None else \
+        metric_columns(df, date_column, group_column)
+    values = df[columns].to_numpy(dtype=float)
+    derived = _derive(values, pos, periods, min_periods, scale)
+    return _assign(df, columns, periods, derived)
+
+
+def append_and_recompute(df, new_rows, value_columns=None, periods=DEFAULT_PERIODS, date_column='Date',
+                         group_column=None, min_periods=T3M_WINDOW, scale=1.0):
+    """
+    Append months to a frame already processed by compute_periods() and recompute
+    only the rows that can change: per series, from the first new row on, using
+    the TRAILING_ROWS - 1 rows before it as history.
+    """
+    columns = list(value_columns) if value_columns is not None else \
+        metric_columns(df, date_column, group_column)
+    if any(derived_column(c, p) not in df.columns for c in columns for p in periods):
+        # Never computed: nothing to reuse
+        return compute_periods(pd.concat([df, new_rows], ignore_index=True), columns, periods,
+                               date_column, group_column, min_periods, scale)
+    
+    combined = pd.concat([df.assign(_new=False), new_rows.assign(_new=True)], ignore_index=True)
+    combined, pos = _sorted_frame(combined, date_column, group_column)
+    is_new = combined.pop('_new').to_numpy(dtype=bool)
+    
+    # Position of each series' first new row, broadcast to its rows
+    first_new = np.where(is_new, pos, np.iinfo(np.int64).max)
+    if group_column:
+        first_new = pd.Series(first_new).groupby(combined[group_column].to_numpy()).transform('min').to_numpy()
+    else:
+        first_new = np.full(len(combined), first_new.min() if len(first_new) else 0)
+    window_start = np.maximum(first_new - (TRAILING_ROWS - 1), 0)
+    in_window = pos >= window_start
+    dirty = pos >= first_new
+    
+    window_values = combined.loc[in_window, columns].to_numpy(dtype=float)
+    window_pos = (pos - window_start)[in_window]
+    derived = _derive(window_values, window_pos, periods, min_periods, scale)
+    dirty_in_window = dirty[in_window]
+    derived = {period: block[dirty_in_window] for period, block in derived.items()}
+    return _assign(combined, columns, periods, derived, rows=np.flatnonzero(dirty))
+
+
+def calculate_t3m_metrics(df, value_columns=None, periods=DEFAULT_PERIODS):
+    """
+    Recalculate T3M (Trailing 3-Month) metrics for every metric column
+    Including M/M, Q/Q % and Y/Y % on the monthly values and on T3M
+    """
+    return compute_periods(df, value_columns, periods)
 
 def add_new_data_and_recalculate(df, new_date, new_visits, new_bounce_rate):
     """
-    Add new row of data and recalculate all T3M metrics
+    Add new row of data and recalculate the T3M metrics it affects
     """
     # Create new row
-    new_row = {
+    new_row = pd.DataFrame([{
         'Date': new_date,
         'adobe.com - Visits': new_visits,
         'openai.com - Bounce Rate': new_bounce_rate
-    }
-    
-    # Add other columns with NaN (they'll be calculated)
-    for col in df.columns:
-        if col not in new_row:
-            new_row[col] = np.nan
-    
-    # Append new row
-    df_updated = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-    
-    # Recalculate all T3M metrics
-    df_recalculated = calculate_t3m_metrics(df_updated)
+    }])
     
-    return df_recalculated
+    # Only the trailing window is recomputed
+    return append_and_recompute(df, new_row)
 
 # Example usage function
 def example_usage():
@@ -79,10 +215,9 @@ def example_usage():
     #     new_bounce_rate=0.595
     # )
     
-    # Method 3: If you want to update specific T3M calculations manually
-    # df['openai.com - Bounce Rate (T3M)'] = df['openai.com - Bounce Rate'].rolling(window=3, min_periods=3).mean()
-    # df['openai.com - Bounce Rate (T3M) Q/Q %'] = df['openai.com - Bounce Rate (T3M)'].pct_change(periods=3)
-    # df['openai.com - Bounce Rate (T3M) Y/Y %'] = df['openai.com - Bounce Rate (T3M)'].pct_change(periods=12)
+    # Method 3: Long format, one row per domain and month
+    # df_long = compute_periods(df_long, ['Visits', 'Bounce Rate'], group_column='Domain')
+    # df_long = append_and_recompute(df_long, next_month_rows, ['Visits', 'Bounce Rate'], group_column='Domain')
     
     pass
 
@@ -0,0 +1,34 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fixlib.account_links import AccountLinks, _parse_link_file
+
+INI = "[lookup]\n0=ONBEHALFOFCOMPID\n[result]\n1=ACCOUNT\n"
+
+
+def _links(tmp_path, routing):
+    files = {
+        'enrichment_NYFIXAccountMapping.csv': 'OB1;A1\nOB2;A2\nOB3;A3\n',
+        'enrichment_NYFIXAccountMapping.ini': INI,
+        'alias_AutoRouteNYFIX.csv': routing,
+    }
+    parsed = {}
+    for name, text in files.items():
+        path = tmp_path / name
+        path.write_text(text)
+        parsed[str(path)] = _parse_link_file(str(path))
+    return AccountLinks(parsed, 'NYFIX')
+
+
+def test_trailing_delimiter_on_data_rows(tmp_path):
+    links = _links(tmp_path, 'ONBEHALFOFCOMPID;CURRENCY;DESTINATION\n'
+                             'OB1;EUR;D1;\nOB2;*;D2;\nOB4;USD;D3;\n*;*;D4;\n')
+    assert (links.to_dict('NYFIX'), links.unmatched_keys('NYFIX')) == ({'A1': ['D1'], 'A2': ['D2']}, ['OB4'])
+
+
+def test_ragged_rows_are_linked(tmp_path):
+    links = _links(tmp_path, 'ONBEHALFOFCOMPID;CURRENCY;DESTINATION\n'
+                             'OB1;EUR;D1;extra\nOB2;EUR\nOB3;USD;D3\n')
+    assert links.to_dict('NYFIX') == {'A1': ['D1'], 'A3': ['D3']}
+    assert links.unmatched_keys('NYFIX') == []
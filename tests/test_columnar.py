@@ -0,0 +1,30 @@
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fixlib.columnar import INT, FixColumnBuilder, append_frame
+
+SOH = '\x01'
+
+
+def _fix(*fields):
+    return SOH.join(['8=FIX.4.2'] + list(fields)) + SOH
+
+
+def test_append_frame_matches_whole_frame():
+    builder = FixColumnBuilder(names={'35': 'MsgType', '54': 'Side', '44': 'Price', '11': 'ClOrdID'},
+                               decoders={'54': {'1': 'Buy', '2': 'Sell'}}, extra_kinds={'_LineNumber': INT})
+    builder.append_fix(_fix('35=D', '54=2', '44=10.5', '11=A', '52=20240102-10:00:00.000'), _LineNumber=1)
+    builder.append_fix(_fix('35=8', '54=2', '11=B'), _LineNumber=2)
+    head = builder.to_frame()
+    # New categories, a column head never had and a row missing an existing one
+    builder.append_fix(_fix('35=G', '54=1', '44=11', '11=C', '58=late text'), _LineNumber=3)
+    builder.append_fix(_fix('35=D', '52=20240102-10:00:01.000'))
+    tail = builder.to_frame(len(head))
+
+    whole = builder.to_frame()
+    pd.testing.assert_frame_equal(append_frame(head, tail), whole)
+    columns = list(reversed(whole.columns))
+    pd.testing.assert_frame_equal(append_frame(head, tail, columns), whole[columns])
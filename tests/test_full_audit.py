@@ -0,0 +1,106 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tools'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'sw_web', 'audit_trail'))
+from ca1 import find_root_order
+from fixlib.genealogy import Genealogy
+from full_audit import FIXOrderAuditTrail
+
+
+def _walked_chain(auditor, clordid, orders_by_clordid, genealogy):
+    """The chain as it was built before chains were shared: one walk per order, insert(0)"""
+    chain = []
+    current, visited = clordid, set()
+    while current and current not in visited:
+        if not orders_by_clordid.get(current):
+            break
+        visited.add(current)
+        link = genealogy.first_child(current)
+        if link is None:
+            break
+        other, msg = link
+        chain.insert(0, {'ClOrdID': current, 'ModifiedBy': other,
+                         'ModificationType': auditor._get_modification_type(msg)})
+        current = other
+    return chain
+
+
+def _random_orders(rng, count):
+    """ClOrdID -> messages with replace/cancel links, branches, cycles and ids without messages"""
+    orders = {}
+    for i in range(count):
+        clordid = f'C{i}'
+        msg = {'ClOrdID': clordid, 'MsgType': rng.choice('DGF8')}
+        if i and rng.random() < 0.8:
+            msg['OrigClOrdID'] = f'C{rng.randrange(count + 5)}'
+        orders.setdefault(clordid, []).append(msg)
+    return orders
+
+
+def test_shared_modification_chains_match_per_order_walk():
+    auditor = FIXOrderAuditTrail()
+    rng = random.Random(7)
+    for _ in range(50):
+        orders = _random_orders(rng, rng.randrange(1, 40))
+        genealogy = auditor._build_genealogy(orders)
+        chains = {}
+        clordids = list(orders)
+        rng.shuffle(clordids)
+        for clordid in clordids:
+            expected = _walked_chain(auditor, clordid, orders, genealogy)
+            assert auditor._build_modification_chain(clordid, orders, genealogy, chains) == expected
+            assert auditor._build_modification_chain(clordid, orders, genealogy) == expected
+
+
+def test_modification_chain_latest_first():
+    auditor = FIXOrderAuditTrail()
+    orders = {
+        'A': [{'ClOrdID': 'A', 'MsgType': 'D'}],
+        'B': [{'ClOrdID': 'B', 'OrigClOrdID': 'A', 'MsgType': 'G'}],
+        'C': [{'ClOrdID': 'C', 'OrigClOrdID': 'B', 'MsgType': 'F'}],
+    }
+    genealogy = auditor._build_genealogy(orders)
+    chains = {}
+    assert auditor._build_modification_chain('A', orders, genealogy, chains) == [
+        {'ClOrdID': 'B', 'ModifiedBy': 'C', 'ModificationType': 'CANCEL'},
+        {'ClOrdID': 'A', 'ModifiedBy': 'B', 'ModificationType': 'REPLACE'},
+    ]
+    assert chains['B'] == [{'ClOrdID': 'B', 'ModifiedBy': 'C', 'ModificationType': 'CANCEL'}]
+
+
+def test_find_root_order_matches_genealogy():
+    rng = random.Random(3)
+    for _ in range(50):
+        count = rng.randrange(1, 30)
+        # Links only to lower ids, so the map has no cycles
+        parents = {f'C{i}': f'C{rng.randrange(i)}' for i in range(1, count) if rng.random() < 0.7}
+        genealogy = Genealogy.from_parent_map(parents)
+        for i in range(count + 2):
+            assert find_root_order(f'C{i}', parents) == genealogy.root(f'C{i}')
+
+
+def test_find_root_order_on_cycle_matches_genealogy():
+    parents = {'A': 'B', 'B': 'C', 'C': 'A', 'D': 'C', 'E': 'E'}
+    genealogy = Genealogy.from_parent_map(parents)
+    assert find_root_order('A', parents) == 'A'
+    for clordid in parents:
+        assert find_root_order(clordid, parents) == genealogy.root(clordid)
+
+
+def test_modification_chains_latest_first_walk_each_link_once():
+    auditor = FIXOrderAuditTrail()
+    orders = {'C0': [{'ClOrdID': 'C0', 'MsgType': 'D'}]}
+    for i in range(1, 200):
+        orders[f'C{i}'] = [{'ClOrdID': f'C{i}', 'OrigClOrdID': f'C{i - 1}', 'MsgType': 'G'}]
+    genealogy = auditor._build_genealogy(orders)
+    expected = {clordid: _walked_chain(auditor, clordid, orders, genealogy) for clordid in orders}
+    calls = []
+    first_child = genealogy.first_child
+    genealogy.first_child = lambda clordid: calls.append(clordid) or first_child(clordid)
+    chains = {}
+    for clordid in reversed(list(orders)):
+        assert auditor._build_modification_chain(clordid, orders, genealogy, chains) == expected[clordid]
+    assert len(calls) == len(orders)
@@ -0,0 +1,37 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tools'))
+from fixlib.rule_index import RuleIndex
+from fixlib.rule_minimize import analyze_rules
+from routing_ds import _account_pattern
+
+
+def _route(rows, account):
+    index = RuleIndex([{'ACCOUNT': row['ACCOUNT']} for row in rows], compile_pattern=_account_pattern)
+    return rows[index.first({'ACCOUNT': account})]['DESTINATION']
+
+
+def test_pattern_row_keeps_literal_above_it():
+    rows = [
+        {'ACCOUNT': '20012345', 'DESTINATION': 'D1'},
+        {'ACCOUNT': '200xxxxx', 'DESTINATION': 'D2'},
+        {'ACCOUNT': '*', 'DESTINATION': 'D1'},
+    ]
+    analysis = analyze_rules(rows, ['ACCOUNT'], compile_pattern=_account_pattern)
+    assert analysis.redundant == {}
+    kept = analysis.kept_rows()
+    for account in ('20012345', '20099999', '30000000'):
+        assert _route(kept, account) == _route(rows, account)
+
+
+def test_pattern_row_covers_nothing():
+    rows = [
+        {'ACCOUNT': '200xxxxx', 'CURRENCY': '*', 'DESTINATION': 'D2'},
+        {'ACCOUNT': '20012345', 'CURRENCY': 'EUR', 'DESTINATION': 'D1'},
+        {'ACCOUNT': '200xxxxx', 'CURRENCY': 'USD', 'DESTINATION': 'D2'},
+    ]
+    analysis = analyze_rules(rows, ['ACCOUNT', 'CURRENCY'], compile_pattern=_account_pattern)
+    assert analysis.shadowed == {}
+    assert analysis.minimized_rows()[0] == rows[0]
@@ -0,0 +1,53 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fixlib import tail
+
+
+class _Lines:
+    def __init__(self):
+        self.lines = []
+
+    def feed(self, lines):
+        self.lines.extend(lines)
+        return lines
+
+
+def _log(tmp_path, name='a.log'):
+    path = tmp_path / name
+    path.write_text('8=FIX.4.2|35=D|\n')
+    return str(path)
+
+
+def test_idle_session_is_closed(tmp_path, monkeypatch):
+    path = _log(tmp_path)
+    idle = tail.open_session([path], _Lines)
+    tail.get_session(idle).poll()
+    monkeypatch.setattr(tail, 'SESSION_IDLE_SECONDS', -1)
+    active = tail.open_session([path], _Lines)
+    assert tail.get_session(idle) is None
+    tail.close_session(active)
+
+
+def test_session_cap_closes_least_recently_used(tmp_path, monkeypatch):
+    path = _log(tmp_path)
+    monkeypatch.setattr(tail, 'MAX_SESSIONS', 2)
+    first = tail.open_session([path], _Lines)
+    second = tail.open_session([path], _Lines)
+    tail.get_session(first).poll()
+    third = tail.open_session([path], _Lines)
+    assert tail.get_session(second) is None
+    assert tail.get_session(first) is not None
+    assert tail.get_session(third).tailer.files[0].handle is not None
+    for session_id in (first, third):
+        tail.close_session(session_id)
+
+
+def test_resolve_log_path_stays_under_root(tmp_path):
+    root = str(tmp_path)
+    path = _log(tmp_path)
+    assert tail.resolve_log_path('a.log', root) == os.path.realpath(path)
+    assert tail.resolve_log_path(path, root) == os.path.realpath(path)
+    assert tail.resolve_log_path('../a.log', root) is None
+    assert tail.resolve_log_path('/etc/passwd', root) is None
@@ -0,0 +1,26 @@
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fixlib.text_index import TextIndex
+
+
+def test_build_without_tokens():
+    for values in ([''], ['=.-'], [None, '  ']):
+        df = pd.DataFrame({'x': values})
+        index = TextIndex.build(df)
+        assert index.rows == len(df)
+        assert index.vocab == []
+        assert len(index.search('abc', df)) == 0
+
+
+def test_add_without_tokens_then_with_tokens():
+    df = pd.DataFrame({'ACCOUNT_NUMBER': ['', ''], 'ACRONAME': ['-', None]})
+    index = TextIndex.build(df, ['ACCOUNT_NUMBER', 'ACRONAME'])
+    more = pd.DataFrame({'ACCOUNT_NUMBER': ['20010964'], 'ACRONAME': ['=']})
+    index.add(more)
+    full = pd.concat([df, more], ignore_index=True)
+    assert index.search('2001', full).tolist() == [2]
+    assert len(index.search('=.', full)) == 0
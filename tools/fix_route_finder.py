@@ -1,37 +1,98 @@
 import csv
 import os
+import sys
+import time
 import argparse
 from collections import defaultdict
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fixlib.rule_cache import rule_cache
+from fixlib.rule_index import RuleIndex, is_missing
+
+# 两次检查规则文件是否修改之间的秒数
+RELOAD_CHECK_SECONDS = 2.0
+
+def _partial_wildcard(field, required_value):
+    """部分通配符条件（如ABC*）：消息值以去掉*后的部分开头或结尾"""
+    if '*' in required_value and required_value != '*':
+        pattern = required_value.replace('*', '')
+        return lambda value: value.startswith(pattern) or value.endswith(pattern)
+    return None
+
+def network_name(file_path):
+    """alias_<网络>.csv -> 网络名称"""
+    filename = os.path.basename(file_path)
+    return filename[len('alias_'):-len('.csv')]
+
+class CompiledRules:
+    """某一版本的路由规则及其索引，重新加载时整体替换"""
+    
+    def __init__(self, routing_rules):
+        self.routing_rules = routing_rules  # 按网络名称组织规则
+        self.rule_refs = []
+        conditions = []
+        for network, rules in routing_rules.items():
+            for rule in rules:
+                conditions.append(rule['conditions'])
+                self.rule_refs.append((network, rule))
+        self.rule_index = RuleIndex(conditions, compile_pattern=_partial_wildcard, wildcards=('*',))
+    
+    @classmethod
+    def from_files(cls, files):
+        routing_rules = defaultdict(list)
+        for path, rules in files.items():
+            if rules:
+                routing_rules[network_name(path)].extend(rules)
+        return cls(routing_rules)
+
 class FixRouteFinder:
     def __init__(self, rules_dir):
         """初始化路由查找器，加载指定目录下的所有路由规则"""
         self.rules_dir = rules_dir
-        self.routing_rules = defaultdict(list)  # 按网络名称组织规则
         self.field_mapping = {
             # 可以添加FIX标签到字段名的映射，如果需要的话
             # 例如: '35' : 'MSG_TYPE',
         }
+        self.checked_at = 0.0
         self.load_all_rules()
         
     def load_all_rules(self):
-        """加载目录中所有的路由规则CSV文件"""
+        """
+        加载目录中所有的路由规则CSV文件
+        解析结果来自进程级规则缓存，只有上次加载后修改过的文件才会重新解析
+        """
         try:
             # 获取目录中所有以alias_开头且以.csv结尾的文件
-            for filename in os.listdir(self.rules_dir):
-                if filename.startswith('alias_') and filename.endswith('.csv'):
-                    network_name = filename[len('alias_'):-len('.csv')]
-                    file_path = os.path.join(self.rules_dir, filename)
-                    self._load_rules_from_file(network_name, file_path)
+            file_paths = [os.path.join(self.rules_dir, filename)
+                          for filename in os.listdir(self.rules_dir)
+                          if filename.startswith('alias_') and filename.endswith('.csv')]
+            rule_set = rule_cache('fix_route_finder_alias').load(
+                file_paths, self._load_rules_from_file, CompiledRules.from_files)
+            # 一次赋值切换到新版本，正在进行的查找继续使用旧版本
+            self.rules = rule_set.compiled
+            self.checked_at = time.monotonic()
                     
             print(f"成功加载 {len(self.routing_rules)} 个网络的路由规则")
+            return self.rules
             
         except Exception as e:
             print(f"加载路由规则时出错: {str(e)}")
             raise
     
-    def _load_rules_from_file(self, network, file_path):
+    def refresh(self):
+        """返回当前规则，最多每RELOAD_CHECK_SECONDS秒检查一次文件是否被修改"""
+        if time.monotonic() - self.checked_at < RELOAD_CHECK_SECONDS:
+            return self.rules
+        return self.load_all_rules()
+    
+    @property
+    def routing_rules(self):
+        return self.rules.routing_rules
+    
+    @staticmethod
+    def _load_rules_from_file(file_path):
         """从单个CSV文件加载路由规则"""
+        rules = []
         try:
             with open(file_path, 'r', encoding='utf-8') as csvfile:
                 # 检测CSV文件使用的分隔符
@@ -39,7 +100,6 @@ class FixRouteFinder:
                 csvfile.seek(0)
                 
                 reader = csv.DictReader(csvfile, dialect=dialect)
-                rules_count = 0
                 
                 for row in reader:
                     # 提取目标地址
@@ -51,16 +111,16 @@ class FixRouteFinder:
                     conditions = {k: v.strip() for k, v in row.items() if k != 'DESTINATION' and v.strip()}
                     
                     # 添加到规则集合
-                    self.routing_rules[network].append({
+                    rules.append({
                         'conditions': conditions,
                         'destination': destination
                     })
-                    rules_count += 1
                 
-                print(f"从 {file_path} 加载了 {rules_count} 条规则 (网络: {network})")
+                print(f"从 {file_path} 加载了 {len(rules)} 条规则 (网络: {network_name(file_path)})")
                 
         except Exception as e:
             print(f"加载文件 {file_path} 时出错: {str(e)}")
+        return rules
     
     def _parse_fix_message(self, fix_string):
         """解析FIX格式的消息字符串为字典"""
@@ -116,26 +176,41 @@ class FixRouteFinder:
             fix_message = self._parse_fix_message(fix_input)
         else:
             fix_message = fix_input
-            
-        best_route = None
-        highest_score = 0
         
-        # 检查所有网络的所有规则
-        for network, rules in self.routing_rules.items():
-            for rule in rules:
-                score = self._calculate_match_score(fix_message, rule['conditions'])
-                
-                # 更新最佳路由
-                if score > highest_score and score > 0:
-                    highest_score = score
-                    best_route = {
-                        'network': network,
-                        'destination': rule['destination'],
-                        'match_score': round(score, 2),
-                        'conditions_matched': rule['conditions']
-                    }
+        # 只有与消息共享字段值的规则才会被评分，分数相同时先加载的规则优先
+        rules = self.refresh()
+        best = rules.rule_index.best_scored(fix_message)
+        if best is None:
+            return None
+        
+        rule_id, ratio = best
+        network, rule = rules.rule_refs[rule_id]
+        return {
+            'network': network,
+            'destination': rule['destination'],
+            'match_score': round(ratio * 100, 2),
+            'conditions_matched': rule['conditions']
+        }
+    
+    def find_best_routes(self, orders):
+        """
+        批量路由：为DataFrame中的每条订单找到最佳路由（列名与规则字段相同）
+        返回增加了network、destination和match_score列的副本，字段值相同的订单只计算一次
+        """
+        columns = [c for c in self.refresh().rule_index.column_names if c in orders.columns]
+        best = {}
+        results = []
+        for values in zip(*(orders[c].tolist() for c in columns)) if columns else [()] * len(orders):
+            if values not in best:
+                best[values] = self.find_best_route(
+                    {c: v for c, v in zip(columns, values) if not is_missing(v)})
+            results.append(best[values])
         
-        return best_route
+        routed = orders.copy()
+        routed['network'] = [r['network'] if r else None for r in results]
+        routed['destination'] = [r['destination'] if r else None for r in results]
+        routed['match_score'] = [r['match_score'] if r else 0 for r in results]
+        return routed
 
 def main():
     # 设置命令行参数
@@ -5,13 +5,19 @@ Tracks order lifecycle and modifications using ClOrdID (11) and OrigClOrdID (41)
 """
 
 import os
-import re
+import sys
 import csv
 import argparse
 from datetime import datetime
 from collections import defaultdict, OrderedDict
 import glob
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fixlib.genealogy import Genealogy
+from fixlib.order_index import OrderIndex, read_messages
+from fixlib.scan import iter_lines, map_file, scan_files
+from fixlib.tokenizer import parse_fix
+
 class FIXOrderAuditTrail:
     def __init__(self):
         # FIX 4.2 tag definitions
@@ -78,77 +84,129 @@ class FIXOrderAuditTrail:
         }
 
     def parse_fix_message(self, message):
-        """Parse a single FIX message into a dictionary"""
-        parsed = {}
-        
-        # Handle different delimiters
-        if '\x01' in message:
-            fields = message.split('\x01')
-        elif '|' in message:
-            fields = message.split('|')
-        else:
-            # Try to split on any non-alphanumeric delimiter followed by '='
-            fields = re.split(r'(?<=\=)[^a-zA-Z0-9]', message)
-        
-        for field in fields:
-            if '=' in field:
-                parts = field.split('=', 1)
-                if len(parts) == 2:
-                    tag, value = parts
-                    if tag in self.tag_definitions:
-                        parsed[self.tag_definitions[tag]] = value
-                    else:
-                        parsed[tag] = value
+        """Parse a single FIX message into a dictionary (delimiter is auto-detected)"""
+        return parse_fix(message, names=self.tag_definitions)
+
+    def _parse_order_line(self, buf, start=0, end=None):
+        """Parse one log line if it carries an order-related FIX 4.2 message, else None"""
+        if end is None:
+            end = len(buf)
+        if buf.find(b'8=FIX.4.2', start, end) < 0:
+            return None
+        
+        parsed = parse_fix(buf, names=self.tag_definitions, start=start, end=end)
+        
+        # Only process order-related messages
+        if parsed.get('MsgType', '') not in self.order_msg_types:
+            return None
+        
+        # Add timestamp if not present
+        if 'TransactTime' not in parsed:
+            parsed['TransactTime'] = datetime.now().strftime('%Y%m%d-%H:%M:%S.%f')[:-3]
         
         return parsed
 
-    def build_order_audit_trail(self, log_files, target_order_id=None, target_account=None, target_clordid=None):
-        """Build audit trail for orders, optionally filtered by criteria"""
-        # Store all messages by ClOrdID and OrderID
+    def _scan_chunk(self, log_file, start, end):
+        """Parse one newline-aligned byte range of a log file (runs in a worker process)"""
+        messages = []
+        by_clordid = defaultdict(list)
+        by_orderid = defaultdict(list)
+        
+        with map_file(log_file) as mm:
+            for line_start, line_end in iter_lines(mm, start, end):
+                try:
+                    parsed = self._parse_order_line(mm, line_start, line_end)
+                    if parsed is None:
+                        continue
+                    
+                    # Index by position within this chunk
+                    clordid = parsed.get('ClOrdID')
+                    if clordid:
+                        by_clordid[clordid].append(len(messages))
+                    
+                    orderid = parsed.get('OrderID')
+                    if orderid:
+                        by_orderid[orderid].append(len(messages))
+                    
+                    messages.append(parsed)
+                    
+                except Exception as e:
+                    print(f"Error parsing {os.path.basename(log_file)} at byte {line_start}: {e}")
+                    continue
+        
+        return messages, dict(by_clordid), dict(by_orderid)
+
+    def scan_messages(self, log_files, workers=None):
+        """Scan log files in parallel; returns (all_messages, orders_by_clordid, orders_by_orderid)"""
+        orders_by_clordid = defaultdict(list)
+        orders_by_orderid = defaultdict(list)
+        all_messages = []
+        
+        print(f"Found {len(log_files)} log files to process")
+        
+        # Merge per-chunk indexes, rebasing chunk positions onto all_messages
+        for messages, by_clordid, by_orderid in scan_files(log_files, self._scan_chunk, workers=workers):
+            base = len(all_messages)
+            all_messages.extend(messages)
+            for clordid, positions in by_clordid.items():
+                orders_by_clordid[clordid].extend(all_messages[base + i] for i in positions)
+            for orderid, positions in by_orderid.items():
+                orders_by_orderid[orderid].extend(all_messages[base + i] for i in positions)
+        
+        return all_messages, orders_by_clordid, orders_by_orderid
+
+    def load_indexed_messages(self, index_path, log_files, workers=None, **criteria):
+        """
+        Bring the on-disk index up to date, then read only the messages related to
+        the criteria (and their replace chains) with targeted seeks.
+        Returns the same triple as scan_messages.
+        """
         orders_by_clordid = defaultdict(list)
         orders_by_orderid = defaultdict(list)
         all_messages = []
         
-        # Process all log files
-        for log_file in log_files:
-            print(f"Processing: {os.path.basename(log_file)}")
+        with OrderIndex(index_path) as index:
+            added = index.update(log_files, workers=workers)
+            print(f"Index {index_path}: {added} new messages indexed")
+            locations = index.related_locations(**criteria)
+        
+        for log_file, offset, raw in read_messages(locations):
             try:
-                with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    for line_num, line in enumerate(f, 1):
-                        line = line.strip()
-                        if not line or '8=FIX.4.2' not in line:
-                            continue
-                        
-                        try:
-                            parsed = self.parse_fix_message(line)
-                            msg_type = parsed.get('MsgType', '')
-                            
-                            # Only process order-related messages
-                            if msg_type in self.order_msg_types:
-                                # Add timestamp if not present
-                                if 'TransactTime' not in parsed:
-                                    parsed['TransactTime'] = datetime.now().strftime('%Y%m%d-%H:%M:%S.%f')[:-3]
-                                
-                                # Store message
-                                all_messages.append(parsed)
-                                
-                                # Index by ClOrdID
-                                clordid = parsed.get('ClOrdID')
-                                if clordid:
-                                    orders_by_clordid[clordid].append(parsed)
-                                
-                                # Index by OrderID
-                                orderid = parsed.get('OrderID')
-                                if orderid:
-                                    orders_by_orderid[orderid].append(parsed)
-                                
-                        except Exception as e:
-                            print(f"Error parsing line {line_num}: {e}")
-                            continue
-                            
+                parsed = self._parse_order_line(raw)
             except Exception as e:
-                print(f"Error reading file {log_file}: {e}")
+                print(f"Error parsing {os.path.basename(log_file)} at byte {offset}: {e}")
+                continue
+            if parsed is None:
                 continue
+            
+            all_messages.append(parsed)
+            if parsed.get('ClOrdID'):
+                orders_by_clordid[parsed['ClOrdID']].append(parsed)
+            if parsed.get('OrderID'):
+                orders_by_orderid[parsed['OrderID']].append(parsed)
+        
+        return all_messages, orders_by_clordid, orders_by_orderid
+
+    def build_order_audit_trail(self, log_files, target_order_id=None, target_account=None, target_clordid=None,
+                                workers=None, index_path=None):
+        """Build audit trail for orders, optionally filtered by criteria"""
+        # Store all messages by ClOrdID and OrderID
+        criteria = {
+            key: value for key, value in
+            (('orderid', target_order_id), ('account', target_account), ('clordid', target_clordid))
+            if value
+        }
+        if index_path and criteria:
+            all_messages, orders_by_clordid, orders_by_orderid = self.load_indexed_messages(
+                index_path, log_files, workers=workers, **criteria
+            )
+        else:
+            all_messages, orders_by_clordid, orders_by_orderid = self.scan_messages(log_files, workers)
+        
+        # OrigClOrdID links, indexed once for every chain lookup below, and the
+        # modification chains already walked
+        genealogy = self._build_genealogy(orders_by_clordid)
+        chains = {}
         
         # Build audit trails
         audit_trails = []
@@ -160,7 +218,8 @@ class FIXOrderAuditTrail:
             )
             
             for order_info in matching_orders:
-                audit_trail = self._build_single_audit_trail(order_info, orders_by_clordid, orders_by_orderid)
+                audit_trail = self._build_single_audit_trail(order_info, orders_by_clordid, orders_by_orderid,
+                                                             genealogy, chains)
                 if audit_trail:
                     audit_trails.append(audit_trail)
         else:
@@ -174,7 +233,9 @@ class FIXOrderAuditTrail:
                     audit_trail = self._build_single_audit_trail(
                         {'ClOrdID': clordid, 'OrderID': orderid},
                         orders_by_clordid,
-                        orders_by_orderid
+                        orders_by_orderid,
+                        genealogy,
+                        chains
                     )
                     if audit_trail:
                         audit_trails.append(audit_trail)
@@ -211,7 +272,8 @@ class FIXOrderAuditTrail:
         
         return matching_orders
 
-    def _build_single_audit_trail(self, order_info, orders_by_clordid, orders_by_orderid):
+    def _build_single_audit_trail(self, order_info, orders_by_clordid, orders_by_orderid, genealogy=None,
+                                  chains=None):
         """Build audit trail for a single order"""
         clordid = order_info['ClOrdID']
         orderid = order_info['OrderID']
@@ -232,7 +294,7 @@ class FIXOrderAuditTrail:
             'OrderID': orderid,
             'Account': order_info.get('Account'),
             'events': [],
-            'modification_chain': self._build_modification_chain(clordid, orders_by_clordid)
+            'modification_chain': self._build_modification_chain(clordid, orders_by_clordid, genealogy, chains)
         }
         
         # Add each event to the trail
@@ -242,36 +304,69 @@ class FIXOrderAuditTrail:
         
         return audit_trail
 
-    def _build_modification_chain(self, clordid, orders_by_clordid):
-        """Build the chain of order modifications using OrigClOrdID"""
-        modification_chain = []
+    def _build_genealogy(self, orders_by_clordid):
+        """Index every ClOrdID -> OrigClOrdID link in one pass (first linking message kept)"""
+        genealogy = Genealogy()
+        for other_clordid, other_messages in orders_by_clordid.items():
+            for msg in other_messages:
+                genealogy.add(other_clordid, msg.get('OrigClOrdID'), msg)
+        return genealogy
+
+    def _build_modification_chain(self, clordid, orders_by_clordid, genealogy=None, chains=None):
+        """
+        Build the chain of order modifications using OrigClOrdID (latest first).
+        chains is shared between calls: the chain of every ClOrdID met on a walk
+        that does not end on a cycle is stored there, and a walk that reaches one
+        of them takes its chain as the rest, so each tree is walked once.
+        """
+        if genealogy is None:
+            genealogy = self._build_genealogy(orders_by_clordid)
+        if chains is None:
+            chains = {}
+        cached = chains.get(clordid)
+        if cached is not None:
+            return cached
+        
+        links = []
+        rest = []
         current_clordid = clordid
+        visited = set()
+        cycle = False
         
         while current_clordid:
-            messages = orders_by_clordid.get(current_clordid, [])
-            if not messages:
+            if current_clordid in visited:
+                cycle = True
                 break
+            # Stored chains never end on a cycle, so this one cannot loop back into our walk
+            if current_clordid in chains:
+                rest = chains[current_clordid]
+                break
+            if not orders_by_clordid.get(current_clordid):
+                break
+            visited.add(current_clordid)
             
-            # Find the message that references this ClOrdID as OrigClOrdID
-            found_previous = False
-            for other_clordid, other_messages in orders_by_clordid.items():
-                for msg in other_messages:
-                    if msg.get('OrigClOrdID') == current_clordid:
-                        modification_chain.insert(0, {
-                            'ClOrdID': current_clordid,
-                            'ModifiedBy': other_clordid,
-                            'ModificationType': self._get_modification_type(msg)
-                        })
-                        current_clordid = other_clordid
-                        found_previous = True
-                        break
-                if found_previous:
-                    break
-            
-            if not found_previous:
+            # The first message that references this ClOrdID as OrigClOrdID
+            link = genealogy.first_child(current_clordid)
+            if link is None:
                 break
+            
+            other_clordid, msg = link
+            links.append({
+                'ClOrdID': current_clordid,
+                'ModifiedBy': other_clordid,
+                'ModificationType': self._get_modification_type(msg)
+            })
+            current_clordid = other_clordid
         
-        return modification_chain
+        walked = len(links)
+        links.reverse()
+        links = rest + links
+        if not cycle:
+            chains[clordid] = links
+            # Every later ClOrdID of the walk ends the same way, its chain is a prefix of this one
+            for i in range(1, walked):
+                chains[links[-1 - i]['ClOrdID']] = links[:-i]
+        return links
 
     def _get_modification_type(self, msg):
         """Determine the type of modification"""
@@ -378,6 +473,10 @@ def main():
     parser.add_argument('--account', help='Filter by Account')
     parser.add_argument('--clordid', help='Filter by ClOrdID')
     parser.add_argument('-o', '--output', help='Output report file', default='fix_audit_trail.txt')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes for log scanning (default: CPU count)')
+    parser.add_argument('--index', help='SQLite order index file; filtered lookups update it '
+                                        'incrementally and read only the matching messages')
     
     args = parser.parse_args()
     
@@ -401,7 +500,9 @@ def main():
         log_files, 
         target_order_id=args.order_id,
         target_account=args.account,
-        target_clordid=args.clordid
+        target_clordid=args.clordid,
+        workers=args.workers,
+        index_path=args.index
     )
     
     if audit_trails:
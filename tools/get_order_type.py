@@ -5,13 +5,17 @@ Extracts order characteristics from FIX protocol log files
 """
 
 import os
-import re
+import sys
 import csv
 import argparse
 from datetime import datetime
 from collections import defaultdict, Counter
 import glob
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fixlib.scan import iter_lines, map_file, scan_files
+from fixlib.tokenizer import parse_fix
+
 class FIXLogAnalyzer:
     def __init__(self):
         # FIX 4.2 tag definitions for order characteristics
@@ -44,24 +48,8 @@ class FIXLogAnalyzer:
         self.order_msgs = ['D', '8', 'F', 'G']  # New Order, Execution Report, Order Cancel, Order Replace
         
     def parse_fix_message(self, message):
-        """Parse a single FIX message into a dictionary"""
-        parsed = {}
-        # Split on SOH character (ASCII 1) or pipe if SOH isn't preserved
-        if '\x01' in message:
-            fields = message.split('\x01')
-        else:
-            # Try common delimiters
-            fields = re.split(r'[|=]', message)
-        
-        for field in fields:
-            if '=' in field:
-                tag, value = field.split('=', 1)
-                if tag in self.tag_definitions:
-                    parsed[self.tag_definitions[tag]] = value
-                else:
-                    parsed[tag] = value
-        
-        return parsed
+        """Parse a single FIX message into a dictionary (SOH, '|' or ';' delimited)"""
+        return parse_fix(message, names=self.tag_definitions)
     
     def extract_order_characteristics(self, parsed_msg):
         """Extract order characteristics from parsed message"""
@@ -136,7 +124,38 @@ class FIXLogAnalyzer:
         }
         return ord_type_map.get(ord_type_code, f'Unknown({ord_type_code})')
     
-    def scan_log_files(self, log_directory, output_file=None):
+    def _scan_chunk(self, log_file, start, end):
+        """Extract order characteristics from one byte range of a log file (runs in a worker process)"""
+        orders = []
+        stats = defaultdict(Counter)
+        
+        with map_file(log_file) as mm:
+            for line_start, line_end in iter_lines(mm, start, end):
+                # Look for FIX messages (typically start with 8=FIX.4.2)
+                if mm.find(b'8=FIX.4.2', line_start, line_end) < 0:
+                    continue
+                
+                try:
+                    parsed = parse_fix(mm, names=self.tag_definitions, start=line_start, end=line_end)
+                    order_chars = self.extract_order_characteristics(parsed)
+                    
+                    if order_chars:
+                        orders.append(order_chars)
+                        
+                        # Update statistics
+                        stats['by_side'][order_chars['Side']] += 1
+                        stats['by_tif'][order_chars['TimeInForce']] += 1
+                        stats['by_type'][order_chars['OrdType']] += 1
+                        stats['by_symbol'][order_chars['Symbol']] += 1
+                        stats['by_account'][order_chars['Account']] += 1
+                        
+                except Exception as e:
+                    print(f"Error parsing byte {line_start} in {log_file}: {e}")
+                    continue
+        
+        return orders, stats
+    
+    def scan_log_files(self, log_directory, output_file=None, workers=None):
         """Scan all log files in directory and extract order characteristics"""
         all_orders = []
         stats = defaultdict(Counter)
@@ -150,38 +169,11 @@ class FIXLogAnalyzer:
         
         print(f"Found {len(log_files)} log files to process")
         
-        for log_file in log_files:
-            print(f"Processing: {os.path.basename(log_file)}")
-            try:
-                with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    for line_num, line in enumerate(f, 1):
-                        line = line.strip()
-                        if not line:
-                            continue
-                        
-                        # Look for FIX messages (typically start with 8=FIX.4.2)
-                        if '8=FIX.4.2' in line:
-                            try:
-                                parsed = self.parse_fix_message(line)
-                                order_chars = self.extract_order_characteristics(parsed)
-                                
-                                if order_chars:
-                                    all_orders.append(order_chars)
-                                    
-                                    # Update statistics
-                                    stats['by_side'][order_chars['Side']] += 1
-                                    stats['by_tif'][order_chars['TimeInForce']] += 1
-                                    stats['by_type'][order_chars['OrdType']] += 1
-                                    stats['by_symbol'][order_chars['Symbol']] += 1
-                                    stats['by_account'][order_chars['Account']] += 1
-                                    
-                            except Exception as e:
-                                print(f"Error parsing line {line_num} in {log_file}: {e}")
-                                continue
-                                
-            except Exception as e:
-                print(f"Error reading file {log_file}: {e}")
-                continue
+        # Memory-mapped chunks are parsed in a process pool; merge the partial results
+        for orders, chunk_stats in scan_files(log_files, self._scan_chunk, workers=workers):
+            all_orders.extend(orders)
+            for key, counter in chunk_stats.items():
+                stats[key].update(counter)
         
         # Generate summary report
         self.generate_report(all_orders, stats, output_file)
@@ -258,6 +250,8 @@ def main():
     parser = argparse.ArgumentParser(description='Analyze FIX 4.2 log files for order characteristics')
     parser.add_argument('log_dir', help='Directory containing log files')
     parser.add_argument('-o', '--output', help='Output report file', default='fix_analysis_report.txt')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes for log scanning (default: CPU count)')
     
     args = parser.parse_args()
     
@@ -266,7 +260,7 @@ def main():
         return
     
     analyzer = FIXLogAnalyzer()
-    analyzer.scan_log_files(args.log_dir, args.output)
+    analyzer.scan_log_files(args.log_dir, args.output, workers=args.workers)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
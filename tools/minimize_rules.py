@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Routing Table Minimizer
+Reports shadowed and redundant rows of ';'-separated first-match routing CSVs
+(SENDERCOMPID;ONBEHALFOFCOMPID;CURRENCY;...;DESTINATION) and writes an
+equivalent table with those rows dropped. --merge-values also merges
+CURRENCY values into comma-separated sets; the routers read such a set as
+one literal value, so that output is for review only.
+"""
+
+import os
+import sys
+import csv
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fixlib.rule_minimize import analyze_rules
+# Account patterns (200xxxxx) are matched the way the alias router matches them
+from routing_ds import _account_pattern
+
+
+def read_rule_table(path, delimiter=';'):
+    """Header row plus rule rows of one routing CSV"""
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f, delimiter=delimiter)
+        return reader.fieldnames or [], [row for row in reader]
+
+
+def write_rule_table(path, header, rows, delimiter=';'):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=header, delimiter=delimiter, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def format_row(row, header):
+    return ';'.join(str(row.get(column, '')) for column in header)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Routing Table Minimizer')
+    parser.add_argument('rules_file', help='Routing CSV (first matching row wins)')
+    parser.add_argument('--destination', default='DESTINATION', help='Destination column')
+    parser.add_argument('--merge-column', default='CURRENCY', help='Column whose values are merged into sets')
+    parser.add_argument('--ignore', nargs='*', default=[], help='Columns that are not routing criteria')
+    parser.add_argument('-o', '--output', help='Write the table without shadowed/redundant rows here')
+    parser.add_argument('--merge-values', action='store_true',
+                        help='With -o, also merge the merge column values into "A,B" sets (for review: '
+                             'the routers do not expand sets, so this table does not route the same)')
+    parser.add_argument('-v', '--verbose', action='store_true', help='List every dropped row')
+
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.rules_file):
+        print(f"Error: File '{args.rules_file}' does not exist")
+        return
+
+    header, rows = read_rule_table(args.rules_file)
+    if args.destination not in header:
+        print(f"Error: No '{args.destination}' column in {args.rules_file}")
+        return
+    columns = [c for c in header if c != args.destination and c not in args.ignore]
+    analysis = analyze_rules(rows, columns, args.destination, args.merge_column,
+                             compile_pattern=_account_pattern)
+
+    summary = analysis.summary()
+    print(f"Rows:      {summary['rows']}")
+    print(f"Shadowed:  {summary['shadowed']} (an earlier row already matches all their orders)")
+    print(f"Redundant: {summary['redundant']} (a later row routes their orders to the same destination)")
+    print(f"Kept:      {summary['kept']}")
+    print(f"Merged:    {summary['minimized']} rows if {args.merge_column} values were merged into sets")
+
+    if args.verbose:
+        # Row numbers are file lines (header is line 1)
+        for title, dropped in (('Shadowed', analysis.shadowed), ('Redundant', analysis.redundant)):
+            if dropped:
+                print(f"\n{title} rows:")
+            for row, by in sorted(dropped.items()):
+                print(f"  line {row + 2}: {format_row(rows[row], header)}")
+                print(f"      {'covered by' if title == 'Shadowed' else 'falls through to'} line {by + 2}: "
+                      f"{format_row(rows[by], header)}")
+
+    if args.output:
+        if args.merge_values:
+            write_rule_table(args.output, header, analysis.minimized_rows())
+            print(f"\nMerged table written to {args.output} (review only: "
+                  f"routers read a merged {args.merge_column} set as one literal value)")
+        else:
+            write_rule_table(args.output, header, analysis.kept_rows())
+            print(f"\nEquivalent table written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Batch route simulation over historical orders.
+
+Routes every order of a parsed order file (CSV with FIX tag or field-name
+columns) or of raw FIX logs through the alias_*.csv routing tables, and
+optionally through a second, proposed version of the tables, reporting which
+orders would change destination.
+
+    python route_simulation.py orders.csv --rules ./routing
+    python route_simulation.py /var/log/ullink --rules ./routing --compare ./routing_new -o reroutes.csv
+"""
+
+import argparse
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fixlib.scan import iter_lines, map_file, scan_files
+from fixlib.tokenizer import FIXFields
+
+from routing_ds import FIXRouter, simulate_reroutes
+
+# New orders and replaces are what gets routed
+ROUTED_MSG_TYPES = ('D', 'G')
+
+
+def _order_rows(log_file, start, end):
+    """Tag -> value dicts of the routed messages in one byte range (worker process)"""
+    rows = []
+    with map_file(log_file) as mm:
+        for line_start, line_end in iter_lines(mm, start, end):
+            if mm.find(b'8=FIX', line_start, line_end) < 0:
+                continue
+            fields = FIXFields(mm, line_start, line_end)
+            if fields.msg_type in ROUTED_MSG_TYPES:
+                rows.append(dict(fields.items()))
+    return rows
+
+
+def load_orders(path, workers=None):
+    """Orders from a CSV file, or from every .log file under a directory / a single log"""
+    if path.endswith('.csv'):
+        return pd.read_csv(path, dtype=str)
+    if os.path.isdir(path):
+        log_files = sorted(os.path.join(path, f) for f in os.listdir(path) if f.endswith('.log'))
+    else:
+        log_files = [path]
+    rows = [row for chunk in scan_files(log_files, _order_rows, workers=workers) for row in chunk]
+    return pd.DataFrame(rows, dtype=str)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Route historical orders through alias routing tables')
+    parser.add_argument('orders', help='Parsed orders CSV, FIX log file or directory of .log files')
+    parser.add_argument('--rules', required=True, help='Directory with the current alias_*.csv files')
+    parser.add_argument('--compare', help='Directory with a proposed version of the alias_*.csv files')
+    parser.add_argument('-o', '--output', help='Output CSV (routed orders, or reroutes with --compare)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes for log parsing (default: CPU count)')
+    args = parser.parse_args()
+
+    orders = load_orders(args.orders, args.workers)
+    print(f"Loaded {len(orders)} orders")
+    current = FIXRouter(args.rules)
+
+    if not args.compare:
+        routed = current.route_dataframe(orders)
+        print("\nOrders per destination:")
+        print(routed['destination'].fillna('(unrouted)').value_counts().to_string())
+        if args.output:
+            routed.to_csv(args.output, index=False)
+            print(f"\nRouted orders written to {args.output}")
+        return
+
+    proposed = FIXRouter(args.compare)
+    diff, summary = simulate_reroutes(orders, current, proposed)
+    print(f"\n{len(diff)} of {len(orders)} orders would be rerouted")
+    if not summary.empty:
+        print(summary.to_string(index=False))
+    if args.output:
+        diff.to_csv(args.output, index=False)
+        print(f"\nRerouted orders written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,43 @@
 import csv
 import os
 import re
+import sys
+import time
 from typing import Dict, List, Optional, Tuple
 import simplefix
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fixlib.rule_cache import rule_cache
+from fixlib.rule_index import RuleIndex, is_missing
+
+# Seconds between checks of the routing files for edits
+RELOAD_CHECK_SECONDS = 2.0
+
+# Criteria values that match anything
+WILDCARDS = ('*', '*:*:*:*')
+
+def _account_pattern(key: str, expected_value: str):
+    """Account number patterns (e.g., 200xxxxx), where x is a digit"""
+    if key == 'account' and 'x' in expected_value.lower():
+        return re.compile(expected_value.replace('x', '\\d').replace('X', '\\d')).match
+    return None
+
+class CompiledRules:
+    """One version of the routing tables and the index built from it; replaced as a whole on reload"""
+    
+    def __init__(self, routing_rules: Dict[str, List[Dict]]):
+        self.routing_rules = routing_rules
+        self.rule_refs = []
+        criteria = []
+        for network, rules in routing_rules.items():
+            for rule in rules:
+                # Rules without criteria never match
+                if rule['criteria']:
+                    criteria.append(rule['criteria'])
+                    self.rule_refs.append((network, rule))
+        self.rule_index = RuleIndex(criteria, compile_pattern=_account_pattern,
+                                    wildcards=WILDCARDS, missing_matches=True)
+
 class FIXRouter:
     def __init__(self, routing_files_directory: str):
         """
@@ -13,21 +47,49 @@ class FIXRouter:
             routing_files_directory: Directory containing routing CSV files
         """
         self.routing_files_directory = routing_files_directory
-        self.routing_rules = {}
+        self.checked_at = 0.0
+        self.rules = CompiledRules({})
         self.load_routing_rules()
     
-    def load_routing_rules(self):
-        """Load all routing rules from CSV files in the directory."""
+    def load_routing_rules(self) -> 'CompiledRules':
+        """
+        Load all routing rules from CSV files in the directory.
+        Parsed files come from the process-wide rule cache, so only files changed
+        since the last load are parsed again.
+        """
         if not os.path.exists(self.routing_files_directory):
             print(f"Directory {self.routing_files_directory} does not exist")
-            return
-            
-        for filename in os.listdir(self.routing_files_directory):
-            if filename.endswith('.csv'):
-                network_name = self.extract_network_name(filename)
-                file_path = os.path.join(self.routing_files_directory, filename)
-                self.routing_rules[network_name] = self.parse_routing_file(file_path)
-                print(f"Loaded routing rules for {network_name}")
+            return self.rules
+        
+        file_paths = [os.path.join(self.routing_files_directory, filename)
+                      for filename in os.listdir(self.routing_files_directory)
+                      if filename.endswith('.csv')]
+        rule_set = rule_cache('routing_alias').load(file_paths, self._parse_network_file, self._compile)
+        # Swap in the new version in one assignment; lookups keep the one they started with
+        self.rules = rule_set.compiled
+        self.checked_at = time.monotonic()
+        return self.rules
+    
+    def refresh(self) -> 'CompiledRules':
+        """Current rules, reloading edited files at most every RELOAD_CHECK_SECONDS."""
+        if time.monotonic() - self.checked_at < RELOAD_CHECK_SECONDS:
+            return self.rules
+        return self.load_routing_rules()
+    
+    def _parse_network_file(self, file_path: str) -> List[Dict]:
+        rules = self.parse_routing_file(file_path)
+        print(f"Loaded routing rules for {self.extract_network_name(os.path.basename(file_path))}")
+        return rules
+    
+    def _compile(self, files: Dict[str, List[Dict]]) -> 'CompiledRules':
+        return CompiledRules({
+            self.extract_network_name(os.path.basename(path)): rules
+            for path, rules in files.items()
+        })
+    
+    @property
+    def routing_rules(self) -> Dict[str, List[Dict]]:
+        return self.rules.routing_rules
     
     def extract_network_name(self, filename: str) -> str:
         """Extract network name from filename."""
@@ -174,6 +236,28 @@ class FIXRouter:
             print(f"Error parsing FIX message: {e}")
             return {}
     
+    def _ranked_routes(self, rules: 'CompiledRules', parsed_msg: Dict,
+                       preferred_networks: List[str] = None) -> List[Dict]:
+        # Networks are checked in preference order, rules in file order
+        network_order = {network: i for i, network in enumerate(preferred_networks or [])}
+        matched = [rules.rule_refs[rule_id] for rule_id in rules.rule_index.matches(parsed_msg)]
+        if network_order:
+            matched.sort(key=lambda ref: network_order.get(ref[0], len(network_order)))
+        
+        matching_routes = [
+            {
+                'network': network,
+                'rule': rule,
+                'match_score': self.calculate_match_score(parsed_msg, rule['criteria'])
+            }
+            for network, rule in matched
+        ]
+        
+        # Sort by match score (higher is better)
+        matching_routes.sort(key=lambda x: x['match_score'], reverse=True)
+        
+        return matching_routes
+    
     def find_routing_path(self, fix_message: str, preferred_networks: List[str] = None) -> List[Dict]:
         """
         Find the routing path for a given FIX message.
@@ -189,34 +273,35 @@ class FIXRouter:
         if not parsed_msg:
             return []
         
-        matching_routes = []
-        
-        # Check preferred networks first
-        networks_to_check = []
-        if preferred_networks:
-            networks_to_check.extend(preferred_networks)
-        
-        # Add all other networks
-        for network in self.routing_rules.keys():
-            if network not in networks_to_check:
-                networks_to_check.append(network)
-        
-        for network in networks_to_check:
-            rules = self.routing_rules.get(network, [])
-            
-            for rule in rules:
-                if self.matches_criteria(parsed_msg, rule['criteria']):
-                    route_info = {
-                        'network': network,
-                        'rule': rule,
-                        'match_score': self.calculate_match_score(parsed_msg, rule['criteria'])
-                    }
-                    matching_routes.append(route_info)
+        return self._ranked_routes(self.refresh(), parsed_msg, preferred_networks)
+    
+    def route_dataframe(self, orders, preferred_networks: List[str] = None):
+        """
+        Best route for every row of a DataFrame of orders with columns named like the
+        parsed message fields (account, currency, target_sub_id, deliver_to_sub_id).
+        Returns a copy with 'network', 'route_to' and 'match_score' columns; orders
+        sharing the same routing fields are resolved once.
         
-        # Sort by match score (higher is better)
-        matching_routes.sort(key=lambda x: x['match_score'], reverse=True)
+        Args:
+            orders: pandas DataFrame, one order per row
+            preferred_networks: List of preferred networks to check first
+        """
+        rules = self.refresh()
+        columns = [c for c in rules.rule_index.column_names if c in orders.columns]
+        best = {}
+        results = []
+        for values in zip(*(orders[c].tolist() for c in columns)) if columns else [()] * len(orders):
+            if values not in best:
+                parsed_msg = {c: str(v) for c, v in zip(columns, values) if not is_missing(v)}
+                routes = self._ranked_routes(rules, parsed_msg, preferred_networks)
+                best[values] = routes[0] if routes else None
+            results.append(best[values])
         
-        return matching_routes
+        routed = orders.copy()
+        routed['network'] = [r['network'] if r else None for r in results]
+        routed['route_to'] = [r['rule'].get('route_to') if r else None for r in results]
+        routed['match_score'] = [r['match_score'] if r else 0 for r in results]
+        return routed
     
     def matches_criteria(self, message_fields: Dict, criteria: Dict) -> bool:
         """
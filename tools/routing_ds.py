@@ -1,37 +1,124 @@
 import os
+import re
+import sys
 import glob
+import time
+from functools import lru_cache
 import pandas as pd
 from typing import Dict, List, Optional, Any
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fixlib.rule_cache import rule_cache
+from fixlib.rule_frame import diff_routes, first_match, reroute_summary
+from fixlib.rule_index import RuleIndex
+from fixlib.tokenizer import FIELD_NAMES
+
+# Seconds between checks of the rule files for edits
+RELOAD_CHECK_SECONDS = 2.0
+
+# Routing CSV column -> FIX tag
+COLUMN_TAGS = {
+    'SENDERCOMPID': '49',      # SenderCompID
+    'ONBEHALFOFCOMPID': '116', # OnBehalfOfCompID
+    'TARGETSUBID': '57',       # TargetSubID
+    'DELIVERTOSUBID': '128',   # DeliverToSubID
+    'CURRENCY': '15',          # Currency
+    'ACCOUNT': '1',            # Account
+    'HANDLINST': '21',         # HandlInst
+    'COUNTRYCODE': '421',      # Country
+    'FIX.5847': '5847',        # Custom tag
+    'ULFOMSESSIONNAME': 'n',   # Adjust based on your implementation
+    'ELECTRONIC_TRADING': 'n', # Adjust based on your implementation
+}
+
+def _account_regex(column: str, pattern: str) -> Optional[str]:
+    """Account number patterns like 200xxxxx, where x is any character"""
+    if pattern.startswith('200') and 'x' in pattern:
+        return pattern.replace('x', '.')
+    return None
+
+@lru_cache(maxsize=None)
+def _account_pattern(column: str, pattern: str):
+    regex = _account_regex(column, pattern)
+    return re.compile(regex).match if regex else None
+
+def read_rule_file(csv_file: str) -> Optional[Dict[str, Any]]:
+    """Parse one alias_*.csv file into {'columns', 'rules'}"""
+    try:
+        # Try different delimiters since files use different separators
+        for delimiter in [';', ',']:
+            try:
+                df = pd.read_csv(csv_file, delimiter=delimiter)
+                if not df.empty:
+                    return {
+                        'columns': df.columns.tolist(),
+                        'rules': df.to_dict('records')
+                    }
+            except:
+                continue
+    except Exception as e:
+        print(f"Error loading {csv_file}: {e}")
+    return None
+
+def network_name(csv_file: str) -> str:
+    # Extract network name from filename
+    filename = os.path.basename(csv_file)
+    return filename.replace("alias_", "").replace(".csv", "")
+
+class CompiledRules:
+    """One version of the routing tables and the index built from it; replaced as a whole on reload"""
+    
+    def __init__(self, routing_rules: Dict[str, Dict[str, Any]]):
+        self.routing_rules = routing_rules
+        self.rule_refs = []
+        conditions = []
+        columns = {}
+        for name, network_data in routing_rules.items():
+            for rule in network_data['rules']:
+                destination = rule.get('DESTINATION')
+                # A rule without a destination is skipped by the lookups anyway
+                if not destination or pd.isna(destination):
+                    continue
+                condition = {k: v for k, v in rule.items() if k != 'DESTINATION'}
+                columns.update(dict.fromkeys(condition))
+                conditions.append(condition)
+                self.rule_refs.append((name, rule))
+        self.rule_columns = list(columns)
+        self.rule_index = RuleIndex(conditions, compile_pattern=_account_pattern)
+    
+    @classmethod
+    def from_files(cls, files: Dict[str, Optional[Dict[str, Any]]]) -> 'CompiledRules':
+        return cls({network_name(path): data for path, data in files.items() if data})
+
 class FIXRouter:
     def __init__(self, csv_directory: str = "."):
-        self.routing_rules = {}
+        self.csv_directory = csv_directory
+        self.checked_at = 0.0
         self.load_routing_rules(csv_directory)
     
-    def load_routing_rules(self, directory: str):
-        """Load all routing rule CSV files from the directory"""
-        csv_files = glob.glob(os.path.join(directory, "alias_*.csv"))
-        
-        for csv_file in csv_files:
-            # Extract network name from filename
-            filename = os.path.basename(csv_file)
-            network_name = filename.replace("alias_", "").replace(".csv", "")
-            
-            try:
-                # Try different delimiters since files use different separators
-                for delimiter in [';', ',']:
-                    try:
-                        df = pd.read_csv(csv_file, delimiter=delimiter)
-                        if not df.empty:
-                            self.routing_rules[network_name] = {
-                                'columns': df.columns.tolist(),
-                                'rules': df.to_dict('records')
-                            }
-                            break
-                    except:
-                        continue
-            except Exception as e:
-                print(f"Error loading {csv_file}: {e}")
+    def load_routing_rules(self, directory: str = None) -> CompiledRules:
+        """
+        Load all routing rule CSV files from the directory. Parsed files come from the
+        process-wide rule cache, so only files changed since the last load are re-read.
+        """
+        if directory:
+            self.csv_directory = directory
+        csv_files = glob.glob(os.path.join(self.csv_directory, "alias_*.csv"))
+        rule_set = rule_cache('routing_ds_alias').load(csv_files, read_rule_file, CompiledRules.from_files)
+        # Swap in the new version in one assignment; lookups hold on to the one they started with
+        self.rules = rule_set.compiled
+        self.checked_at = time.monotonic()
+        return self.rules
+    
+    def refresh(self) -> CompiledRules:
+        """Current rules, reloading edited files at most every RELOAD_CHECK_SECONDS"""
+        if time.monotonic() - self.checked_at < RELOAD_CHECK_SECONDS:
+            return self.rules
+        return self.load_routing_rules()
+    
+    @property
+    def routing_rules(self) -> Dict[str, Dict[str, Any]]:
+        return self.rules.routing_rules
     
     def parse_fix_message(self, fix_message: str) -> Dict[str, str]:
         """Parse FIX message into a dictionary of tag=value pairs"""
@@ -52,62 +139,38 @@ class FIXRouter:
         
         return fix_fields
     
-    def match_rule(self, rule: Dict[str, Any], fix_fields: Dict[str, str]) -> bool:
-        """Check if a rule matches the given FIX message fields"""
-        for field, pattern in rule.items():
-            if pd.isna(pattern) or pattern in ['*', '']:
-                continue
-                
-            # Handle special field mappings
-            actual_value = None
-            
-            # Map CSV column names to FIX tags
-            if field == 'SENDERCOMPID':
-                actual_value = fix_fields.get('49')  # SenderCompID
-            elif field == 'ONBEHALFOFCOMPID':
-                actual_value = fix_fields.get('116')  # OnBehalfOfCompID
-            elif field == 'TARGETSUBID':
-                actual_value = fix_fields.get('57')  # TargetSubID
-            elif field == 'DELIVERTOSUBID':
-                actual_value = fix_fields.get('128')  # DeliverToSubID
-            elif field == 'CURRENCY':
-                actual_value = fix_fields.get('15')  # Currency
-            elif field == 'ACCOUNT':
-                actual_value = fix_fields.get('1')   # Account
-            elif field == 'HANDLINST':
-                actual_value = fix_fields.get('21')  # HandlInst
-            elif field == 'ETF':
+    def rule_fields(self, fix_fields: Dict[str, str], columns=None) -> Dict[str, Optional[str]]:
+        """Map the FIX tags of a message onto routing CSV column names"""
+        fields = {}
+        for column in (self.rules.rule_columns if columns is None else columns):
+            if column in COLUMN_TAGS:
+                fields[column] = fix_fields.get(COLUMN_TAGS[column])
+            elif column == 'ETF':
                 # ETF might be in custom tag 5847 or other field
-                actual_value = fix_fields.get('5847') or fix_fields.get('n')  # Adjust as needed
-            elif field == 'COUNTRYCODE':
-                actual_value = fix_fields.get('421')  # Country
-            elif field == 'FIX.5847':
-                actual_value = fix_fields.get('5847')  # Custom tag
-            elif field == 'ULFOMSESSIONNAME':
-                actual_value = fix_fields.get('n')    # Adjust based on your implementation
-            elif field == 'ELECTRONIC_TRADING':
-                actual_value = fix_fields.get('n')    # Adjust based on your implementation
-            elif field.startswith('#'):
+                fields[column] = fix_fields.get('5847') or fix_fields.get('n')  # Adjust as needed
+            elif column.startswith('#'):
                 # Custom identifier field (like #ACCOUNT)
-                identifier_name = field[1:]
-                actual_value = fix_fields.get(identifier_name)
+                fields[column] = fix_fields.get(column[1:])
             else:
                 # Try direct tag mapping
-                actual_value = fix_fields.get(field)
+                fields[column] = fix_fields.get(column)
+        return fields
+    
+    def match_rule(self, rule: Dict[str, Any], fix_fields: Dict[str, str]) -> bool:
+        """Check if a rule matches the given FIX message fields"""
+        fields = self.rule_fields(fix_fields, [k for k in rule if k != 'DESTINATION'])
+        for field, actual_value in fields.items():
+            pattern = rule[field]
+            if pd.isna(pattern) or pattern in ['*', '']:
+                continue
             
             # If we have a pattern but no actual value, no match
             if actual_value is None:
                 return False
             
-            # Handle wildcard patterns
-            if pattern == '*':
-                continue
-            
-            # Handle account number patterns like 200xxxxx
-            if str(pattern).startswith('200') and 'x' in str(pattern):
-                pattern_str = str(pattern).replace('x', '.')
-                import re
-                if not re.match(pattern_str, str(actual_value)):
+            matcher = _account_pattern(field, str(pattern))
+            if matcher is not None:
+                if not matcher(str(actual_value)):
                     return False
             # Exact match for other cases
             elif str(actual_value) != str(pattern):
@@ -115,36 +178,87 @@ class FIXRouter:
         
         return True
     
+    @staticmethod
+    def _route(rules: CompiledRules, rule_id: Optional[int]) -> Optional[Dict[str, Any]]:
+        if rule_id is None:
+            return None
+        network_name, rule = rules.rule_refs[rule_id]
+        return {
+            'network': network_name,
+            'destination': rule['DESTINATION'],
+            'matched_rule': {k: v for k, v in rule.items() if k != 'DESTINATION'}
+        }
+    
     def find_routing_path(self, fix_message: str) -> Optional[str]:
         """Find the routing destination for a given FIX message"""
+        rules = self.refresh()
         fix_fields = self.parse_fix_message(fix_message)
-        
-        for network_name, network_data in self.routing_rules.items():
-            for rule in network_data['rules']:
-                if self.match_rule(rule, fix_fields):
-                    destination = rule.get('DESTINATION')
-                    if destination and not pd.isna(destination):
-                        return destination
-        
-        return None
+        route = self._route(rules, rules.rule_index.first(self.rule_fields(fix_fields, rules.rule_columns)))
+        return route['destination'] if route else None
     
     def get_all_possible_routes(self, fix_message: str) -> List[Dict[str, str]]:
         """Get all possible routing paths for a given FIX message"""
+        rules = self.refresh()
         fix_fields = self.parse_fix_message(fix_message)
-        routes = []
-        
-        for network_name, network_data in self.routing_rules.items():
-            for rule in network_data['rules']:
-                if self.match_rule(rule, fix_fields):
-                    destination = rule.get('DESTINATION')
-                    if destination and not pd.isna(destination):
-                        routes.append({
-                            'network': network_name,
-                            'destination': destination,
-                            'matched_rule': {k: v for k, v in rule.items() if k != 'DESTINATION'}
-                        })
+        return [self._route(rules, rule_id)
+                for rule_id in rules.rule_index.matches(self.rule_fields(fix_fields, rules.rule_columns))]
+    
+    def order_rule_columns(self, orders: pd.DataFrame, rule_columns: List[str] = None) -> pd.DataFrame:
+        """
+        Vectorized rule_fields(): one column per routing CSV column, taken from the
+        order columns named by FIX tag ('49') or by FIX field name ('SenderCompID').
+        """
+        def source(tag):
+            for name in (tag, FIELD_NAMES.get(tag)):
+                if name in orders.columns:
+                    return orders[name]
+            return pd.Series(None, index=orders.index, dtype=object)
         
-        return routes
+        columns = {}
+        for column in (self.rules.rule_columns if rule_columns is None else rule_columns):
+            if column in COLUMN_TAGS:
+                columns[column] = source(COLUMN_TAGS[column])
+            elif column == 'ETF':
+                etf = source('5847')
+                columns[column] = etf.where(etf.notna() & (etf != ''), source('n'))
+            elif column.startswith('#'):
+                columns[column] = source(column[1:])
+            else:
+                columns[column] = source(column)
+        return pd.DataFrame(columns, index=orders.index)
+    
+    def rules_frame(self, rules: CompiledRules = None) -> pd.DataFrame:
+        """The compiled rules as a DataFrame, in priority order"""
+        rules = rules or self.rules
+        return pd.DataFrame([{k: v for k, v in rule.items() if k != 'DESTINATION'}
+                             for _, rule in rules.rule_refs], columns=rules.rule_columns)
+    
+    def route_dataframe(self, orders: pd.DataFrame) -> pd.DataFrame:
+        """
+        Route a whole DataFrame of parsed orders (columns named by FIX tag or field
+        name) with joins and masks rather than a loop per order.
+        Returns a copy with 'network' and 'destination' columns added.
+        """
+        rules = self.refresh()
+        positions = first_match(self.rules_frame(rules), self.order_rule_columns(orders, rules.rule_columns),
+                                rules.rule_columns, pattern_regex=_account_regex)
+        networks = pd.Series([network for network, _ in rules.rule_refs] + [None])
+        destinations = pd.Series([rule['DESTINATION'] for _, rule in rules.rule_refs] + [None])
+        # NO_MATCH (-1) picks the trailing None
+        routed = orders.copy()
+        routed['network'] = networks.iloc[positions.values].values
+        routed['destination'] = destinations.iloc[positions.values].values
+        return routed
+
+def simulate_reroutes(orders: pd.DataFrame, current: 'FIXRouter', proposed: 'FIXRouter'):
+    """
+    Route the same orders under two versions of the rule files.
+    Returns (orders whose destination changes, counts per before -> after flow).
+    """
+    before = current.route_dataframe(orders)['destination']
+    after = proposed.route_dataframe(orders)['destination']
+    diff = diff_routes(orders, before, after)
+    return diff, reroute_summary(diff)
 
 # Example usage
 def main():